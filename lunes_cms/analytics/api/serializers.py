@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
+from django.conf import settings
 from rest_framework import serializers
 
 from ..models import AnalyticsEvent
@@ -154,3 +155,41 @@ class AnalyticsEventSerializer(serializers.ModelSerializer):
 
         model = AnalyticsEvent
         fields = ("installation_id", "event_type", "timestamp", "payload")
+
+
+class AnalyticsEventBatchSerializer(serializers.Serializer):
+    """
+    Serializer for a batch of analytics events of one installation. Every event is
+    validated like a single event.
+    """
+
+    installation_id = serializers.CharField(max_length=255)
+    events = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+
+    def validate_events(self, events: list[dict]) -> list[dict]:
+        """
+        Limit the size of a batch to :setting:`ANALYTICS_BULK_MAX_EVENTS`
+        """
+        if len(events) > settings.ANALYTICS_BULK_MAX_EVENTS:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {settings.ANALYTICS_BULK_MAX_EVENTS} elements."
+            )
+        return events
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        events = AnalyticsEventSerializer(
+            data=[
+                {**event, "installation_id": attrs["installation_id"]}
+                for event in attrs["events"]
+            ],
+            many=True,
+        )
+        if not events.is_valid():
+            raise serializers.ValidationError({"events": events.errors})
+        return {**attrs, "events": events.validated_data}
+
+    def update(self, instance: Any, validated_data: Any) -> Any:
+        raise RuntimeError("Should not be called on a batch serializer")
+
+    def create(self, validated_data: dict[str, Any]) -> list[AnalyticsEvent]:
+        return [AnalyticsEvent(**event) for event in validated_data["events"]]
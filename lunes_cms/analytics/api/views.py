@@ -2,15 +2,19 @@ from __future__ import annotations
 
 from typing import Any
 
+from django.conf import settings
 from django.db.models import QuerySet
-from rest_framework import mixins, status, viewsets
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import mixins, serializers, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.throttling import ScopedRateThrottle, SimpleRateThrottle
 from rest_framework.views import APIView
 
+from ..buffer import event_buffer
 from ..models import AnalyticsEvent
-from .serializers import AnalyticsEventSerializer
+from .serializers import AnalyticsEventBatchSerializer, AnalyticsEventSerializer
 
 
 class InstallationRateThrottle(SimpleRateThrottle):
@@ -24,22 +28,74 @@ class InstallationRateThrottle(SimpleRateThrottle):
         """
         Get the cache key for this request if exists
         """
+        if not isinstance(request.data, dict):
+            return None
         installation_id = request.data.get("installation_id")
         if not installation_id:
             return None
         return f"rl:installation:{installation_id}"
 
 
+def _write_status() -> int:
+    """
+    :return: 201 if the events are written right away, or 202 if they are only
+        buffered and may still be lost if the process dies
+    """
+    return (
+        status.HTTP_202_ACCEPTED
+        if settings.ANALYTICS_BUFFER_SIZE > 0
+        else status.HTTP_201_CREATED
+    )
+
+
 class AnalyticsEventViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     """
-    View class for analytics events
+    View class for analytics events. If the write buffer is enabled, events are
+    answered with 202 Accepted instead of 201 Created, since they are written
+    later.
     """
 
     throttle_classes = [InstallationRateThrottle]
     serializer_class = AnalyticsEventSerializer
 
+    @extend_schema(
+        responses={
+            response_status: AnalyticsEventSerializer
+            for response_status in (status.HTTP_201_CREATED, status.HTTP_202_ACCEPTED)
+        },
+    )
+    def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Create a single event. If the write buffer is enabled, the event is
+        accepted but written later.
+        """
+        response = super().create(request, *args, **kwargs)
+        response.status_code = _write_status()
+        return response
+
     def perform_create(self, serializer: AnalyticsEventSerializer) -> None:
-        serializer.save()
+        event_buffer.add([AnalyticsEvent(**serializer.validated_data)])
+
+    @extend_schema(
+        request=AnalyticsEventBatchSerializer,
+        responses={
+            response_status: inline_serializer(
+                "AnalyticsEventBatchResponse", {"count": serializers.IntegerField()}
+            )
+            for response_status in (status.HTTP_201_CREATED, status.HTTP_202_ACCEPTED)
+        },
+    )
+    @action(detail=False, methods=["post"])
+    def bulk(self, request: Request) -> Response:
+        """
+        Create a batch of events of one installation with a single query. If the
+        write buffer is enabled, the events are accepted but written later.
+        """
+        serializer = AnalyticsEventBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        events = serializer.save()
+        event_buffer.add(events)
+        return Response({"count": len(events)}, status=_write_status())
 
 
 class AnalyticsGDPRViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
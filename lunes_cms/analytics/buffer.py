@@ -0,0 +1,103 @@
+"""
+In-process write buffer for analytics events.
+
+Events are collected in memory and written with a single ``bulk_create`` once
+the buffer holds :setting:`ANALYTICS_BUFFER_SIZE` events or its oldest event is
+:setting:`ANALYTICS_BUFFER_MAX_AGE` seconds old. Every process has its own
+buffer, which is flushed when the process exits. Events still buffered when a
+process is killed are lost, which is why the buffer is disabled by default.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections, DatabaseError
+
+from .models import AnalyticsEvent
+
+logger = logging.getLogger(__name__)
+
+
+def write_events(events: list[AnalyticsEvent]) -> None:
+    """
+    Write analytics events with as few queries as possible
+
+    :param events: The unsaved events
+    """
+    for event in events:
+        event.copy_payload_keys()
+    if events:
+        AnalyticsEvent.objects.bulk_create(
+            events, batch_size=settings.ANALYTICS_BULK_MAX_EVENTS
+        )
+
+
+class EventBuffer:
+    """
+    Thread-safe buffer of analytics events which are not written yet
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._events: list[AnalyticsEvent] = []
+        self._timer: threading.Timer | None = None
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def add(self, events: list[AnalyticsEvent]) -> None:
+        """
+        Buffer analytics events and flush the buffer if it's full. If the buffer
+        is disabled, the events are written right away.
+
+        :param events: The unsaved events
+        """
+        if settings.ANALYTICS_BUFFER_SIZE <= 0:
+            write_events(events)
+            return
+        with self._lock:
+            self._events.extend(events)
+            full = len(self._events) >= settings.ANALYTICS_BUFFER_SIZE
+            if not full and self._timer is None:
+                self._timer = threading.Timer(
+                    settings.ANALYTICS_BUFFER_MAX_AGE, self._flush_in_background
+                )
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all buffered events. Events that can't be written are dropped,
+        so a database outage doesn't let the buffer grow without bounds.
+
+        :return: The number of flushed events
+        """
+        with self._lock:
+            events, self._events = self._events, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        try:
+            write_events(events)
+        except DatabaseError:
+            logger.exception("Dropped %d buffered analytics events", len(events))
+        return len(events)
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        finally:
+            # The timer thread has its own database connection
+            connections.close_all()
+
+
+#: The write buffer of this process
+event_buffer = EventBuffer()
+
+atexit.register(event_buffer.flush)
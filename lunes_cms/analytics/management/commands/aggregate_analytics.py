@@ -3,12 +3,14 @@ from __future__ import annotations
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, UTC
-from typing import Any, Mapping
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Any, Iterator
 
 from django.core.management import CommandParser
 from django.core.management.base import BaseCommand
 from django.db import models, transaction
-from django.db.models import Count, IntegerField, OuterRef, Q, QuerySet, Subquery, Sum
+from django.db.models import Count, IntegerField, Q, QuerySet, Sum
 from django.db.models.fields.json import KT
 from django.db.models.functions import Cast, TruncDate
 from django.utils import timezone
@@ -46,7 +48,8 @@ class EventAggregator(ABC):
 
         The queryset is already filtered to events of this aggregator's types,
         bounded by the snapshot ID, restricted to ``aggregated_at__isnull=True``
-        and annotated with ``event_date`` (UTC date of the event).
+        and annotated with ``event_date`` (UTC date of the event). The type checker
+        can't see this annotation, so queries using it are marked as ignored.
 
         Returns a list of InfluxDB line protocol strings to be pushed after the
         transaction commits.
@@ -68,15 +71,11 @@ class JobSelectionAggregator(EventAggregator):
         job_names: dict[int, str],
         unit_names: dict[int, str],
     ) -> list[str]:
-        daily_stats = (
-            events.annotate(job_id=KT("payload__job_id"))
-            .values("job_id", "event_date")
-            .annotate(
-                selection_count=(
-                    Count("id", filter=Q(payload__action="add"))
-                    - Count("id", filter=Q(payload__action="remove"))
-                ),
-            )
+        daily_stats = events.values("job_id", "event_date").annotate(  # type: ignore[misc]
+            selection_count=(
+                Count("id", filter=Q(payload__action="add"))
+                - Count("id", filter=Q(payload__action="remove"))
+            ),
         )
 
         lines = []
@@ -119,6 +118,9 @@ class SessionAggregator(EventAggregator):
         AnalyticsEvent.EventType.SESSION_END,
     ]
 
+    #: Number of events fetched per round trip while streaming the events
+    chunk_size = 10_000
+
     @classmethod
     def aggregate(
         cls,
@@ -131,71 +133,75 @@ class SessionAggregator(EventAggregator):
         daily: dict[Any, tuple[int, int]] = (
             {}
         )  # event_date -> (session_count, total_duration_seconds)
-        consumed_session_ids: list[str] = []
+        unpaired_ids: list[int] = []
 
-        for session in cls.sessions(events):
+        for session in cls.sessions(events, unpaired_ids):
             d = session["event_date"]
             duration_seconds = int(
                 (session["end_timestamp"] - session["timestamp"]).total_seconds()
             )
             count, total = daily.get(d, (0, 0))
             daily[d] = (count + 1, total + duration_seconds)
-            consumed_session_ids.append(session["payload__session_id"])
-            logger.info("Queued session for date=%s duration=%ds", d, duration_seconds)
+            logger.debug("Queued session for date=%s duration=%ds", d, duration_seconds)
 
         lines = []
         for d, (count, total_duration) in daily.items():
-            ts = date_to_ns(d)
             lines.append(
-                f"lunes_sessions total_sessions={count}i,total_duration_seconds={total_duration}i {ts}"
+                f"lunes_sessions total_sessions={count}i,total_duration_seconds={total_duration}i {date_to_ns(d)}"
             )
-
-        if consumed_session_ids:
-            events.filter(payload__session_id__in=consumed_session_ids).update(
-                aggregated_at=aggregated_at
+            logger.info(
+                "Queued sessions line: date=%s sessions=%d duration=%ds",
+                d,
+                count,
+                total_duration,
             )
+
+        # Usually almost all events are paired, so mark all of them at once and
+        # only reset the few unpaired ones instead of listing every paired event.
+        events.update(aggregated_at=aggregated_at)
+        for start in range(0, len(unpaired_ids), cls.chunk_size):
+            AnalyticsEvent.objects.filter(
+                pk__in=unpaired_ids[start : start + cls.chunk_size]
+            ).update(aggregated_at=None)
         return lines
 
-    @staticmethod
+    @classmethod
     def sessions(
-        events: QuerySet[AnalyticsEvent],
-    ) -> QuerySet[AnalyticsEvent, Mapping[str, Any]]:
+        cls, events: QuerySet[AnalyticsEvent], unpaired_ids: list[int] | None = None
+    ) -> Iterator[dict[str, Any]]:
         """
-        Converts the query set of session_start and session_end events into a query set of
-        valid sessions with `event_date`, `timestamp`, `end_timestamp` and `payload__session_id` keys.
+        Pairs the session_start and session_end events in a single pass and yields the
+        valid sessions with `event_date`, `timestamp`, `end_timestamp` and `session_id` keys.
+
+        The events are streamed ordered by their session id, so all events of a session
+        are adjacent and only one session has to be kept in memory at a time. A session is
+        valid if its id occurs exactly twice in the dataset, once as start and once as end.
+        Any other group of events, e.g. a session that was started but not ended yet or
+        ended multiple times, is invalid and its event ids are appended to
+        ``unpaired_ids``, if given.
         """
-        # First filter on the number of unique session ids.
-        # Any session which does not occur exactly twice in the dataset is invalid.
-        # For example, a session that was started but not ended, or ended multiple times.
-        # This still leaves some invalid data, like sessions that were ended twice or started twice.
-        possibly_valid_sessions = (
-            events.values("payload__session_id")
-            .annotate(num_session_ids=Count("pk"))
-            .filter(num_session_ids=2)
-            .values("payload__session_id")
-        )
-        # Next figure out all session end events that may be valid.
-        possibly_valid_ends = events.filter(
-            event_type=AnalyticsEvent.EventType.SESSION_END,
-            payload__session_id__in=possibly_valid_sessions,
-        )
-        # With the possibly valid ends we can now figure out all the valid pairs of (session_start, session_end):
-        # The main condition is: session_id is used exactly twice, there exists an end event with the session id
-        # and there exists a start event with the session id. If this is true, we know that the session is valid.
-        return (
-            events.filter(
-                event_type=AnalyticsEvent.EventType.SESSION_START,
-            )
-            .annotate(
-                end_timestamp=Subquery(
-                    possibly_valid_ends.filter(
-                        payload__session_id=OuterRef("payload__session_id")
-                    ).values("timestamp")
-                )
-            )
-            .values("event_date", "timestamp", "end_timestamp", "payload__session_id")
-            .filter(end_timestamp__isnull=False)
+        rows = (
+            events.order_by("session_id", "event_type", "pk")  # type: ignore[misc]
+            .values_list("pk", "session_id", "event_type", "timestamp", "event_date")
+            .iterator(chunk_size=cls.chunk_size)
         )
+        for session_id, group in groupby(rows, key=itemgetter(1)):
+            session_events = list(islice(group, 3))
+            event_types = [event_type for _, _, event_type, _, _ in session_events]
+            if session_id is not None and event_types == [
+                AnalyticsEvent.EventType.SESSION_END,
+                AnalyticsEvent.EventType.SESSION_START,
+            ]:
+                end, start = session_events
+                yield {
+                    "event_date": start[4],
+                    "timestamp": start[3],
+                    "end_timestamp": end[3],
+                    "session_id": session_id,
+                }
+            elif unpaired_ids is not None:
+                unpaired_ids.extend(pk for pk, _, _, _, _ in session_events)
+                unpaired_ids.extend(pk for pk, _, _, _, _ in group)
 
 
 class ModuleDurationAggregator(EventAggregator):
@@ -215,10 +221,10 @@ class ModuleDurationAggregator(EventAggregator):
         unit_names: dict[int, str],
     ) -> list[str]:
         standard_events = events.filter(
-            payload__exercise_key__type=AnalyticsEvent.ExerciseKeyType.STANDARD
+            exercise_key_type=AnalyticsEvent.ExerciseKeyType.STANDARD
         )
         training_events = events.filter(
-            payload__exercise_key__type=AnalyticsEvent.ExerciseKeyType.TRAINING
+            exercise_key_type=AnalyticsEvent.ExerciseKeyType.TRAINING
         )
         lines = cls._standard_lines(standard_events, unit_names) + cls._training_lines(
             training_events, job_names
@@ -232,8 +238,6 @@ class ModuleDurationAggregator(EventAggregator):
     ) -> list[str]:
         standard_aggregated = (
             standard_events.annotate(
-                exercise_type=KT("payload__exercise_key__exercise_type"),
-                unit_id=KT("payload__exercise_key__unit_id"),
                 duration_seconds=Cast(
                     KT("payload__duration_seconds"), output_field=IntegerField()
                 ),
@@ -272,8 +276,6 @@ class ModuleDurationAggregator(EventAggregator):
     ) -> list[str]:
         training_aggregated = (
             training_events.annotate(
-                exercise_type=KT("payload__exercise_key__exercise_type"),
-                job_id=KT("payload__exercise_key__job_id"),
                 duration_seconds=Cast(
                     KT("payload__duration_seconds"), output_field=IntegerField()
                 ),
@@ -322,10 +324,10 @@ class DropoutAggregator(EventAggregator):
         unit_names: dict[int, str],
     ) -> list[str]:
         standard_events = events.filter(
-            payload__exercise_key__type=AnalyticsEvent.ExerciseKeyType.STANDARD
+            exercise_key_type=AnalyticsEvent.ExerciseKeyType.STANDARD
         )
         training_events = events.filter(
-            payload__exercise_key__type=AnalyticsEvent.ExerciseKeyType.TRAINING
+            exercise_key_type=AnalyticsEvent.ExerciseKeyType.TRAINING
         )
         lines = cls._standard_lines(standard_events, unit_names) + cls._training_lines(
             training_events, job_names
@@ -337,20 +339,13 @@ class DropoutAggregator(EventAggregator):
     def _standard_lines(
         standard_events: QuerySet[AnalyticsEvent], unit_names: dict[int, str]
     ) -> list[str]:
-        standard_aggregated = (
-            standard_events.annotate(
-                exercise_type=KT("payload__exercise_key__exercise_type"),
-                unit_id=KT("payload__exercise_key__unit_id"),
-            )
-            .values(
-                "event_date",
-                "exercise_type",
-                "unit_id",
-                "payload__position",
-                "payload__total",
-            )
-            .annotate(dropout_count=Count("pk"))
-        )
+        standard_aggregated = standard_events.values(  # type: ignore[misc]
+            "event_date",
+            "exercise_type",
+            "unit_id",
+            "payload__position",
+            "payload__total",
+        ).annotate(dropout_count=Count("pk"))
         lines = []
         for event in standard_aggregated:
             unit_id = event["unit_id"]
@@ -379,20 +374,13 @@ class DropoutAggregator(EventAggregator):
     def _training_lines(
         training_events: QuerySet[AnalyticsEvent], job_names: dict[int, str]
     ) -> list[str]:
-        training_aggregated = (
-            training_events.annotate(
-                exercise_type=KT("payload__exercise_key__exercise_type"),
-                job_id=KT("payload__exercise_key__job_id"),
-            )
-            .values(
-                "event_date",
-                "exercise_type",
-                "job_id",
-                "payload__position",
-                "payload__total",
-            )
-            .annotate(dropout_count=Count("pk"))
-        )
+        training_aggregated = training_events.values(  # type: ignore[misc]
+            "event_date",
+            "exercise_type",
+            "job_id",
+            "payload__position",
+            "payload__total",
+        ).annotate(dropout_count=Count("pk"))
         lines = []
         for event in training_aggregated:
             job_id = event["job_id"]
@@ -436,10 +424,10 @@ class ExerciseRepetitionAggregator(EventAggregator):
         unit_names: dict[int, str],
     ) -> list[str]:
         standard_events = events.filter(
-            payload__exercise_key__type=AnalyticsEvent.ExerciseKeyType.STANDARD
+            exercise_key_type=AnalyticsEvent.ExerciseKeyType.STANDARD
         )
         training_events = events.filter(
-            payload__exercise_key__type=AnalyticsEvent.ExerciseKeyType.TRAINING
+            exercise_key_type=AnalyticsEvent.ExerciseKeyType.TRAINING
         )
         lines = ExerciseRepetitionAggregator._standard_lines(
             standard_events, unit_names
@@ -451,15 +439,9 @@ class ExerciseRepetitionAggregator(EventAggregator):
     def _standard_lines(
         standard_events: QuerySet[AnalyticsEvent], unit_names: dict[int, str]
     ) -> list[str]:
-        per_session = (
-            standard_events.annotate(
-                exercise_type=KT("payload__exercise_key__exercise_type"),
-                unit_id=KT("payload__exercise_key__unit_id"),
-                session_id=KT("payload__session_id"),
-            )
-            .values("event_date", "exercise_type", "unit_id", "session_id")
-            .annotate(reps=Count("pk"))
-        )
+        per_session = standard_events.values(  # type: ignore[misc]
+            "event_date", "exercise_type", "unit_id", "session_id"
+        ).annotate(reps=Count("pk"))
         dist: dict[tuple, int] = {}
         for row in per_session:
             unit_id = row["unit_id"]
@@ -494,15 +476,9 @@ class ExerciseRepetitionAggregator(EventAggregator):
     def _training_lines(
         training_events: QuerySet[AnalyticsEvent], job_names: dict[int, str]
     ) -> list[str]:
-        per_session = (
-            training_events.annotate(
-                exercise_type=KT("payload__exercise_key__exercise_type"),
-                job_id=KT("payload__exercise_key__job_id"),
-                session_id=KT("payload__session_id"),
-            )
-            .values("event_date", "exercise_type", "job_id", "session_id")
-            .annotate(reps=Count("pk"))
-        )
+        per_session = training_events.values(  # type: ignore[misc]
+            "event_date", "exercise_type", "job_id", "session_id"
+        ).annotate(reps=Count("pk"))
         dist: dict[tuple, int] = {}
         for row in per_session:
             job_id = row["job_id"]
@@ -628,19 +604,22 @@ class Command(BaseCommand):
         event_types = aggregator_class.event_types
 
         # Capture max ID to avoid touching events that arrive during aggregation.
-        max_id = AnalyticsEvent.objects.filter(
+        # The oldest timestamp lets PostgreSQL skip partitions of months that are
+        # aggregated completely.
+        bounds = AnalyticsEvent.objects.filter(
             event_type__in=event_types,
             aggregated_at__isnull=True,
-        ).aggregate(max_id=models.Max("id"))["max_id"]
+        ).aggregate(max_id=models.Max("id"), min_timestamp=models.Min("timestamp"))
 
-        if max_id is None:
+        if bounds["max_id"] is None:
             self.stdout.write(f"No new {event_types} events to aggregate.")
             return
 
         events = AnalyticsEvent.objects.filter(
             event_type__in=event_types,
             aggregated_at__isnull=True,
-            id__lte=max_id,
+            id__lte=bounds["max_id"],
+            timestamp__gte=bounds["min_timestamp"],
         ).annotate(event_date=TruncDate("timestamp", tzinfo=UTC))
 
         aggregated_at = timezone.now()
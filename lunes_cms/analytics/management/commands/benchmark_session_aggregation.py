@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, UTC
+from typing import Any
+
+from django.core.management import CommandParser
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models.functions import TruncDate
+
+from lunes_cms.analytics.models import AnalyticsEvent
+
+from .aggregate_analytics import SessionAggregator
+
+INSTALLATION_ID = "session-aggregation-benchmark"
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the session pairing of ``aggregate_analytics`` against generated events.
+
+    The events are created in a transaction that is rolled back afterwards, so the
+    command can be run on any database without leaving data behind.
+    """
+
+    help = "Benchmark the session aggregation against generated session events (rolled back afterwards)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sessions",
+            type=int,
+            default=1_000_000,
+            help="Number of complete sessions to generate (each consists of two events).",
+        )
+        parser.add_argument(
+            "--unpaired",
+            type=float,
+            default=0.01,
+            help="Share of additional session_start events without a session_end.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Number of days the generated sessions are spread over.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Number of events inserted per query.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+
+    @transaction.atomic
+    def handle(self, *args: Any, **options: Any) -> None:
+        random.seed(options["seed"])
+        started = time.perf_counter()
+        expected = self._generate_events(
+            options["sessions"],
+            options["unpaired"],
+            options["days"],
+            options["batch_size"],
+        )
+        self.stdout.write(
+            f"Generated {AnalyticsEvent.objects.filter(installation_id=INSTALLATION_ID).count()} "
+            f"events in {time.perf_counter() - started:.1f}s."
+        )
+
+        events = AnalyticsEvent.objects.filter(
+            installation_id=INSTALLATION_ID,
+            event_type__in=SessionAggregator.event_types,
+            aggregated_at__isnull=True,
+        ).annotate(event_date=TruncDate("timestamp", tzinfo=UTC))
+        started = time.perf_counter()
+        lines = SessionAggregator.aggregate(events, datetime.now(tz=UTC), {}, {})
+        elapsed = time.perf_counter() - started
+
+        expected_lines = {
+            f"total_sessions={count}i,total_duration_seconds={duration}i"
+            for count, duration in expected.values()
+        }
+        actual_lines = {line.split(" ")[1] for line in lines}
+        transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"Aggregated {options['sessions']} sessions into {len(lines)} lines "
+            f"in {elapsed:.1f}s ({options['sessions'] / max(elapsed, 1e-9):.0f} sessions/s)."
+        )
+        if actual_lines == expected_lines:
+            self.stdout.write(self.style.SUCCESS("Daily totals match."))
+        else:
+            self.stderr.write(self.style.ERROR("Daily totals don't match."))
+
+    @staticmethod
+    def _generate_events(
+        sessions: int, unpaired: float, days: int, batch_size: int
+    ) -> dict[date, tuple[int, int]]:
+        """
+        Insert random session events and return the expected daily totals
+        (session count and total duration in seconds) per start day.
+        """
+        first_day = datetime(2026, 1, 1, tzinfo=UTC)
+        expected: dict[date, tuple[int, int]] = {}
+        batch: list[AnalyticsEvent] = []
+
+        def event(event_type: str, timestamp: datetime, session_id: str) -> None:
+            new_event = AnalyticsEvent(
+                installation_id=INSTALLATION_ID,
+                event_type=event_type,
+                timestamp=timestamp,
+                payload={"session_id": session_id},
+            )
+            new_event.copy_payload_keys()
+            batch.append(new_event)
+            if len(batch) >= batch_size:
+                AnalyticsEvent.objects.bulk_create(batch)
+                batch.clear()
+
+        for _ in range(sessions):
+            session_id = uuid.uuid4().hex
+            start = first_day + timedelta(seconds=random.randrange(days * 86_400))
+            duration = random.randrange(1, 3_600)
+            event(AnalyticsEvent.EventType.SESSION_START, start, session_id)
+            event(
+                AnalyticsEvent.EventType.SESSION_END,
+                start + timedelta(seconds=duration),
+                session_id,
+            )
+            count, total = expected.get(start.date(), (0, 0))
+            expected[start.date()] = (count + 1, total + duration)
+        for _ in range(int(sessions * unpaired)):
+            event(
+                AnalyticsEvent.EventType.SESSION_START,
+                first_day + timedelta(seconds=random.randrange(days * 86_400)),
+                uuid.uuid4().hex,
+            )
+        AnalyticsEvent.objects.bulk_create(batch)
+        return expected
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, UTC
+from typing import Any
+
+from django.core.management import CommandParser
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from lunes_cms.analytics.models import AnalyticsEvent
+from lunes_cms.analytics.partitions import (
+    create_partition,
+    drop_partition,
+    get_partitions,
+    is_partitioned,
+    next_month,
+    partition_name,
+)
+
+from .aggregate_analytics import EVENT_AGGREGATORS, RETENTION_DAYS
+
+
+class Command(BaseCommand):
+    """
+    Create the monthly partitions of the analytics events for the upcoming months
+    and drop partitions whose events are all expired.
+
+    Partitions which still contain events waiting for a batch aggregator are never
+    dropped, so a failing aggregation can't lose data.
+    """
+
+    help = "Create upcoming and drop expired monthly partitions of the analytics events (PostgreSQL only)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Number of upcoming months to create partitions for, besides the current one.",
+        )
+        parser.add_argument(
+            "--drop-expired",
+            action="store_true",
+            help="Drop partitions of months that ended before the retention period.",
+        )
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=RETENTION_DAYS,
+            help=f"Number of days events are kept when using --drop-expired (default: {RETENTION_DAYS}).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only show which partitions would be created or dropped.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not is_partitioned():
+            self.stdout.write(
+                "Analytics events are not partitioned (requires PostgreSQL), nothing to do."
+            )
+            return
+        self._create_partitions(options["months_ahead"], options["dry_run"])
+        if options["drop_expired"]:
+            self._drop_expired_partitions(options["retention_days"], options["dry_run"])
+
+    def _create_partitions(self, months_ahead: int, dry_run: bool) -> None:
+        existing = get_partitions()
+        month = timezone.now().date().replace(day=1)
+        for _ in range(months_ahead + 1):
+            if month not in existing:
+                if dry_run:
+                    self.stdout.write(
+                        f"[DRY RUN] Would create {partition_name(month)}."
+                    )
+                elif create_partition(month):
+                    self.stdout.write(
+                        self.style.SUCCESS(f"Created {partition_name(month)}.")
+                    )
+            month = next_month(month)
+
+    def _drop_expired_partitions(self, retention_days: int, dry_run: bool) -> None:
+        cutoff = (timezone.now() - timedelta(days=retention_days)).date()
+        batch_aggregated_types = [
+            event_type
+            for aggregator in EVENT_AGGREGATORS
+            for event_type in aggregator.event_types
+        ]
+        for month, name in sorted(get_partitions().items()):
+            if next_month(month) > cutoff:
+                continue
+            pending = AnalyticsEvent.objects.filter(
+                timestamp__gte=datetime(month.year, month.month, 1, tzinfo=UTC),
+                timestamp__lt=datetime(
+                    next_month(month).year, next_month(month).month, 1, tzinfo=UTC
+                ),
+                event_type__in=batch_aggregated_types,
+                aggregated_at__isnull=True,
+            )
+            if pending.exists():
+                self.stderr.write(
+                    self.style.WARNING(
+                        f"Keeping {name}, it contains events which are not aggregated yet."
+                    )
+                )
+            elif dry_run:
+                self.stdout.write(f"[DRY RUN] Would drop {name}.")
+            else:
+                drop_partition(month)
+                self.stdout.write(self.style.SUCCESS(f"Dropped {name}."))
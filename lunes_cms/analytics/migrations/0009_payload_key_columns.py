@@ -0,0 +1,114 @@
+# Generated by Django 5.2.16 on 2026-10-18 11:58
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.models import Max, Min
+from django.db.models.fields.json import KT
+from django.db.models.functions import Coalesce
+
+#: How many events are updated by a single query of the backfill
+BATCH_SIZE = 10_000
+
+#: The index the session pairing streams the events in
+SESSION_INDEX = models.Index(
+    fields=["session_id", "event_type"], name="analytics_a_session_36cbe4_idx"
+)
+
+
+# pylint: disable=unused-argument
+def backfill_payload_keys(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """
+    Copy the payload keys of the existing events into their columns, in batches of
+    ids so every query only locks a few rows. Events written while the backfill
+    runs are included.
+    """
+    AnalyticsEvent = apps.get_model("analytics", "AnalyticsEvent")
+    bounds = AnalyticsEvent.objects.aggregate(first=Min("id"), last=Max("id"))
+    if bounds["first"] is None:
+        return
+    start, last = bounds["first"], bounds["last"]
+    while start <= last:
+        AnalyticsEvent.objects.filter(id__range=(start, start + BATCH_SIZE - 1)).update(
+            session_id=KT("payload__session_id"),
+            exercise_key_type=KT("payload__exercise_key__type"),
+            exercise_type=KT("payload__exercise_key__exercise_type"),
+            unit_id=KT("payload__exercise_key__unit_id"),
+            job_id=Coalesce(KT("payload__job_id"), KT("payload__exercise_key__job_id")),
+        )
+        start += BATCH_SIZE
+        if start > last:
+            last = AnalyticsEvent.objects.aggregate(last=Max("id"))["last"]
+
+
+def add_session_index(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """
+    Add the index of the session pairing, on PostgreSQL without blocking writes
+    """
+    model = apps.get_model("analytics", "AnalyticsEvent")
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(model, SESSION_INDEX, concurrently=True)
+    else:
+        schema_editor.add_index(model, SESSION_INDEX)
+
+
+def remove_session_index(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """
+    Remove the index of the session pairing
+    """
+    model = apps.get_model("analytics", "AnalyticsEvent")
+    schema_editor.remove_index(model, SESSION_INDEX)
+
+
+class Migration(migrations.Migration):
+    """
+    Store the payload keys the aggregations group on in their own columns, so
+    they are extracted from the JSON payload once instead of on every run.
+
+    The columns are nullable and have no default, so adding them doesn't rewrite
+    the table. The existing events are backfilled in batches outside of a single
+    transaction, and the index is built concurrently on PostgreSQL.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("analytics", "0008_keep_raw_events_drop_buckets"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analyticsevent",
+            name="exercise_key_type",
+            field=models.TextField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="analyticsevent",
+            name="exercise_type",
+            field=models.TextField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="analyticsevent",
+            name="job_id",
+            field=models.TextField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="analyticsevent",
+            name="session_id",
+            field=models.TextField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="analyticsevent",
+            name="unit_id",
+            field=models.TextField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_payload_keys, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_session_index, remove_session_index),
+            ],
+            state_operations=[
+                migrations.AddIndex(model_name="analyticsevent", index=SESSION_INDEX),
+            ],
+        ),
+    ]
@@ -0,0 +1,146 @@
+from datetime import date, timedelta
+
+from django.apps.registry import Apps
+from django.db import migrations
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.utils import timezone
+
+#: The table of the analytics events
+TABLE = "analytics_analyticsevent"
+
+#: The partition of all events outside of the monthly partitions
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+#: How many months of existing events get their own partition
+MONTHS_BACK = 12
+
+#: How many upcoming months get a partition right away
+MONTHS_AHEAD = 3
+
+
+def next_month(month: date) -> date:
+    """
+    :param month: The first day of a month
+    :return: The first day of the following month
+    """
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """
+    :param month: The first day of a month
+    :return: The name of the partition of this month
+    """
+    return f"{TABLE}_{month:%Y_%m}"
+
+
+def partition_bounds(month: date) -> str:
+    """
+    :param month: The first day of a month
+    :return: The SQL bounds of the partition of this month (in UTC)
+    """
+    return (
+        f"FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{next_month(month).isoformat()} 00:00:00+00')"
+    )
+
+
+def rebuild_table(schema_editor: BaseDatabaseSchemaEditor, partitioned: bool) -> None:
+    """
+    Copy the events into a new (partitioned or plain) table with the same
+    columns and indexes. Existing events older than ``MONTHS_BACK`` months are
+    stored in the default partition.
+    """
+    quote = schema_editor.quote_name
+    table, old = quote(TABLE), quote(f"{TABLE}_old")
+    sequence = quote(f"{TABLE}_id_seq")
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes"
+            " WHERE schemaname = current_schema() AND tablename = %s AND indexname NOT IN"
+            " (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p')",
+            [TABLE, TABLE],
+        )
+        index_definitions = [
+            definition.replace(" ON ONLY ", " ON ")
+            for (definition,) in cursor.fetchall()
+        ]
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns"
+            " WHERE table_schema = current_schema() AND table_name = %s AND is_generated = 'NEVER'",
+            [TABLE],
+        )
+        columns = ", ".join(quote(column) for (column,) in cursor.fetchall())
+
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {old}")
+        if partitioned:
+            cursor.execute(
+                f"CREATE TABLE {table} (LIKE {old} INCLUDING GENERATED)"
+                f" PARTITION BY RANGE ({quote('timestamp')})"
+            )
+            cursor.execute(
+                f"CREATE TABLE {quote(DEFAULT_PARTITION)} PARTITION OF {table} DEFAULT"
+            )
+            today = timezone.now().date()
+            month = (today - timedelta(days=31 * MONTHS_BACK)).replace(day=1)
+            last_month = today.replace(day=1)
+            for _ in range(MONTHS_AHEAD):
+                last_month = next_month(last_month)
+            while month <= last_month:
+                cursor.execute(
+                    f"CREATE TABLE {quote(partition_name(month))} PARTITION OF {table}"
+                    f" FOR VALUES {partition_bounds(month)}"
+                )
+                month = next_month(month)
+        else:
+            cursor.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING GENERATED)")
+        cursor.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {old}")
+        cursor.execute(f"DROP TABLE {old}")
+
+        cursor.execute(f"CREATE SEQUENCE {sequence} OWNED BY {table}.{quote('id')}")
+        cursor.execute(
+            f"SELECT setval('{sequence}', COALESCE(MAX({quote('id')}), 0) + 1, false) FROM {table}"
+        )
+        cursor.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {quote('id')} SET DEFAULT nextval('{sequence}')"
+        )
+        primary_key = ("id", "timestamp") if partitioned else ("id",)
+        cursor.execute(
+            f"ALTER TABLE {table} ADD PRIMARY KEY ({', '.join(map(quote, primary_key))})"
+        )
+        for definition in index_definitions:
+            cursor.execute(definition)
+
+
+# pylint: disable=unused-argument
+def partition_events(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """
+    Partition the analytics events by month on PostgreSQL
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        rebuild_table(schema_editor, partitioned=True)
+
+
+def unpartition_events(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """
+    Store the analytics events in a plain table again
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        rebuild_table(schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+    """
+    Partition the analytics events by month on PostgreSQL, so expired events
+    can be dropped as whole partitions. The primary key of the partitioned
+    table has to include the ``timestamp``, the ids stay unique nevertheless
+    because they are still assigned by a single sequence.
+    """
+
+    dependencies = [
+        ("analytics", "0009_payload_key_columns"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_events, unpartition_events),
+    ]
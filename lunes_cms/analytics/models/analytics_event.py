@@ -1,6 +1,18 @@
+import json
+from typing import Any
+
 from django.db import models
 
 
+def _payload_text(value: Any) -> str | None:
+    """
+    Get a payload value as text, like PostgreSQL's ``->>`` operator returns it
+    """
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
 class AnalyticsEvent(models.Model):
     """
     Analytics event
@@ -57,6 +69,15 @@ class AnalyticsEvent(models.Model):
         db_index=True,
     )
 
+    # Payload keys the aggregations group on, copied from the payload when an
+    # event is saved instead of extracted on every aggregation run
+    session_id = models.TextField(null=True, editable=False)
+    exercise_key_type = models.TextField(null=True, editable=False)
+    exercise_type = models.TextField(null=True, editable=False)
+    unit_id = models.TextField(null=True, editable=False)
+    # The job of job_selected events or of the exercise key of training events
+    job_id = models.TextField(null=True, editable=False)
+
     class Meta:
         """
         Meta class
@@ -64,9 +85,31 @@ class AnalyticsEvent(models.Model):
 
         indexes = [
             models.Index(fields=["timestamp"]),
+            models.Index(fields=["session_id", "event_type"]),
         ]
         ordering = ["-timestamp"]
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.copy_payload_keys()
+        super().save(*args, **kwargs)
+
+    def copy_payload_keys(self) -> None:
+        """
+        Copy the payload keys the aggregations group on into their columns. Events
+        written with ``bulk_create()`` have to call this explicitly.
+        """
+        payload = self.payload if isinstance(self.payload, dict) else {}
+        exercise_key = payload.get("exercise_key")
+        if not isinstance(exercise_key, dict):
+            exercise_key = {}
+        self.session_id = _payload_text(payload.get("session_id"))
+        self.exercise_key_type = _payload_text(exercise_key.get("type"))
+        self.exercise_type = _payload_text(exercise_key.get("exercise_type"))
+        self.unit_id = _payload_text(exercise_key.get("unit_id"))
+        self.job_id = _payload_text(payload.get("job_id"))
+        if self.job_id is None:
+            self.job_id = _payload_text(exercise_key.get("job_id"))
+
     def __str__(self) -> str:
         return (
             f"{self.installation_id} | {self.event_type} | {self.timestamp.isoformat()}"
@@ -0,0 +1,153 @@
+"""
+Monthly partitions of the analytics events.
+
+On PostgreSQL, the table of :class:`~lunes_cms.analytics.models.AnalyticsEvent`
+is partitioned by the month of ``timestamp``, so expired events can be dropped
+as whole partitions instead of being deleted row by row, and queries bounded
+by ``timestamp`` only touch the relevant months. Events outside of all monthly
+partitions (e.g. from devices with a wrong clock) end up in a default
+partition. The ``manage_analytics_partitions`` command creates upcoming
+partitions and drops expired ones. Other databases use a plain table.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date
+
+from django.db import connection, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from .models import AnalyticsEvent
+
+#: The name of the partitioned table
+TABLE = AnalyticsEvent._meta.db_table  # pylint: disable=protected-access
+
+#: The partition of all events outside of the monthly partitions
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+_PARTITION_NAME = re.compile(rf"^{TABLE}_(\d{{4}})_(\d{{2}})$")
+
+
+def next_month(month: date) -> date:
+    """
+    :param month: The first day of a month
+    :return: The first day of the following month
+    """
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """
+    :param month: The first day of a month
+    :return: The name of the partition of this month
+    """
+    return f"{TABLE}_{month:%Y_%m}"
+
+
+def partition_bounds(month: date) -> str:
+    """
+    :param month: The first day of a month
+    :return: The SQL bounds of the partition of this month (in UTC)
+    """
+    return (
+        f"FROM ('{month.isoformat()} 00:00:00+00') "
+        f"TO ('{next_month(month).isoformat()} 00:00:00+00')"
+    )
+
+
+def event_columns() -> str:
+    """
+    :return: The quoted columns of the events which are not generated by the database
+    """
+    return ", ".join(
+        connection.ops.quote_name(field.column)
+        # pylint: disable-next=protected-access
+        for field in AnalyticsEvent._meta.concrete_fields
+        if field.column and not field.generated
+    )
+
+
+def is_partitioned(db: BaseDatabaseWrapper = connection) -> bool:
+    """
+    :param db: The database connection
+    :return: Whether the events are stored in a partitioned table
+    """
+    if db.vendor != "postgresql":
+        return False
+    with db.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass)",
+            [TABLE],
+        )
+        return bool(cursor.fetchone()[0])
+
+
+def get_partitions() -> dict[date, str]:
+    """
+    :return: The names of all monthly partitions by the first day of their month
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+            " WHERE pg_inherits.inhparent = %s::regclass",
+            [TABLE],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+    return {
+        date(int(match[1]), int(match[2]), 1): name
+        for name in names
+        if (match := _PARTITION_NAME.match(name))
+    }
+
+
+def create_partition(month: date) -> bool:
+    """
+    Create the partition of a month. Events of this month which are already
+    stored in the default partition are moved to the new partition.
+
+    :param month: The first day of the month
+    :return: Whether the partition had to be created
+    """
+    if month in get_partitions():
+        return False
+    quote = connection.ops.quote_name
+    table, partition, default = (
+        quote(TABLE),
+        quote(partition_name(month)),
+        quote(DEFAULT_PARTITION),
+    )
+    in_month = (
+        f"{quote('timestamp')} >= '{month.isoformat()} 00:00:00+00'"
+        f" AND {quote('timestamp')} < '{next_month(month).isoformat()} 00:00:00+00'"
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_month})")
+        if not cursor.fetchone()[0]:
+            cursor.execute(
+                f"CREATE TABLE {partition} PARTITION OF {table} FOR VALUES {partition_bounds(month)}"
+            )
+            return True
+        # The default partition must not contain events of a new partition
+        cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {default}")
+        cursor.execute(
+            f"CREATE TABLE {partition} PARTITION OF {table} FOR VALUES {partition_bounds(month)}"
+        )
+        cursor.execute(
+            f"INSERT INTO {table} ({event_columns()})"
+            f" SELECT {event_columns()} FROM {default} WHERE {in_month}"
+        )
+        cursor.execute(f"DELETE FROM {default} WHERE {in_month}")
+        cursor.execute(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+    return True
+
+
+def drop_partition(month: date) -> None:
+    """
+    Drop the partition of a month including all of its events
+
+    :param month: The first day of the month
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE {connection.ops.quote_name(partition_name(month))}")
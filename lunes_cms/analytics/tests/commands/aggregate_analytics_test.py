@@ -1,11 +1,15 @@
 # pylint: disable=too-many-lines
 import unittest
 from datetime import datetime, timedelta, timezone
+from io import StringIO
 from unittest.mock import patch
 
 from django.core.management import call_command
 from django.test import TestCase
 
+from lunes_cms.analytics.management.commands.aggregate_analytics import (
+    SessionAggregator,
+)
 from lunes_cms.analytics.models import AnalyticsEvent
 from lunes_cms.cmsv2.models import Unit
 from lunes_cms.cmsv2.models.job import Job
@@ -386,6 +390,73 @@ class SessionAggregateTests(TestCase):
             f"total_duration_seconds={60 + 61 + 300 + 301 + 1800 + 1860}i", line
         )
 
+    def test_pairs_sessions_streamed_in_several_chunks(self) -> None:
+        """Sessions are paired correctly when the events span several fetched chunks"""
+        for i in range(5):
+            self._create_session(f"s{i}", "2026-01-15T10:00:00", "2026-01-15T10:00:10")
+        self._create_session_event("s9", "session_start", "2026-01-15T11:00:00")
+
+        with (
+            patch.object(SessionAggregator, "chunk_size", 2),
+            patch(PATCH_PUSH) as mock_push,
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("aggregate_analytics")
+
+        [line] = mock_push.call_args[0][0]
+        self.assertIn("total_sessions=5i", line)
+        self.assertIn("total_duration_seconds=50i", line)
+        self.assertEqual(
+            list(
+                AnalyticsEvent.objects.filter(aggregated_at__isnull=True).values_list(
+                    "payload__session_id", flat=True
+                )
+            ),
+            ["s9"],
+        )
+
+    def test_ignores_events_without_session_id(self) -> None:
+        """Session events without a session_id are never paired with each other"""
+        for event_type in ("session_start", "session_end"):
+            AnalyticsEvent.objects.create(
+                installation_id="test-install",
+                event_type=event_type,
+                timestamp=datetime(2026, 1, 15, 10, tzinfo=timezone.utc),
+                payload={},
+            )
+
+        with patch(PATCH_PUSH) as mock_push:
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("aggregate_analytics")
+
+        mock_push.assert_not_called()
+        self.assertEqual(
+            AnalyticsEvent.objects.filter(aggregated_at__isnull=True).count(), 2
+        )
+
+
+class BenchmarkSessionAggregationTests(TestCase):
+    """
+    Tests for the session aggregation benchmark.
+    """
+
+    def test_reports_matching_totals_and_rolls_back(self) -> None:
+        """The benchmark verifies the daily totals and leaves no events behind"""
+        stdout = StringIO()
+
+        call_command(
+            "benchmark_session_aggregation",
+            "--sessions",
+            "50",
+            "--days",
+            "3",
+            stdout=stdout,
+        )
+
+        self.assertIn("Aggregated 50 sessions", stdout.getvalue())
+        self.assertIn("Daily totals match.", stdout.getvalue())
+        self.assertEqual(AnalyticsEvent.objects.count(), 0)
+
 
 class ModuleDurationAggregateTests(TestCase):
     """
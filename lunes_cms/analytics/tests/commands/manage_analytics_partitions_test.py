@@ -0,0 +1,43 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from lunes_cms.analytics.partitions import (
+    is_partitioned,
+    next_month,
+    partition_bounds,
+    partition_name,
+)
+
+
+class PartitionTests(TestCase):
+    """
+    Tests for the monthly partitions of analytics events.
+    """
+
+    def test_next_month(self) -> None:
+        """The following month wraps around at the end of the year"""
+        self.assertEqual(next_month(date(2026, 1, 1)), date(2026, 2, 1))
+        self.assertEqual(next_month(date(2026, 12, 1)), date(2027, 1, 1))
+
+    def test_partition_of_month(self) -> None:
+        """Partitions are named after their month and cover it completely in UTC"""
+        self.assertEqual(
+            partition_name(date(2026, 12, 1)), "analytics_analyticsevent_2026_12"
+        )
+        self.assertEqual(
+            partition_bounds(date(2026, 12, 1)),
+            "FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')",
+        )
+
+    def test_command_without_partitioning(self) -> None:
+        """The command does nothing on databases without partitioning"""
+        if is_partitioned():
+            self.skipTest("The analytics events are partitioned")
+        stdout = StringIO()
+
+        call_command("manage_analytics_partitions", "--drop-expired", stdout=stdout)
+
+        self.assertIn("not partitioned", stdout.getvalue())
@@ -0,0 +1,186 @@
+from datetime import datetime, timedelta, UTC
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from lunes_cms.analytics.models import AnalyticsEvent
+from lunes_cms.analytics.partitions import (
+    DEFAULT_PARTITION,
+    get_partitions,
+    is_partitioned,
+    next_month,
+    partition_name,
+    TABLE,
+)
+
+UNPARTITIONED = ("analytics", "0009_payload_key_columns")
+PARTITIONED = ("analytics", "0010_partition_analytics_events")
+
+
+def _migrate(target: tuple[str, str]) -> None:
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate([target])
+
+
+def _indexes(table: str = TABLE) -> set[str]:
+    """The definitions of all indexes of a table except its primary key"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname NOT IN"
+            " (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p')",
+            [table, table],
+        )
+        return {
+            definition.replace(" ON ONLY ", " ON ")
+            for (definition,) in cursor.fetchall()
+        }
+
+
+def _constraints() -> set[tuple[str, str]]:
+    """All constraints of the events table and referencing it except its primary key"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint"
+            " WHERE (conrelid = %s::regclass OR confrelid = %s::regclass) AND contype != 'p'",
+            [TABLE, TABLE],
+        )
+        return set(cursor.fetchall())
+
+
+def _rows() -> list[tuple]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT id, installation_id, event_type, timestamp, payload::text, session_id"
+            f" FROM {TABLE} ORDER BY id"
+        )
+        return cursor.fetchall()
+
+
+def _partition_of(event_id: int) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT tableoid::regclass::text FROM {TABLE} WHERE id = %s", [event_id]
+        )
+        return str(cursor.fetchone()[0])
+
+
+def _first_of_month(months: int) -> datetime:
+    """The first day of the month ``months`` months after the current one"""
+    month = timezone.now().date().replace(day=1)
+    for _ in range(months):
+        month = next_month(month)
+    return datetime(month.year, month.month, 1, 12, tzinfo=UTC)
+
+
+def _create_event(timestamp: datetime, session_id: str) -> AnalyticsEvent:
+    return AnalyticsEvent.objects.create(
+        installation_id="test123",
+        event_type=AnalyticsEvent.EventType.SESSION_START,
+        timestamp=timestamp,
+        payload={"session_id": session_id},
+    )
+
+
+class PartitionAnalyticsEventsMigrationTests(TransactionTestCase):
+    """
+    Tests for the monthly partitioning of the analytics events on PostgreSQL.
+    """
+
+    def setUp(self) -> None:
+        if connection.vendor != "postgresql":
+            self.skipTest("The analytics events are only partitioned on PostgreSQL")
+        _migrate(UNPARTITIONED)
+        self.assertFalse(is_partitioned())
+        self.indexes = _indexes()
+        self.constraints = _constraints()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {TABLE} (installation_id, event_type, timestamp, payload,"
+                f" created_at, session_id) VALUES"
+                " ('test123', 'session_start', %s, '{\"session_id\": \"old\"}', now(), 'old'),"
+                " ('test123', 'session_start', %s, '{\"session_id\": \"now\"}', now(), 'now')",
+                [timezone.now() - timedelta(days=800), timezone.now()],
+            )
+        self.rows = _rows()
+
+    def tearDown(self) -> None:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def _assert_table_intact(self) -> None:
+        self.assertEqual(_rows(), self.rows)
+        self.assertEqual(_indexes(), self.indexes)
+        self.assertEqual(_constraints(), self.constraints)
+        # New events continue the sequence of the ids
+        event = _create_event(timezone.now(), "new")
+        self.assertEqual(event.pk, self.rows[-1][0] + 1)
+        event.delete()
+
+    def test_events_are_partitioned_and_unpartitioned(self) -> None:
+        """The events, indexes, constraints and ids are kept in both directions"""
+        _migrate(PARTITIONED)
+
+        self.assertTrue(is_partitioned())
+        self._assert_table_intact()
+        old, current = (row[0] for row in self.rows)
+        self.assertEqual(_partition_of(old), DEFAULT_PARTITION)
+        self.assertEqual(
+            _partition_of(current), partition_name(_first_of_month(0).date())
+        )
+        # The partitions have the indexes of the table
+        self.assertEqual(
+            len(_indexes(partition_name(_first_of_month(0).date()))), len(self.indexes)
+        )
+
+        _migrate(UNPARTITIONED)
+
+        self.assertFalse(is_partitioned())
+        self._assert_table_intact()
+
+    def test_partition_of_new_month_is_attached(self) -> None:
+        """Events of a new month stored in the default partition are moved to it"""
+        _migrate(PARTITIONED)
+        month = _first_of_month(6)
+        event = _create_event(month, "later")
+        self.assertEqual(_partition_of(event.pk), DEFAULT_PARTITION)
+
+        call_command(
+            "manage_analytics_partitions", "--months-ahead", "6", stdout=StringIO()
+        )
+
+        self.assertIn(month.date(), get_partitions())
+        self.assertEqual(_partition_of(event.pk), partition_name(month.date()))
+        self.assertEqual(len(_indexes(partition_name(month.date()))), len(self.indexes))
+        self.assertEqual(
+            AnalyticsEvent.objects.filter(session_id="later").get().pk, event.pk
+        )
+
+    def test_expired_partitions_are_dropped(self) -> None:
+        """Partitions of expired months are dropped unless events are pending"""
+        _migrate(PARTITIONED)
+        oldest = min(get_partitions())
+        pending = _create_event(
+            datetime(oldest.year, oldest.month, 1, 12, tzinfo=UTC), "pending"
+        )
+        AnalyticsEvent.objects.filter(pk=pending.pk).update(event_type="job_selected")
+        stderr = StringIO()
+
+        call_command(
+            "manage_analytics_partitions",
+            "--drop-expired",
+            "--retention-days",
+            "90",
+            stdout=StringIO(),
+            stderr=stderr,
+        )
+
+        partitions = get_partitions()
+        self.assertIn(oldest, partitions)
+        self.assertIn("not aggregated yet", stderr.getvalue())
+        self.assertNotIn(next_month(oldest), partitions)
+        self.assertIn(_first_of_month(0).date(), partitions)
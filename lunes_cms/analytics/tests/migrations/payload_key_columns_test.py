@@ -0,0 +1,77 @@
+import importlib
+from unittest.mock import patch
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+payload_key_columns = importlib.import_module(
+    "lunes_cms.analytics.migrations.0009_payload_key_columns"
+)
+
+BEFORE = ("analytics", "0008_keep_raw_events_drop_buckets")
+AFTER = ("analytics", "0009_payload_key_columns")
+
+
+class PayloadKeyColumnsMigrationTests(TransactionTestCase):
+    """
+    Tests for the backfill of the payload key columns of analytics events.
+    """
+
+    def _migrate(self, target: tuple[str, str]) -> None:
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([target])
+
+    def tearDown(self) -> None:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_existing_events_are_backfilled_in_batches(self) -> None:
+        """The payload keys of existing events are copied into their columns"""
+        self._migrate(BEFORE)
+        apps = MigrationExecutor(connection).loader.project_state(BEFORE).apps
+        OldEvent = apps.get_model("analytics", "AnalyticsEvent")
+        payloads = [{"session_id": f"s{i}"} for i in range(4)] + [
+            {"job_id": 5},
+            {
+                "exercise_key": {
+                    "type": "training",
+                    "exercise_type": "image",
+                    "job_id": 7,
+                }
+            },
+            {"exercise_key": {"type": "exercise", "unit_id": 3}},
+        ]
+        OldEvent.objects.bulk_create(
+            OldEvent(
+                installation_id="test123",
+                event_type="session_start",
+                timestamp="2026-01-30T12:34:56Z",
+                payload=payload,
+            )
+            for payload in payloads
+        )
+
+        with patch.object(payload_key_columns, "BATCH_SIZE", 2):
+            self._migrate(AFTER)
+
+        apps = MigrationExecutor(connection).loader.project_state(AFTER).apps
+        NewEvent = apps.get_model("analytics", "AnalyticsEvent")
+        self.assertEqual(
+            list(
+                NewEvent.objects.order_by("id").values_list(
+                    "session_id",
+                    "exercise_key_type",
+                    "exercise_type",
+                    "unit_id",
+                    "job_id",
+                )
+            ),
+            [(f"s{i}", None, None, None, None) for i in range(4)]
+            + [
+                (None, None, None, None, "5"),
+                (None, "training", "image", None, "7"),
+                (None, "exercise", None, "3", None),
+            ],
+        )
@@ -0,0 +1,149 @@
+from typing import Any
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from lunes_cms.analytics.api.views import InstallationRateThrottle
+from lunes_cms.analytics.buffer import event_buffer
+from lunes_cms.analytics.models import AnalyticsEvent
+
+
+def _session_event(event_type: str, session_id: str = "s1") -> dict[str, Any]:
+    return {
+        "event_type": event_type,
+        "timestamp": "2026-01-30T12:34:56Z",
+        "payload": {"session_id": session_id},
+    }
+
+
+class AnalyticsEventBulkTests(APITestCase):
+    """
+    Test class for the bulk endpoint of analytics events
+    """
+
+    def setUp(self) -> None:
+        self.url = reverse("api:v2:analytics:analytics_event-bulk")
+        cache.clear()
+
+    def tearDown(self) -> None:
+        event_buffer.flush()
+
+    def test_creates_all_events_with_one_query(self) -> None:
+        """All events of a batch are written with a single query"""
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                self.url,
+                data={
+                    "installation_id": "test123",
+                    "events": [
+                        _session_event("session_start"),
+                        _session_event("session_end"),
+                    ],
+                },
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"count": 2})
+        self.assertEqual(
+            list(
+                AnalyticsEvent.objects.order_by("event_type").values_list(
+                    "installation_id", "event_type", "session_id"
+                )
+            ),
+            [("test123", "session_end", "s1"), ("test123", "session_start", "s1")],
+        )
+
+    def test_invalid_event_rejects_the_batch(self) -> None:
+        """A single invalid event rejects the whole batch and reports its position"""
+        response = self.client.post(
+            self.url,
+            data={
+                "installation_id": "test123",
+                "events": [
+                    _session_event("session_start"),
+                    {**_session_event("session_end"), "payload": {}},
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["events"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("payload", errors[1])
+        self.assertEqual(AnalyticsEvent.objects.count(), 0)
+
+    def test_empty_batch(self) -> None:
+        """A batch without events is rejected"""
+        response = self.client.post(
+            self.url, data={"installation_id": "test123", "events": []}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(ANALYTICS_BULK_MAX_EVENTS=2)
+    def test_too_many_events(self) -> None:
+        """Batches larger than the configured maximum are rejected"""
+        response = self.client.post(
+            self.url,
+            data={
+                "installation_id": "test123",
+                "events": [_session_event("session_start")] * 3,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("events", response.json())
+
+    def test_throttled_per_installation(self) -> None:
+        """Bulk requests count towards the rate limit of their installation"""
+        data = {
+            "installation_id": "test123",
+            "events": [_session_event("session_start")],
+        }
+        with patch.object(
+            InstallationRateThrottle, "THROTTLE_RATES", {"installation": "2/min"}
+        ):
+            statuses = [
+                self.client.post(self.url, data=data, format="json").status_code
+                for _ in range(3)
+            ]
+            other_installation = self.client.post(
+                self.url,
+                data={**data, "installation_id": "other"},
+                format="json",
+            )
+
+        self.assertEqual(statuses, [201, 201, 429])
+        self.assertEqual(other_installation.status_code, 201)
+
+    @override_settings(ANALYTICS_BUFFER_SIZE=3, ANALYTICS_BUFFER_MAX_AGE=60)
+    def test_buffered_events_are_written_once_the_buffer_is_full(self) -> None:
+        """Buffered events are accepted right away and written by size"""
+        response = self.client.post(
+            self.url,
+            data={
+                "installation_id": "test123",
+                "events": [
+                    _session_event("session_start", "s1"),
+                    _session_event("session_start", "s2"),
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(AnalyticsEvent.objects.count(), 0)
+
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                reverse("api:v2:analytics:analytics_event-list"),
+                data={"installation_id": "test123", **_session_event("session_end")},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 202)
+
+        self.assertEqual(AnalyticsEvent.objects.count(), 3)
+        self.assertEqual(len(event_buffer), 0)
@@ -58,6 +58,7 @@ class AnalyticsEventTests(APITestCase):
         self.assertEqual(event.event_type, "job_selected")
         self.assertEqual(event.payload["job_id"], 1)
         self.assertEqual(event.payload["action"], "add")
+        self.assertEqual(event.job_id, "1")
 
     def test_job_selected_remove_action(self) -> None:
         """Test creating a job_selected event with remove action"""
@@ -128,6 +129,10 @@ class AnalyticsEventTests(APITestCase):
         self.assertEqual(event.payload["exercise_key"]["exercise_type"], "word_choice")
         self.assertEqual(event.payload["exercise_key"]["unit_id"], 1)
         self.assertEqual(event.payload["duration_seconds"], 10)
+        self.assertEqual(event.exercise_key_type, "exercise")
+        self.assertEqual(event.exercise_type, "word_choice")
+        self.assertEqual(event.unit_id, "1")
+        self.assertIsNone(event.job_id)
 
     def test_create_training_module_duration_event(self) -> None:
         """Test creating a valid module_duration event for a training exercise"""
@@ -153,6 +158,9 @@ class AnalyticsEventTests(APITestCase):
         assert event is not None
         self.assertEqual(event.payload["exercise_key"]["exercise_type"], "image")
         self.assertEqual(event.payload["exercise_key"]["job_id"], 5)
+        self.assertEqual(event.exercise_key_type, "training")
+        self.assertEqual(event.job_id, "5")
+        self.assertIsNone(event.unit_id)
 
     def test_create_session_start_event(self) -> None:
         """Test creating a valid session_start event"""
@@ -172,6 +180,7 @@ class AnalyticsEventTests(APITestCase):
         assert event is not None
         self.assertEqual(event.event_type, "session_start")
         self.assertEqual(event.payload["session_id"], "abc123")
+        self.assertEqual(event.session_id, "abc123")
 
     def test_create_session_end_event(self) -> None:
         """Test creating a valid session_end event"""
@@ -0,0 +1,59 @@
+"""
+Management command to prebuild the offline bundles of all published jobs.
+
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from lunes_cms.api.v2.bundle import get_job_bundle, remove_outdated_bundles
+from lunes_cms.api.v2.querysets import get_published_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Management command to prebuild the offline bundles of published jobs."""
+
+    help = (
+        "Build the offline bundles of published jobs whose content changed "
+        "and remove outdated bundles."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--job",
+            type=int,
+            action="append",
+            dest="job_ids",
+            help="Only build the bundle of the job with this id (can be repeated)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        jobs = get_published_jobs()
+        if options["job_ids"]:
+            jobs = jobs.filter(pk__in=options["job_ids"])
+
+        self.stdout.write(self.style.NOTICE("Building job bundles..."))
+
+        built_count = 0
+        for job in jobs:
+            path, built = get_job_bundle(job)
+            if built:
+                built_count += 1
+                self.stdout.write(f"Built {path.name} for job #{job.pk}: {job.name}")
+            else:
+                logger.info("Bundle of job #%d is up to date", job.pk)
+
+        removed_count = remove_outdated_bundles()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. Built {built_count} of {len(jobs)} bundles, "
+                f"the others were up to date. Removed {removed_count} outdated bundles."
+            )
+        )
@@ -4,8 +4,7 @@ from typing import TYPE_CHECKING
 
 from rest_framework import permissions
 
-from ..cms.models import GroupAPIKey
-from .utils import get_key
+from .utils import get_group_api_key
 
 if TYPE_CHECKING:
     from rest_framework.request import Request
@@ -31,8 +30,4 @@ class VerifyGroupKey(permissions.AllowAny):
         :return: False if user doesn't send a API-key
         :rtype: bool
         """
-        key = get_key(request)
-        if key is None:
-            return False
-        GroupAPIKey.get_from_token(key)
-        return True
+        return get_group_api_key(request) is not None
@@ -13,7 +13,7 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import routers
 
 from ..cms.models import Discipline, Document, GroupAPIKey
-from ..cms.utils import document_to_string, get_child_count
+from ..cms.utils import annotate_discipline_trees, document_to_string
 
 if TYPE_CHECKING:
     from rest_framework.request import Request
@@ -53,6 +53,22 @@ def get_key(request: Request, keyword: str = "Api-Key") -> str | None:
     return key
 
 
+def get_group_api_key(request: Request) -> GroupAPIKey | None:
+    """Returns the API key of the request, looked up only once per request.
+
+    :param request: current request
+    :type request: ~rest_framework.request.Request
+    :raises PermissionDenied: Exception if the API-Key is not valid
+    :return: the API key, or None if the request doesn't contain one
+    :rtype: ~lunes_cms.cms.models.group_api_key.GroupAPIKey
+    """
+    if not hasattr(request, "group_api_key"):
+        key = get_key(request)
+        request.group_api_key = GroupAPIKey.get_from_token(key) if key else None
+    api_key: GroupAPIKey | None = request.group_api_key
+    return api_key
+
+
 def get_filtered_discipline_queryset(
     discipline_view_set: GenericViewSet,
 ) -> list[Discipline]:
@@ -91,16 +107,13 @@ def get_overview_discipline_queryset() -> list[Discipline]:
     :return: (filtered) queryset
     :rtype: QuerySet
     """
-    queryset = Discipline.objects.filter(
-        Q(released=True) & Q(creator_is_admin=True)
+    root_disciplines = Discipline.objects.filter(
+        Q(released=True) & Q(creator_is_admin=True) & Q(parent=None)
     ).annotate(
         total_training_sets=Count(
             "training_sets", filter=Q(training_sets__released=True)
         ),
     )
-    root_disciplines = [
-        discipline for discipline in queryset if discipline.is_root_node()
-    ]
     return get_non_empty_disciplines(root_disciplines)
 
 
@@ -117,18 +130,14 @@ def get_discipline_by_group_queryset(
     :return: (filtered) queryset
     :rtype: QuerySet
     """
-    queryset = Discipline.objects.filter(
-        released=True, created_by=discipline_view_set.kwargs["group_id"]
+    root_disciplines = Discipline.objects.filter(
+        released=True, created_by=discipline_view_set.kwargs["group_id"], parent=None
     ).annotate(
         total_training_sets=Count(
             "training_sets", filter=Q(training_sets__released=True)
         ),
     )
-    return [
-        discipline
-        for discipline in queryset
-        if discipline.is_root_node() and discipline.is_valid()
-    ]
+    return get_non_empty_disciplines(root_disciplines)
 
 
 def get_non_empty_disciplines(
@@ -136,7 +145,8 @@ def get_non_empty_disciplines(
 ) -> list[Discipline]:
     """
     Filters a discipline queryset so that every element recursively either have
-    at least one sub-discipline or one training set.
+    at least one sub-discipline or one training set. The remaining disciplines
+    are annotated with :func:`~lunes_cms.cms.utils.annotate_discipline_trees`.
 
     :param queryset: Queryset of `~lunes_cms.cms.models.Discipline` objects
     :type queryset: QuerySet
@@ -145,9 +155,8 @@ def get_non_empty_disciplines(
     """
     return [
         discipline
-        for discipline in queryset
-        if get_child_count(discipline) > 0
-        or discipline.training_sets.filter(released=True).count() > 0
+        for discipline in annotate_discipline_trees(queryset)
+        if discipline.is_valid()
     ]
 
 
@@ -165,9 +174,8 @@ def check_group_object_permissions(request: Request, group_id: str | int) -> Non
     :raises PermissionDenied: Exception if no API-Key is delivered
     :raises PermissionDenied: Exception if API-Key doesn't belong to passed group id
     """
-    key = get_key(request)
-    api_key_object = GroupAPIKey.get_from_token(key)
-    if api_key_object.group_id != int(group_id):
+    api_key_object = get_group_api_key(request)
+    if api_key_object is None or api_key_object.group_id != int(group_id):
         raise PermissionDenied()
 
 
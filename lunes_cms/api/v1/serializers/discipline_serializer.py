@@ -1,12 +1,44 @@
 from __future__ import annotations
 
+from typing import Any, Iterable
+
+from django.db.models import Manager
 from rest_framework import serializers
 
 from ....cms.models import Discipline
-from ....cms.utils import get_child_count
+from ....cms.utils import annotate_discipline_trees, get_child_count
 from .fallback_icon_serializer import FallbackIconSerializer
 
 
+class DisciplineListSerializer(serializers.ListSerializer):
+    """
+    List Serializer for the Discipline module. Inherits from
+    `serializers.ListSerializer`.
+    """
+
+    def update(self, instance: Any, validated_data: Any) -> Any:
+        raise NotImplementedError(
+            "Serializers with many=True do not support multiple update by "
+            "default, only multiple create."
+        )
+
+    def to_representation(
+        self, data: Manager[Discipline] | Iterable[Discipline]
+    ) -> list[Any]:
+        """
+        Overwrite django built-in function to count the nested training sets
+        of all disciplines at once instead of per discipline.
+
+        :param data: disciplines
+        :type data: ~collections.abc.Iterable
+        :return: serialized disciplines
+        :rtype: list
+        """
+        if isinstance(data, Manager):
+            data = data.all()
+        return super().to_representation(annotate_discipline_trees(data))
+
+
 class DisciplineSerializer(FallbackIconSerializer):
     """
     Serializer for the Discipline module. Inherits from
@@ -27,6 +59,7 @@ class DisciplineSerializer(FallbackIconSerializer):
         """
 
         model = Discipline
+        list_serializer_class = DisciplineListSerializer
         fields = (
             "id",
             "title",
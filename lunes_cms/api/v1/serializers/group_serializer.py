@@ -4,6 +4,7 @@ from django.contrib.auth.models import Group
 from rest_framework import serializers
 
 from ....cms.models import Discipline
+from ...utils import get_non_empty_disciplines
 
 
 class GroupSerializer(serializers.ModelSerializer):
@@ -39,10 +40,7 @@ class GroupSerializer(serializers.ModelSerializer):
         :return: sum of children
         :rtype: int
         """
-        queryset = Discipline.objects.filter(released=True, created_by=group.id)
-        valid_root_disciplines = [
-            discipline
-            for discipline in queryset
-            if discipline.is_root_node() and discipline.is_valid()
-        ]
-        return len(valid_root_disciplines)
+        root_disciplines = Discipline.objects.filter(
+            released=True, created_by=group.id, parent=None
+        )
+        return len(get_non_empty_disciplines(root_disciplines))
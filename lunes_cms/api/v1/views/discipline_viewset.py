@@ -3,8 +3,8 @@ from __future__ import annotations
 from django.db.models import Count, Q, QuerySet
 from rest_framework import viewsets
 
-from ....cms.models import Discipline, GroupAPIKey
-from ...utils import get_key
+from ....cms.models import Discipline
+from ...utils import get_group_api_key
 from ..serializers import DisciplineSerializer
 
 
@@ -27,11 +27,9 @@ class DisciplineViewSet(viewsets.ModelViewSet):
         if getattr(self, "swagger_fake_view", False):
             return Discipline.objects.none()
         queryset = Discipline.objects.filter(released=True)
-        key = get_key(self.request)
-        if key:
-            # If the key is given, get the corresponding group
-            api_key_object = GroupAPIKey.get_from_token(key)
-            # Return all disciplines of the group with the given key
+        api_key_object = get_group_api_key(self.request)
+        if api_key_object:
+            # If the key is given, return all disciplines of the group with the given key
             self.queryset = queryset.filter(created_by=api_key_object.group)
         else:
             # If no key is given, return all admin disciplines
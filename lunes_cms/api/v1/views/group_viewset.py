@@ -5,9 +5,9 @@ from django.core.exceptions import PermissionDenied
 from django.db.models import QuerySet
 from rest_framework import viewsets
 
-from ....cms.models import GroupAPIKey, TrainingSet
+from ....cms.models import TrainingSet
 from ...permissions import VerifyGroupKey
-from ...utils import get_key
+from ...utils import get_group_api_key
 from ..serializers import GroupSerializer
 
 
@@ -35,13 +35,7 @@ class GroupViewSet(viewsets.ModelViewSet):
         """
         if getattr(self, "swagger_fake_view", False):
             return TrainingSet.objects.none()
-        key = get_key(self.request)
-        if not key:
-            raise PermissionDenied()
-        try:
-            api_key_object = GroupAPIKey.get_from_token(key)
-        except GroupAPIKey.DoesNotExist as e:
-            raise PermissionDenied() from e
+        api_key_object = get_group_api_key(self.request)
         if not api_key_object:
             raise PermissionDenied()
         queryset = Group.objects.filter(id=api_key_object.group_id)
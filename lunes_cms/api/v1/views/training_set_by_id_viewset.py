@@ -3,8 +3,8 @@ from __future__ import annotations
 from django.db.models import Count, Q, QuerySet
 from rest_framework import viewsets
 
-from ....cms.models import GroupAPIKey, TrainingSet
-from ...utils import get_key
+from ....cms.models import TrainingSet
+from ...utils import get_group_api_key
 from ..serializers import TrainingSetSerializer
 
 
@@ -36,9 +36,9 @@ class TrainingSetByIdViewSet(viewsets.ReadOnlyModelViewSet):
                 distinct=True,
             )
         )
-        key = get_key(self.request)
-        if key:
-            queryset = queryset.filter(created_by=GroupAPIKey.get_from_token(key).group)
+        api_key_object = get_group_api_key(self.request)
+        if api_key_object:
+            queryset = queryset.filter(created_by=api_key_object.group)
         else:
             queryset = queryset.filter(creator_is_admin=True)
         return queryset
@@ -4,8 +4,8 @@ from django.db.models import Q, QuerySet
 from rest_framework import viewsets
 from rest_framework.authentication import BasicAuthentication, SessionAuthentication
 
-from ....cms.models import Document, GroupAPIKey
-from ...utils import get_key
+from ....cms.models import Document
+from ...utils import get_group_api_key
 from ..serializers import DocumentSerializer
 
 
@@ -34,11 +34,9 @@ class WordViewSet(viewsets.ModelViewSet):
             training_sets__discipline__released=True,
         )
         # Get API key of current request
-        key = get_key(self.request)
-        if key:
-            # If the key is given, get the corresponding group
-            api_key_object = GroupAPIKey.get_from_token(key)
-            # Return all public words as well as those of the group with the given key
+        api_key_object = get_group_api_key(self.request)
+        if api_key_object:
+            # If the key is given, return all public words as well as those of the group with the given key
             queryset = queryset.filter(
                 Q(creator_is_admin=True) | Q(created_by=api_key_object.group)
             )
@@ -0,0 +1,218 @@
+"""
+Offline bundles of published jobs.
+
+A bundle is a zip archive containing everything the app needs to use a job
+offline: a ``manifest.json`` with the job, its units and their words (as served
+by the regular endpoints) and all media files referenced by the manifest. Media
+files are stored below their URL path, e.g. ``/media/audio/Hammer.mp3`` is
+contained as ``media/audio/Hammer.mp3``.
+
+Bundles are stored on disk and named after a hash of their content, so an
+unchanged job is never packed twice. The name of a job's current bundle is
+cached per content version of the job (see
+:mod:`~lunes_cms.cmsv2.content_version`), so serving an unchanged bundle is a
+single cache read and a plain file send.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import timedelta
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Iterator
+from urllib.parse import unquote
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+from ...cmsv2.content_version import get_job_versions
+from ...cmsv2.models import Job
+from .querysets import get_published_unit_words, get_published_units
+from .serializers import JobSerializer, UnitSerializer, UnitWordRelationSerializer
+
+logger = logging.getLogger(__name__)
+
+#: The name of the manifest inside of the bundle
+MANIFEST_NAME = "manifest.json"
+
+#: How long outdated bundles are kept after a newer bundle of their job was built,
+#: so requests which already looked up an outdated bundle can still send it
+OUTDATED_BUNDLE_GRACE_PERIOD = timedelta(hours=1)
+
+
+def get_job_manifest(job: Job) -> dict[str, Any]:
+    """
+    Get the manifest of a job, which contains the same data as the endpoints of
+    the job's units and their words.
+
+    :param job: The job
+    :return: The job data with a list of units, each with a list of words
+    """
+    units = [
+        {
+            **UnitSerializer(unit).data,
+            "words": UnitWordRelationSerializer(
+                get_published_unit_words(unit), many=True
+            ).data,
+        }
+        for unit in get_published_units(job)
+    ]
+    return {**JobSerializer(job).data, "units": units}
+
+
+def iter_media_names(data: Any) -> Iterator[str]:
+    """
+    Find all media files referenced in serialized data
+
+    :param data: The serialized data
+    :return: The storage names of all referenced media files
+    """
+    if isinstance(data, dict):
+        for value in data.values():
+            yield from iter_media_names(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from iter_media_names(value)
+    elif isinstance(data, str) and data.startswith(settings.MEDIA_URL):
+        yield unquote(data[len(settings.MEDIA_URL) :])
+
+
+def get_bundle_hash(manifest: dict[str, Any], media_names: list[str]) -> str:
+    """
+    Hash the content of a bundle. Media files are identified by their name, size
+    and modification time, because regenerated audio keeps its file name.
+
+    :param manifest: The manifest of the bundle
+    :param media_names: The media files of the bundle
+    :return: The hex digest of the content
+    """
+    content_hash = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode("utf-8"))
+    for name in media_names:
+        try:
+            stat = os.stat(default_storage.path(name))
+            content_hash.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        except OSError:
+            content_hash.update(f"{name}:missing".encode())
+    return content_hash.hexdigest()
+
+
+def get_bundle_path(job: Job, bundle_hash: str) -> Path:
+    """
+    :param job: The job
+    :param bundle_hash: The content hash of the bundle
+    :return: The path of the bundle on disk
+    """
+    return Path(settings.JOB_BUNDLE_ROOT) / f"job-{job.pk}-{bundle_hash}.zip"
+
+
+def write_bundle(path: Path, manifest: dict[str, Any], media_names: list[str]) -> None:
+    """
+    Write a bundle atomically, so concurrent readers never see a partial archive.
+    Media files are already compressed and therefore stored as they are.
+
+    :param path: The target path of the bundle
+    :param manifest: The manifest of the bundle
+    :param media_names: The media files to include
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".part")
+    try:
+        with (
+            os.fdopen(file_descriptor, "wb") as temp_file,
+            ZipFile(temp_file, "w") as zip_file,
+        ):
+            zip_file.writestr(
+                MANIFEST_NAME,
+                json.dumps(manifest, ensure_ascii=False),
+                compress_type=ZIP_DEFLATED,
+            )
+            for name in media_names:
+                try:
+                    zip_file.write(
+                        default_storage.path(name),
+                        arcname=f"{settings.MEDIA_URL}{name}".lstrip("/"),
+                        compress_type=ZIP_STORED,
+                    )
+                except OSError as e:
+                    logger.warning("Skipping missing media file %s: %s", name, e)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def list_bundles(job_id: int | None = None) -> list[tuple[int, float, Path]]:
+    """
+    :param job_id: Only list the bundles of the job with this id
+    :return: The job id, modification time and path of each bundle, newest first per job
+    """
+    bundles = []
+    for path in Path(settings.JOB_BUNDLE_ROOT).glob(f"job-{job_id or '*'}-*.zip"):
+        try:
+            bundles.append((int(path.name.split("-")[1]), path.stat().st_mtime, path))
+        except (OSError, ValueError):
+            continue
+    return sorted(bundles, key=lambda bundle: (bundle[0], -bundle[1]))
+
+
+def remove_outdated_bundles(job_id: int | None = None) -> int:
+    """
+    Remove the bundles which were superseded by a newer bundle of their job for
+    longer than :data:`OUTDATED_BUNDLE_GRACE_PERIOD`. The newest bundle of each
+    job is always kept.
+
+    :param job_id: Only remove outdated bundles of the job with this id
+    :return: The number of removed bundles
+    """
+    expired = time.time() - OUTDATED_BUNDLE_GRACE_PERIOD.total_seconds()
+    removed_count = 0
+    for _, job_bundles in groupby(list_bundles(job_id), key=lambda bundle: bundle[0]):
+        _, superseded_at, _ = next(job_bundles)
+        for _, modified_at, path in job_bundles:
+            if superseded_at < expired:
+                path.unlink(missing_ok=True)
+                removed_count += 1
+            # The next older bundle was superseded when this one was built
+            superseded_at = modified_at
+    return removed_count
+
+
+def get_job_bundle(job: Job) -> tuple[Path, bool]:
+    """
+    Get the up-to-date bundle of a job, building it only if its content changed.
+    The bundle is looked up by the content version of the job first, so the
+    manifest and the hash are only computed after the job was edited or when
+    the cached lookup expired (see ``API_CACHE_TIMEOUT``).
+
+    :param job: The job
+    :return: The path of the bundle and whether it had to be built
+    """
+    cache_key = f"job-bundle:{job.pk}:{get_job_versions([job.pk])[job.pk]}"
+    if (name := cache.get(cache_key)) and (
+        path := Path(settings.JOB_BUNDLE_ROOT) / name
+    ).exists():
+        return path, False
+
+    manifest = get_job_manifest(job)
+    media_names = sorted(set(iter_media_names(manifest)))
+    path = get_bundle_path(job, get_bundle_hash(manifest, media_names))
+    built = not path.exists()
+    if built:
+        write_bundle(path, manifest, media_names)
+        logger.info("Built bundle %s for job %r", path.name, job)
+    elif path.stat().st_mtime < list_bundles(job.pk)[0][1]:
+        # A reverted edit made an older bundle current again, which must not be
+        # removed as outdated
+        path.touch()
+    if settings.API_CACHE_TIMEOUT:
+        cache.set(cache_key, path.name, timeout=settings.API_CACHE_TIMEOUT)
+    remove_outdated_bundles(job.pk)
+    return path, built
@@ -0,0 +1,169 @@
+"""
+Response cache and conditional requests for the read-only endpoints of the
+second API version.
+
+Responses are cached per endpoint, URL and content version (see
+:mod:`~lunes_cms.cmsv2.content_version`). Editing content bumps the version,
+so stale entries are never served and simply expire. The same key is used as
+strong ``ETag``, so clients revalidating unchanged content get a ``304 Not
+Modified`` before any serialization or main query is run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, QuerySet
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins, status, viewsets
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from ...cmsv2.content_version import (
+    get_global_version,
+    get_job_versions,
+    get_version_modified_at,
+)
+
+
+def get_latest_modification(*querysets: QuerySet) -> datetime | None:
+    """
+    Get the latest ``modified_at`` timestamp of the given querysets
+
+    :param querysets: Querysets of models with a ``modified_at`` field
+    :return: The latest modification, or ``None`` if all querysets are empty
+    """
+    timestamps = [
+        queryset.aggregate(latest=Max("modified_at"))["latest"]
+        for queryset in querysets
+    ]
+    return max((timestamp for timestamp in timestamps if timestamp), default=None)
+
+
+class CachedResponseMixin(
+    mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """
+    Mixin for viewsets that caches the serialized data of successful ``list``
+    and ``retrieve`` responses and answers conditional requests. By default,
+    the cache is invalidated by every content change. Viewsets can narrow this
+    down by overriding :meth:`get_content_version`.
+    """
+
+    def get_content_version(self) -> str:
+        """
+        Get the version of the content this endpoint depends on
+
+        :return: A token that changes whenever the response might change
+        """
+        return get_global_version()
+
+    def get_last_modified(self) -> datetime | None:
+        """
+        Get the latest ``modified_at`` timestamp of the content this endpoint depends on
+
+        :return: The time of the last modification, if known
+        """
+        return None
+
+    def get_response_cache_key(self, request: Request, version: str) -> str:
+        """
+        Get the cache key of the response to the given request. It contains the
+        absolute URL because the serialized media URLs depend on the requested host.
+
+        :param request: The current request
+        :param version: The content version of this endpoint
+        :return: The cache key
+        """
+        url_hash = hashlib.sha256(
+            request.build_absolute_uri().encode("utf-8")
+        ).hexdigest()
+        return f"api-v2:{self.basename}:{self.action}:{version}:{url_hash}"
+
+    def get_cached_last_modified(self, key: str, version: str) -> datetime | None:
+        """
+        Get the time of the last modification of the content cached under the given key.
+        Both content edits recorded in the version and ``modified_at`` timestamps count.
+
+        :param key: The cache key of the response
+        :param version: The content version of this endpoint
+        :return: The time of the last modification, if known
+        """
+        last_modified_key = f"{key}:last-modified"
+        last_modified = cache.get(last_modified_key)
+        if last_modified is None:
+            last_modified = self.get_last_modified() or False
+            cache.set(
+                last_modified_key, last_modified, timeout=settings.API_CACHE_TIMEOUT
+            )
+        return max(
+            (
+                timestamp
+                for timestamp in (last_modified, get_version_modified_at(version))
+                if timestamp
+            ),
+            default=None,
+        )
+
+    def cached_response(
+        self, request: Request, action: Callable[..., Response], **kwargs: Any
+    ) -> Response:
+        """
+        Answer conditional requests, return the cached data for this request or
+        run the given action and cache its data
+
+        :param request: The current request
+        :param action: The uncached action (e.g. ``super().list``)
+        :return: The response
+        """
+        version = self.get_content_version()
+        key = self.get_response_cache_key(request, version)
+        etag = quote_etag(
+            hashlib.sha256(
+                f"{key}:{request.accepted_renderer.format}".encode("utf-8")
+            ).hexdigest()
+        )
+        last_modified = self.get_cached_last_modified(key, version)
+        headers = {"ETag": etag}
+        if last_modified:
+            headers["Last-Modified"] = http_date(last_modified.timestamp())
+
+        if conditional_response := get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        ):
+            return Response(status=conditional_response.status_code, headers=headers)
+
+        data = cache.get(key) if settings.API_CACHE_TIMEOUT else None
+        if data is not None:
+            return Response(data, headers=headers)
+        response = action(request, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            if settings.API_CACHE_TIMEOUT:
+                cache.set(key, response.data, timeout=settings.API_CACHE_TIMEOUT)
+            for header, value in headers.items():
+                response[header] = value
+        return response
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return self.cached_response(request, super().list, **kwargs)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return self.cached_response(request, super().retrieve, **kwargs)
+
+
+class JobContentCachedResponseMixin(CachedResponseMixin):
+    """
+    Response cache for endpoints nested below a job, which are only invalidated
+    by changes to the content of this job.
+    """
+
+    def get_content_version(self) -> str:
+        job_id = int(self.kwargs["job_id"])
+        return get_job_versions([job_id])[job_id]
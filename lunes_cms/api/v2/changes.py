@@ -0,0 +1,195 @@
+"""
+Change feed of the published content.
+
+Clients which already downloaded content can ask for everything that changed
+since their last sync instead of downloading all words of a job again. Changes
+are found by the ``modified_at`` timestamps of jobs, units, words and unit
+word relations, deletions by the :class:`~lunes_cms.cmsv2.models.Tombstone`
+records (see :mod:`~lunes_cms.cmsv2.change_tracking`).
+
+For each kind of content the feed contains the ``changed`` objects, which are
+published and serialized as by the regular endpoints, and the ids of the
+``removed`` objects, which were deleted or are not published anymore. Units
+and jobs that are new to a client have to be downloaded in full.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Exists, Model, OuterRef, Prefetch, Q, QuerySet
+
+from ...cmsv2.models import Job, Tombstone, Unit, UnitWordRelation, Word
+from .querysets import (
+    get_all_published_units,
+    get_public_unit_word_relations,
+    get_published_jobs,
+    get_published_words,
+)
+
+#: Changes shortly before the requested cursor are returned as well, because
+#: objects are timestamped before their transaction is committed
+CURSOR_OVERLAP = timedelta(seconds=30)
+
+#: The kinds of content contained in the change feed
+CHANGE_KINDS = ("jobs", "units", "unit_words", "words")
+
+
+def get_tombstones(model: type[Model], since: datetime) -> QuerySet[Tombstone]:
+    """
+    :param model: The model of the deleted objects
+    :param since: The start of the time range
+    :return: The queryset of tombstones of the given model since the given time
+    """
+    return Tombstone.objects.filter(
+        content_type=ContentType.objects.get_for_model(model), deleted_at__gte=since
+    )
+
+
+def get_removed_ids(
+    model: type[Model], changed: QuerySet, published: list[Any], since: datetime
+) -> list[int]:
+    """
+    Get the ids of all objects that were deleted or are not published anymore
+
+    :param model: The model of the objects
+    :param changed: The queryset of changed objects
+    :param published: The published objects among the changed ones
+    :param since: The start of the time range
+    :return: The sorted ids of the removed objects
+    """
+    removed = set(changed.values_list("pk", flat=True))
+    removed.update(get_tombstones(model, since).values_list("object_id", flat=True))
+    return sorted(removed - {obj.pk for obj in published})
+
+
+def get_job_changes(since: datetime) -> dict[str, list[Any]]:
+    """
+    Jobs change with their own fields and the units they contain
+
+    :param since: The start of the time range
+    :return: The changed and removed jobs
+    """
+    changed = Job.objects.filter(
+        Q(modified_at__gte=since)
+        | Exists(
+            Unit.jobs.through.objects.filter(
+                job_id=OuterRef("pk"), unit__modified_at__gte=since
+            )
+        )
+    )
+    published = list(get_published_jobs().filter(pk__in=changed.values("pk")))
+    return {
+        "changed": published,
+        "removed": get_removed_ids(Job, changed, published, since),
+    }
+
+
+def get_unit_changes(since: datetime) -> dict[str, list[Any]]:
+    """
+    Units change with their own fields, their jobs and the words they contain
+
+    :param since: The start of the time range
+    :return: The changed and removed units
+    """
+    changed = Unit.objects.filter(
+        Q(modified_at__gte=since)
+        | Exists(
+            UnitWordRelation.objects.filter(
+                Q(modified_at__gte=since) | Q(word__modified_at__gte=since),
+                unit_id=OuterRef("pk"),
+            )
+        )
+        | Exists(
+            get_tombstones(UnitWordRelation, since).filter(parent_id=OuterRef("pk"))
+        )
+    )
+    published = list(
+        get_all_published_units()
+        .filter(pk__in=changed.values("pk"))
+        .prefetch_related(
+            Prefetch(
+                "jobs",
+                Job.objects.filter(released=True, archived=False).order_by("pk"),
+                to_attr="published_jobs",
+            )
+        )
+    )
+    return {
+        "changed": published,
+        "removed": get_removed_ids(Unit, changed, published, since),
+    }
+
+
+def get_unit_word_changes(since: datetime) -> dict[str, list[Any]]:
+    """
+    Words of units change with the relation and the word itself. Only words of
+    published units are contained.
+
+    :param since: The start of the time range
+    :return: The changed unit word relations and the removed pairs of unit and word ids
+    """
+    changed = UnitWordRelation.objects.filter(
+        Q(modified_at__gte=since) | Q(word__modified_at__gte=since),
+        unit__in=get_all_published_units().values("pk"),
+    )
+    published = list(
+        get_public_unit_word_relations()
+        .filter(pk__in=changed.values("pk"))
+        .select_related("word")
+        .prefetch_related("word__alternative_words")
+        .order_by("unit_id", "word__word")
+    )
+    # A word can be removed from a unit and added again, so tombstones of
+    # relations are only reported if the relation isn't published again
+    removed = set(changed.values_list("unit_id", "word_id"))
+    removed.update(
+        (unit_id, word_id)
+        for unit_id, word_id in get_tombstones(UnitWordRelation, since).values_list(
+            "parent_id", "object_id"
+        )
+        if unit_id is not None
+    )
+    removed -= {(relation.unit_id, relation.word_id) for relation in published}
+    return {
+        "changed": published,
+        "removed": [
+            {"unit": unit_id, "word": word_id} for unit_id, word_id in sorted(removed)
+        ],
+    }
+
+
+def get_word_changes(since: datetime) -> dict[str, list[Any]]:
+    """
+    Words change with their own fields and their alternative words
+
+    :param since: The start of the time range
+    :return: The changed and removed words
+    """
+    changed = Word.objects.filter(modified_at__gte=since)
+    published = list(get_published_words().filter(modified_at__gte=since))
+    return {
+        "changed": published,
+        "removed": get_removed_ids(Word, changed, published, since),
+    }
+
+
+def get_changes(since: datetime | None) -> dict[str, dict[str, list[Any]]]:
+    """
+    Get all changes of the published content since the given time, including
+    changes during the :data:`CURSOR_OVERLAP` before it
+
+    :param since: The start of the time range, or ``None`` to return no changes
+    :return: The changes of each kind of content
+    """
+    if since is None:
+        return {kind: {"changed": [], "removed": []} for kind in CHANGE_KINDS}
+    since -= CURSOR_OVERLAP
+    return {
+        "jobs": get_job_changes(since),
+        "units": get_unit_changes(since),
+        "unit_words": get_unit_word_changes(since),
+        "words": get_word_changes(since),
+    }
@@ -0,0 +1,35 @@
+"""
+Opt-in downscaled images for the endpoints returning words.
+
+By default, the full-size images are returned. Clients can request copies that
+fit into a square of one of the :data:`~lunes_cms.cmsv2.utils.IMAGE_SIZES`
+with the ``image_size`` query parameter. The response cache is keyed by the
+full URL, so every size is cached separately.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from rest_framework import viewsets
+
+from .serializers import ImageSizeQuerySerializer
+
+
+class ImageSizeMixin(viewsets.GenericViewSet):
+    """
+    Mixin for viewsets passing the requested ``image_size`` to their serializers.
+    """
+
+    def get_serializer_context(self) -> dict[str, Any]:
+        """
+        Add the validated ``image_size`` query parameter to the serializer context
+
+        :return: The serializer context
+        """
+        context = super().get_serializer_context()
+        if self.request is not None:
+            query = ImageSizeQuerySerializer(data=self.request.query_params)
+            query.is_valid(raise_exception=True)
+            context["image_size"] = query.validated_data.get("image_size")
+        return context
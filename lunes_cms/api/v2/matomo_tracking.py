@@ -12,17 +12,20 @@ import logging
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, TypeVar
 from urllib import error, parse
 from urllib import request as urllib_request
 
 from django.conf import settings
+from django.http import HttpResponseBase
 from rest_framework.request import Request
-from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 
 logger = logging.getLogger(__name__)
 
+#: The type of the response returned by a tracked action
+R = TypeVar("R", bound=HttpResponseBase)
+
 # Module-level thread pool executor for Matomo tracking requests.
 # Reuses threads instead of creating new ones for each request.
 _executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="matomo_tracking")
@@ -114,7 +117,7 @@ def matomo_tracking(
     action_name: str,
     category: str = "API",
     resource_id: Optional[str] = None,
-) -> Callable[[Callable[..., Response]], Callable[..., Response]]:
+) -> Callable[[Callable[..., R]], Callable[..., R]]:
     """
     Decorator for tracking API endpoint access in Matomo.
 
@@ -128,11 +131,11 @@ def matomo_tracking(
     :return: Decorated function
     """
 
-    def decorator(func: Callable[..., Response]) -> Callable[..., Response]:
+    def decorator(func: Callable[..., R]) -> Callable[..., R]:
         @wraps(func)
         def wrapper(
             self: ViewSet, http_request: Request, *args: Any, **kwargs: Any
-        ) -> Response:
+        ) -> R:
             # Execute the original function first
             response = func(self, http_request, *args, **kwargs)
 
@@ -0,0 +1,157 @@
+"""
+Querysets of the content published via the second API version.
+
+They are shared by the viewsets and the offline bundles, so both always agree
+on which jobs, units and words are public.
+"""
+
+from __future__ import annotations
+
+from django.db.models import Exists, OuterRef, Prefetch, QuerySet
+from rest_framework.exceptions import PermissionDenied
+
+from ...cmsv2.models import Job, Unit, Word
+from ...cmsv2.models.unit import UnitWordRelation
+
+
+def get_published_jobs() -> QuerySet[Job]:
+    """
+    Get the queryset of released jobs
+
+    :return: The queryset of jobs
+    """
+    return Job.objects.filter(released=True, archived=False).order_by("name")
+
+
+def get_published_job(job_id: int | str) -> Job:
+    """
+    Get a released job
+
+    :param job_id: The id of the job
+    :raises ~rest_framework.exceptions.PermissionDenied: If the job is not published
+    :return: The job
+    """
+    try:
+        job = Job.objects.get(pk=job_id)
+    except Job.DoesNotExist as e:
+        raise PermissionDenied() from e
+
+    if not job.released or job.archived:
+        raise PermissionDenied()
+    return job
+
+
+def get_published_units(job: Job) -> QuerySet[Unit]:
+    """
+    Get the queryset of all released units of a job
+
+    :param job: The job
+    :return: The queryset of units
+    """
+    return Unit.objects.filter(jobs__pk=job.pk, released=True).order_by("title")
+
+
+def get_all_published_units() -> QuerySet[Unit]:
+    """
+    Get the queryset of all released units which belong to at least one published job
+
+    :return: The queryset of units
+    """
+    return Unit.objects.filter(
+        Exists(
+            Unit.jobs.through.objects.filter(
+                unit_id=OuterRef("pk"), job__released=True, job__archived=False
+            )
+        ),
+        released=True,
+    ).order_by("title")
+
+
+def get_published_unit(unit_id: int | str) -> Unit:
+    """
+    Get a released unit which belongs to at least one published job
+
+    :param unit_id: The id of the unit
+    :raises ~rest_framework.exceptions.PermissionDenied: If the unit is not published
+    :return: The unit
+    """
+    units = Unit.objects.filter(
+        pk=unit_id,
+        released=True,
+        jobs__released=True,
+        jobs__archived=False,
+    ).distinct()
+    if len(units) != 1:
+        raise PermissionDenied()
+    return units[0]
+
+
+def get_public_unit_word_relations() -> QuerySet[UnitWordRelation]:
+    """
+    Get the queryset of all unit word relations with a confirmed audio and a confirmed image
+
+    :return: The queryset of unit word relations
+    """
+    return UnitWordRelation.objects.filter(is_public=True)
+
+
+def get_published_unit_words(unit: Unit) -> QuerySet[UnitWordRelation]:
+    """
+    Get the queryset of all public words of a unit
+
+    :param unit: The unit
+    :return: The queryset of unit word relations
+    """
+    return (
+        get_public_unit_word_relations()
+        .select_related("word")
+        .prefetch_related("word__alternative_words")
+        .filter(unit=unit)
+        .order_by("word__word")
+    )
+
+
+def get_published_job_words(job: Job) -> QuerySet[Word]:
+    """
+    Get the queryset of all words that are public in at least one released unit of a job.
+    The public images of the job's units are prefetched as ``unit_word_relations_of_job``.
+
+    :param job: The job
+    :return: The queryset of words
+    """
+    unit_word_relations = get_public_unit_word_relations().filter(
+        unit__released=True,
+        unit__jobs=job,
+    )
+    return (
+        Word.objects.filter(Exists(unit_word_relations.filter(word__pk=OuterRef("pk"))))
+        .prefetch_related(
+            Prefetch(
+                "unit_word_relations",
+                unit_word_relations.exclude(image="").order_by("unit__title"),
+                to_attr="unit_word_relations_of_job",
+            ),
+            "alternative_words",
+        )
+        .order_by("word")
+    )
+
+
+def get_published_words() -> QuerySet[Word]:
+    """
+    Get the queryset of all words with a confirmed default image in at least one published unit
+
+    :return: The queryset of words
+    """
+    return (
+        Word.objects.filter(
+            unit_word_relations__unit__released=True,
+            unit_word_relations__unit__jobs__released=True,
+            unit_word_relations__unit__jobs__archived=False,
+            audio_check_status="CONFIRMED",
+            image_check_status="CONFIRMED",
+        )
+        .prefetch_related("alternative_words")
+        .distinct()
+        .order_by("word")
+    )
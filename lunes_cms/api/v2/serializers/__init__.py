@@ -3,7 +3,9 @@ This module contains the model serializers, see :doc:`django:topics/serializatio
 """
 
 from .alternative_word_serializer import AlternativeWordSerializer
+from .changes_serializer import ChangesQuerySerializer, ChangesSerializer
 from .feedback_serializer import FeedbackSerializer
+from .image_serializer import ImageSizeQuerySerializer, ResponsiveImageField
 from .job_serializer import JobSerializer
 from .sponsor_serializer import SponsorSerializer
 from .unit_serializer import UnitSerializer
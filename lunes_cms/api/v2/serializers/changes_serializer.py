@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+from ....cmsv2.models import Unit, UnitWordRelation
+from .job_serializer import JobSerializer
+from .unit_serializer import UnitSerializer
+from .unit_word_relation_serializer import UnitWordRelationSerializer
+from .word_serializer import WordSerializer
+
+
+class ChangeFeedSerializer(serializers.Serializer):
+    """Common base class for the serializers of the change feed"""
+
+    def update(self, instance: Any, validated_data: Any) -> Any:
+        raise RuntimeError("Should not be called on a change feed serializer")
+
+    def create(self, validated_data: Any) -> Any:
+        raise RuntimeError("Should not be called on a change feed serializer")
+
+
+class ChangesQuerySerializer(ChangeFeedSerializer):
+    """
+    Serializer for the query parameters of the change feed.
+    """
+
+    since = serializers.DateTimeField(
+        required=False,
+        help_text=(
+            "The cursor of the previous sync. If omitted, only a new cursor is returned. "
+            "Cursors older than CHANGES_RETENTION_DAYS (90 by default) are rejected, "
+            "because the deletions before them are not known anymore."
+        ),
+    )
+
+    def validate_since(self, value: datetime) -> datetime:
+        """
+        Reject cursors from before the oldest tombstones that are kept
+
+        :param value: The cursor of the previous sync
+        :return: The cursor
+        """
+        if value < timezone.now() - timedelta(days=settings.CHANGES_RETENTION_DAYS):
+            raise serializers.ValidationError(
+                f"The cursor is older than {settings.CHANGES_RETENTION_DAYS} days. "
+                "Download the content in full and start over without a cursor."
+            )
+        return value
+
+
+class ChangedUnitSerializer(UnitSerializer):
+    """
+    Serializer for changed units, which also contains the ids of their published jobs.
+    """
+
+    jobs = serializers.PrimaryKeyRelatedField(
+        many=True, read_only=True, source="published_jobs"
+    )
+
+    class Meta:
+        """
+        Define model and the corresponding fields
+        """
+
+        model = Unit
+        fields = UnitSerializer.Meta.fields + ("jobs",)
+
+
+class ChangedUnitWordRelationSerializer(UnitWordRelationSerializer):
+    """
+    Serializer for changed words of units, which also contains the id of the unit.
+    """
+
+    unit = serializers.IntegerField(source="unit_id")
+
+    class Meta:
+        """
+        Define model and the corresponding fields
+        """
+
+        model = UnitWordRelation
+        fields = ("unit",) + UnitWordRelationSerializer.Meta.fields
+
+
+class RemovedUnitWordRelationSerializer(ChangeFeedSerializer):
+    """
+    Serializer for words removed from units.
+    """
+
+    unit = serializers.IntegerField()
+    word = serializers.IntegerField()
+
+
+class JobChangesSerializer(ChangeFeedSerializer):
+    """
+    Serializer for the changed and removed jobs.
+    """
+
+    changed = JobSerializer(many=True)
+    removed = serializers.ListField(child=serializers.IntegerField())
+
+
+class UnitChangesSerializer(ChangeFeedSerializer):
+    """
+    Serializer for the changed and removed units.
+    """
+
+    changed = ChangedUnitSerializer(many=True)
+    removed = serializers.ListField(child=serializers.IntegerField())
+
+
+class UnitWordChangesSerializer(ChangeFeedSerializer):
+    """
+    Serializer for the changed and removed words of units.
+    """
+
+    changed = ChangedUnitWordRelationSerializer(many=True)
+    removed = RemovedUnitWordRelationSerializer(many=True)
+
+
+class WordChangesSerializer(ChangeFeedSerializer):
+    """
+    Serializer for the changed and removed words.
+    """
+
+    changed = WordSerializer(many=True)
+    removed = serializers.ListField(child=serializers.IntegerField())
+
+
+class ChangesSerializer(ChangeFeedSerializer):
+    """
+    Serializer for the change feed.
+    """
+
+    cursor = serializers.DateTimeField(
+        help_text="The cursor to pass as ``since`` on the next sync."
+    )
+    jobs = JobChangesSerializer()
+    units = UnitChangesSerializer()
+    unit_words = UnitWordChangesSerializer()
+    words = WordChangesSerializer()
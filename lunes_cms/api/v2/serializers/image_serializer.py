@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Any
+
+from rest_framework import serializers
+
+from ....cmsv2.utils import get_image_derivative, IMAGE_SIZES
+
+
+class ImageSizeQuerySerializer(serializers.Serializer):
+    """
+    Serializer for the query parameter selecting the size of the returned images.
+    """
+
+    image_size = serializers.ChoiceField(
+        choices=IMAGE_SIZES,
+        required=False,
+        help_text=(
+            "Return downscaled copies of the images which fit into a square of this "
+            "size in pixels instead of the full-size images."
+        ),
+    )
+
+    def update(self, instance: Any, validated_data: Any) -> Any:
+        raise RuntimeError("Should not be called on a query serializer")
+
+    def create(self, validated_data: Any) -> Any:
+        raise RuntimeError("Should not be called on a query serializer")
+
+
+class ResponsiveImageField(serializers.ImageField):
+    """
+    Image field which returns the downscaled copy of the image requested by the
+    ``image_size`` in the serializer context, if there is one.
+    """
+
+    def to_representation(self, value: Any) -> Any:
+        if image_size := self.context.get("image_size"):
+            value = get_image_derivative(value, image_size)
+        return super().to_representation(value)
@@ -7,6 +7,7 @@ from rest_framework import serializers
 from ....cmsv2.models.unit import UnitWordRelation
 from ...utils import build_absolute_url
 from .alternative_word_serializer import AlternativeWordSerializer
+from .image_serializer import ResponsiveImageField
 
 
 class UnitWordRelationSerializer(serializers.ModelSerializer):
@@ -22,7 +23,7 @@ class UnitWordRelationSerializer(serializers.ModelSerializer):
         many=True, read_only=True, source="word.alternative_words"
     )
     images = serializers.ListSerializer(
-        child=serializers.ImageField(), source="effective_public_images"
+        child=ResponsiveImageField(), source="effective_public_images"
     )
     audio = serializers.FileField(source="word.audio")
     example_sentence = serializers.SerializerMethodField()
@@ -9,6 +9,7 @@ from rest_framework import serializers
 from ....cmsv2.models import Word
 from ...utils import build_absolute_url
 from .alternative_word_serializer import AlternativeWordSerializer
+from .image_serializer import ResponsiveImageField
 
 
 class WordSerializer(serializers.ModelSerializer):
@@ -19,7 +20,7 @@ class WordSerializer(serializers.ModelSerializer):
     article = serializers.CharField(source="singular_article_as_text")
     alternative_words = AlternativeWordSerializer(many=True, read_only=True)
     images = serializers.ListSerializer(
-        child=serializers.ImageField(), source="images_for_api"
+        child=ResponsiveImageField(), source="images_for_api"
     )
     example_sentence = serializers.SerializerMethodField()
     example_sentence_audio = serializers.SerializerMethodField()
@@ -13,8 +13,12 @@ app_name = "v2"
 
 #: Router for dynamic url patterns
 router = OptionalSlashRouter()
+router.register(r"changes", views.ChangesViewSet, "changes")
 router.register(r"feedback", views.CreateFeedbackViewSet, basename="feedback")
 router.register(r"jobs", views.JobViewSet, "jobs")
+router.register(
+    r"jobs/(?P<job_id>[0-9]+)/bundle", views.JobBundleViewSet, "bundle-of-job"
+)
 router.register(r"jobs/(?P<job_id>[0-9]+)/units", views.JobUnitsViewSet, "units-of-job")
 router.register(r"jobs/(?P<job_id>[0-9]+)/words", views.JobWordsViewSet, "words-of-job")
 router.register(r"sponsors", views.SponsorsViewSet, "sponsors")
@@ -1,4 +1,6 @@
+from .changes_viewset import ChangesViewSet
 from .feedback_viewset import CreateFeedbackViewSet
+from .job_bundle_viewset import JobBundleViewSet
 from .job_units_viewset import JobUnitsViewSet
 from .job_viewset import JobViewSet
 from .job_words_viewset import JobWordsViewSet
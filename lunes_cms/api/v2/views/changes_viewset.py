@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema
+from rest_framework import viewsets
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from ..changes import get_changes
+from ..matomo_tracking import matomo_tracking
+from ..serializers import ChangesQuerySerializer, ChangesSerializer
+
+
+class ChangesViewSet(viewsets.ViewSet):
+    """
+    Retrieve all jobs, units, words and words of units that changed since the
+    cursor of a previous sync. Changed objects are serialized as by the regular
+    endpoints, removed objects are listed by their ids. Objects may be reported
+    again on the next sync, so applying the changes has to be idempotent.
+    Jobs and units that are new to the client have to be downloaded in full,
+    as does all content if the last sync was longer ago than the retention of
+    deletions (``CHANGES_RETENTION_DAYS``).
+    """
+
+    @extend_schema(parameters=[ChangesQuerySerializer], responses=ChangesSerializer)
+    @matomo_tracking(action_name="Changes")
+    def list(self, request: Request, *_args: Any, **_kwargs: Any) -> Response:
+        """List all changes since the given cursor with Matomo tracking."""
+        query = ChangesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        cursor = timezone.now()
+        changes = get_changes(query.validated_data.get("since"))
+        return Response(
+            ChangesSerializer(
+                {"cursor": cursor, **changes}, context={"request": request}
+            ).data
+        )
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.http import FileResponse, HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import viewsets
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.request import Request
+
+from ....cmsv2.utils import make_safe_filename
+from ..bundle import get_job_bundle
+from ..matomo_tracking import matomo_tracking
+from ..querysets import get_published_jobs
+
+
+class JobBundleViewSet(viewsets.ViewSet):
+    """
+    Download all units, words and media files of a job as a single zip archive
+    for offline use. The archive contains a ``manifest.json`` and the media files
+    below their URL path.
+    """
+
+    @extend_schema(responses={(200, "application/zip"): OpenApiTypes.BINARY})
+    @matomo_tracking(action_name="Bundle of job", resource_id="job_id")
+    def list(self, request: Request, *_args: Any, **kwargs: Any) -> HttpResponseBase:
+        """Send the bundle of a job with Matomo tracking."""
+        job = get_published_jobs().filter(pk=kwargs["job_id"]).first()
+        if job is None:
+            raise PermissionDenied()
+
+        path, _ = get_job_bundle(job)
+        etag = quote_etag(path.stem)
+        if not_modified := get_conditional_response(request, etag=etag):
+            not_modified["ETag"] = etag
+            return not_modified
+
+        response = FileResponse(
+            path.open("rb"),
+            as_attachment=True,
+            filename=f"{make_safe_filename(job.name)}.zip",
+            content_type="application/zip",
+        )
+        response["ETag"] = etag
+        return response
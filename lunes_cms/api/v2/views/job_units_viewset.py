@@ -1,19 +1,21 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 
-from django.db.models import Count, Q, QuerySet
+from django.db.models import QuerySet
 from rest_framework import viewsets
-from rest_framework.exceptions import PermissionDenied
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from ....cmsv2.models import Job, Unit
+from ....cmsv2.models import Job, Unit, Word
+from ..caching import get_latest_modification, JobContentCachedResponseMixin
 from ..matomo_tracking import matomo_tracking
+from ..querysets import get_published_job, get_published_units
 from ..serializers import UnitSerializer
 
 
-class JobUnitsViewSet(viewsets.ModelViewSet):
+class JobUnitsViewSet(JobContentCachedResponseMixin, viewsets.ModelViewSet):
     """
     Retrieve the list of all units that belong to a job
     """
@@ -31,6 +33,19 @@ class JobUnitsViewSet(viewsets.ModelViewSet):
         """Retrieve a single unit with Matomo tracking."""
         return super().retrieve(request, *args, **kwargs)
 
+    def get_last_modified(self) -> datetime | None:
+        """
+        Get the latest modification of the job, its units and their words
+
+        :return: The time of the last modification, if any
+        """
+        job_id = self.kwargs["job_id"]
+        return get_latest_modification(
+            Job.objects.filter(pk=job_id),
+            Unit.objects.filter(jobs=job_id),
+            Word.objects.filter(units__jobs=job_id),
+        )
+
     def get_queryset(self) -> QuerySet[Unit]:
         """
         Get the queryset of all released units of a job
@@ -41,27 +56,4 @@ class JobUnitsViewSet(viewsets.ModelViewSet):
         if getattr(self, "swagger_fake_view", False):
             return Unit.objects.none()
 
-        try:
-            job = Job.objects.get(pk=self.kwargs["job_id"])
-        except Job.DoesNotExist as e:
-            raise PermissionDenied() from e
-
-        if not job.released or job.archived:
-            raise PermissionDenied()
-
-        queryset = Unit.objects.filter(jobs__pk=job.pk, released=True).annotate(
-            number_words=Count(
-                "unit_word_relations",
-                filter=Q(
-                    unit_word_relations__word__audio_check_status="CONFIRMED",
-                )
-                & (
-                    Q(
-                        unit_word_relations__image="",
-                        unit_word_relations__word__image_check_status="CONFIRMED",
-                    )
-                    | Q(unit_word_relations__image_check_status="CONFIRMED")
-                ),
-            )
-        )
-        return queryset.order_by("title")
+        return get_published_units(get_published_job(self.kwargs["job_id"]))
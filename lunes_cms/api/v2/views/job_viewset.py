@@ -1,18 +1,21 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 
-from django.db.models import Count, Q, QuerySet
+from django.db.models import QuerySet
 from rest_framework import viewsets
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from ....cmsv2.models import Job
+from ....cmsv2.models import Job, Unit
+from ..caching import CachedResponseMixin, get_latest_modification
 from ..matomo_tracking import matomo_tracking
+from ..querysets import get_published_jobs
 from ..serializers import JobSerializer
 
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """
     Retrieve the list of all jobs, or a single job by id
     """
@@ -25,6 +28,14 @@ class JobViewSet(viewsets.ModelViewSet):
         """List all jobs with Matomo tracking."""
         return super().list(request, *args, **kwargs)
 
+    def get_last_modified(self) -> datetime | None:
+        """
+        Jobs change with their own fields and the release state of their units
+
+        :return: The latest modification of any job or unit
+        """
+        return get_latest_modification(Job.objects.all(), Unit.objects.all())
+
     def get_queryset(self) -> QuerySet[Job]:
         """
         Get the queryset of jobs
@@ -35,8 +46,4 @@ class JobViewSet(viewsets.ModelViewSet):
         if getattr(self, "swagger_fake_view", False):
             return Job.objects.none()
 
-        queryset = Job.objects.filter(
-            released=True,
-            archived=False,
-        ).annotate(number_units=Count("units", filter=Q(units__released=True)))
-        return queryset.order_by("name")
+        return get_published_jobs()
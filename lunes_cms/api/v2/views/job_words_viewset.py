@@ -1,20 +1,25 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 
-from django.db.models import Exists, OuterRef, Prefetch, Q, QuerySet
+from django.db.models import QuerySet
+from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets
-from rest_framework.exceptions import PermissionDenied
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from ....cmsv2.models import Job, Word
-from ....cmsv2.models.unit import UnitWordRelation
+from ....cmsv2.models import Job, Unit, Word
+from ..caching import get_latest_modification, JobContentCachedResponseMixin
+from ..image_sizes import ImageSizeMixin
 from ..matomo_tracking import matomo_tracking
-from ..serializers import WordSerializer
+from ..querysets import get_published_job, get_published_job_words
+from ..serializers import ImageSizeQuerySerializer, WordSerializer
 
 
-class JobWordsViewSet(viewsets.ModelViewSet):
+class JobWordsViewSet(
+    JobContentCachedResponseMixin, ImageSizeMixin, viewsets.ModelViewSet
+):
     """
     Retrieve the list of all words of a job.
     A word is returned if it's public in at least one unit that belongs to the job.
@@ -26,16 +31,31 @@ class JobWordsViewSet(viewsets.ModelViewSet):
     serializer_class = WordSerializer
     http_method_names = ["get"]
 
+    @extend_schema(parameters=[ImageSizeQuerySerializer])
     @matomo_tracking(action_name="All words of job", resource_id="job_id")
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """List all words of a job with Matomo tracking."""
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=[ImageSizeQuerySerializer])
     @matomo_tracking(action_name="Word", resource_id="pk")
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Retrieve a single word with Matomo tracking."""
         return super().retrieve(request, *args, **kwargs)
 
+    def get_last_modified(self) -> datetime | None:
+        """
+        Get the latest modification of the job, its units and their words
+
+        :return: The time of the last modification, if any
+        """
+        job_id = self.kwargs["job_id"]
+        return get_latest_modification(
+            Job.objects.filter(pk=job_id),
+            Unit.objects.filter(jobs=job_id),
+            Word.objects.filter(units__jobs=job_id),
+        )
+
     def get_queryset(self) -> QuerySet[Word]:
         """
         Get the queryset of words
@@ -46,35 +66,4 @@ class JobWordsViewSet(viewsets.ModelViewSet):
         if getattr(self, "swagger_fake_view", False):
             return Word.objects.none()
 
-        try:
-            job = Job.objects.get(pk=self.kwargs["job_id"])
-        except Job.DoesNotExist as e:
-            raise PermissionDenied() from e
-
-        if not job.released or job.archived:
-            raise PermissionDenied()
-
-        unit_word_relations = UnitWordRelation.objects.filter(
-            unit__released=True,
-            unit__jobs=job,
-            word__audio_check_status="CONFIRMED",
-        ).filter(
-            Q(image_check_status="CONFIRMED")
-            | Q(image="", word__image_check_status="CONFIRMED")
-        )
-        queryset = (
-            Word.objects.filter(
-                Exists(unit_word_relations.filter(word__pk=OuterRef("pk")))
-            )
-            .prefetch_related(
-                Prefetch(
-                    "unit_word_relations",
-                    unit_word_relations.exclude(image="").order_by("unit__title"),
-                    to_attr="unit_word_relations_of_job",
-                ),
-                "alternative_words",
-            )
-            .order_by("word")
-        )
-
-        return queryset
+        return get_published_job_words(get_published_job(self.kwargs["job_id"]))
@@ -1,20 +1,25 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
+from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets
-from rest_framework.exceptions import PermissionDenied
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from ....cmsv2.models import Unit
+from ....cmsv2.content_version import get_job_versions, job_ids_of_units
+from ....cmsv2.models import Job, Unit, Word
 from ....cmsv2.models.unit import UnitWordRelation
+from ..caching import CachedResponseMixin, get_latest_modification
+from ..image_sizes import ImageSizeMixin
 from ..matomo_tracking import matomo_tracking
-from ..serializers import UnitWordRelationSerializer
+from ..querysets import get_published_unit, get_published_unit_words
+from ..serializers import ImageSizeQuerySerializer, UnitWordRelationSerializer
 
 
-class UnitWordViewSet(viewsets.ModelViewSet):
+class UnitWordViewSet(CachedResponseMixin, ImageSizeMixin, viewsets.ModelViewSet):
     """
     Retrieve the list of all words that belong to a given unit
     """
@@ -22,16 +27,40 @@ class UnitWordViewSet(viewsets.ModelViewSet):
     serializer_class = UnitWordRelationSerializer
     http_method_names = ["get"]
 
+    @extend_schema(parameters=[ImageSizeQuerySerializer])
     @matomo_tracking(action_name="All words of unit", resource_id="unit_id")
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """List all words of a unit with Matomo tracking."""
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=[ImageSizeQuerySerializer])
     @matomo_tracking(action_name="Word", resource_id="pk")
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Retrieve a single word with Matomo tracking."""
         return super().retrieve(request, *args, **kwargs)
 
+    def get_content_version(self) -> str:
+        """
+        The words of a unit only change with the content of the jobs it belongs to
+
+        :return: The combined version of all jobs of the unit
+        """
+        versions = get_job_versions(job_ids_of_units([int(self.kwargs["unit_id"])]))
+        return ".".join(versions[job_id] for job_id in sorted(versions))
+
+    def get_last_modified(self) -> datetime | None:
+        """
+        Get the latest modification of the unit, its jobs and its words
+
+        :return: The time of the last modification, if any
+        """
+        unit_id = self.kwargs["unit_id"]
+        return get_latest_modification(
+            Job.objects.filter(units=unit_id),
+            Unit.objects.filter(pk=unit_id),
+            Word.objects.filter(units=unit_id),
+        )
+
     def get_queryset(self) -> QuerySet[UnitWordRelation]:
         """
         Get the queryset of unit word relations
@@ -42,27 +71,4 @@ class UnitWordViewSet(viewsets.ModelViewSet):
         if getattr(self, "swagger_fake_view", False):
             return UnitWordRelation.objects.none()
 
-        units = Unit.objects.filter(
-            pk=self.kwargs["unit_id"],
-            released=True,
-            jobs__released=True,
-            jobs__archived=False,
-        ).distinct()
-        if len(units) != 1:
-            raise PermissionDenied()
-        unit = units[0]
-
-        queryset = (
-            UnitWordRelation.objects.select_related("word")
-            .prefetch_related("word__alternative_words")
-            .filter(
-                unit=unit,
-                word__audio_check_status="CONFIRMED",
-            )
-            .filter(
-                Q(image_check_status="CONFIRMED")
-                | Q(image="", word__image_check_status="CONFIRMED")
-            )
-            .order_by("word__word")
-        )
-        return queryset
+        return get_published_unit_words(get_published_unit(self.kwargs["unit_id"]))
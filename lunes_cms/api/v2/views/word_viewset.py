@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 
 from django.db.models import QuerySet
+from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from ....cmsv2.models import Word
+from ....cmsv2.models import Job, Unit, Word
+from ..caching import CachedResponseMixin, get_latest_modification
+from ..image_sizes import ImageSizeMixin
 from ..matomo_tracking import matomo_tracking
-from ..serializers import WordSerializer
+from ..querysets import get_published_words
+from ..serializers import ImageSizeQuerySerializer, WordSerializer
 
 
-class WordViewSet(viewsets.ModelViewSet):
+class WordViewSet(CachedResponseMixin, ImageSizeMixin, viewsets.ModelViewSet):
     """
     Retrieve the list of all words with their default images, or a single word by id
     """
@@ -20,16 +25,28 @@ class WordViewSet(viewsets.ModelViewSet):
     serializer_class = WordSerializer
     http_method_names = ["get"]
 
+    @extend_schema(parameters=[ImageSizeQuerySerializer])
     @matomo_tracking(action_name="All words")
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """List all words with Matomo tracking."""
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=[ImageSizeQuerySerializer])
     @matomo_tracking(action_name="Word", resource_id="pk")
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Retrieve a single word with Matomo tracking."""
         return super().retrieve(request, *args, **kwargs)
 
+    def get_last_modified(self) -> datetime | None:
+        """
+        Words are published depending on the release state of their units and jobs
+
+        :return: The latest modification of any word, unit or job
+        """
+        return get_latest_modification(
+            Word.objects.all(), Unit.objects.all(), Job.objects.all()
+        )
+
     def get_queryset(self) -> QuerySet[Word]:
         """
         Get the queryset of words/documents
@@ -40,13 +57,4 @@ class WordViewSet(viewsets.ModelViewSet):
         if getattr(self, "swagger_fake_view", False):
             return Word.objects.none()
 
-        queryset = Word.objects.filter(
-            unit_word_relations__unit__released=True,
-            unit_word_relations__unit__jobs__released=True,
-            unit_word_relations__unit__jobs__archived=False,
-            audio_check_status="CONFIRMED",
-            image_check_status="CONFIRMED",
-        )
-        return (
-            queryset.prefetch_related("alternative_words").distinct().order_by("word")
-        )
+        return get_published_words()
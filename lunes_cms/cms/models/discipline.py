@@ -5,7 +5,7 @@ from django.db.models.deletion import CASCADE
 from django.utils.translation import gettext_lazy as _
 from mptt.models import MPTTModel, TreeForeignKey
 
-from ..utils import get_child_count, get_image_tag
+from ..utils import annotate_discipline_trees, get_image_tag
 from .feedback import Feedback
 from .static import convert_umlaute_images
 
@@ -52,10 +52,8 @@ class Discipline(MPTTModel):
         :return: True if discipline is valid
         :rtype: bool
         """
-        return (
-            get_child_count(self) > 0
-            or self.training_sets.filter(released=True).count() > 0
-        )
+        annotate_discipline_trees([self])
+        return self.non_empty_child_count > 0 or self.released_training_set_count > 0
 
     def get_nested_training_sets(self):
         """
@@ -65,12 +63,8 @@ class Discipline(MPTTModel):
         :return: training set ids
         :rtype: list(int)
         """
-        training_sets = []
-        for child in self.get_descendants(include_self=True):
-            training_sets += child.training_sets.filter(released=True).values_list(
-                "id", flat=True
-            )
-        return set(training_sets)
+        annotate_discipline_trees([self])
+        return self.nested_training_set_ids
 
     def image_tag(self):
         """
@@ -1,17 +1,27 @@
 from html import escape
 from string import ascii_uppercase, digits
+from time import monotonic
 
 from django.contrib.auth.models import Group
 from django.core.exceptions import PermissionDenied
 from django.core.validators import MinLengthValidator, RegexValidator
 from django.db import models
 from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.crypto import get_random_string
 from django.utils.html import mark_safe
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from qr_code.qrcode.maker import make_qr_code_url_with_args
 
+#: How many seconds a validated API key is reused without querying the database.
+#: Changes of keys in other processes take effect after this time at the latest.
+CACHE_TIMEOUT = 60
+
+#: The API keys validated by this process with the time they expire from the cache
+_validated_keys = {}
+
 
 def generate_default_token():
     """
@@ -134,21 +144,30 @@ class GroupAPIKey(models.Model):
     @classmethod
     def get_from_token(cls, token):
         """
-        returns a group api which maches to the given token
+        returns a group api which maches to the given token.
+        Valid keys are cached for :data:`CACHE_TIMEOUT` seconds.
 
         :param token: token
         :type token: str
 
+        :raises ~django.core.exceptions.PermissionDenied: If no valid key matches
+
         :return: Group API Key object
         :rtype: ~lunes_cms.cms.models.group_api_key.GroupAPIKey
         """
+        cached_until, api_key = _validated_keys.get(token, (0, None))
+        if cached_until > monotonic() and api_key.is_valid():
+            return api_key
         try:
-            return cls.objects.get(
+            api_key = cls.objects.select_related("group").get(
                 Q(token=token, revoked=False)
                 & (Q(expiry_date__isnull=True) | Q(expiry_date__gt=now()))
             )
         except cls.DoesNotExist as e:
+            _validated_keys.pop(token, None)
             raise PermissionDenied() from e
+        _validated_keys[token] = (monotonic() + CACHE_TIMEOUT, api_key)
+        return api_key
 
     def __str__(self):
         """
@@ -164,3 +183,12 @@ class GroupAPIKey(models.Model):
 
         verbose_name = _("API Key")
         verbose_name_plural = _("API Keys")
+
+
+@receiver([post_save, post_delete], sender=GroupAPIKey)
+def clear_api_key_cache(**_kwargs):
+    """
+    Forgets the validated API keys when a key is changed, revoked or deleted,
+    so the change takes effect in this process right away.
+    """
+    _validated_keys.clear()
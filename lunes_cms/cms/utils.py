@@ -6,13 +6,17 @@ import os
 import pathlib
 import string
 import uuid
+from collections import defaultdict
 from html import escape
 from typing import Optional
 
+from django.db.models import Exists, F, Func, IntegerField, OuterRef, Q, Subquery
 from django.utils.crypto import get_random_string
 from django.utils.html import mark_safe
 from django.utils.translation import gettext as _
 
+from ..core.media_metadata import file_exists
+
 
 def create_resource_path(parent_dir, filename):
     """
@@ -79,6 +83,99 @@ def document_to_string(doc):
     return has_foto + " " + "(" + doc.get_singular_article_display() + ") " + doc.word
 
 
+def annotate_discipline_trees(disciplines):
+    """
+    Attaches the numbers of training sets and non-empty children of the given
+    disciplines and the ids of their nested training sets to the instances.
+    The training sets of all descendants are found with the ``tree_id``,
+    ``lft`` and ``rght`` columns of the tree, so two queries are issued no
+    matter how many disciplines are given or how deep they are nested.
+    Disciplines which were already annotated are skipped.
+
+    :param disciplines: Discipline instances
+    :type disciplines: ~collections.abc.Iterable
+
+    :return: the annotated disciplines
+    :rtype: list(~lunes_cms.cms.models.discipline.Discipline)
+    """
+    # pylint: disable=import-outside-toplevel
+    from .models import Discipline
+
+    disciplines = list(disciplines)
+    pending = [
+        disc for disc in disciplines if not hasattr(disc, "nested_training_set_ids")
+    ]
+    if not pending:
+        return disciplines
+
+    relations = Discipline.training_sets.through.objects.order_by()
+    in_subtree = Q(
+        discipline__tree_id=OuterRef("tree_id"),
+        discipline__lft__gte=OuterRef("lft"),
+        discipline__lft__lte=OuterRef("rght"),
+    )
+    non_empty_children = (
+        Discipline.objects.filter(parent=OuterRef("pk"), released=True)
+        .filter(Exists(relations.filter(in_subtree)))
+        .order_by()
+    )
+    counts = {
+        pk: (training_set_count, child_count)
+        for pk, training_set_count, child_count in Discipline.objects.filter(
+            pk__in=[disc.pk for disc in pending]
+        )
+        .annotate(
+            training_set_count=_count(relations.filter(in_subtree)),
+            child_count=_count(non_empty_children),
+        )
+        .values_list("pk", "training_set_count", "child_count")
+    }
+
+    released_relations = defaultdict(list)
+    for tree_id, lft, training_set_id in (
+        relations.filter(
+            trainingset__released=True,
+            discipline__tree_id__in={disc.tree_id for disc in pending},
+        )
+        .order_by("discipline__lft", "trainingset__tree_id", "trainingset__lft")
+        .values_list("discipline__tree_id", "discipline__lft", "trainingset_id")
+    ):
+        released_relations[tree_id].append((lft, training_set_id))
+
+    for disc in pending:
+        disc.training_set_count, disc.non_empty_child_count = counts.get(
+            disc.pk, (0, 0)
+        )
+        nested = [
+            (lft, training_set_id)
+            for lft, training_set_id in released_relations[disc.tree_id]
+            if disc.lft <= lft <= disc.rght
+        ]
+        disc.released_training_set_count = sum(
+            1 for lft, _training_set_id in nested if lft == disc.lft
+        )
+        disc.nested_training_set_ids = set(
+            training_set_id for _lft, training_set_id in nested
+        )
+    return disciplines
+
+
+def _count(queryset):
+    """
+    Counts the rows of a queryset within a subquery.
+
+    :param queryset: queryset referring to the outer query
+    :type queryset: ~django.db.models.query.QuerySet
+
+    :return: number of rows
+    :rtype: ~django.db.models.Subquery
+    """
+    return Subquery(
+        queryset.annotate(count=Func(F("pk"), function="COUNT")).values("count"),
+        output_field=IntegerField(),
+    )
+
+
 def get_child_count(disc):
     """
     Returns the number of children of a discipline.
@@ -91,11 +188,8 @@ def get_child_count(disc):
     :return: sum of children
     :rtype: int
     """
-    children_counter = 0
-    for child in disc.get_children():
-        if child.released and get_training_set_count(child) > 0:
-            children_counter += 1
-    return children_counter
+    annotate_discipline_trees([disc])
+    return disc.non_empty_child_count
 
 
 def get_training_set_count(disc):
@@ -109,10 +203,8 @@ def get_training_set_count(disc):
     :return: sum of training sets
     :rtype: int
     """
-    training_set_counter = 0
-    for child in disc.get_descendants(include_self=True):
-        training_set_counter += child.training_sets.count()
-    return training_set_counter
+    annotate_discipline_trees([disc])
+    return disc.training_set_count
 
 
 def get_image_tag(image, width=330):
@@ -130,7 +222,7 @@ def get_image_tag(image, width=330):
     src = ""
     if (
         image
-        and image.storage.exists(image.name)
+        and file_exists(image.storage, image.name)
         and any(image.name.lower().endswith(ext) for ext in [".jpg", ".png"])
     ):
         # The normal src attribute for jpg and png previews
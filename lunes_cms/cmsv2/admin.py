@@ -8,12 +8,20 @@ from __future__ import absolute_import, unicode_literals
 from django.contrib import admin
 from django.contrib.auth.models import User
 
-from .admins import FeedbackAdmin, JobAdmin, LunesUserAdmin, UnitAdmin, WordAdmin
-from .models import Feedback, Job, Unit, Word
+from .admins import (
+    FeedbackAdmin,
+    GenerationTaskAdmin,
+    JobAdmin,
+    LunesUserAdmin,
+    UnitAdmin,
+    WordAdmin,
+)
+from .models import Feedback, GenerationTask, Job, Unit, Word
 
 admin.site.register(Job, JobAdmin)
 admin.site.register(Unit, UnitAdmin)
 admin.site.register(Word, WordAdmin)
 admin.site.register(Feedback, FeedbackAdmin)
+admin.site.register(GenerationTask, GenerationTaskAdmin)
 admin.site.unregister(User)
 admin.site.register(User, LunesUserAdmin)
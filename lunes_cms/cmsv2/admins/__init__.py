@@ -1,7 +1,15 @@
 from .feedback_admin import FeedbackAdmin
+from .generation_task_admin import GenerationTaskAdmin
 from .job_admin import JobAdmin
 from .unit_admin import UnitAdmin
 from .user_admin import LunesUserAdmin
 from .word_admin import WordAdmin
 
-__all__ = ["JobAdmin", "WordAdmin", "UnitAdmin", "FeedbackAdmin", "LunesUserAdmin"]
+__all__ = [
+    "JobAdmin",
+    "WordAdmin",
+    "UnitAdmin",
+    "FeedbackAdmin",
+    "GenerationTaskAdmin",
+    "LunesUserAdmin",
+]
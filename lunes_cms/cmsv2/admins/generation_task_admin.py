@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.contrib import admin, messages
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.template.response import TemplateResponse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from ..models import GenerationTask
+from ..services.generation_queue import queue_stats
+
+
+class GenerationTaskAdmin(admin.ModelAdmin):
+    """
+    Read-only admin interface for the queue of background generation tasks.
+
+    The change list shows the number of pending, done and failed tasks per
+    kind above the results. Filtered by a job, this is the progress of its
+    imports.
+    """
+
+    model = GenerationTask
+    list_display = [
+        "word",
+        "kind",
+        "job",
+        "status",
+        "attempts",
+        "next_run_at",
+        "lease_owner",
+        "last_error",
+    ]
+    list_filter = ["status", "kind", "job"]
+    list_select_related = ["word", "job"]
+    search_fields = ["word__word"]
+    ordering = ["-created_at"]
+    actions = ["retry_tasks"]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: GenerationTask | None = None
+    ) -> bool:
+        return False
+
+    def changelist_view(
+        self, request: HttpRequest, extra_context: dict[str, Any] | None = None
+    ) -> HttpResponse:
+        """
+        Add the queue statistics of the filtered tasks to the change list.
+
+        Args:
+            request: The current request
+            extra_context: Additional template context
+
+        Returns:
+            HttpResponse: The change list
+        """
+        response = super().changelist_view(request, extra_context)
+        if isinstance(response, TemplateResponse) and response.context_data:
+            if change_list := response.context_data.get("cl"):
+                response.context_data["queue_stats"] = queue_stats(change_list.queryset)
+        return response
+
+    @admin.action(description=_("Retry selected tasks"))
+    def retry_tasks(
+        self, request: HttpRequest, queryset: QuerySet[GenerationTask]
+    ) -> None:
+        """
+        Schedule failed tasks to be processed again right away.
+
+        Args:
+            request: The current request
+            queryset: The selected tasks
+        """
+        retried = queryset.filter(status=GenerationTask.Status.FAILED).update(
+            status=GenerationTask.Status.PENDING,
+            attempts=0,
+            next_run_at=timezone.now(),
+            finished_at=None,
+        )
+        messages.success(
+            request,
+            _("%(count)d failed task(s) will be retried.") % {"count": retried},
+        )
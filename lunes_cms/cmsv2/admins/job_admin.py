@@ -1,21 +1,23 @@
 from __future__ import absolute_import, annotations, unicode_literals
 
+import csv
 import io
 from datetime import date
 from typing import Iterable, Iterator, TYPE_CHECKING
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, ZipFile
 
 from django.contrib import admin, messages
 from django.db.models import QuerySet
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe, SafeString
 from django.utils.translation import gettext_lazy as _
-from tablib import Dataset
 
-from ..models import Job, Unit, Word
+from ..content_version import bump_content_version
+from ..models import Job, Unit
 from ..utils import make_safe_filename
 from .base import BaseAdmin
 from .word_export_resource import WordExportResource
@@ -26,6 +28,80 @@ if TYPE_CHECKING:
     from django.utils.functional import _StrOrPromise
 
 
+#: How many words of a job are read (and their units prefetched) at once
+EXPORT_CHUNK_SIZE = 500
+
+
+class _ZipStream:
+    """
+    Write-only file collecting what :class:`~zipfile.ZipFile` writes until
+    it is taken by :func:`_stream_zip`. Since it can't seek, the archive is
+    written sequentially.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def write(self, data: bytes, /) -> int:
+        """
+        Collect the written data.
+        """
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        """
+        Nothing to flush, the data is taken by :func:`_stream_zip`.
+        """
+
+    def close(self) -> None:
+        """
+        Nothing to close, the chunks which weren't taken yet are kept.
+        """
+
+    def take(self) -> list[bytes]:
+        """
+        Return the data written since the last call and forget it.
+        """
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+
+def _stream_zip(files: Iterable[tuple[str, Iterable[list]]]) -> Iterator[bytes]:
+    """
+    Write CSV files into a zip archive row by row and yield the archive in pieces.
+
+    :param files: The names of the files and their rows
+    :return: The bytes of the archive
+    """
+    stream = _ZipStream()
+    with ZipFile(stream, "w", compression=ZIP_DEFLATED) as archive:
+        for name, rows in files:
+            with (
+                archive.open(name, "w") as entry,
+                io.TextIOWrapper(entry, encoding="utf-8", newline="") as text,
+            ):
+                writer = csv.writer(text)
+                for row in rows:
+                    writer.writerow(row)
+                    yield from stream.take()
+            yield from stream.take()
+    yield from stream.take()
+
+
+def _export_rows(profession: Job) -> Iterator[list]:
+    """
+    Get the header and the rows of the words of a job for the export.
+
+    :param profession: The job to export
+    :return: The rows of the CSV file
+    """
+    resource = WordExportResource(for_profession=profession)
+    yield resource.get_export_headers()
+    for word in resource.get_words().iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield resource.export_resource(word)
+
+
 class UnitInline(admin.TabularInline):
     """
     Inline admin for the relationship between Job and Unit models.
@@ -256,39 +332,27 @@ class JobAdmin(BaseAdmin):
     migrated_status.short_description = _("migrated")  # type: ignore[attr-defined]
 
     @admin.action(description=_("Export all vocabulary for these jobs to CSV"))
-    def export_to_csv(self, _: HttpRequest, queryset: QuerySet[Job]) -> HttpResponse:
+    def export_to_csv(
+        self, _: HttpRequest, queryset: QuerySet[Job]
+    ) -> StreamingHttpResponse:
         """
-        Export the words of the selected jobs.
+        Export the words of the selected jobs. The archive is streamed to the
+        client while the words are read from the database in chunks.
 
         :param request: current user request
         :param queryset: current queryset
         :type queryset: QuerySet
         """
-        csvs = {}
-
-        for profession in queryset:
-            resource = WordExportResource(for_profession=profession)
-            units = Unit.objects.filter(jobs=profession)
-            words = (
-                Word.objects.filter(units__in=units)
-                .order_by("units__title", "word")
-                .distinct()
-            )
-
-            dataset = Dataset(
-                *(resource.export_resource(word) for word in words),
-                headers=resource.export().headers,
-            )
-
-            csvs[profession] = dataset.csv
-
-        zip_buffer = io.BytesIO()
-
-        with ZipFile(zip_buffer, "w") as zipfile:
-            for profession, csv in csvs.items():
-                zipfile.writestr(f"{make_safe_filename(profession.name)}.csv", csv)
-
-        response = HttpResponse(zip_buffer.getvalue(), content_type="application/zip")
+        response = StreamingHttpResponse(
+            _stream_zip(
+                (
+                    f"{make_safe_filename(profession.name)}.csv",
+                    _export_rows(profession),
+                )
+                for profession in queryset
+            ),
+            content_type="application/zip",
+        )
         response["Content-Disposition"] = 'attachment; filename="Lunes_vocabulary.zip"'
         return response
 
@@ -314,7 +378,11 @@ class JobAdmin(BaseAdmin):
     @admin.action(description=_("Archive selected jobs"))
     def archive_jobs(self, request: HttpRequest, queryset: QuerySet[Job]) -> None:
         """Archive the selected jobs so they are no longer published or listed."""
-        updated = queryset.update(archived=True, released=False)
+        job_ids = list(queryset.values_list("pk", flat=True))
+        updated = queryset.update(
+            archived=True, released=False, modified_at=timezone.now()
+        )
+        bump_content_version(job_ids)
         messages.success(
             request,
             _("%(count)d job(s) have been archived successfully.") % {"count": updated},
@@ -323,7 +391,9 @@ class JobAdmin(BaseAdmin):
     @admin.action(description=_("Restore selected jobs from archive"))
     def restore_jobs(self, request: HttpRequest, queryset: QuerySet[Job]) -> None:
         """Restore the selected jobs from the archive."""
-        updated = queryset.update(archived=False)
+        job_ids = list(queryset.values_list("pk", flat=True))
+        updated = queryset.update(archived=False, modified_at=timezone.now())
+        bump_content_version(job_ids)
         messages.success(
             request,
             _("%(count)d job(s) have been restored successfully.") % {"count": updated},
@@ -10,12 +10,19 @@ from django.db.models import QuerySet
 from django.forms import BaseModelFormSet, ModelForm
 from django.http import HttpRequest, HttpResponse
 from django.template.response import TemplateResponse
+from django.utils import timezone
 from django.utils.safestring import mark_safe, SafeString
 from django.utils.translation import gettext_lazy as _
 
 from lunes_cms.cmsv2.admins.base import BaseAdmin
+from lunes_cms.cmsv2.content_version import bump_content_version, job_ids_of_units
+from lunes_cms.cmsv2.models import Job
 from lunes_cms.cmsv2.models.review import ReviewAssignment
-from lunes_cms.cmsv2.models.unit import Unit, UnitWordRelation
+from lunes_cms.cmsv2.models.unit import (
+    Unit,
+    UnitWordRelation,
+    update_number_units,
+)
 
 if TYPE_CHECKING:
     from django.utils.functional import _StrOrPromise
@@ -204,7 +211,13 @@ class UnitAdmin(BaseAdmin):
             raise PermissionDenied
 
         units_skipped = queryset.filter(released=True).count()
-        released_unit_count = queryset.filter(released=False).update(released=True)
+        unreleased_units = queryset.filter(released=False)
+        job_ids = job_ids_of_units(unreleased_units.values_list("pk", flat=True))
+        released_unit_count = unreleased_units.update(
+            released=True, modified_at=timezone.now()
+        )
+        update_number_units(Job.objects.filter(pk__in=job_ids))
+        bump_content_version(job_ids)
 
         self.message_user(
             request,
@@ -4,6 +4,8 @@ from datetime import date
 from typing import TYPE_CHECKING
 
 from django.contrib import admin
+from django.db.models import Prefetch, QuerySet
+from django.http import HttpRequest
 from django.urls import reverse
 from django.utils.functional import lazy
 from django.utils.html import escape, format_html
@@ -23,6 +25,7 @@ from lunes_cms.cmsv2.models.unit import UnitWordRelation
 from lunes_cms.cmsv2.utils import (
     cache_busted_url,
     example_sentence_generate_html,
+    get_image_derivative,
     get_image_tag,
     is_not_blank,
 )
@@ -34,6 +37,9 @@ if TYPE_CHECKING:
 
 _format_html_lazy = lazy(format_html, SafeString)
 
+#: Size in pixels of the image preview shown when hovering a thumbnail
+HOVER_IMAGE_SIZE = 300
+
 
 class AlternativeWordInline(admin.TabularInline):
     """
@@ -497,7 +503,7 @@ class WordAdmin(BaseAdmin):
                 </div>""",
                 f"{settings.MEDIA_URL}{obj.image}",
                 mark_safe(get_image_tag(obj.image, width=120)),
-                f"{settings.MEDIA_URL}{obj.image}",
+                f"{settings.MEDIA_URL}{get_image_derivative(obj.image, HOVER_IMAGE_SIZE)}",
                 escape(obj.word),
             )
         return "No image uploaded."
@@ -542,6 +548,19 @@ class WordAdmin(BaseAdmin):
 
     image_generate.short_description = _("Image Generation")  # type: ignore[attr-defined]
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Word]:
+        """Prefetch the unit word relations and their units shown in list_image"""
+        return (
+            super()
+            .get_queryset(request)
+            .prefetch_related(
+                Prefetch(
+                    "unit_word_relations",
+                    queryset=UnitWordRelation.objects.select_related("unit"),
+                )
+            )
+        )
+
     def creator_group(self, obj: Word) -> str | None:
         """
         Determine the creator group for display in the admin interface.
@@ -667,7 +686,7 @@ class WordAdmin(BaseAdmin):
             image_html = f"""<div class="image-hover-container">
                 <a href="{escape(f"{settings.MEDIA_URL}{obj.image}")}" target="_blank">{get_image_tag(obj.image, width=50)}</a>
                 <div class="image-hover-overlay">
-                    <img src="{escape(f"{settings.MEDIA_URL}{obj.image}")}" alt="{escape(obj.word)}">
+                    <img src="{escape(f"{settings.MEDIA_URL}{get_image_derivative(obj.image, HOVER_IMAGE_SIZE)}")}" alt="{escape(obj.word)}">
                 </div>
             </div>"""
         else:
@@ -717,7 +736,7 @@ class WordAdmin(BaseAdmin):
         """
         unit_word_images = ""
 
-        for relation in obj.unit_word_relations.select_related("unit").all():
+        for relation in obj.unit_word_relations.all():
             unit_word_images += self._generate_unit_word_image(relation)
 
         return unit_word_images
@@ -737,7 +756,7 @@ class WordAdmin(BaseAdmin):
             unit_image_html = f"""<div class="image-hover-container">
                 <a href="{escape(f"{settings.MEDIA_URL}{relation.image}")}" target="_blank">{get_image_tag(relation.image, width=50)}</a>
                 <div class="image-hover-overlay">
-                    <img src="{escape(f"{settings.MEDIA_URL}{relation.image}")}" alt="{escape(relation.unit.title)}">
+                    <img src="{escape(f"{settings.MEDIA_URL}{get_image_derivative(relation.image, HOVER_IMAGE_SIZE)}")}" alt="{escape(relation.unit.title)}">
                 </div>
             </div>"""
         else:
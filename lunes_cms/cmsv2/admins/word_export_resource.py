@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from django.db.models import Prefetch, QuerySet
 from django.utils.translation import gettext_lazy as _
 from import_export import fields, resources
 from import_export.admin import ExportActionMixin
 
-from ..models import Job, Word
+from ..models import Job, Unit, Word
 from ..models.static import PluralArticle, SingularArticle
 
 if TYPE_CHECKING:
@@ -30,6 +31,26 @@ class WordExportResource(resources.ModelResource):
             else None
         )
 
+    def get_words(self) -> QuerySet[Word]:
+        """
+        Get the words of the profession to export, once per unit of the
+        profession, with these units prefetched for the "Units" column.
+        """
+        assert self.for_profession is not None
+        units = Unit.objects.filter(jobs=self.for_profession)
+        return (
+            Word.objects.filter(units__in=units)
+            .order_by("units__title", "word")
+            .distinct()
+            .prefetch_related(
+                Prefetch(
+                    "units",
+                    queryset=units.order_by("title"),
+                    to_attr="exported_units",
+                )
+            )
+        )
+
     word = fields.Field(column_name=_("Word"), attribute="word")
 
     word_type = fields.Field(column_name=_("Word type"), attribute="word_type")
@@ -100,6 +121,8 @@ class WordExportResource(resources.ModelResource):
         """
         Method to get relevant units.
         """
+        if hasattr(word, "exported_units"):
+            return " | ".join(unit.title for unit in word.exported_units)
         relevant_units = (
             self.relevant_units
             if self.relevant_units
@@ -49,10 +49,10 @@ class UnitOrJobDropdownFilter(admin.SimpleListFilter):
         self, request: HttpRequest, model_admin: admin.ModelAdmin[Word]
     ) -> Iterable[tuple[str, _StrOrPromise]]:
         options = []
-        for unit in Unit.objects.all():
-            options.append((f"unit_{unit.pk}", f"Unit: {unit.title}"))
-        for job in Job.objects.all():
-            options.append((f"job_{job.pk}", f"Job: {job.name}"))
+        for pk, title in Unit.objects.values_list("pk", "title"):
+            options.append((f"unit_{pk}", f"Unit: {title}"))
+        for pk, name in Job.objects.values_list("pk", "name"):
+            options.append((f"job_{pk}", f"Job: {name}"))
         return options
 
     def queryset(
@@ -1,12 +1,22 @@
 import logging
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple, TYPE_CHECKING
+from typing import Dict, Iterable, Optional, Tuple, TYPE_CHECKING
 
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from tablib import Dataset
 
-from ..models import Job, PluralArticle, SingularArticle, Unit, Word, WordType
+from ..content_version import bump_content_version
+from ..models import (
+    Job,
+    PluralArticle,
+    SingularArticle,
+    Unit,
+    UnitWordRelation,
+    Word,
+    WordType,
+)
 
 if TYPE_CHECKING:
     from django.utils.functional import _StrOrPromise
@@ -166,35 +176,26 @@ def create_unit(unit_title: str, job: Job, creator_fields: dict) -> Unit:
     return unit
 
 
-@dataclass(frozen=True)
-class WordAttributes:
-    """The (already converted/validated) word fields a CSV row contributes."""
-
-    singular_article: int
-    plural_article: int | None
-    plural: str = ""
-    pronunciation: str = ""
-    word_type: str = ""
-
-
-def create_word(
-    word_text: str, attributes: WordAttributes, creator_fields: dict
-) -> Word:
+def build_word(parsed: ParsedRow, creator_fields: dict) -> Word:
     """
-    Creates a new word object.
+    Builds an unsaved word object from a parsed row, to be inserted with
+    ``bulk_create``. ``Word.save()`` isn't called, which is fine for a new
+    word without audio or image: all its check statuses keep their default
+    ``NOT_CHECKED``.
     """
-    return Word.objects.create(
-        word=word_text,
-        singular_article=attributes.singular_article,
-        plural_article=attributes.plural_article,
-        plural=attributes.plural,
-        pronunciation=attributes.pronunciation,
-        word_type=attributes.word_type,
+    return Word(
+        word=parsed.word,
+        singular_article=map_article_to_int(parsed.article),
+        plural_article=map_plural_article_to_int(parsed.plural_article),
+        plural=parsed.plural,
+        pronunciation=parsed.pronunciation,
+        word_type=map_word_type(parsed.word_type),
+        example_sentence=parsed.example,
         **creator_fields,
     )
 
 
-def _creator_fields_for_user(user: User) -> dict:
+def creator_fields_for_user(user: User) -> dict:
     """
     Builds the created_by/created_by_user/creator_is_admin values a CSV
     import should stamp on the units and words it creates, mirroring how
@@ -213,15 +214,6 @@ def _creator_fields_for_user(user: User) -> dict:
     }
 
 
-def update_or_add_example_sentence(word_obj: Word, word_defaults: dict) -> None:
-    """
-    Adds or edits example sentence to word object.
-    """
-    if word_obj.example_sentence != word_defaults["example_sentence"]:
-        word_obj.example_sentence = word_defaults["example_sentence"]
-        word_obj.save(update_fields=["example_sentence"])
-
-
 def parse_row(raw_row: dict, row_number: int) -> ParsedRow | RowResult:
     """
     Parses a single row and returns either a ParsedRow or a RowResult (error).
@@ -313,66 +305,80 @@ def _split_unit_titles(unit_column: str) -> list[str]:
     return [title for title in titles if title]
 
 
-def _resolve_unit(
-    unit_title: str,
-    job: Job,
-    created_units: Dict[str, Unit],
-    creator_fields: dict,
-) -> Tuple[Unit, bool]:
-    """
-    Looks up ``unit_title`` in the ``created_units`` cache, creating it (even
-    if a unit with the same title already exists elsewhere) if this is the
-    first time this import encounters it. Returns the unit and whether it
-    was newly created.
-    """
-    unit = created_units.get(unit_title)
-    if unit is None:
-        unit = create_unit(unit_title, job, creator_fields)
-        created_units[unit_title] = unit
-        return unit, True
-
-    if not unit.jobs.filter(pk=job.pk).exists():
-        unit.jobs.add(job)
-    return unit, False
-
-
-def process_row(
-    parsed: ParsedRow,
-    job: Job,
-    created_units: Dict[str, Unit],
-    creator_fields: dict,
-) -> RowResult:
-    """
-    Processes a single parsed row.
-
-    The "unit" column may name more than one unit (see
-    ``_split_unit_titles``); each one is resolved/created and linked to the
-    word individually. Update example sentence. Add word to newly created
-    unit(s).
-    """
-    units_created = 0
-    units = []
-    for unit_title in _split_unit_titles(parsed.unit):
-        unit, created = _resolve_unit(unit_title, job, created_units, creator_fields)
-        units.append(unit)
-        if created:
-            units_created += 1
-
-    attributes = WordAttributes(
-        singular_article=map_article_to_int(parsed.article),
-        plural_article=map_plural_article_to_int(parsed.plural_article),
-        plural=parsed.plural,
-        pronunciation=parsed.pronunciation,
-        word_type=map_word_type(parsed.word_type),
+def _create_units(
+    rows: list[ParsedRow], job: Job, creator_fields: dict, units: Dict[str, Unit]
+) -> int:
+    """
+    Creates one unit per distinct unit title of the rows that isn't in
+    ``units`` yet (even if a unit with the same title already exists
+    elsewhere), adds it to the job and to ``units``. Returns the number of
+    created units.
+    """
+    titles = dict.fromkeys(
+        title
+        for parsed in rows
+        for title in _split_unit_titles(parsed.unit)
+        if title not in units
     )
-    word = create_word(parsed.word, attributes, creator_fields)
+    for title in titles:
+        units[title] = create_unit(title, job, creator_fields)
+    return len(titles)
+
+
+def parse_rows(
+    raw_rows: Iterable[Tuple[int, dict]],
+) -> Tuple[list[ParsedRow], list[str]]:
+    """
+    Parses numbered rows. Returns the parsed rows and the error messages of
+    the rows that can't be imported.
+    """
+    rows: list[ParsedRow] = []
+    error_messages: list[str] = []
+    for row_number, raw_row in raw_rows:
+        parsed_or_error = parse_row(raw_row, row_number)
+
+        if isinstance(parsed_or_error, RowResult):
+            if parsed_or_error.error:
+                error_messages.append(parsed_or_error.error)
+            continue
+
+        rows.append(parsed_or_error)
+    return rows, error_messages
 
-    update_or_add_example_sentence(word, {"example_sentence": parsed.example})
 
-    for unit in units:
-        unit.words.add(word)
+def import_parsed_rows(
+    rows: list[ParsedRow], job: Job, creator_fields: dict, units: Dict[str, Unit]
+) -> Tuple[list[int], int]:
+    """
+    Imports parsed rows to a job in one transaction. The units are created
+    once per distinct title, and the words and their unit relations are
+    inserted with one ``bulk_create`` each.
+    ``units`` holds the units this import created so far by title, and is
+    extended by the new ones, so a file can be imported in several chunks.
+    Returns the ids of the imported words and the number of created units.
+    """
+    if not rows:
+        return [], 0
 
-    return RowResult(units_created=units_created, word_created=True, word_id=word.pk)
+    with transaction.atomic():
+        units_created = _create_units(rows, job, creator_fields, units)
+        words = Word.objects.bulk_create(
+            [build_word(parsed, creator_fields) for parsed in rows]
+        )
+        UnitWordRelation.objects.bulk_create(
+            [
+                UnitWordRelation(unit=units[title], word=word)
+                for parsed, word in zip(rows, words)
+                for title in dict.fromkeys(_split_unit_titles(parsed.unit))
+            ]
+        )
+        # ``bulk_create`` doesn't send any signals. The new relations aren't
+        # public (their words have no confirmed audio yet), so the word counts
+        # of the units stay the same, but the cached API responses of the job
+        # are outdated.
+        bump_content_version([job.pk])
+
+    return [word.pk for word in words], units_created
 
 
 def import_words_from_csv(
@@ -383,40 +389,17 @@ def import_words_from_csv(
     Returns a tuple of words_created_count, units_created_count, error_messages,
     imported_word_ids
 
-    Important: During the import there is a local cache ``created_units`` because of the following scenario:
+    All rows are parsed first and imported at once with
+    ``import_parsed_rows``. Rows that can't be parsed are reported and
+    skipped.
+
+    Important: every unit title of the file gets a new unit because of the following scenario:
     In the CSV file there are ten words for the unit "tools"
     There is already a unit called "tools" in the system
     What we want to happen is: a second unit "tools" is created, distinct from the one that already exists. All words
     in the CSV file gets imported into that second instance of "tools".
     """
-    total_words_created = 0
-    total_units_created = 0
-    error_messages: list[str] = []
-    imported_word_ids: list[int] = []
-
-    creator_fields = _creator_fields_for_user(user)
-    created_units: Dict[str, Unit] = {}
-
-    for row_number, raw_row in enumerate(dataset.dict, start=1):
-        parsed_or_error = parse_row(raw_row, row_number)
-
-        if isinstance(parsed_or_error, RowResult):
-            if parsed_or_error.error:
-                error_messages.append(parsed_or_error.error)
-            continue
-
-        result = process_row(parsed_or_error, job, created_units, creator_fields)
-
-        if result.error:
-            error_messages.append(
-                _("Row %(n)s: %(msg)s") % {"n": row_number, "msg": result.error}
-            )
-            continue
-
-        if result.word_created:
-            total_words_created += 1
-        total_units_created += result.units_created
-        if result.word_id is not None:
-            imported_word_ids.append(result.word_id)
-
-    return total_words_created, total_units_created, error_messages, imported_word_ids
+    creator_fields = creator_fields_for_user(user)
+    rows, error_messages = parse_rows(enumerate(dataset.dict, start=1))
+    word_ids, units_created = import_parsed_rows(rows, job, creator_fields, {})
+    return len(word_ids), units_created, error_messages, word_ids
@@ -18,6 +18,11 @@ class CmsV2Config(AppConfig):
     def ready(self) -> None:
         """
         Called when the app is ready.
-        Performs startup checks including OpenAI availability.
+        Performs startup checks including OpenAI availability and connects the
+        signal handlers maintaining the content versions, change tracking and
+        counters.
         """
+        # pylint: disable=import-outside-toplevel,unused-import
+        from . import change_tracking, content_version, counters  # noqa: F401
+
         check_openai_availability()
@@ -0,0 +1,91 @@
+"""
+Change tracking for the API's change feed.
+
+The feed finds changed content by its ``modified_at`` timestamp. This module
+records what these timestamps can't express on their own: deletions are stored
+as :class:`~lunes_cms.cmsv2.models.Tombstone`, and edits that change how a
+parent object is serialized (alternative words of a word, units added to or
+removed from a job) touch the parent's timestamp.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import AlternativeWord, Job, Tombstone, Unit, UnitWordRelation, Word
+
+
+def touch(model: type[Model], pks: Iterable[int]) -> None:
+    """
+    Set ``modified_at`` of the given objects to now without sending any signals
+
+    :param model: A model with a ``modified_at`` field
+    :param pks: The ids of the objects
+    """
+    model._default_manager.filter(  # pylint: disable=protected-access
+        pk__in=list(pks)
+    ).update(modified_at=timezone.now())
+
+
+@receiver(post_delete, sender=Job)
+@receiver(post_delete, sender=Unit)
+@receiver(post_delete, sender=Word)
+def content_deleted(sender: type[Model], instance: Model, **_kwargs: Any) -> None:
+    """Record the deletion of a job, unit or word"""
+    Tombstone.objects.create(
+        content_type=ContentType.objects.get_for_model(sender),
+        object_id=instance.pk,
+    )
+
+
+@receiver(pre_delete, sender=Unit)
+def unit_deleting(instance: Unit, **_kwargs: Any) -> None:
+    """The jobs of a deleted unit lose it without an ``m2m_changed`` signal"""
+    touch(Job, instance.jobs.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=UnitWordRelation)
+def unit_word_relation_deleted(instance: UnitWordRelation, **_kwargs: Any) -> None:
+    """Record the removal of a word from a unit"""
+    Tombstone.objects.create(
+        content_type=ContentType.objects.get_for_model(UnitWordRelation),
+        object_id=instance.word_id,
+        parent_id=instance.unit_id,
+    )
+
+
+@receiver(post_save, sender=AlternativeWord)
+@receiver(post_delete, sender=AlternativeWord)
+def alternative_word_changed(instance: AlternativeWord, **_kwargs: Any) -> None:
+    """Alternative words are serialized as part of their word"""
+    touch(Word, [instance.word_id])
+
+
+@receiver(m2m_changed, sender=Unit.jobs.through)
+def unit_jobs_changed(
+    instance: Job | Unit,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **_kwargs: Any,
+) -> None:
+    """Both the jobs of a unit and the number of units of a job changed"""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    own_field, related_field = (
+        ("job_id", "unit_id") if reverse else ("unit_id", "job_id")
+    )
+    if action == "pre_clear":
+        pk_set = set(
+            Unit.jobs.through.objects.filter(**{own_field: instance.pk}).values_list(
+                related_field, flat=True
+            )
+        )
+    touch(Job if reverse else Unit, [instance.pk])
+    touch(Unit if reverse else Job, pk_set or ())
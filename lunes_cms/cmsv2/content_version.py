@@ -0,0 +1,176 @@
+"""
+Content versions of the published vocabulary.
+
+Every job has an opaque version token that changes whenever content reachable
+through that job (the job itself, its units, their words and the relations in
+between) is saved or deleted. A global token changes on every such edit. The
+public API uses these tokens as part of its cache keys, so bumping a version is
+all that's needed to invalidate the affected cached responses. Tokens of
+bumped versions also carry the time of the bump, which tells clients when the
+content changed last, including deletions that leave no ``modified_at`` behind.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import AlternativeWord, Job, Unit, UnitWordRelation, Word
+
+#: Cache key of the version token covering all published content
+GLOBAL_VERSION_KEY = "content-version:global"
+
+#: Cache key template of the version token of a single job
+JOB_VERSION_KEY = "content-version:job:{}"
+
+
+def _new_token(bumped_at: float = 0) -> str:
+    return f"{int(bumped_at * 1000):x}-{uuid.uuid4().hex}"
+
+
+def get_version_modified_at(version: str) -> datetime | None:
+    """
+    Get the time of the latest bump contained in a version. Versions which were
+    created lazily instead of being bumped don't carry a time.
+
+    :param version: A single version token or several tokens joined by ``"."``
+    :return: The time of the latest bump, if known
+    """
+    latest = max(
+        (int(token.split("-")[0], 16) for token in version.split(".") if token),
+        default=0,
+    )
+    return datetime.fromtimestamp(latest / 1000, tz=timezone.utc) if latest else None
+
+
+def get_global_version() -> str:
+    """
+    Get the version token covering all published content.
+
+    :return: The current global version token
+    """
+    return str(cache.get_or_set(GLOBAL_VERSION_KEY, _new_token, timeout=None))
+
+
+def get_job_versions(job_ids: Iterable[int]) -> dict[int, str]:
+    """
+    Get the version tokens of the given jobs. Jobs without a token yet get a fresh one.
+
+    :param job_ids: The ids of the jobs
+    :return: A mapping from job id to its current version token
+    """
+    keys = {JOB_VERSION_KEY.format(job_id): job_id for job_id in job_ids}
+    tokens = cache.get_many(keys)
+    missing = {key: _new_token() for key in keys if key not in tokens}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        tokens.update(missing)
+    return {job_id: tokens[key] for key, job_id in keys.items()}
+
+
+def bump_content_version(job_ids: Iterable[int] = ()) -> None:
+    """
+    Invalidate the global version and the versions of the given jobs.
+
+    The versions are bumped right away and once more after the surrounding
+    transaction committed, so a request running in between can't cache the
+    state from before the commit under the new version.
+
+    :param job_ids: The ids of the jobs whose content changed
+    """
+    job_ids = set(job_ids)
+
+    def bump() -> None:
+        now = time.time()
+        tokens = {JOB_VERSION_KEY.format(job_id): _new_token(now) for job_id in job_ids}
+        tokens[GLOBAL_VERSION_KEY] = _new_token(now)
+        cache.set_many(tokens, timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def job_ids_of_units(unit_ids: Iterable[int]) -> set[int]:
+    """
+    :param unit_ids: The ids of the units
+    :return: The ids of all jobs the given units belong to
+    """
+    return set(
+        Unit.jobs.through.objects.filter(unit_id__in=list(unit_ids)).values_list(
+            "job_id", flat=True
+        )
+    )
+
+
+def job_ids_of_words(word_ids: Iterable[int]) -> set[int]:
+    """
+    :param word_ids: The ids of the words
+    :return: The ids of all jobs the given words are published in
+    """
+    return set(
+        Job.objects.filter(
+            units__unit_word_relations__word_id__in=list(word_ids)
+        ).values_list("pk", flat=True)
+    )
+
+
+@receiver(post_save, sender=Job)
+@receiver(pre_delete, sender=Job)
+def job_changed(instance: Job, **_kwargs: Any) -> None:
+    """Bump the version of a saved or deleted job"""
+    bump_content_version([instance.pk])
+
+
+@receiver(post_save, sender=Unit)
+@receiver(pre_delete, sender=Unit)
+def unit_changed(instance: Unit, **_kwargs: Any) -> None:
+    """Bump the versions of all jobs of a saved or deleted unit"""
+    bump_content_version(job_ids_of_units([instance.pk]))
+
+
+@receiver(post_save, sender=Word)
+@receiver(pre_delete, sender=Word)
+def word_changed(instance: Word, **_kwargs: Any) -> None:
+    """Bump the versions of all jobs containing a saved or deleted word"""
+    bump_content_version(job_ids_of_words([instance.pk]))
+
+
+@receiver(post_save, sender=AlternativeWord)
+@receiver(pre_delete, sender=AlternativeWord)
+def alternative_word_changed(instance: AlternativeWord, **_kwargs: Any) -> None:
+    """Bump the versions of all jobs containing the word of an alternative word"""
+    bump_content_version(job_ids_of_words([instance.word_id]))
+
+
+@receiver(post_save, sender=UnitWordRelation)
+@receiver(pre_delete, sender=UnitWordRelation)
+def unit_word_relation_changed(instance: UnitWordRelation, **_kwargs: Any) -> None:
+    """Bump the versions of all jobs of the unit of a saved or deleted relation"""
+    bump_content_version(job_ids_of_units([instance.unit_id]))
+
+
+@receiver(m2m_changed, sender=Unit.jobs.through)
+def unit_jobs_changed(
+    instance: Job | Unit,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **_kwargs: Any,
+) -> None:
+    """Bump the versions of all jobs that gained or lost units"""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        # The relation was changed from the job's side
+        bump_content_version([instance.pk])
+    elif action == "pre_clear":
+        bump_content_version(job_ids_of_units([instance.pk]))
+    else:
+        bump_content_version(pk_set or ())
@@ -0,0 +1,84 @@
+"""
+Public flags and counters of the published content.
+
+Unit word relations store whether they are public, units their number of public
+words and jobs their number of released units, so the API doesn't have to
+compute them on every request. They are recomputed for the affected objects
+whenever relations, check statuses or release flags change. Queryset updates
+bypass these handlers and have to recount explicitly, see
+:func:`~lunes_cms.cmsv2.models.unit.update_number_words` and
+:func:`~lunes_cms.cmsv2.models.unit.update_number_units`. The
+``reconcile_counters`` command repairs counters that drifted nevertheless.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Job, Unit, UnitWordRelation, Word
+from .models.unit import update_number_units, update_number_words, update_public_flags
+
+
+@receiver(post_save, sender=Word)
+def word_saved(instance: Word, **_kwargs: Any) -> None:
+    """
+    Update the public flags of the relations of a saved word, whose check
+    statuses might have changed, and recount the public words of its units
+    """
+    update_public_flags(instance.unit_word_relations.all())
+
+
+@receiver(post_save, sender=UnitWordRelation)
+@receiver(post_delete, sender=UnitWordRelation)
+def unit_word_relation_changed(instance: UnitWordRelation, **_kwargs: Any) -> None:
+    """Recount the public words of the unit of a saved or deleted relation"""
+    update_number_words(Unit.objects.filter(pk=instance.unit_id))
+
+
+@receiver(post_save, sender=Unit)
+def unit_saved(instance: Unit, **_kwargs: Any) -> None:
+    """
+    Recount the public words of a saved unit, whose instance might have held an
+    outdated counter, and the released units of all its jobs
+    """
+    update_number_words(Unit.objects.filter(pk=instance.pk))
+    update_number_units(Job.objects.filter(units=instance))
+
+
+@receiver(post_save, sender=Job)
+def job_saved(instance: Job, **_kwargs: Any) -> None:
+    """
+    Recount the released units of a saved job, whose instance might have held an
+    outdated counter
+    """
+    update_number_units(Job.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_delete, sender=Unit)
+def unit_deleting(instance: Unit, **_kwargs: Any) -> None:
+    """Recount the released units of all jobs of a deleted unit"""
+    update_number_units(
+        Job.objects.filter(units=instance), excluded_unit_ids=[instance.pk]
+    )
+
+
+@receiver(m2m_changed, sender=Unit.jobs.through)
+def unit_jobs_changed(
+    instance: Job | Unit,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **_kwargs: Any,
+) -> None:
+    """Recount the released units of all jobs that gained or lost units"""
+    if reverse and action in ("post_add", "post_remove", "post_clear"):
+        update_number_units(Job.objects.filter(pk=instance.pk))
+    elif not reverse and action in ("post_add", "post_remove"):
+        update_number_units(Job.objects.filter(pk__in=pk_set or ()))
+    elif not reverse and action == "pre_clear":
+        update_number_units(
+            Job.objects.filter(units=instance.pk), excluded_unit_ids=[instance.pk]
+        )
@@ -0,0 +1,110 @@
+"""
+Helpers for the batch commands processing media files: a process pool and a
+progress file, which lets an interrupted run continue where it stopped.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import django
+from django.core.management.base import CommandError
+from django.db.models import Model
+
+#: Applies a function to every item of the given iterables, like :func:`map`
+Map = Callable[..., Iterator[Any]]
+
+
+@contextmanager
+def process_pool(workers: int) -> Iterator[Map]:
+    """
+    Provide a :func:`map` running the function in a pool of worker processes,
+    or in this process if there's only one worker. The results are returned in
+    the order of the items.
+
+    The function has to be defined at module level, so it can be pickled.
+
+    Args:
+        workers: The number of worker processes
+
+    Returns:
+        Iterator[Map]: A context yielding the map function
+    """
+    if workers == 1:
+        yield map
+        return
+    # The workers set up Django, since the messages of errors are translated
+    # (and with the "spawn" start method, nothing is set up yet)
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+        yield executor.map
+
+
+def local_paths(model: type[Model], field: str, names: list[str]) -> list[str]:
+    """
+    Get the local paths of the files of a model's file field, which the worker
+    processes can open.
+
+    Args:
+        model: The model of the files
+        field: The name of the file field
+        names: The names of the files in the field's storage
+
+    Raises:
+        CommandError: If the storage doesn't store the files locally
+
+    Returns:
+        list[str]: The paths of the files
+    """
+    # pylint: disable-next=protected-access
+    storage = model._meta.get_field(field).storage  # type: ignore[union-attr]
+    try:
+        return [storage.path(name) for name in names]
+    except NotImplementedError as e:
+        raise CommandError("The media storage doesn't support local file paths.") from e
+
+
+class ProgressFile:
+    """
+    A JSON file storing the progress of a batch command, e.g. the last
+    processed primary key of every model.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def load(self) -> dict[str, Any]:
+        """
+        Read the progress of a previous run.
+
+        Returns:
+            dict[str, Any]: The stored progress, empty if there is none
+        """
+        try:
+            progress: dict[str, Any] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+        return progress
+
+    def save(self, progress: dict[str, Any]) -> None:
+        """
+        Replace the stored progress atomically.
+
+        Args:
+            progress: The progress to store
+        """
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(progress), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        """
+        Remove the stored progress once a run is complete, so the next run starts
+        from the beginning.
+        """
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from lunes_cms.core.audio import normalize_loudness, read_loudness_tag
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the loudness normalization against a corpus of mp3 clips.
+
+    Every clip is normalized to the configured target (measurement and linear
+    gain, unless the clip already carries a measurement) and the result is
+    normalized again to another target, which only needs a single pass. The
+    clips are only read, nothing is written.
+    """
+
+    help = "Benchmark the loudness normalization of generated audio against a corpus of mp3 clips."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--corpus",
+            default=os.path.join(settings.MEDIA_ROOT, "audio"),
+            help="Directory with the mp3 clips (default: the word audio in the MEDIA_ROOT)",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="Maximum number of clips to normalize (default: 100)",
+        )
+        parser.add_argument(
+            "--renormalize-to",
+            type=float,
+            default=settings.OPENAI_TTS_LOUDNESS_LUFS - 4,
+            help="Loudness in LUFS the normalized clips are normalized to again",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        clips = sorted(Path(options["corpus"]).rglob("*.mp3"))[: options["limit"]]
+        if not clips:
+            raise CommandError(f"No mp3 clips found in {options['corpus']}.")
+
+        normalized = []
+        first_pass = renormalize = 0.0
+        tagged = failed = 0
+        for clip in clips:
+            audio_bytes = clip.read_bytes()
+            try:
+                started = time.perf_counter()
+                result = normalize_loudness(
+                    audio_bytes, settings.OPENAI_TTS_LOUDNESS_LUFS
+                )
+                first_pass += time.perf_counter() - started
+            except ValidationError:
+                failed += 1
+                continue
+            normalized.append(result)
+            tagged += read_loudness_tag(result) is not None
+
+        for audio_bytes in normalized:
+            started = time.perf_counter()
+            normalize_loudness(audio_bytes, options["renormalize_to"])
+            renormalize += time.perf_counter() - started
+
+        count = len(normalized)
+        if not count:
+            raise CommandError("None of the clips could be normalized.")
+        self.stdout.write(
+            f"Normalized {count} clips in {first_pass:.1f}s "
+            f"({1000 * first_pass / count:.0f} ms per clip)."
+        )
+        self.stdout.write(
+            f"Normalized them again in {renormalize:.1f}s "
+            f"({1000 * renormalize / count:.0f} ms per clip), "
+            f"{tagged} of them from the stored measurement in a single pass."
+        )
+        if failed:
+            self.stderr.write(self.style.WARNING(f"Skipped {failed} invalid clips."))
@@ -1,21 +1,104 @@
 """
 Management command to convert existing images to WebP format.
 
+The images are decoded and encoded in parallel processes. The database is
+updated once per batch, and the last processed item is stored in a progress
+file, so an interrupted run continues where it stopped when started again.
+The file is removed once all images were processed.
+Images which already are WebP get their missing downscaled copies.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Any
+import os
+import time
+from typing import Any, NamedTuple
 
-from django.core.management.base import BaseCommand, CommandParser
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import Model
+from django.utils import timezone
+from PIL import Image
 
+from lunes_cms.cmsv2.content_version import (
+    bump_content_version,
+    job_ids_of_units,
+    job_ids_of_words,
+)
+from lunes_cms.cmsv2.management.batch import (
+    local_paths,
+    Map,
+    process_pool,
+    ProgressFile,
+)
 from lunes_cms.cmsv2.models import Word
-from lunes_cms.cmsv2.models.static import convert_image_to_webp
+from lunes_cms.cmsv2.models.static import encode_webp, save_image_derivatives
 from lunes_cms.cmsv2.models.unit import UnitWordRelation
+from lunes_cms.cmsv2.utils import image_derivative_name, IMAGE_SIZES
 
 logger = logging.getLogger(__name__)
 
+#: The images to convert: a label (also the key in the progress file) and the model
+IMAGE_MODELS: list[tuple[str, type[Model]]] = [
+    ("words", Word),
+    ("unit-word relations", UnitWordRelation),
+]
+
+
+def webp_name(name: str) -> str:
+    """
+    Get the name of the converted image.
+
+    Args:
+        name: The name or path of the original image
+
+    Returns:
+        str: The name with the extension ``.webp``
+    """
+    return os.path.splitext(name)[0] + ".webp"
+
+
+class Conversion(NamedTuple):
+    """The result of converting an image"""
+
+    #: ``converted``, ``resized`` (only the copies were created), ``skipped``
+    #: or ``failed``
+    outcome: str
+    #: The number of bytes the converted image is smaller than the original
+    saved: int = 0
+    #: The error, if the conversion failed
+    error: str = ""
+
+
+def convert_file(path: str) -> Conversion:
+    """
+    Encode an image as WebP next to the original, which is kept until the
+    database refers to the converted image. Of WebP images, only the missing
+    downscaled copies are created. Runs in a worker process.
+
+    Args:
+        path: The path of the image
+
+    Returns:
+        Conversion: The result
+    """
+    try:
+        if path.endswith(".webp"):
+            if all(
+                os.path.exists(image_derivative_name(path, size))
+                for size in IMAGE_SIZES
+            ):
+                return Conversion("skipped")
+            with Image.open(path) as img:
+                save_image_derivatives(img, path)
+            return Conversion("resized")
+        original_size = os.path.getsize(path)
+        encode_webp(path, webp_name(path))
+        return Conversion("converted", original_size - os.path.getsize(webp_name(path)))
+    except (OSError, ValueError) as e:
+        return Conversion("failed", error=str(e))
+
 
 class Command(BaseCommand):
     """Management command to convert existing images to WebP format."""
@@ -34,125 +117,172 @@ class Command(BaseCommand):
             default=None,
             help="Maximum number of items to process (default: no limit)",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes (default: number of CPU cores)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of images converted per database update (default: 100)",
+        )
+        parser.add_argument(
+            "--progress-file",
+            default=os.path.join(settings.BASE_DIR, "convert_images_to_webp.json"),
+            help="File storing the progress of the run (default: in the BASE_DIR)",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore the progress of a previous run and start from the beginning",
+        )
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.dry_run = False
+        self.batch_size = 0
+        self.progress_file = ProgressFile("")
+        self.progress: dict[str, Any] = {}
+        self.totals: dict[str, int] = {}
 
     def handle(self, *args: Any, **options: Any) -> None:
-        dry_run = options["dry_run"]
-        limit = options["limit"]
+        if options["workers"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--workers and --batch-size must be at least 1.")
+        self.dry_run = options["dry_run"]
+        self.batch_size = options["batch_size"]
+        self.progress_file = ProgressFile(options["progress_file"])
+        self.progress = {} if options["restart"] else self.progress_file.load()
+        self.totals = {
+            "processed": 0,
+            "converted": 0,
+            "resized": 0,
+            "skipped": 0,
+            "failed": 0,
+            "saved": 0,
+        }
 
         self.stdout.write(self.style.NOTICE("Starting image conversion to WebP..."))
 
-        if dry_run:
+        if self.dry_run:
             self.stdout.write(
                 self.style.WARNING("DRY RUN MODE - No changes will be made")
             )
 
-        total_processed = self._process_words(dry_run, limit)
-
-        remaining_limit = None if limit is None else max(0, limit - total_processed)
-        if remaining_limit is None or remaining_limit > 0:
-            total_processed += self._process_unit_word_relations(
-                dry_run, remaining_limit
-            )
+        limit = options["limit"]
+        started = time.perf_counter()
+        with process_pool(options["workers"]) as run:
+            for label, model in IMAGE_MODELS:
+                if limit is not None and limit <= 0:
+                    break
+                processed = self._process_model(run, label, model, limit)
+                if limit is not None:
+                    limit -= processed
+        elapsed = time.perf_counter() - started
+        if not self.dry_run and (limit is None or limit > 0):
+            self.progress_file.clear()
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"Conversion complete. Total processed: {total_processed}"
+                f"Conversion complete. Total processed: {self.totals['processed']}"
             )
         )
+        if not self.dry_run:
+            converted = self.totals["converted"]
+            self.stdout.write(
+                f"Converted {converted} images in {elapsed:.1f}s "
+                f"({converted / elapsed if elapsed else 0:.1f} images/s), "
+                f"saved {self.totals['saved'] / 1024 / 1024:.1f} MB. "
+                f"Created the missing sizes of {self.totals['resized']} WebP images, "
+                f"failed: {self.totals['failed']}"
+            )
 
-    def _process_words(self, dry_run: bool, limit: int | None) -> int:
-        """Process Word instances."""
-        self.stdout.write(self.style.NOTICE("Processing words..."))
-
-        queryset = (
-            Word.objects.filter(image__isnull=False)
-            .exclude(image="")
-            .exclude(image__endswith=".webp")
-        )
-
-        if limit is not None:
-            queryset = queryset[:limit]
-
-        processed_count = 0
-        for word in queryset:
-            logger.info("Processing word #%d: %s", word.pk, word.word)
-
-            if dry_run:
-                logger.info(
-                    "[DRY RUN] Would convert image for word: %s (%s)",
-                    word.word,
-                    word.image.name,
-                )
-                processed_count += 1
-            else:
-                if self._convert_image(word, label=f"word #{word.pk}: {word.word}"):
-                    processed_count += 1
-
-        logger.info("Finished processing words. Count: %d", processed_count)
-        return processed_count
-
-    def _process_unit_word_relations(self, dry_run: bool, limit: int | None) -> int:
-        """Process UnitWordRelation instances."""
-        self.stdout.write(self.style.NOTICE("Processing unit-word relations..."))
-
+    def _process_model(
+        self, run: Map, label: str, model: type[Model], limit: int | None
+    ) -> int:
+        """
+        Convert the images of a model in batches, ordered by primary key and
+        starting after the last one processed by a previous run.
+        """
+        self.stdout.write(self.style.NOTICE(f"Processing {label}..."))
         queryset = (
-            UnitWordRelation.objects.filter(image__isnull=False)
+            model._default_manager.filter(  # pylint: disable=protected-access
+                image__isnull=False
+            )
             .exclude(image="")
-            .exclude(image__endswith=".webp")
+            .order_by("pk")
+            .values_list("pk", "image")
         )
+        after = self.progress.get(label, 0)
+        processed = 0
+        while limit is None or processed < limit:
+            batch_size = self.batch_size
+            if limit is not None:
+                batch_size = min(batch_size, limit - processed)
+            batch = list(queryset.filter(pk__gt=after)[:batch_size])
+            if not batch:
+                break
+            after = batch[-1][0]
+            processed += len(batch)
+            self.totals["processed"] += len(batch)
+            if self.dry_run:
+                for pk, name in batch:
+                    logger.info(
+                        "[DRY RUN] Would convert image for %s #%d (%s)", label, pk, name
+                    )
+                continue
+            self._convert_batch(run, label, model, batch)
+            self.progress[label] = after
+            self.progress_file.save(self.progress)
+        logger.info("Finished processing %s. Count: %d", label, processed)
+        return processed
 
-        if limit is not None:
-            queryset = queryset[:limit]
-
-        processed_count = 0
-        for unitword in queryset:
-            word_text = unitword.word.word
-            unit_title = unitword.unit.title
-            logger.info(
-                "Processing unit-word #%d: %s in %s",
-                unitword.pk,
-                word_text,
-                unit_title,
-            )
-
-            if dry_run:
-                logger.info(
-                    "[DRY RUN] Would convert image for unit-word: %s in %s (%s)",
-                    word_text,
-                    unit_title,
-                    unitword.image.name,
+    def _convert_batch(
+        self, run: Map, label: str, model: type[Model], batch: list[tuple[int, str]]
+    ) -> None:
+        """
+        Convert a batch of images, point the items to the converted images and
+        delete the originals afterwards.
+        """
+        paths = local_paths(model, "image", [name for _pk, name in batch])
+        now = timezone.now()
+        converted: dict[str, Model] = {}
+        for (pk, name), path, result in zip(batch, paths, run(convert_file, paths)):
+            self.totals[result.outcome] += 1
+            self.totals["saved"] += result.saved
+            if result.outcome == "failed":
+                logger.error(
+                    "Error converting image for %s #%d: %s", label, pk, result.error
                 )
-                processed_count += 1
-            else:
-                if self._convert_image(
-                    unitword,
-                    label=f"unit-word #{unitword.pk}: {word_text} in {unit_title}",
-                ):
-                    processed_count += 1
-
-        logger.info(
-            "Finished processing unit-word relations. Count: %d", processed_count
-        )
-        return processed_count
+            elif result.outcome == "converted":
+                converted[path] = model(pk=pk, image=webp_name(name), modified_at=now)
+        if converted:
+            self._replace_images(model, converted)
 
-    def _convert_image(self, instance: Word | UnitWordRelation, label: str) -> bool:
+    @staticmethod
+    def _replace_images(model: type[Model], converted: dict[str, Model]) -> None:
         """
-        Convert the image of a Word or UnitWordRelation instance to WebP.
-
-        Args:
-            instance: The Word or UnitWordRelation instance to process.
-            label: A human-readable label for logging.
-
-        Returns:
-            bool: True if successful, False otherwise.
+        Point the items to their converted images, delete the original images
+        and bump the content versions of the jobs of the items.
         """
-        try:
-            if convert_image_to_webp(instance.image):
-                instance.save(update_fields=["image"])
-                logger.info("Successfully converted image for %s", label)
-                return True
-            logger.warning("Image already WebP or skipped for %s", label)
-            return False
-        except (OSError, ValueError) as e:
-            logger.error("Error converting image for %s: %s", label, e)
-            return False
+        model._default_manager.bulk_update(  # pylint: disable=protected-access
+            converted.values(), ["image", "modified_at"]
+        )
+        for path in converted:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        pks = [item.pk for item in converted.values()]
+        if model is Word:
+            bump_content_version(job_ids_of_words(pks))
+        else:
+            bump_content_version(
+                job_ids_of_units(
+                    UnitWordRelation.objects.filter(pk__in=pks).values_list(
+                        "unit_id", flat=True
+                    )
+                )
+            )
@@ -0,0 +1,47 @@
+"""
+Management command to remove the tombstones the API's change feed doesn't need anymore.
+
+The change feed rejects cursors older than ``CHANGES_RETENTION_DAYS``, so
+tombstones of deletions before that are never read again.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from lunes_cms.cmsv2.models import Tombstone
+
+
+class Command(BaseCommand):
+    """Management command to remove expired tombstones."""
+
+    help = "Remove the tombstones of deletions older than the retention of the change feed."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the expired tombstones without removing them",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        expired = Tombstone.objects.filter(
+            deleted_at__lt=timezone.now()
+            - timedelta(days=settings.CHANGES_RETENTION_DAYS)
+        )
+        if options["dry_run"]:
+            self.stdout.write(f"{expired.count()} tombstones would be removed.")
+            return
+
+        removed_count, _ = expired.delete()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Removed {removed_count} tombstones older than "
+                f"{settings.CHANGES_RETENTION_DAYS} days."
+            )
+        )
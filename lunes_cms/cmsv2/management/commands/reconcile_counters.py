@@ -0,0 +1,84 @@
+"""
+Management command to recount the public words of all units and the released units of all jobs.
+
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import Count, F, Q
+
+from lunes_cms.cmsv2.content_version import bump_content_version
+from lunes_cms.cmsv2.models import Job, Unit
+from lunes_cms.cmsv2.models.unit import update_number_units, update_number_words
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Management command to repair the counters of units and jobs."""
+
+    help = (
+        "Recount the public words of all units and the released units of all jobs "
+        "and report the counters that drifted."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only show which counters drifted without repairing them",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        dry_run = options["dry_run"]
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING("DRY RUN MODE - No changes will be made")
+            )
+
+        drifted_units = (
+            Unit.objects.annotate(
+                count=Count(
+                    "unit_word_relations",
+                    filter=Q(unit_word_relations__is_public=True),
+                )
+            )
+            .exclude(number_words=F("count"))
+            .order_by("pk")
+        )
+        drifted_jobs = (
+            Job.objects.annotate(count=Count("units", filter=Q(units__released=True)))
+            .exclude(number_units=F("count"))
+            .order_by("pk")
+        )
+        unit_ids = []
+        for unit in drifted_units:
+            self.stdout.write(
+                f"Unit #{unit.pk}: {unit.number_words} -> {unit.count} words"
+            )
+            unit_ids.append(unit.pk)
+        job_ids = []
+        for job in drifted_jobs:
+            self.stdout.write(f"Job #{job.pk}: {job.number_units} -> {job.count} units")
+            job_ids.append(job.pk)
+
+        if not dry_run and (unit_ids or job_ids):
+            update_number_words(Unit.objects.filter(pk__in=unit_ids))
+            update_number_units(Job.objects.filter(pk__in=job_ids))
+            logger.info(
+                "Repaired the counters of %d unit(s) and %d job(s)",
+                len(unit_ids),
+                len(job_ids),
+            )
+            bump_content_version(Job.objects.values_list("pk", flat=True))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. {len(unit_ids)} unit(s) and {len(job_ids)} job(s) "
+                "had drifted counters."
+            )
+        )
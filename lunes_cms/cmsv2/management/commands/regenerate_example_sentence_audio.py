@@ -18,6 +18,7 @@ from django.core.management.base import BaseCommand, CommandParser
 
 from lunes_cms.cmsv2.models import Word
 from lunes_cms.cmsv2.models.unit import UnitWordRelation
+from lunes_cms.cmsv2.services import tts_cache
 from lunes_cms.cmsv2.services.audio_generation import openai_sentence_audio_bytes
 from lunes_cms.cmsv2.utils import OpenAIConfigurationError
 
@@ -73,9 +74,12 @@ class Command(BaseCommand):
                 delay, dry_run, remaining_limit
             )
 
+        cache_stats = tts_cache.stats()
         self.stdout.write(
             self.style.SUCCESS(
-                f"Regeneration complete. Total processed: {total_processed}"
+                f"Regeneration complete. Total processed: {total_processed} "
+                f"(TTS cache: {cache_stats['hits']} hits, "
+                f"{cache_stats['misses']} misses)"
             )
         )
 
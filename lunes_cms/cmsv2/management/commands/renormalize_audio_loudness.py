@@ -0,0 +1,273 @@
+"""
+Management command to normalize existing audio to the configured loudness.
+
+Generated audio is normalized to ``OPENAI_TTS_LOUDNESS_LUFS`` when it is
+created. After changing the target, this command brings the existing word
+audio and example sentence audio of words and unit-word relations to the new
+target. The files are normalized in parallel processes and replaced atomically
+under their current name, so the database only needs a bumped ``modified_at``
+(which invalidates the API caches).
+
+The last processed item is stored in a progress file after every batch, so an
+interrupted run continues where it stopped when started again with the same
+target. The file is removed once all files were processed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+from itertools import repeat
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import Model
+from django.utils import timezone
+
+from lunes_cms.cmsv2.content_version import (
+    bump_content_version,
+    job_ids_of_units,
+    job_ids_of_words,
+)
+from lunes_cms.cmsv2.management.batch import (
+    local_paths,
+    Map,
+    process_pool,
+    ProgressFile,
+)
+from lunes_cms.cmsv2.models import Word
+from lunes_cms.cmsv2.models.unit import UnitWordRelation
+from lunes_cms.core.audio import normalize_loudness, read_loudness_tag
+
+logger = logging.getLogger(__name__)
+
+#: The audio files to normalize: a label (also the key in the progress file),
+#: the model and the name of the file field
+AUDIO_FIELDS: list[tuple[str, type[Model], str]] = [
+    ("word audio", Word, "audio"),
+    ("word example sentence audio", Word, "example_sentence_audio"),
+    ("unit-word example sentence audio", UnitWordRelation, "example_sentence_audio"),
+]
+
+#: Loudness difference in LU below which a file already counts as normalized
+TOLERANCE = 0.1
+
+
+def renormalize_file(path: str, target_lufs: float) -> tuple[str, str]:
+    """
+    Normalize an audio file in place.
+
+    The normalized audio is written to a temporary file next to the original,
+    which is then renamed over it, so readers never see a partially written
+    file. Runs in a worker process.
+
+    Args:
+        path: The path of the mp3 file
+        target_lufs: The loudness to normalize to
+
+    Returns:
+        tuple[str, str]: The outcome (``normalized``, ``skipped`` or ``failed``)
+        and the error, if the normalization failed
+    """
+    try:
+        audio_bytes = Path(path).read_bytes()
+        measured = read_loudness_tag(audio_bytes)
+        if measured and abs(float(measured["input_i"]) - target_lufs) < TOLERANCE:
+            return "skipped", ""
+        normalized = normalize_loudness(audio_bytes, target_lufs)
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path), suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(normalized)
+        try:
+            shutil.copymode(path, tmp.name)
+            os.replace(tmp.name, path)
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+    except (OSError, ValidationError) as e:
+        return "failed", str(e)
+    return "normalized", ""
+
+
+class Command(BaseCommand):
+    """Management command to normalize existing audio to the configured loudness."""
+
+    help = (
+        "Normalize the existing word and example sentence audio to the loudness "
+        "configured in OPENAI_TTS_LOUDNESS_LUFS (resumable)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--target",
+            type=float,
+            default=settings.OPENAI_TTS_LOUDNESS_LUFS,
+            help="Loudness in LUFS to normalize to (default: OPENAI_TTS_LOUDNESS_LUFS)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes (default: number of CPU cores)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of files loaded and normalized at once (default: 100)",
+        )
+        parser.add_argument(
+            "--progress-file",
+            default=os.path.join(settings.BASE_DIR, "renormalize_audio_loudness.json"),
+            help="File storing the progress of the run (default: in the BASE_DIR)",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore the progress of a previous run and start from the beginning",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only show which files would be processed without normalizing them",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of files to process (default: no limit)",
+        )
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.target = 0.0
+        self.dry_run = False
+        self.batch_size = 0
+        self.progress_file = ProgressFile("")
+        self.progress: dict[str, Any] = {}
+        self.totals: dict[str, int] = {}
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["workers"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--workers and --batch-size must be at least 1.")
+        self.target = options["target"]
+        self.dry_run = options["dry_run"]
+        self.batch_size = options["batch_size"]
+        self.progress_file = ProgressFile(options["progress_file"])
+        self.progress = {} if options["restart"] else self.progress_file.load()
+        if self.progress.get("target") != self.target:
+            self.progress = {"target": self.target}
+        self.totals = {"normalized": 0, "skipped": 0, "failed": 0}
+
+        self.stdout.write(
+            self.style.NOTICE(f"Normalizing existing audio to {self.target} LUFS...")
+        )
+        if self.dry_run:
+            self.stdout.write(
+                self.style.WARNING("DRY RUN MODE - No changes will be made")
+            )
+
+        limit = options["limit"]
+        with process_pool(options["workers"]) as run:
+            for label, model, field in AUDIO_FIELDS:
+                if limit is not None and limit <= 0:
+                    break
+                processed = self._process_field(run, label, model, field, limit)
+                if limit is not None:
+                    limit -= processed
+        if not self.dry_run and (limit is None or limit > 0):
+            self.progress_file.clear()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Normalization complete. Normalized: {self.totals['normalized']}, "
+                f"already normalized: {self.totals['skipped']}, "
+                f"failed: {self.totals['failed']}"
+            )
+        )
+
+    def _process_field(
+        self,
+        run: Map,
+        label: str,
+        model: type[Model],
+        field: str,
+        limit: int | None,
+    ) -> int:
+        """
+        Normalize the audio files of a field in batches, ordered by primary key
+        and starting after the last one processed by a previous run.
+        """
+        self.stdout.write(self.style.NOTICE(f"Processing {label}..."))
+        manager = model._default_manager  # pylint: disable=protected-access
+        queryset = (
+            manager.exclude(**{field: ""})
+            .exclude(**{f"{field}__isnull": True})
+            .order_by("pk")
+            .values_list("pk", field)
+        )
+        after = self.progress.get(label, 0)
+        processed = 0
+        while limit is None or processed < limit:
+            batch_size = self.batch_size
+            if limit is not None:
+                batch_size = min(batch_size, limit - processed)
+            batch = list(queryset.filter(pk__gt=after)[:batch_size])
+            if not batch:
+                break
+            after = batch[-1][0]
+            processed += len(batch)
+            if self.dry_run:
+                for pk, name in batch:
+                    logger.info("[DRY RUN] Would normalize %s #%d: %s", label, pk, name)
+                continue
+            self._normalize_batch(run, label, model, field, batch)
+            self.progress[label] = after
+            self.progress_file.save(self.progress)
+        logger.info("Finished processing %s. Count: %d", label, processed)
+        return processed
+
+    def _normalize_batch(
+        self,
+        run: Map,
+        label: str,
+        model: type[Model],
+        field: str,
+        batch: list[tuple[int, str]],
+    ) -> None:
+        """
+        Normalize a batch of files, bump ``modified_at`` of the changed items
+        and the content versions of their jobs.
+        """
+        paths = local_paths(model, field, [name for _pk, name in batch])
+        changed = []
+        for (pk, name), (outcome, error) in zip(
+            batch, run(renormalize_file, paths, repeat(self.target))
+        ):
+            self.totals[outcome] += 1
+            if outcome == "normalized":
+                changed.append(pk)
+            elif outcome == "failed":
+                logger.error(
+                    "Could not normalize %s #%d (%s): %s", label, pk, name, error
+                )
+        if not changed:
+            return
+        changed_items = (
+            model._default_manager.filter(  # pylint: disable=protected-access
+                pk__in=changed
+            )
+        )
+        changed_items.update(modified_at=timezone.now())
+        if model is Word:
+            bump_content_version(job_ids_of_words(changed))
+        else:
+            bump_content_version(
+                job_ids_of_units(changed_items.values_list("unit_id", flat=True))
+            )
@@ -0,0 +1,69 @@
+"""
+Management command to process the queue of background generation tasks.
+
+Run it as a long-running service next to the web application (e.g. a systemd
+unit). It may run on several nodes at once, the workers never process the same
+task at the same time. On ``SIGTERM`` or ``SIGINT``, the worker finishes the
+tasks in progress and exits.
+"""
+
+from __future__ import annotations
+
+import signal
+from types import FrameType
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from lunes_cms.cmsv2.models import GenerationTask
+from lunes_cms.cmsv2.services.generation_queue import GenerationWorker
+
+
+class Command(BaseCommand):
+    """Management command to process the queue of background generation tasks."""
+
+    help = "Generate the example sentences, audio and images queued by CSV imports."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--kind",
+            action="append",
+            choices=GenerationTask.Kind.values,
+            help="Only process tasks of this kind (can be given multiple times, default: all)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait for new tasks when the queue is empty (default: 5.0)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no task is claimable anymore instead of waiting for new tasks",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        worker = GenerationWorker(
+            kinds=options["kind"],
+            poll_interval=options["poll_interval"],
+            exit_when_idle=options["once"],
+        )
+
+        def stop(signum: int, _frame: FrameType | None) -> None:
+            self.stdout.write(
+                f"Received {signal.Signals(signum).name}, finishing the tasks in progress..."
+            )
+            worker.stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(
+            self.style.NOTICE(
+                f"Generation worker {worker.owner} started "
+                f"({', '.join(worker.kinds)})."
+            )
+        )
+        worker.run()
+        self.stdout.write(self.style.SUCCESS("Generation worker stopped."))
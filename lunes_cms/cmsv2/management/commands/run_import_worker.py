@@ -0,0 +1,56 @@
+"""
+Management command to import the CSV files queued for the background import.
+
+Run it as a long-running service next to the web application (e.g. a systemd
+unit). It may run on several nodes at once, the workers never import the same
+file at the same time. On ``SIGTERM`` or ``SIGINT``, the worker finishes the
+chunk in progress and exits. The next worker continues the import.
+"""
+
+from __future__ import annotations
+
+import signal
+from types import FrameType
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from lunes_cms.cmsv2.services.csv_import_queue import ImportWorker
+
+
+class Command(BaseCommand):
+    """Management command to import the CSV files queued for the background import."""
+
+    help = "Import the large CSV files uploaded in the admin."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait for new imports when the queue is empty (default: 5.0)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no import is pending anymore instead of waiting for new imports",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        worker = ImportWorker(
+            poll_interval=options["poll_interval"],
+            exit_when_idle=options["once"],
+        )
+
+        def stop(signum: int, _frame: FrameType | None) -> None:
+            self.stdout.write(
+                f"Received {signal.Signals(signum).name}, finishing the chunk in progress..."
+            )
+            worker.stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(self.style.NOTICE(f"Import worker {worker.owner} started."))
+        worker.run()
+        self.stdout.write(self.style.SUCCESS("Import worker stopped."))
@@ -0,0 +1,60 @@
+"""
+Management command to recompute the public flag of all unit word relations.
+
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from lunes_cms.cmsv2.content_version import bump_content_version
+from lunes_cms.cmsv2.models import Job
+from lunes_cms.cmsv2.models.unit import (
+    PUBLIC_RELATION_FILTER,
+    UnitWordRelation,
+    update_public_flags,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Management command to recompute the public flag of all unit word relations."""
+
+    help = (
+        "Recompute the public flag of all unit word relations, e.g. after check "
+        "statuses were changed directly in the database."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only show how many relations are out of sync without updating them",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        relations = UnitWordRelation.objects.all()
+
+        if options["dry_run"]:
+            out_of_sync = (
+                relations.filter(PUBLIC_RELATION_FILTER, is_public=False).count()
+                + relations.exclude(PUBLIC_RELATION_FILTER)
+                .filter(is_public=True)
+                .count()
+            )
+            self.stdout.write(
+                self.style.WARNING(
+                    f"DRY RUN MODE - {out_of_sync} relation(s) are out of sync"
+                )
+            )
+            return
+
+        updated = update_public_flags(relations)
+        if updated:
+            logger.info("Updated the public flag of %d relation(s)", updated)
+            bump_content_version(Job.objects.values_list("pk", flat=True))
+        self.stdout.write(self.style.SUCCESS(f"Done. Updated {updated} relation(s)."))
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.16 on 2026-10-18 11:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Add tombstones of deleted content and the modification date of unit-word relations."""
+
+    dependencies = [
+        ("cmsv2", "0029_backfill_null_check_status"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="unitwordrelation",
+            name="modified_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="modified at"),
+        ),
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.PositiveIntegerField(
+                        help_text="The id of the deleted object. For unit word relations, this is the id of the word.",
+                        verbose_name="object id",
+                    ),
+                ),
+                (
+                    "parent_id",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="For unit word relations, the id of the unit.",
+                        null=True,
+                        verbose_name="parent id",
+                    ),
+                ),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="deleted at"
+                    ),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        help_text="The content type of the deleted object.",
+                        limit_choices_to=models.Q(
+                            ("app_label", "cmsv2"),
+                            ("model__in", ["job", "unit", "word", "unitwordrelation"]),
+                        ),
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                        verbose_name="content type",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Tombstone",
+                "verbose_name_plural": "Tombstones",
+            },
+        ),
+    ]
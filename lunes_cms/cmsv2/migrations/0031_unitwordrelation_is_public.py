@@ -0,0 +1,53 @@
+# Generated by Django 5.2.16 on 2026-10-18 11:13
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+# pylint: disable=unused-argument
+def backfill_is_public(apps, schema_editor):
+    """
+    Publish all unit word relations whose word has a confirmed audio and which
+    have a confirmed image, either their own or the default image of the word.
+
+    :param apps: The configuration of installed applications
+    :type apps: ~django.apps.registry.Apps
+
+    :param schema_editor: The database abstraction layer that creates actual SQL code
+    :type schema_editor: ~django.db.backends.base.schema.BaseDatabaseSchemaEditor
+    """
+    UnitWordRelation = apps.get_model("cmsv2", "UnitWordRelation")
+    UnitWordRelation.objects.filter(word__audio_check_status="CONFIRMED").filter(
+        Q(image_check_status="CONFIRMED")
+        | Q(image="", word__image_check_status="CONFIRMED")
+    ).update(is_public=True)
+
+
+class Migration(migrations.Migration):
+    """
+    Migration file to add the denormalized public flag to unit word relations.
+    """
+
+    dependencies = [
+        ("cmsv2", "0030_tombstone_unitwordrelation_modified_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="unitwordrelation",
+            name="is_public",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Whether the word is published in this unit. This is kept in sync with the check statuses of the relation and its word.",
+                verbose_name="public",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="unitwordrelation",
+            index=models.Index(
+                fields=["unit", "is_public"], name="cmsv2_unitw_unit_id_d5ace1_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_is_public, migrations.RunPython.noop),
+    ]
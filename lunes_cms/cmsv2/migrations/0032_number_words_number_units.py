@@ -0,0 +1,81 @@
+# Generated by Django 5.2.16 on 2026-10-18 11:22
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# pylint: disable=unused-argument
+def count_words_and_units(apps, schema_editor):
+    """
+    Initialize the number of public words of all units and the number of
+    released units of all jobs.
+
+    :param apps: The configuration of installed applications
+    :type apps: ~django.apps.registry.Apps
+
+    :param schema_editor: The database abstraction layer that creates actual SQL code
+    :type schema_editor: ~django.db.backends.base.schema.BaseDatabaseSchemaEditor
+    """
+    Job = apps.get_model("cmsv2", "Job")
+    Unit = apps.get_model("cmsv2", "Unit")
+    UnitWordRelation = apps.get_model("cmsv2", "UnitWordRelation")
+
+    Unit.objects.update(
+        number_words=Coalesce(
+            Subquery(
+                UnitWordRelation.objects.filter(unit=OuterRef("pk"), is_public=True)
+                .values("unit")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+    Job.objects.update(
+        number_units=Coalesce(
+            Subquery(
+                Unit.jobs.through.objects.filter(
+                    job_id=OuterRef("pk"), unit__released=True
+                )
+                .values("job_id")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Migration file to add the counters of public words and released units.
+    """
+
+    dependencies = [
+        ("cmsv2", "0031_unitwordrelation_is_public"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="number_units",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="The number of released units, which is kept up to date automatically.",
+                verbose_name="number of units",
+            ),
+        ),
+        migrations.AddField(
+            model_name="unit",
+            name="number_words",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="The number of public words, which is kept up to date automatically.",
+                verbose_name="number of words",
+            ),
+        ),
+        migrations.RunPython(count_words_and_units, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,136 @@
+# Generated by Django 5.2.16 on 2026-10-18 12:28
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Migration file to add the queue of background generation tasks.
+    """
+
+    dependencies = [
+        ("cmsv2", "0032_number_words_number_units"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GenerationTask",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("sentence", "Example sentence"),
+                            ("audio", "Audio"),
+                            ("image", "Image"),
+                        ],
+                        max_length=20,
+                        verbose_name="kind",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(default=0, verbose_name="attempts"),
+                ),
+                (
+                    "next_run_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="The task is not processed before this time.",
+                        verbose_name="next run at",
+                    ),
+                ),
+                (
+                    "lease_owner",
+                    models.CharField(
+                        blank=True,
+                        help_text="The worker which processes the task.",
+                        max_length=255,
+                        verbose_name="lease owner",
+                    ),
+                ),
+                (
+                    "lease_expires_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="If the worker didn't finish the task until then, another worker may take it over.",
+                        null=True,
+                        verbose_name="lease expires at",
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True, verbose_name="last error")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created at"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="finished at"
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="The job providing the context for generated sentences and images.",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="generation_tasks",
+                        to="cmsv2.job",
+                        verbose_name="job",
+                    ),
+                ),
+                (
+                    "word",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="generation_tasks",
+                        to="cmsv2.word",
+                        verbose_name="word",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Generation task",
+                "verbose_name_plural": "Generation tasks",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "kind", "next_run_at"],
+                        name="cmsv2_gener_status_b23f9e_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("status", "pending")),
+                        fields=("word", "kind"),
+                        name="unique_pending_generation_task",
+                    )
+                ],
+            },
+        ),
+    ]
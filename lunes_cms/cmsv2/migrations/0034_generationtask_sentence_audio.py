@@ -0,0 +1,56 @@
+# Generated by Django 5.2.16 on 2026-10-18 12:39
+
+from django.db import migrations, models
+
+
+# pylint: disable=unused-argument
+def split_pending_audio_tasks(apps, schema_editor):
+    """
+    Audio tasks used to generate the example sentence audio as well, so add an
+    example sentence audio task for every pending audio task.
+
+    :param apps: The configuration of installed applications
+    :type apps: ~django.apps.registry.Apps
+
+    :param schema_editor: The database abstraction layer that creates actual SQL code
+    :type schema_editor: ~django.db.backends.base.schema.BaseDatabaseSchemaEditor
+    """
+    GenerationTask = apps.get_model("cmsv2", "GenerationTask")
+    GenerationTask.objects.bulk_create(
+        [
+            GenerationTask(
+                word_id=task.word_id, job_id=task.job_id, kind="sentence_audio"
+            )
+            for task in GenerationTask.objects.filter(kind="audio", status="pending")
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Migration file to split the audio generation tasks into word audio and
+    example sentence audio tasks.
+    """
+
+    dependencies = [
+        ("cmsv2", "0033_generationtask"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="generationtask",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("sentence", "Example sentence"),
+                    ("audio", "Word audio"),
+                    ("sentence_audio", "Example sentence audio"),
+                    ("image", "Image"),
+                ],
+                max_length=20,
+                verbose_name="kind",
+            ),
+        ),
+        migrations.RunPython(split_pending_audio_tasks, migrations.RunPython.noop),
+    ]
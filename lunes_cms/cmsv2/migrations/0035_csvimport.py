@@ -0,0 +1,160 @@
+# Generated by Django 5.2.16 on 2026-10-18 13:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import lunes_cms.cmsv2.models.csv_import
+
+
+class Migration(migrations.Migration):
+    """Add the CSVImport model for imports in the background."""
+
+    dependencies = [
+        ("cmsv2", "0034_generationtask_sentence_audio"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CSVImport",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        upload_to=lunes_cms.cmsv2.models.csv_import.csv_import_path,
+                        verbose_name="file",
+                    ),
+                ),
+                (
+                    "file_size",
+                    models.PositiveBigIntegerField(default=0, verbose_name="file size"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "bytes_processed",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="bytes processed"
+                    ),
+                ),
+                (
+                    "rows_processed",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="rows processed"
+                    ),
+                ),
+                (
+                    "words_created",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="words created"
+                    ),
+                ),
+                (
+                    "units_created",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="units created"
+                    ),
+                ),
+                (
+                    "units",
+                    models.JSONField(
+                        default=dict,
+                        help_text="The ids of the units created by the import, by title.",
+                        verbose_name="units",
+                    ),
+                ),
+                (
+                    "errors",
+                    models.JSONField(
+                        default=list,
+                        help_text="The first errors of rows which couldn't be imported.",
+                        verbose_name="errors",
+                    ),
+                ),
+                (
+                    "error_count",
+                    models.PositiveIntegerField(default=0, verbose_name="errors"),
+                ),
+                (
+                    "lease_owner",
+                    models.CharField(
+                        blank=True,
+                        help_text="The worker which processes the import.",
+                        max_length=255,
+                        verbose_name="lease owner",
+                    ),
+                ),
+                (
+                    "lease_expires_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="If the worker didn't import the next chunk until then, another worker may take it over.",
+                        null=True,
+                        verbose_name="lease expires at",
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True, verbose_name="last error")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created at"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="finished at"
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="csv_imports",
+                        to="cmsv2.job",
+                        verbose_name="job",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="csv_imports",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "CSV import",
+                "verbose_name_plural": "CSV imports",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "created_at"],
+                        name="cmsv2_csvim_status_e9ba29_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,7 +1,10 @@
 from .alternative_word import AlternativeWord
+from .csv_import import CSVImport
 from .feedback import Feedback
+from .generation_task import GenerationTask
 from .job import Job
 from .review import ImageReview, ReviewAssignment
 from .static import GrammaticalGenders, PluralArticle, SingularArticle, WordType
+from .tombstone import Tombstone
 from .unit import Unit, UnitWordRelation
 from .word import Word
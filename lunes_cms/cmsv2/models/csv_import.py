@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+def csv_import_path(_instance: CSVImport, _filename: str) -> str:
+    """
+    Stores uploaded CSV files under a random name, so they can't be guessed
+    from the media URL.
+    """
+    return f"csv_imports/{uuid.uuid4().hex}.csv"
+
+
+class CSVImport(models.Model):
+    """
+    A CSV file of vocabulary imported in the background by the
+    ``run_import_worker`` command.
+
+    The file is imported in chunks. The counters are updated after every
+    chunk, so they show the progress of the import, and an interrupted
+    import continues after the last imported row.
+    """
+
+    class Status(models.TextChoices):
+        """The states of an import"""
+
+        PENDING = "pending", _("Pending")
+        DONE = "done", _("Done")
+        FAILED = "failed", _("Failed")
+
+    job = models.ForeignKey(
+        "Job",
+        on_delete=models.CASCADE,
+        related_name="csv_imports",
+        verbose_name=_("job"),
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="csv_imports",
+        verbose_name=_("user"),
+    )
+    file = models.FileField(upload_to=csv_import_path, verbose_name=_("file"))
+    file_size = models.PositiveBigIntegerField(default=0, verbose_name=_("file size"))
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_("status"),
+    )
+    bytes_processed = models.PositiveBigIntegerField(
+        default=0, verbose_name=_("bytes processed")
+    )
+    rows_processed = models.PositiveIntegerField(
+        default=0, verbose_name=_("rows processed")
+    )
+    words_created = models.PositiveIntegerField(
+        default=0, verbose_name=_("words created")
+    )
+    units_created = models.PositiveIntegerField(
+        default=0, verbose_name=_("units created")
+    )
+    units = models.JSONField(
+        default=dict,
+        verbose_name=_("units"),
+        help_text=_("The ids of the units created by the import, by title."),
+    )
+    errors = models.JSONField(
+        default=list,
+        verbose_name=_("errors"),
+        help_text=_("The first errors of rows which couldn't be imported."),
+    )
+    error_count = models.PositiveIntegerField(default=0, verbose_name=_("errors"))
+    lease_owner = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_("lease owner"),
+        help_text=_("The worker which processes the import."),
+    )
+    lease_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("lease expires at"),
+        help_text=_(
+            "If the worker didn't import the next chunk until then, another worker may take it over."
+        ),
+    )
+    last_error = models.TextField(blank=True, verbose_name=_("last error"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("created at"))
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("finished at")
+    )
+
+    @property
+    def progress(self) -> int:
+        """
+        Returns:
+            int: The percentage of the file which is imported
+        """
+        if self.status != self.Status.PENDING:
+            return 100
+        if not self.file_size:
+            return 0
+        return min(round(100 * self.bytes_processed / self.file_size), 99)
+
+    def __str__(self) -> str:
+        """
+        Returns:
+            str: The name of the file and the job
+        """
+        return f"{self.file.name} ({self.job})"
+
+    class Meta:
+        """
+        Meta options for the CSVImport model.
+        """
+
+        indexes = [models.Index(fields=["status", "created_at"])]
+        verbose_name = _("CSV import")
+        verbose_name_plural = _("CSV imports")
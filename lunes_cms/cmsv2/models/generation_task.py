@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class GenerationTask(models.Model):
+    """
+    Background generation of an asset of a word, processed by the
+    ``run_generation_worker`` command.
+
+    Finished tasks are kept, so the admin can show the progress of an import.
+    """
+
+    class Kind(models.TextChoices):
+        """The kinds of generated assets"""
+
+        SENTENCE = "sentence", _("Example sentence")
+        AUDIO = "audio", _("Word audio")
+        SENTENCE_AUDIO = "sentence_audio", _("Example sentence audio")
+        IMAGE = "image", _("Image")
+
+    class Status(models.TextChoices):
+        """The states of a task"""
+
+        PENDING = "pending", _("Pending")
+        DONE = "done", _("Done")
+        FAILED = "failed", _("Failed")
+
+    word = models.ForeignKey(
+        "Word",
+        on_delete=models.CASCADE,
+        related_name="generation_tasks",
+        verbose_name=_("word"),
+    )
+    job = models.ForeignKey(
+        "Job",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="generation_tasks",
+        verbose_name=_("job"),
+        help_text=_(
+            "The job providing the context for generated sentences and images."
+        ),
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices, verbose_name=_("kind"))
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_("status"),
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name=_("attempts"))
+    next_run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_("next run at"),
+        help_text=_("The task is not processed before this time."),
+    )
+    lease_owner = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_("lease owner"),
+        help_text=_("The worker which processes the task."),
+    )
+    lease_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("lease expires at"),
+        help_text=_(
+            "If the worker didn't finish the task until then, another worker may take it over."
+        ),
+    )
+    last_error = models.TextField(blank=True, verbose_name=_("last error"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("created at"))
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("finished at")
+    )
+
+    def __str__(self) -> str:
+        """
+        Returns:
+            str: The kind of the task and the word
+        """
+        return f"{self.get_kind_display()}: {self.word}"
+
+    class Meta:
+        """
+        Meta options for the GenerationTask model.
+        """
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["word", "kind"],
+                condition=models.Q(status="pending"),
+                name="unique_pending_generation_task",
+            )
+        ]
+        indexes = [models.Index(fields=["status", "kind", "next_run_at"])]
+        verbose_name = _("Generation task")
+        verbose_name_plural = _("Generation tasks")
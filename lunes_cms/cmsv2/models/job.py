@@ -51,6 +51,14 @@ class Job(models.Model):
         verbose_name=_("creator"),
         related_name="created_jobs",
     )
+    number_units = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("number of units"),
+        help_text=_(
+            "The number of released units, which is kept up to date automatically."
+        ),
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("created at"))
     modified_at = models.DateTimeField(auto_now=True, verbose_name=_("modified at"))
 
@@ -11,7 +11,12 @@ from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 from PIL import Image
 
-from ..utils import create_resource_path, make_safe_filename
+from ..utils import (
+    create_resource_path,
+    image_derivative_name,
+    IMAGE_SIZES,
+    make_safe_filename,
+)
 
 
 class SingularArticle(models.IntegerChoices):
@@ -102,6 +107,7 @@ class Permissions:
         "change_unitwordrelation",
         "delete_unitwordrelation",
         "view_unitwordrelation",
+        "view_generationtask",
     ]
     REVIEW_PERMISSIONS = [
         "add_imagereview",
@@ -115,12 +121,50 @@ class Permissions:
     ]
 
 
+#: Quality of images converted to WebP
+WEBP_QUALITY = 85
+
+
+def save_image_derivatives(img: Image.Image, path: str) -> None:
+    """
+    Saves the downscaled copies of an image next to it, see
+    :data:`~lunes_cms.cmsv2.utils.IMAGE_SIZES`.
+
+    :param img: The opened image
+    :type img: PIL.Image.Image
+    :param path: The path of the image
+    :type path: str
+    """
+    for size in IMAGE_SIZES:
+        derivative = img.copy()
+        derivative.thumbnail((size, size))
+        derivative.save(
+            image_derivative_name(path, size), format="WEBP", quality=WEBP_QUALITY
+        )
+
+
+def encode_webp(source_path: str, target_path: str) -> None:
+    """
+    Encodes an image file as WebP, including its downscaled copies.
+
+    :param source_path: The path of the image to convert
+    :type source_path: str
+    :param target_path: The path to write the WebP image to
+    :type target_path: str
+    """
+    with Image.open(source_path) as img:
+        img.save(target_path, format="WEBP", quality=WEBP_QUALITY)
+        save_image_derivatives(img, target_path)
+
+
 def convert_image_to_webp(image_field: ImageFieldFile) -> bool:
     """
     Converts an ImageField's file to WebP format in-place.
 
     Opens the existing file, saves it as WebP with quality=85, removes the
     original file if the extension changed, and updates image_field.name.
+    The downscaled copies of the image are (re)created as well, also for
+    images which already are WebP.
 
     :param image_field: An ImageField (FieldFile) whose file is already saved to disk.
     :type image_field: django.db.models.fields.files.FieldFile
@@ -140,10 +184,11 @@ def convert_image_to_webp(image_field: ImageFieldFile) -> bool:
     new_name = os.path.splitext(old_name)[0] + ".webp"
 
     if old_path == new_path:
+        with Image.open(old_path) as img:
+            save_image_derivatives(img, old_path)
         return False
 
-    img = Image.open(old_path)
-    img.save(new_path, format="WEBP", quality=85)
+    encode_webp(old_path, new_path)
     os.remove(old_path)
     image_field.name = new_name
     return True
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted job, unit, word or unit word relation.
+
+    Deleted objects leave no ``modified_at`` behind, so the API's change feed
+    reads their deletion from these records instead.
+    """
+
+    content_type = models.ForeignKey(
+        ContentType,
+        limit_choices_to=models.Q(
+            app_label="cmsv2",
+            model__in=["job", "unit", "word", "unitwordrelation"],
+        ),
+        on_delete=models.CASCADE,
+        verbose_name=_("content type"),
+        help_text=_("The content type of the deleted object."),
+    )
+    object_id = models.PositiveIntegerField(
+        verbose_name=_("object id"),
+        help_text=_(
+            "The id of the deleted object. For unit word relations, this is the id of the word."
+        ),
+    )
+    parent_id = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name=_("parent id"),
+        help_text=_("For unit word relations, the id of the unit."),
+    )
+    deleted_at = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name=_("deleted at")
+    )
+
+    def __str__(self) -> str:
+        """
+        Returns:
+            str: The content type and id of the deleted object
+        """
+        return f"{self.content_type.model} #{self.object_id}"
+
+    class Meta:
+        """
+        Meta options for the Tombstone model.
+        """
+
+        verbose_name = _("Tombstone")
+        verbose_name_plural = _("Tombstones")
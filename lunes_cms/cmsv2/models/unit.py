@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, TYPE_CHECKING
+from typing import Any, Iterable, TYPE_CHECKING
 
 from django.conf import settings as django_settings
 from django.contrib.auth.models import Group
 from django.db import models
+from django.db.models import Count, OuterRef, Q, QuerySet, Subquery
 from django.db.models.fields.files import ImageFieldFile
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils.html import escape, format_html
 from django.utils.safestring import mark_safe, SafeString
@@ -32,6 +34,86 @@ if TYPE_CHECKING:
     from django.utils.functional import _StrPromise
 
 
+#: Filter for the unit word relations whose word has a confirmed audio and
+#: which have a confirmed image, either their own or the default image of the word
+PUBLIC_RELATION_FILTER = Q(word__audio_check_status=CheckStatus.CONFIRMED) & (
+    Q(image_check_status=CheckStatus.CONFIRMED)
+    | Q(image="", word__image_check_status=CheckStatus.CONFIRMED)
+)
+
+
+def update_public_flags(relations: QuerySet[UnitWordRelation]) -> int:
+    """
+    Recompute :attr:`UnitWordRelation.is_public` of the given relations, e.g.
+    after the check statuses of their word changed, and recount the public words
+    of the affected units.
+
+    Args:
+        relations: The relations to update
+
+    Returns:
+        int: The number of relations whose flag changed
+    """
+    published = (
+        relations.filter(PUBLIC_RELATION_FILTER)
+        .filter(is_public=False)
+        .update(is_public=True)
+    )
+    unpublished = (
+        relations.exclude(PUBLIC_RELATION_FILTER)
+        .filter(is_public=True)
+        .update(is_public=False)
+    )
+    if published or unpublished:
+        update_number_words(Unit.objects.filter(unit_word_relations__in=relations))
+    return published + unpublished
+
+
+def update_number_words(units: QuerySet[Unit]) -> None:
+    """
+    Recount :attr:`Unit.number_words` of the given units. Counting the public
+    relations of a unit only reads the index on unit and public flag.
+
+    Args:
+        units: The units to update
+    """
+    units.update(
+        number_words=Coalesce(
+            Subquery(
+                UnitWordRelation.objects.filter(unit=OuterRef("pk"), is_public=True)
+                .values("unit")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+def update_number_units(
+    jobs: QuerySet[Job], excluded_unit_ids: Iterable[int] = ()
+) -> None:
+    """
+    Recount :attr:`Job.number_units` of the given jobs
+
+    Args:
+        jobs: The jobs to update
+        excluded_unit_ids: Units which are about to be deleted and must not be counted
+    """
+    jobs.update(
+        number_units=Coalesce(
+            Subquery(
+                Unit.objects.filter(jobs=OuterRef("pk"), released=True)
+                .exclude(pk__in=list(excluded_unit_ids))
+                .values("jobs")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
 class UnitWordRelation(models.Model):
     """
     Model representing the relationship between Unit and Word models.
@@ -83,6 +165,35 @@ class UnitWordRelation(models.Model):
             "Indicates whether the audio has been regenerated with the new TTS model."
         ),
     )
+    is_public = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name=_("public"),
+        help_text=_(
+            "Whether the word is published in this unit. This is kept in sync with the "
+            "check statuses of the relation and its word."
+        ),
+    )
+    modified_at = models.DateTimeField(auto_now=True, verbose_name=_("modified at"))
+
+    def compute_is_public(self) -> bool:
+        """
+        Check whether the word is published in this unit, which requires a
+        confirmed audio and a confirmed image. The image of the relation takes
+        precedence over the default image of the word. The check statuses of the
+        word are read from the database, because ``self.word`` might be outdated.
+
+        Returns:
+            bool: Whether the word is published in this unit
+        """
+        audio_check_status, image_check_status = Word.objects.values_list(
+            "audio_check_status", "image_check_status"
+        ).get(pk=self.word_id)
+        if audio_check_status != CheckStatus.CONFIRMED:
+            return False
+        return self.image_check_status == CheckStatus.CONFIRMED or (
+            not self.image and image_check_status == CheckStatus.CONFIRMED
+        )
 
     def image_tag(self) -> SafeString:
         """
@@ -100,7 +211,8 @@ class UnitWordRelation(models.Model):
         Override the save method to handle image and example sentence check status.
 
         This method ensures that when an image or example sentence is
-        updated or removed, its check status is (re)set to "NOT_CHECKED".
+        updated or removed, its check status is (re)set to "NOT_CHECKED",
+        and keeps :attr:`is_public` in sync.
         """
         previous_relation = (
             UnitWordRelation.objects.get(pk=self.pk) if self.pk else None
@@ -134,6 +246,10 @@ class UnitWordRelation(models.Model):
         if not self.example_sentence or not self.example_sentence.strip():
             self.example_sentence_check_status = CheckStatus.NOT_CHECKED
 
+        self.is_public = self.compute_is_public()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "is_public"}
+
         super().save(*args, **kwargs)
         if image_updated and convert_image_to_webp(self.image):
             super().save(update_fields=["image"])
@@ -322,12 +438,14 @@ class UnitWordRelation(models.Model):
         Meta class for the UnitWordRelation model.
 
         This class defines metadata for the UnitWordRelation model, including verbose names
-        for singular and plural forms, and a unique constraint on unit and word.
+        for singular and plural forms, a unique constraint on unit and word and an index
+        for the public words of a unit.
         """
 
         verbose_name = _("Unit-Word Relation")
         verbose_name_plural = _("Unit-Word Relations")
         unique_together = ("unit", "word")
+        indexes = [models.Index(fields=["unit", "is_public"])]
 
 
 class Unit(models.Model):
@@ -362,6 +480,14 @@ class Unit(models.Model):
         verbose_name=_("creator"),
         related_name="created_units",
     )
+    number_words = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("number of words"),
+        help_text=_(
+            "The number of public words, which is kept up to date automatically."
+        ),
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("created at"))
     modified_at = models.DateTimeField(auto_now=True, verbose_name=_("modified at"))
 
@@ -211,16 +211,32 @@ class Word(models.Model):
         """
         Overrides the default save method to handle audio conversion and
         update check statuses for audio and image files.
+
+        With ``update_fields``, only changes of the given fields are handled.
+        Everything else is left untouched, so concurrent writers of different
+        fields (like the background generation tasks of a word) can't overwrite
+        or delete each other's changes based on stale values.
         """
+        update_fields = kwargs.get("update_fields")
+
+        def updating(*names: str) -> bool:
+            return update_fields is None or any(name in update_fields for name in names)
+
         previous_word = Word.objects.get(pk=self.pk) if self.pk else None
-        audio_updated = self._audio_changed(previous_word)
-        image_updated = self._image_changed(previous_word)
+        audio_updated = updating("audio") and self._audio_changed(previous_word)
+        image_updated = updating("image") and self._image_changed(previous_word)
 
-        if self._pronunciation_changed(previous_word):
+        if updating("pronunciation") and self._pronunciation_changed(previous_word):
             self._flag_stale_audio_for_review()
-        self._update_audio_status(previous_word, audio_updated)
-        self._update_image_status(image_updated)
-        self._handle_example_sentence_change(previous_word)
+        if updating("audio", "audio_check_status"):
+            self._update_audio_status(previous_word, audio_updated)
+        if updating("image"):
+            self._update_image_status(image_updated)
+        if updating("example_sentence"):
+            changed_fields = self._handle_example_sentence_change(previous_word)
+            if update_fields is not None:
+                # The deleted audio has to be reset in the database as well
+                kwargs["update_fields"] = {*update_fields, *changed_fields}
 
         super().save(*args, **kwargs)
         self._post_save_conversions(audio_updated, image_updated)
@@ -259,7 +275,16 @@ class Word(models.Model):
         if not self.image:
             self.image_check_status = CheckStatus.NOT_CHECKED
 
-    def _handle_example_sentence_change(self, previous_word: "Word | None") -> None:
+    def _handle_example_sentence_change(
+        self, previous_word: "Word | None"
+    ) -> list[str]:
+        """
+        Reset the audio and the check status of a changed example sentence.
+
+        Returns:
+            list[str]: The names of the fields which were changed
+        """
+        changed_fields = []
         example_sentence_changed = bool(
             self.pk
             and previous_word
@@ -270,9 +295,13 @@ class Word(models.Model):
             if previous_word.example_sentence_audio:
                 previous_word.example_sentence_audio.delete(save=False)
                 self.example_sentence_audio = None
+                changed_fields.append("example_sentence_audio")
             self.example_sentence_check_status = CheckStatus.NOT_CHECKED
+            changed_fields.append("example_sentence_check_status")
         if not self.example_sentence or not self.example_sentence.strip():
             self.example_sentence_check_status = CheckStatus.NOT_CHECKED
+            changed_fields.append("example_sentence_check_status")
+        return changed_fields
 
     def _pronunciation_changed(self, previous_word: "Word | None") -> bool:
         return bool(
@@ -1,46 +1,27 @@
 """
-Background audio generation for Word objects.
-
-The DB itself is the queue: a Word with empty ``audio`` (or empty
-``example_sentence_audio`` while ``example_sentence`` is set) is "pending".
-A worker thread picks pending rows, calls OpenAI TTS, saves the file.
-Idempotent — already-populated rows are filtered out, so re-runs are free.
-
-The drain is scoped to the word IDs just created by a CSV import (passed via
-``word_ids``); it never touches words created elsewhere. So an import only
-generates audio for its own rows, not for the whole table.
-
-The OpenAI call (several seconds) is made *outside* any DB transaction, so a
-slow request never holds a write lock. An in-process lock makes the drain
-single-flight, so two imports in quick succession don't kick off overlapping
-workers.
-
-Triggered from ``import_csv_view`` after a successful CSV import. If a worker
-dies mid-batch (process crash, OOM, deploy), the remaining rows stay pending
-and will be picked up on the next import. If that ever becomes a real problem
-we should switch to a persistent queue (e.g. Celery).
+Audio generation for Word objects via OpenAI TTS.
+
+``generate_word_audio`` and ``generate_sentence_audio`` generate the missing
+word and example-sentence audio of a single word. They are idempotent — audio
+which already exists is not generated again. After a CSV import they are
+called for every imported word by the generation queue (see
+``generation_queue``).
 """
 
 import logging
 import re
-import threading
-import time
 
 from django.conf import settings
 from django.core.files.base import ContentFile
-from django.db import connection
-from django.db.models import Q
-from openai import RateLimitError
 
 from lunes_cms.core.audio import normalize_loudness
 
 from ..models import Word
-from ..utils import get_openai_client, make_safe_filename, OpenAIConfigurationError
+from ..utils import get_openai_client, make_safe_filename
+from . import tts_cache
 
 logger = logging.getLogger(__name__)
 
-_drain_lock = threading.Lock()
-
 #: Instruction that pins TTS pronunciation to German, shared by word and
 #: sentence audio. Phrased as a positive target ("read as German") rather than
 #: a prohibition ("don't use an English accent"): negative instructions are
@@ -82,24 +63,46 @@ def apply_pronunciation(text: str, word: str, pronunciation: str) -> tuple[str,
     return text, (f'Pronounce "{word}" and its inflected forms as "{pronunciation}".')
 
 
-def openai_word_audio_bytes(text: str) -> bytes:
+def _speech_bytes(text: str, instructions: str) -> bytes:
     """
-    Generate mp3 bytes for a single word/term via OpenAI TTS.
+    Generate loudness-normalized mp3 bytes via OpenAI TTS.
 
-    A single word carries no sentence context, so the model otherwise guesses
-    the language and may read German words with the wrong accent; the German
-    pronunciation instruction prevents that. Requires an instruction-capable
-    model (e.g. gpt-4o-mini-tts).
+    Audio generated before with exactly the same inputs is taken from the
+    :mod:`~lunes_cms.cmsv2.services.tts_cache` instead of calling OpenAI and
+    ffmpeg again.
     """
+    key = tts_cache.cache_key(
+        model=settings.OPENAI_TTS_MODEL,
+        voice=settings.OPENAI_TTS_VOICE,
+        input=text,
+        instructions=instructions,
+        loudness=settings.OPENAI_TTS_LOUDNESS_LUFS,
+    )
+    if (cached := tts_cache.load(key)) is not None:
+        return cached
     client = get_openai_client()
     response = client.audio.speech.create(
         model=settings.OPENAI_TTS_MODEL,
         voice=settings.OPENAI_TTS_VOICE,
         input=text,
-        instructions=GERMAN_PRONUNCIATION_INSTRUCTION,
+        instructions=instructions,
     )
     audio_bytes = b"".join(response.iter_bytes(chunk_size=4096))
-    return normalize_loudness(audio_bytes, settings.OPENAI_TTS_LOUDNESS_LUFS)
+    normalized = normalize_loudness(audio_bytes, settings.OPENAI_TTS_LOUDNESS_LUFS)
+    tts_cache.store(key, normalized)
+    return normalized
+
+
+def openai_word_audio_bytes(text: str) -> bytes:
+    """
+    Generate mp3 bytes for a single word/term via OpenAI TTS.
+
+    A single word carries no sentence context, so the model otherwise guesses
+    the language and may read German words with the wrong accent; the German
+    pronunciation instruction prevents that. Requires an instruction-capable
+    model (e.g. gpt-4o-mini-tts).
+    """
+    return _speech_bytes(text, GERMAN_PRONUNCIATION_INSTRUCTION)
 
 
 def openai_sentence_audio_bytes(sentence: str, word: Word) -> bytes:
@@ -123,126 +126,58 @@ def openai_sentence_audio_bytes(sentence: str, word: Word) -> bytes:
         for part in (GERMAN_PRONUNCIATION_INSTRUCTION, intonation, pronunciation_hint)
         if part
     )
-    client = get_openai_client()
-    response = client.audio.speech.create(
-        model=settings.OPENAI_TTS_MODEL,
-        voice=settings.OPENAI_TTS_VOICE,
-        input=spoken_sentence,
-        instructions=instruction,
-    )
-    audio_bytes = b"".join(response.iter_bytes(chunk_size=4096))
-    return normalize_loudness(audio_bytes, settings.OPENAI_TTS_LOUDNESS_LUFS)
+    return _speech_bytes(spoken_sentence, instruction)
 
 
-def _generate_for_word(word: Word) -> None:
+def generate_word_audio(word: Word) -> None:
     """
-    Generate any missing audio for a single Word and save it to the FileField.
+    Generate the missing audio of a single Word and save it to the FileField.
 
-    Each ``FileField.save()`` runs its own short transaction (and triggers
-    ``Word.save()`` -> ``convert_audio()``); the slow OpenAI calls happen
-    between them, holding no lock.
+    Only the audio fields and ``modified_at`` (for the API's change feed) are
+    saved, so example sentences or images generated for the same word at the
+    same time are not overwritten. ``Word.save()`` converts the audio afterwards.
     """
-    if not word.audio:
-        data = openai_word_audio_bytes(word.text_for_audio_generation())
-        word.audio.save(
-            f"{make_safe_filename(word.word)}.mp3",
-            ContentFile(data),
-        )
-        logger.info("Generated word audio for word_id=%s (%s)", word.pk, word.word)
-
-    if word.example_sentence and not word.example_sentence_audio:
-        data = openai_sentence_audio_bytes(word.example_sentence, word)
-        word.example_sentence_audio_regenerated = True
-        word.example_sentence_audio.save(
-            f"{make_safe_filename(word.word)}_example_sentence.mp3",
-            ContentFile(data),
-        )
-        logger.info(
-            "Generated example-sentence audio for word_id=%s (%s)", word.pk, word.word
-        )
-
-
-def _pending_filter(word_ids: list[int] | None = None) -> Q:
-    needs_word_audio = Q(audio="") | Q(audio__isnull=True)
-    needs_sentence_audio = ~Q(example_sentence="") & (
-        Q(example_sentence_audio="") | Q(example_sentence_audio__isnull=True)
+    if word.audio:
+        return
+    data = openai_word_audio_bytes(word.text_for_audio_generation())
+    word.audio.save(
+        f"{make_safe_filename(word.word)}.mp3", ContentFile(data), save=False
     )
-    pending = (needs_word_audio | needs_sentence_audio) & ~Q(word="")
-    if word_ids is not None:
-        pending &= Q(pk__in=word_ids)
-    return pending
+    word.save(
+        update_fields=[
+            "audio",
+            "audio_check_status",
+            "audio_checked_identifier",
+            "modified_at",
+        ]
+    )
+    logger.info("Generated word audio for word_id=%s (%s)", word.pk, word.word)
 
 
-def drain_pending_audio(
-    word_ids: list[int] | None = None, throttle_seconds: float = 1.0
-) -> None:
+def generate_sentence_audio(word: Word) -> None:
     """
-    Process Words that need audio, one at a time, until none remain.
-
-    ``word_ids`` restricts the drain to those Word rows (the ones a CSV
-    import just created). Without it the whole table is scanned.
+    Generate the missing example sentence audio of a single Word and save it
+    to the FileField.
 
-    Single-flight within the process: if another thread already holds the
-    drain lock this call returns immediately (that thread will pick up
-    anything we just queued).
-
-    Failures on a single row are logged and the loop continues — the row's
-    audio field stays empty so it'll be picked up on the next pass.
+    Like :func:`generate_word_audio`, only the example sentence audio fields are
+    saved.
     """
-    # Non-blocking single-flight guard; released in the finally below.
-    if not _drain_lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+    if not word.example_sentence or word.example_sentence_audio:
         return
-    failed_pks: set[int] = set()
-    scope = Q(pk__in=word_ids) if word_ids is not None else Q()
-    try:
-        missing_word_audio = Word.objects.filter(
-            (Q(audio="") | Q(audio__isnull=True)) & ~Q(word="") & scope
-        ).count()
-        missing_sentence_audio = Word.objects.filter(
-            ~Q(example_sentence="")
-            & (Q(example_sentence_audio="") | Q(example_sentence_audio__isnull=True))
-            & ~Q(word="")
-            & scope
-        ).count()
-        pending = Word.objects.filter(_pending_filter(word_ids)).count()
-        logger.info(
-            "Audio drain starting: %s word(s) pending "
-            "(%s missing word audio, %s missing example-sentence audio) — "
-            "up to %s OpenAI TTS request(s)",
-            pending,
-            missing_word_audio,
-            missing_sentence_audio,
-            missing_word_audio + missing_sentence_audio,
-        )
-        while True:
-            word = (
-                Word.objects.filter(_pending_filter(word_ids))
-                .exclude(pk__in=failed_pks)
-                .first()
-            )
-            if word is None:
-                return
-            try:
-                _generate_for_word(word)
-            except OpenAIConfigurationError:
-                logger.warning("OpenAI not configured — audio worker exiting")
-                return
-            except RateLimitError:
-                # Org RPM limit hit. Back off and retry the same row — the
-                # SDK already did its own short retries before raising.
-                logger.warning("OpenAI rate limit — backing off 30s")
-                time.sleep(30)
-                continue
-            except Exception:  # pylint: disable=broad-exception-caught
-                logger.exception(
-                    "Audio generation failed for word_id=%s — leaving for retry",
-                    word.pk,
-                )
-                # Don't re-pick this row in this pass; it'll be retried on the
-                # next drain (import / app restart).
-                failed_pks.add(word.pk)
-                continue
-            time.sleep(throttle_seconds)
-    finally:
-        _drain_lock.release()
-        connection.close()
+    data = openai_sentence_audio_bytes(word.example_sentence, word)
+    word.example_sentence_audio_regenerated = True
+    word.example_sentence_audio.save(
+        f"{make_safe_filename(word.word)}_example_sentence.mp3",
+        ContentFile(data),
+        save=False,
+    )
+    word.save(
+        update_fields=[
+            "example_sentence_audio",
+            "example_sentence_audio_regenerated",
+            "modified_at",
+        ]
+    )
+    logger.info(
+        "Generated example-sentence audio for word_id=%s (%s)", word.pk, word.word
+    )
@@ -0,0 +1,324 @@
+"""
+Background import of large CSV files.
+
+Importing a large file inside the upload request would time out, so the import
+view stores large uploads as :class:`~lunes_cms.cmsv2.models.CSVImport` and
+the ``run_import_worker`` command imports them:
+
+* The file is read as a stream and imported in chunks of ``CHUNK_SIZE`` rows,
+  so the memory usage doesn't depend on the size of the file. Every chunk is
+  imported in one transaction together with the progress of the import, and
+  the generation of the assets of its words is enqueued right away.
+* Workers lease an import like the generation tasks (see
+  :mod:`~lunes_cms.cmsv2.services.generation_queue`) and renew the lease after
+  every chunk. If a worker dies, another one continues after the last
+  imported chunk once the lease expired.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import os
+import socket
+import threading
+from collections.abc import Iterator
+from datetime import timedelta
+from itertools import islice
+from typing import Any, IO
+
+from django.contrib.auth.models import User
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from ..admins.word_import_resource import (
+    creator_fields_for_user,
+    import_parsed_rows,
+    parse_rows,
+)
+from ..models import CSVImport, Job, Unit
+from .generation_queue import enqueue_word_assets
+
+logger = logging.getLogger(__name__)
+
+Status = CSVImport.Status
+
+#: How many rows are imported in one transaction
+CHUNK_SIZE = 500
+
+#: How many error messages of an import are stored
+MAX_REPORTED_ERRORS = 100
+
+#: How long a worker may import a chunk before another worker takes the import over
+LEASE_DURATION = timedelta(minutes=10)
+
+
+class LeaseLostError(Exception):
+    """
+    Raised when another worker took over an import
+    """
+
+
+def read_csv_header(csv_file: IO[bytes]) -> tuple[list[str] | None, bool]:
+    """
+    Read the header of a CSV file without loading the whole file, and rewind it.
+
+    Args:
+        csv_file: The binary file
+
+    Returns:
+        tuple[list[str] | None, bool]: The header (``None`` for an empty file)
+        and whether the file contains any rows below it
+    """
+    text = io.TextIOWrapper(csv_file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        has_rows = next(reader, None) is not None
+    finally:
+        # Don't close the file together with the wrapper
+        text.detach()
+    csv_file.seek(0)
+    return header, has_rows
+
+
+def enqueue_csv_import(csv_file: File, job: Job, user: User) -> CSVImport:
+    """
+    Store an uploaded CSV file for the background import.
+
+    Args:
+        csv_file: The uploaded file
+        job: The job to import the vocabulary to
+        user: The user importing the file
+
+    Returns:
+        CSVImport: The queued import
+    """
+    csv_import = CSVImport(job=job, user=user, file_size=csv_file.size or 0)
+    csv_import.file.save(os.path.basename(csv_file.name or "import.csv"), csv_file)
+    return csv_import
+
+
+def claim_import(owner: str) -> CSVImport | None:
+    """
+    Lease the oldest pending import which is not leased by another worker.
+
+    Args:
+        owner: The name of the worker
+
+    Returns:
+        CSVImport | None: The leased import, or None if no import is pending
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        csv_import = (
+            CSVImport.objects.filter(status=Status.PENDING)
+            .filter(Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now))
+            .select_related("job", "user")
+            .select_for_update(skip_locked=True, of=("self",))
+            .order_by("created_at", "pk")
+            .first()
+        )
+        if csv_import is None:
+            return None
+        csv_import.lease_owner = owner
+        csv_import.lease_expires_at = now + LEASE_DURATION
+        csv_import.save(update_fields=["lease_owner", "lease_expires_at"])
+    return csv_import
+
+
+def _update_leased(csv_import: CSVImport, **fields: Any) -> None:
+    """
+    Update an import, unless another worker took it over in the meantime.
+    """
+    if not CSVImport.objects.filter(
+        pk=csv_import.pk, lease_owner=csv_import.lease_owner
+    ).update(**fields):
+        raise LeaseLostError(f"The import {csv_import.pk} was taken over")
+
+
+def _chunks(csv_file: IO[bytes]) -> Iterator[tuple[list[tuple[int, dict]], int]]:
+    """
+    Read the numbered rows of a CSV file in chunks.
+
+    Yields:
+        tuple[list[tuple[int, dict]], int]: The numbered rows of a chunk and
+        the number of bytes read so far
+    """
+    reader = csv.DictReader(
+        io.TextIOWrapper(csv_file, encoding="utf-8-sig", newline="")
+    )
+    rows = enumerate(reader, start=1)
+    while chunk := list(islice(rows, CHUNK_SIZE)):
+        yield chunk, csv_file.tell()
+
+
+def _check_dimensions(
+    numbered_rows: list[tuple[int, dict]],
+) -> tuple[list[tuple[int, dict]], list[str]]:
+    """
+    Separate the rows with more or fewer columns than the header.
+    """
+    rows, errors = [], []
+    for row_number, raw_row in numbered_rows:
+        if None in raw_row or None in raw_row.values():
+            errors.append(
+                _(
+                    "Row %(n)s: The number of columns doesn't match the header, "
+                    "row will be skipped."
+                )
+                % {"n": row_number}
+            )
+        else:
+            rows.append((row_number, raw_row))
+    return rows, errors
+
+
+def import_chunk(
+    csv_import: CSVImport,
+    numbered_rows: list[tuple[int, dict]],
+    units: dict[str, Unit],
+    bytes_processed: int,
+) -> None:
+    """
+    Import a chunk of rows, record the progress and renew the lease.
+
+    Args:
+        csv_import: The leased import
+        numbered_rows: The rows with their numbers
+        units: The units created by the import so far, by title
+        bytes_processed: The number of bytes of the file read up to this chunk
+    """
+    if csv_import.user is None:
+        raise ValueError("The user who started the import was deleted.")
+    creator_fields = creator_fields_for_user(csv_import.user)
+    last_row_number = numbered_rows[-1][0]
+    numbered_rows, errors = _check_dimensions(numbered_rows)
+    rows, parse_errors = parse_rows(numbered_rows)
+    errors += parse_errors
+    with transaction.atomic():
+        word_ids, units_created = import_parsed_rows(
+            rows, csv_import.job, creator_fields, units
+        )
+        enqueue_word_assets(word_ids, job=csv_import.job)
+        csv_import.bytes_processed = bytes_processed
+        csv_import.rows_processed = last_row_number
+        csv_import.words_created += len(word_ids)
+        csv_import.units_created += units_created
+        csv_import.units = {title: unit.pk for title, unit in units.items()}
+        csv_import.errors += errors[: MAX_REPORTED_ERRORS - len(csv_import.errors)]
+        csv_import.error_count += len(errors)
+        csv_import.lease_expires_at = timezone.now() + LEASE_DURATION
+        _update_leased(
+            csv_import,
+            bytes_processed=csv_import.bytes_processed,
+            rows_processed=csv_import.rows_processed,
+            words_created=csv_import.words_created,
+            units_created=csv_import.units_created,
+            units=csv_import.units,
+            errors=csv_import.errors,
+            error_count=csv_import.error_count,
+            lease_expires_at=csv_import.lease_expires_at,
+        )
+
+
+def _load_units(csv_import: CSVImport) -> dict[str, Unit]:
+    units = Unit.objects.in_bulk(csv_import.units.values())
+    return {
+        title: units[unit_id]
+        for title, unit_id in csv_import.units.items()
+        if unit_id in units
+    }
+
+
+def run_import(csv_import: CSVImport, stopped: threading.Event | None = None) -> None:
+    """
+    Import a leased import chunk by chunk, starting after the last imported
+    row, and record the outcome. The file is deleted once the import is done or
+    has failed.
+
+    Args:
+        csv_import: The leased import
+        stopped: If this event is set, the lease is released after the current
+            chunk, so the import continues with the next worker
+    """
+    try:
+        units = _load_units(csv_import)
+        with csv_import.file.open("rb") as csv_file:
+            for numbered_rows, bytes_processed in _chunks(csv_file):
+                if stopped is not None and stopped.is_set():
+                    _update_leased(csv_import, lease_owner="", lease_expires_at=None)
+                    return
+                numbered_rows = [
+                    (row_number, raw_row)
+                    for row_number, raw_row in numbered_rows
+                    if row_number > csv_import.rows_processed
+                ]
+                if numbered_rows:
+                    import_chunk(csv_import, numbered_rows, units, bytes_processed)
+        _update_leased(
+            csv_import,
+            status=Status.DONE,
+            bytes_processed=csv_import.file_size,
+            lease_owner="",
+            lease_expires_at=None,
+            finished_at=timezone.now(),
+        )
+    except LeaseLostError:
+        logger.warning("CSV import %s was taken over by another worker", csv_import.pk)
+        return
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.exception("CSV import %s failed", csv_import.pk)
+        if not CSVImport.objects.filter(
+            pk=csv_import.pk, lease_owner=csv_import.lease_owner
+        ).update(
+            status=Status.FAILED,
+            last_error=str(e),
+            lease_owner="",
+            lease_expires_at=None,
+            finished_at=timezone.now(),
+        ):
+            # Another worker took over the import and still needs the file
+            return
+    csv_import.file.delete(save=False)
+
+
+class ImportWorker:
+    """
+    Imports the queued CSV files one after another. When stopped, the import
+    in progress is continued by the next worker.
+    """
+
+    def __init__(self, poll_interval: float = 5.0, exit_when_idle: bool = False):
+        """
+        Args:
+            poll_interval: Seconds to wait for new imports when none is pending
+            exit_when_idle: Whether to return once no import is pending anymore
+        """
+        self.poll_interval = poll_interval
+        self.exit_when_idle = exit_when_idle
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        """
+        Process imports until the worker is stopped (or idle, if ``exit_when_idle``).
+        """
+        while not self.stopped.is_set():
+            csv_import = claim_import(self.owner)
+            if csv_import is not None:
+                run_import(csv_import, self.stopped)
+            elif self.exit_when_idle:
+                return
+            else:
+                self.stopped.wait(self.poll_interval)
+
+    def stop(self) -> None:
+        """
+        Stop the worker once the current chunk is imported.
+        """
+        self.stopped.set()
@@ -0,0 +1,361 @@
+"""
+Persistent queue for the background generation of word assets.
+
+A CSV import enqueues a :class:`~lunes_cms.cmsv2.models.GenerationTask` per
+imported word and asset kind (example sentence, word audio, example sentence
+audio, image). The tasks are
+processed by the ``run_generation_worker`` command, which survives deploys of
+the web application and may run on several nodes at once:
+
+* Workers lease a task: they claim it with ``SELECT ... FOR UPDATE SKIP LOCKED``,
+  stamp it with their name and a lease expiry and process it without holding a
+  transaction. If a worker dies, its task is taken over once the lease expired.
+* Failed tasks are retried with exponential backoff and given up after
+  ``MAX_ATTEMPTS`` attempts. The last error is kept for the admin.
+* The tasks of a word are pipelined instead of processing the whole import
+  stage by stage: only the example sentence audio waits for the example
+  sentence task of its word, everything else is processed right away, oldest
+  word first. Every task saves only the fields it generates, so concurrent
+  tasks of a word don't overwrite each other.
+
+Generation is idempotent (assets which already exist are not generated again),
+so a task which is accidentally processed twice costs money, but does no harm.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Exists, OuterRef, Q, QuerySet
+from django.utils import timezone
+from openai import RateLimitError
+
+from ..models import GenerationTask, Job, Word
+from ..utils import OpenAIConfigurationError
+from .audio_generation import generate_sentence_audio, generate_word_audio
+from .image_generation import generate_word_image
+from .rate_limits import get_bucket, retry_after
+from .sentence_generation import generate_word_sentence
+
+logger = logging.getLogger(__name__)
+
+Kind = GenerationTask.Kind
+Status = GenerationTask.Status
+
+#: How often a task is attempted before it is given up
+MAX_ATTEMPTS = 5
+
+#: The delay before the first retry of a failed task, doubled for every further retry
+RETRY_DELAY = timedelta(minutes=1)
+
+#: The maximum delay between two attempts of a task
+MAX_RETRY_DELAY = timedelta(hours=6)
+
+#: How long a worker may process a task before another worker takes it over
+LEASE_DURATION = timedelta(minutes=10)
+
+
+def _model(kind: str) -> str:
+    return {
+        Kind.SENTENCE: settings.OPENAI_TEXT_MODEL,
+        Kind.AUDIO: settings.OPENAI_TTS_MODEL,
+        Kind.SENTENCE_AUDIO: settings.OPENAI_TTS_MODEL,
+        Kind.IMAGE: settings.OPENAI_IMAGE_MODEL,
+    }[Kind(kind)]
+
+
+def _concurrency(kind: str) -> int:
+    return {
+        Kind.SENTENCE: settings.OPENAI_TEXT_CONCURRENCY,
+        Kind.AUDIO: settings.OPENAI_TTS_CONCURRENCY,
+        Kind.SENTENCE_AUDIO: settings.OPENAI_TTS_CONCURRENCY,
+        Kind.IMAGE: settings.OPENAI_IMAGE_CONCURRENCY,
+    }[Kind(kind)]
+
+
+def enqueue_word_assets(
+    word_ids: Iterable[int],
+    job: Job | None = None,
+    kinds: Iterable[str] | None = None,
+) -> None:
+    """
+    Enqueue the generation of the missing assets of words.
+
+    Words which already have a pending task of a kind don't get another one.
+
+    Args:
+        word_ids: The ids of the words
+        job: The job providing the context for generated sentences and images
+        kinds: The kinds of assets to generate (default: all)
+    """
+    GenerationTask.objects.bulk_create(
+        [
+            GenerationTask(word_id=word_id, job=job, kind=kind)
+            for word_id in Word.objects.filter(pk__in=list(word_ids))
+            .exclude(word="")
+            .values_list("pk", flat=True)
+            for kind in (kinds or Kind)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def claimable_tasks(kinds: Iterable[str]) -> QuerySet[GenerationTask]:
+    """
+    Get the tasks which are due and not leased by another worker.
+
+    Example sentence audio tasks are only claimable once the example sentence
+    of their word is no longer pending.
+
+    Args:
+        kinds: The kinds of tasks
+
+    Returns:
+        QuerySet[GenerationTask]: The claimable tasks
+    """
+    now = timezone.now()
+    pending_sentence = GenerationTask.objects.filter(
+        word=OuterRef("word"), kind=Kind.SENTENCE, status=Status.PENDING
+    )
+    return (
+        GenerationTask.objects.filter(
+            status=Status.PENDING, kind__in=list(kinds), next_run_at__lte=now
+        )
+        .filter(Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now))
+        .exclude(Q(kind=Kind.SENTENCE_AUDIO) & Exists(pending_sentence))
+    )
+
+
+def claim_task(kinds: Iterable[str], owner: str) -> GenerationTask | None:
+    """
+    Lease the next claimable task.
+
+    Args:
+        kinds: The kinds of tasks the worker processes
+        owner: The name of the worker
+
+    Returns:
+        GenerationTask | None: The leased task, or None if no task is claimable
+    """
+    with transaction.atomic():
+        task = (
+            claimable_tasks(kinds)
+            .select_related("word", "job")
+            .select_for_update(skip_locked=True, of=("self",))
+            .order_by("next_run_at", "pk")
+            .first()
+        )
+        if task is None:
+            return None
+        task.lease_owner = owner
+        task.lease_expires_at = timezone.now() + LEASE_DURATION
+        task.attempts += 1
+        task.save(update_fields=["lease_owner", "lease_expires_at", "attempts"])
+    return task
+
+
+def _update_leased(task: GenerationTask, **fields: Any) -> None:
+    """
+    Update a task, unless another worker took it over in the meantime.
+    """
+    GenerationTask.objects.filter(pk=task.pk, lease_owner=task.lease_owner).update(
+        lease_owner="", lease_expires_at=None, **fields
+    )
+
+
+def run_task(task: GenerationTask) -> bool:
+    """
+    Generate the asset of a leased task and record the outcome.
+
+    A failure only affects this task: it is retried with exponential backoff,
+    or marked as failed after ``MAX_ATTEMPTS`` attempts. Rate limit errors
+    don't count as attempt.
+
+    Args:
+        task: The leased task
+
+    Returns:
+        bool: False if the worker should stop because OpenAI is not configured
+    """
+    job_title = task.job.name if task.job else None
+    try:
+        if task.kind == Kind.SENTENCE:
+            generate_word_sentence(task.word, job_title=job_title)
+        elif task.kind == Kind.AUDIO:
+            generate_word_audio(task.word)
+        elif task.kind == Kind.SENTENCE_AUDIO:
+            generate_sentence_audio(task.word)
+        else:
+            generate_word_image(task.word, job_title=job_title)
+    except OpenAIConfigurationError:
+        logger.warning("OpenAI not configured — generation worker exiting")
+        _update_leased(task, attempts=task.attempts - 1)
+        return False
+    except RateLimitError as e:
+        # The SDK already did its own short retries before raising. Pause all
+        # requests to this model and retry the task afterwards.
+        seconds = retry_after(e.response.headers)
+        logger.warning("OpenAI rate limit — backing off %ss", seconds)
+        get_bucket(_model(task.kind)).pause(seconds)
+        _update_leased(
+            task,
+            attempts=task.attempts - 1,
+            next_run_at=timezone.now() + timedelta(seconds=seconds),
+        )
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        given_up = task.attempts >= MAX_ATTEMPTS
+        logger.exception(
+            "%s generation failed for word_id=%s (attempt %s) — %s",
+            task.get_kind_display(),
+            task.word_id,
+            task.attempts,
+            "giving up" if given_up else "leaving for retry",
+        )
+        delay = min(RETRY_DELAY * 2 ** (task.attempts - 1), MAX_RETRY_DELAY)
+        _update_leased(
+            task,
+            status=Status.FAILED if given_up else Status.PENDING,
+            next_run_at=timezone.now() + delay,
+            last_error=repr(e),
+            finished_at=timezone.now() if given_up else None,
+        )
+    else:
+        _update_leased(task, status=Status.DONE, finished_at=timezone.now())
+    return True
+
+
+def queue_stats(tasks: QuerySet[GenerationTask]) -> list[dict[str, Any]]:
+    """
+    Count the tasks per kind and status.
+
+    Args:
+        tasks: The tasks to count
+
+    Returns:
+        list[dict[str, Any]]: The label, the number of tasks per status and the
+        percentage of finished tasks for every kind
+    """
+    counts = {
+        row["kind"]: row
+        for row in tasks.order_by()
+        .values("kind")
+        .annotate(
+            total=Count("pk"),
+            pending=Count("pk", filter=Q(status=Status.PENDING)),
+            done=Count("pk", filter=Q(status=Status.DONE)),
+            failed=Count("pk", filter=Q(status=Status.FAILED)),
+        )
+    }
+    stats = []
+    for kind in Kind:
+        row = counts.get(kind, {"total": 0, "pending": 0, "done": 0, "failed": 0})
+        stats.append(
+            {
+                "label": kind.label,
+                "pending": row["pending"],
+                "done": row["done"],
+                "failed": row["failed"],
+                "progress": (
+                    round(100 * (row["total"] - row["pending"]) / row["total"])
+                    if row["total"]
+                    else 100
+                ),
+            }
+        )
+    return stats
+
+
+class GenerationWorker:
+    """
+    Processes generation tasks with a pool of threads.
+
+    On databases which support ``SKIP LOCKED``, the kinds of tasks sharing a
+    model (e.g. word and example sentence audio) get as many threads as
+    requests to the model may run at the same time. SQLite can't
+    lock rows and serializes all writes anyway, so there a single thread
+    processes all tasks.
+    """
+
+    def __init__(
+        self,
+        kinds: Iterable[str] | None = None,
+        poll_interval: float = 5.0,
+        exit_when_idle: bool = False,
+    ) -> None:
+        """
+        Args:
+            kinds: The kinds of tasks to process (default: all)
+            poll_interval: Seconds to wait for new tasks when none is claimable
+            exit_when_idle: Whether to return once no task is claimable anymore
+        """
+        self.kinds = [Kind(kind) for kind in kinds] if kinds else list(Kind)
+        self.poll_interval = poll_interval
+        self.exit_when_idle = exit_when_idle
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopped = threading.Event()
+        self._active = 0
+        self._active_lock = threading.Lock()
+
+    def run(self) -> None:
+        """
+        Process tasks until the worker is stopped (or idle, if ``exit_when_idle``).
+        """
+        if connection.features.has_select_for_update_skip_locked:
+            kinds_by_model: dict[str, list[Kind]] = {}
+            for kind in self.kinds:
+                kinds_by_model.setdefault(_model(kind), []).append(kind)
+            groups = [
+                kinds
+                for kinds in kinds_by_model.values()
+                for _ in range(max(_concurrency(kinds[0]), 1))
+            ]
+        else:
+            groups = [self.kinds]
+        with ThreadPoolExecutor(
+            max_workers=len(groups), thread_name_prefix="generation-worker"
+        ) as executor:
+            for future in [executor.submit(self._work, kinds) for kinds in groups]:
+                future.result()
+
+    def stop(self) -> None:
+        """
+        Stop the worker once the tasks in progress are finished.
+        """
+        self.stopped.set()
+
+    def _work(self, kinds: list[Kind]) -> None:
+        try:
+            while not self.stopped.is_set():
+                # Claiming and counting the claimed task under one lock lets a
+                # thread tell whether another one is working on a task which
+                # could make further tasks claimable (e.g. audio waiting for
+                # its sentence). Threads which only poll don't count, so they
+                # can't keep each other from becoming idle.
+                with self._active_lock:
+                    task = claim_task(kinds, self.owner)
+                    if task is not None:
+                        self._active += 1
+                    idle = task is None and not self._active
+                if task is None:
+                    if self.exit_when_idle and idle:
+                        return
+                    self.stopped.wait(self.poll_interval)
+                    continue
+                try:
+                    if not run_task(task):
+                        self.stop()
+                finally:
+                    with self._active_lock:
+                        self._active -= 1
+        finally:
+            # Every worker thread has its own database connection
+            connection.close()
@@ -1,36 +1,24 @@
 """
-Background image generation for Word objects.
+Image generation for Word objects via the OpenAI image API.
 
-Mirrors ``audio_generation``: the DB is the queue, a Word with an empty
-``image`` is "pending". A worker thread picks pending rows, calls the OpenAI
-image API, saves the file. Idempotent — already-populated rows are filtered
-out, so re-runs are free.
-
-The OpenAI call is made *outside* any DB transaction. An in-process lock makes
-the drain single-flight; it is separate from the audio drain's lock so image
-and audio generation can run concurrently.
+Mirrors ``audio_generation``: ``generate_word_image`` generates the missing
+image of a single word and is idempotent. After a CSV import it is called for
+every imported word by the generation queue (see ``generation_queue``).
 """
 
 from __future__ import annotations
 
 import base64
 import logging
-import threading
-import time
 
 from django.conf import settings
 from django.core.files.base import ContentFile
-from django.db import connection
-from django.db.models import Q
-from openai import RateLimitError
 
 from ..models import Word
-from ..utils import get_openai_client, OpenAIConfigurationError
+from ..utils import get_openai_client
 
 logger = logging.getLogger(__name__)
 
-_drain_lock = threading.Lock()
-
 
 def build_image_prompt(
     word_text: str,
@@ -41,7 +29,7 @@ def build_image_prompt(
 ) -> str:
     """
     Build the German image-generation prompt shared by the on-demand admin
-    view and the background import drain.
+    view and the background generation after an import.
 
     Most vocabulary items look wrong with any text/numbers/logos in the
     picture (issue #918), so that's banned by default. Some items (a receipt,
@@ -86,89 +74,18 @@ def openai_word_image_bytes(word: Word, job_title: str | None = None) -> bytes:
     return base64.b64decode(response.data[0].b64_json)
 
 
-def _generate_for_word_image(word: Word, job_title: str | None = None) -> None:
+def generate_word_image(word: Word, job_title: str | None = None) -> None:
     """
     Generate a missing image for a single Word and save it to the ImageField.
 
-    ``Word.save()`` converts the uploaded image to WebP and the field defaults
-    ``image_check_status`` to ``NOT_CHECKED``. The file name is the UUID the
-    field's ``upload_to`` assigns — same as every other image in the system.
+    ``Word.save()`` converts the uploaded image to WebP and resets
+    ``image_check_status`` to ``NOT_CHECKED``. Only these fields and
+    ``modified_at`` (for the API's change feed) are saved, so sentences or audio
+    generated for the same word at the same time are not overwritten. The file name is the UUID the field's ``upload_to`` assigns —
+    same as every other image in the system.
     """
     if not word.image:
         data = openai_word_image_bytes(word, job_title=job_title)
-        word.image.save("image.png", ContentFile(data))
+        word.image.save("image.png", ContentFile(data), save=False)
+        word.save(update_fields=["image", "image_check_status", "modified_at"])
         logger.info("Generated image for word_id=%s (%s)", word.pk, word.word)
-
-
-def _pending_filter(word_ids: list[int] | None = None) -> Q:
-    pending = (Q(image="") | Q(image__isnull=True)) & ~Q(word="")
-    if word_ids is not None:
-        pending &= Q(pk__in=word_ids)
-    return pending
-
-
-def drain_pending_images(
-    word_ids: list[int] | None = None,
-    throttle_seconds: float = 1.0,
-    job_title: str | None = None,
-) -> None:
-    """
-    Process Words that need an image, one at a time, until none remain.
-
-    ``word_ids`` restricts the drain to those Word rows (the ones a CSV
-    import just created). Without it the whole table is scanned.
-
-    ``job_title`` adds the importing job to every prompt in the batch. A CSV
-    import always targets a single job, unlike already saved words which can
-    belong to several jobs.
-
-    Single-flight within the process: if another thread already holds the
-    drain lock this call returns immediately.
-
-    Failures on a single row are logged and the loop continues — the row's
-    image field stays empty so it'll be picked up on the next pass.
-    """
-    # Non-blocking single-flight guard; released in the finally below.
-    if not _drain_lock.acquire(blocking=False):  # pylint: disable=consider-using-with
-        return
-    failed_pks: set[int] = set()
-    try:
-        pending = Word.objects.filter(_pending_filter(word_ids)).count()
-        logger.info(
-            "Image drain starting: %s word(s) pending — "
-            "up to %s OpenAI image request(s)",
-            pending,
-            pending,
-        )
-        while True:
-            word = (
-                Word.objects.filter(_pending_filter(word_ids))
-                .exclude(pk__in=failed_pks)
-                .first()
-            )
-            if word is None:
-                return
-            try:
-                _generate_for_word_image(word, job_title=job_title)
-            except OpenAIConfigurationError:
-                logger.warning("OpenAI not configured — image worker exiting")
-                return
-            except RateLimitError:
-                # Org RPM limit hit. Back off and retry the same row — the
-                # SDK already did its own short retries before raising.
-                logger.warning("OpenAI rate limit — backing off 30s")
-                time.sleep(30)
-                continue
-            except Exception:  # pylint: disable=broad-exception-caught
-                logger.exception(
-                    "Image generation failed for word_id=%s — leaving for retry",
-                    word.pk,
-                )
-                # Don't re-pick this row in this pass; it'll be retried on the
-                # next drain (import / app restart).
-                failed_pks.add(word.pk)
-                continue
-            time.sleep(throttle_seconds)
-    finally:
-        _drain_lock.release()
-        connection.close()
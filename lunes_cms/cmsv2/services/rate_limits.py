@@ -0,0 +1,212 @@
+"""
+Client-side rate limiting of OpenAI requests.
+
+All requests to one model share a token bucket. OpenAI reports the limits of
+the organization in the ``x-ratelimit-*`` headers of every response, and the
+bucket adopts them: it holds as many tokens as requests are allowed and refills
+at the rate at which OpenAI resets them. Until the first response for a model
+arrived, its requests are not limited. A ``429`` response (or a depleted token
+limit) pauses all requests to the model until the limit is reset.
+
+The limiter is wired into every client returned by
+:func:`~lunes_cms.cmsv2.utils.get_openai_client` via httpx event hooks, so it
+covers the background generation, the on-demand admin views and the retries of the
+OpenAI SDK alike. The buckets are per process.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+#: How many seconds to pause a model after a rate limit error without a ``retry-after`` header
+DEFAULT_BACK_OFF = 30.0
+
+
+def parse_duration(value: str) -> float:
+    """
+    Parse the durations of the ``x-ratelimit-reset-*`` headers.
+
+    Args:
+        value: A duration like ``"1s"``, ``"6m0s"`` or ``"20ms"``
+
+    Returns:
+        float: The duration in seconds
+    """
+    return sum(
+        float(amount) * _DURATION_UNITS[unit]
+        for amount, unit in _DURATION.findall(value)
+    )
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for the requests to one model.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        #: The maximum number of tokens, ``None`` as long as the limits are unknown
+        self.capacity: float | None = None
+        #: How many tokens are added per second
+        self.rate = 0.0
+        self.tokens = 0.0
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        if self.capacity is not None:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self._updated_at) * self.rate
+            )
+        self._updated_at = now
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent and take a token for it.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self.capacity is None:
+                    return
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def update(self, limit: int, remaining: int, reset: float) -> None:
+        """
+        Adopt the request limits reported by OpenAI.
+
+        Args:
+            limit: The maximum number of requests (``x-ratelimit-limit-requests``)
+            remaining: The number of requests left (``x-ratelimit-remaining-requests``)
+            reset: Seconds until all requests are available again
+                (``x-ratelimit-reset-requests``)
+        """
+        if limit <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            # Requests which are still in flight are not counted in ``remaining`` yet
+            self.tokens = (
+                float(remaining)
+                if self.capacity is None
+                else min(self.tokens, float(remaining))
+            )
+            self.capacity = float(limit)
+            used = limit - remaining
+            self.rate = used / reset if used > 0 and reset > 0 else limit / 60
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back all requests for a while.
+
+        Args:
+            seconds: How long to pause
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(model: str) -> TokenBucket:
+    """
+    Get the token bucket shared by all requests to a model.
+
+    Args:
+        model: The name of the OpenAI model
+
+    Returns:
+        TokenBucket: The token bucket of this model
+    """
+    with _buckets_lock:
+        return _buckets.setdefault(model, TokenBucket())
+
+
+def _requested_model(request: httpx.Request) -> str | None:
+    try:
+        body = json.loads(request.content)
+    except (httpx.RequestNotRead, ValueError):
+        return None
+    model = body.get("model") if isinstance(body, dict) else None
+    return model if isinstance(model, str) else None
+
+
+def _int_header(headers: httpx.Headers, name: str) -> int | None:
+    try:
+        return int(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def retry_after(headers: httpx.Headers) -> float:
+    """
+    Determine how long to wait after a rate limited response.
+
+    Args:
+        headers: The headers of the response
+
+    Returns:
+        float: How many seconds to wait before the next request
+    """
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, ValueError):
+        return DEFAULT_BACK_OFF
+
+
+def limit_request(request: httpx.Request) -> None:
+    """
+    httpx request hook which waits until the request is allowed by the rate limits.
+
+    Args:
+        request: The outgoing request
+    """
+    if model := _requested_model(request):
+        get_bucket(model).acquire()
+
+
+def record_rate_limits(response: httpx.Response) -> None:
+    """
+    httpx response hook which updates the rate limits from the response headers.
+
+    Args:
+        response: The response of OpenAI
+    """
+    if not (model := _requested_model(response.request)):
+        return
+    bucket, headers = get_bucket(model), response.headers
+    if response.status_code == 429:
+        seconds = retry_after(headers)
+        logger.warning("OpenAI rate limit for %s — pausing %ss", model, seconds)
+        bucket.pause(seconds)
+    limit = _int_header(headers, "x-ratelimit-limit-requests")
+    remaining = _int_header(headers, "x-ratelimit-remaining-requests")
+    if limit is not None and remaining is not None:
+        bucket.update(
+            limit,
+            remaining,
+            parse_duration(headers.get("x-ratelimit-reset-requests", "")),
+        )
+    if _int_header(headers, "x-ratelimit-remaining-tokens") == 0:
+        bucket.pause(parse_duration(headers.get("x-ratelimit-reset-tokens", "")))
@@ -0,0 +1,175 @@
+"""
+Content-addressed cache for generated text-to-speech audio.
+
+The same audio is requested again and again: a word appears in several jobs,
+imports are re-run and example sentence audio is regenerated in bulk. The
+normalized mp3 of every TTS request is therefore stored on local disk under the
+hash of all inputs which determine it (model, voice, text, instructions and
+loudness target). A hit returns the stored file instead of calling OpenAI and
+ffmpeg again.
+
+The cache is bounded to ``OPENAI_TTS_CACHE_SIZE`` megabytes: reading a file
+refreshes its modification time, and once the cache grows beyond its size the
+least recently used files are deleted until it is filled to 90% again. Each
+process keeps track of the size of the cache, so the directory is only scanned
+on the first store and when the size is exceeded. Setting the size to ``0``
+disables the cache. Files are written atomically, so several processes may
+share the directory; files stored by other processes are counted at the next
+scan.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+#: Bumped when the generated audio changes for the same inputs (e.g. a new
+#: normalization), so old cache entries aren't returned anymore
+CACHE_VERSION = 1
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+#: The size of each cache directory as known to this process
+_sizes: dict[str, int] = {}
+_sizes_lock = threading.Lock()
+
+
+def cache_key(**inputs: str | float) -> str:
+    """
+    Hash the inputs of a TTS request.
+
+    Args:
+        inputs: Everything which determines the generated audio
+
+    Returns:
+        str: The hex digest identifying the audio
+    """
+    payload = json.dumps({"version": CACHE_VERSION, **inputs}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _max_size() -> int:
+    return max(settings.OPENAI_TTS_CACHE_SIZE, 0) * 1024 * 1024
+
+
+def _path(key: str) -> Path:
+    return Path(settings.OPENAI_TTS_CACHE_DIR) / key[:2] / f"{key}.mp3"
+
+
+def _count(result: str) -> None:
+    with _stats_lock:
+        _stats[result] += 1
+
+
+def load(key: str) -> bytes | None:
+    """
+    Get cached audio and mark it as recently used.
+
+    Args:
+        key: The cache key of the audio
+
+    Returns:
+        bytes | None: The mp3 data, or None if it's not cached
+    """
+    if not _max_size():
+        return None
+    path = _path(key)
+    try:
+        data = path.read_bytes()
+        os.utime(path)
+    except FileNotFoundError:
+        _count("misses")
+        logger.debug("TTS cache miss for %s", key)
+        return None
+    _count("hits")
+    logger.debug("TTS cache hit for %s", key)
+    return data
+
+
+def store(key: str, data: bytes) -> None:
+    """
+    Cache audio and evict the least recently used files if the cache is full.
+
+    Failing to write the cache is logged, but doesn't fail the generation.
+
+    Args:
+        key: The cache key of the audio
+        data: The mp3 data
+    """
+    max_size = _max_size()
+    if not max_size:
+        return
+    path = _path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+        _track(len(data), max_size)
+    except OSError:
+        logger.exception("Could not write TTS cache entry %s", key)
+
+
+def _track(size: int, max_size: int) -> None:
+    """
+    Add a stored file to the size of the cache and evict files if it is full.
+    """
+    directory = settings.OPENAI_TTS_CACHE_DIR
+    with _sizes_lock:
+        total = _sizes.get(directory)
+        if total is None or total + size > max_size:
+            # The scan also counts the stored file
+            total = _evict(directory, max_size)
+        else:
+            total += size
+        _sizes[directory] = total
+
+
+def _evict(directory: str, max_size: int) -> int:
+    """
+    Delete the least recently used files if the cache doesn't fit into its size.
+
+    Returns:
+        int: The size of the remaining files
+    """
+    entries = []
+    for path in Path(directory).glob("*/*.mp3"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    if total <= max_size:
+        return total
+    # Leave some room, so the next stores don't have to scan the cache again
+    target = max_size * 9 // 10
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+    return total
+
+
+def stats() -> dict[str, int]:
+    """
+    Get the number of cache hits and misses of this process.
+
+    Returns:
+        dict[str, int]: The ``hits`` and ``misses``
+    """
+    with _stats_lock:
+        return dict(_stats)
@@ -21,6 +21,16 @@ urlpatterns = [
         views.import_from_csv,
         name="import_csv_for_job",
     ),
+    path(
+        "jobs/imports/<int:import_id>/",
+        views.import_csv_progress,
+        name="import_csv_progress",
+    ),
+    path(
+        "jobs/imports/<int:import_id>/status/",
+        views.import_csv_status,
+        name="import_csv_status",
+    ),
     path(
         "jobs/<int:job_id>/update-icon/", views.update_job_icon, name="update_job_icon"
     ),
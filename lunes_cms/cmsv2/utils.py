@@ -16,9 +16,12 @@ from django.utils.crypto import get_random_string
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe, SafeString
 from django.utils.translation import gettext as _
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
 from lunes_cms.core import settings
+from lunes_cms.core.media_metadata import file_exists, file_modified_time
+
+from .services.rate_limits import limit_request, record_rate_limits
 
 if TYPE_CHECKING:
     from lunes_cms.cmsv2.models.word import Word
@@ -102,12 +105,55 @@ def cache_busted_url(file: FieldFile) -> str:
         str: The file URL, cache-busted when possible.
     """
     try:
-        version = int(file.storage.get_modified_time(file.name or "").timestamp())
+        version = int(file_modified_time(file.storage, file.name or ""))
     except (NotImplementedError, OSError, ValueError):
         return file.url
     return f"{file.url}?v={version}"
 
 
+#: Sizes in pixels of the downscaled copies stored next to converted images.
+#: Each copy fits into a square of the size, images are never upscaled.
+IMAGE_SIZES = (64, 256, 512, 1024)
+
+
+def image_derivative_name(name: str, size: int) -> str:
+    """
+    Get the name of a downscaled copy of an image.
+
+    Args:
+        name: The name or path of the image
+        size: One of :data:`IMAGE_SIZES`
+
+    Returns:
+        str: The name of the WebP copy next to the image
+    """
+    return f"{os.path.splitext(name)[0]}_{size}w.webp"
+
+
+def get_image_derivative(image: ImageFieldFile, size: int) -> ImageFieldFile:
+    """
+    Get the smallest downscaled copy of an image that is at least as large as
+    the requested size.
+
+    Args:
+        image: The image
+        size: The requested size in pixels
+
+    Returns:
+        ImageFieldFile: The copy, or the image itself if it's larger than all
+        copies or has no copies (yet)
+    """
+    if not image or not image.name:
+        return image
+    size = next((s for s in IMAGE_SIZES if s >= size), 0)
+    if not size:
+        return image
+    name = image_derivative_name(image.name, size)
+    if not file_exists(image.storage, name):
+        return image
+    return ImageFieldFile(image.instance, image.field, name)
+
+
 def get_image_tag(image: ImageFieldFile, width: int = 330) -> SafeString:
     """
     Generate an HTML image tag for the given image.
@@ -123,10 +169,10 @@ def get_image_tag(image: ImageFieldFile, width: int = 330) -> SafeString:
     if (
         image
         and image.name
-        and image.storage.exists(image.name)
+        and file_exists(image.storage, image.name)
         and any(image.name.lower().endswith(ext) for ext in [".jpg", ".png", ".webp"])
     ):
-        src = escape(f"{settings.MEDIA_URL}{image}")
+        src = escape(f"{settings.MEDIA_URL}{get_image_derivative(image, width)}")
     html_cls = "" if src else 'class="hidden"'
     return mark_safe(f'<img src="{src}" width={int(width)} height="auto" {html_cls} />')
 
@@ -154,6 +200,9 @@ def get_openai_client() -> OpenAI:
     """
     Get OpenAI client if API key is available.
 
+    All requests of the client are subject to the shared rate limits of their
+    model (see :mod:`~lunes_cms.cmsv2.services.rate_limits`).
+
     Returns:
         OpenAI client instance if API key is available.
 
@@ -165,7 +214,15 @@ def get_openai_client() -> OpenAI:
             "OpenAI API key is not configured. Set the LUNES_CMS_OPENAI_API_KEY environment variable."
         )
 
-    return OpenAI(api_key=settings.OPENAI_API_KEY)
+    return OpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=DefaultHttpxClient(
+            event_hooks={
+                "request": [limit_request],
+                "response": [record_rate_limits],
+            }
+        ),
+    )
 
 
 def check_openai_availability() -> bool:
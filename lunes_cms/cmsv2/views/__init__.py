@@ -1,13 +1,13 @@
+from .delete_alternative_word import delete_alternative_word
 from .generate_example_sentence import (
     unitword_generate_example_sentence_via_openai,
     unitword_store_generated_example_sentence,
     word_generate_example_sentence_via_openai,
     word_store_generated_example_sentence,
 )
-from .delete_alternative_word import delete_alternative_word
 from .generate_image import generate_image_via_openai
+from .import_csv_view import import_csv_progress, import_csv_status, import_from_csv
 from .save_alternative_word import save_alternative_word
-from .import_csv_view import import_from_csv
 from .unitword_generate_example_sentence_audio import (
     unitword_generate_example_sentence_audio,
     unitword_generate_example_sentence_audio_via_openai,
@@ -39,6 +39,8 @@ __all__ = [
     "delete_alternative_word",
     "save_alternative_word",
     "import_from_csv",
+    "import_csv_progress",
+    "import_csv_status",
     "generate_image_via_openai",
     "unitword_generate_image",
     "unitword_store_generated_image_permanently",
@@ -1,9 +1,11 @@
-import threading
+import csv
 
 from django import forms
+from django.conf import settings
 from django.contrib import admin, messages
 from django.contrib.admin.views.decorators import staff_member_required
-from django.http import HttpRequest, HttpResponse
+from django.core.files.uploadedfile import UploadedFile
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -12,13 +14,16 @@ from tablib import Dataset
 from tablib.exceptions import InvalidDimensions
 
 from ..admins.word_import_resource import (
+    creator_fields_for_user,
     import_words_from_csv,
     validate_header_structure,
 )
-from ..models import Job
-from ..services.audio_generation import drain_pending_audio
-from ..services.image_generation import drain_pending_images
-from ..services.sentence_generation import drain_pending_sentences
+from ..models import CSVImport, Job
+from ..services.csv_import_queue import enqueue_csv_import, read_csv_header
+from ..services.generation_queue import enqueue_word_assets
+
+#: How many milliseconds the progress page of a background import waits between two polls
+STATUS_POLL_INTERVAL = 2000
 
 
 class ImportCSVForm(forms.Form):
@@ -57,18 +62,20 @@ def _build_success_message(words_created: int, units_created: int) -> str:
     ) % {"words": words_phrase, "units": units_phrase}
 
 
-def _report_dataset_issue(request: HttpRequest, data: Dataset) -> bool:
+def _report_import_issue(
+    request: HttpRequest, headers: list[str] | None, has_entries: bool
+) -> bool:
     """
-    Checks whether the uploaded dataset can be imported at all, adding the
+    Checks whether the uploaded file can be imported at all, adding the
     appropriate user-facing message if not. Returns True if the caller
-    should stop (nothing to import), False if the dataset is ready for
-    ``import_words_from_csv``.
+    should stop (nothing to import), False if the file is ready for the
+    import.
     """
-    format_error = validate_header_structure(data.headers)
+    format_error = validate_header_structure(headers)
     if format_error:
         messages.error(request, format_error)
         return True
-    if len(data) == 0:
+    if not has_entries:
         messages.warning(
             request, _("The file contains no entries. Nothing was imported.")
         )
@@ -76,6 +83,15 @@ def _report_dataset_issue(request: HttpRequest, data: Dataset) -> bool:
     return False
 
 
+def _build_warning_message(errors: list[str]) -> str:
+    """
+    Builds the message shown after a CSV import in which some rows failed.
+    """
+    return _("Import completed with warnings: %(summary)s") % {
+        "summary": " | ".join(errors[:5])
+    }
+
+
 def _build_context(
     request: HttpRequest, form: ImportCSVForm, job: Job | None, job_id: int | None
 ) -> dict:
@@ -96,10 +112,59 @@ def _build_context(
     }
 
 
+def _import_now(request: HttpRequest, csv_file: UploadedFile, job: Job) -> str | None:
+    """
+    Imports a file during the request. Returns the URL to redirect to, or
+    None if the file can't be imported.
+    """
+    data = Dataset()
+    data.load(csv_file.read().decode("utf-8"), format="csv")
+
+    if _report_import_issue(request, data.headers, len(data) > 0):
+        return None
+
+    # request.user is `User | AnonymousUser`, but this view is only
+    # reachable by authenticated staff users.
+    words_created, units_created, errors, imported_word_ids = import_words_from_csv(
+        data, job, request.user  # type: ignore[arg-type]
+    )
+
+    if errors:
+        messages.warning(request, _build_warning_message(errors))
+    else:
+        messages.success(request, _build_success_message(words_created, units_created))
+
+    if imported_word_ids:
+        # Sentences, audio and images are generated by the
+        # ``run_generation_worker`` command
+        enqueue_word_assets(imported_word_ids, job=job)
+    return reverse("admin:cmsv2_job_change", args=[job.pk])
+
+
+def _start_background_import(
+    request: HttpRequest, csv_file: UploadedFile, job: Job
+) -> str | None:
+    """
+    Queues a large file for the ``run_import_worker`` command after checking
+    its header. Returns the URL of the progress page, or None if the file
+    can't be imported.
+    """
+    headers, has_entries = read_csv_header(csv_file)
+    if _report_import_issue(request, headers, has_entries):
+        return None
+    # Fail early for users whose imports can't be attributed to a group
+    creator_fields_for_user(request.user)  # type: ignore[arg-type]
+    csv_import = enqueue_csv_import(
+        csv_file, job, request.user  # type: ignore[arg-type]
+    )
+    return reverse("cmsv2:import_csv_progress", args=[csv_import.pk])
+
+
 @staff_member_required
 def import_from_csv(request: HttpRequest, job_id: int | None = None) -> HttpResponse:
     """
-    Method for importing vocabularies for a job from csv
+    Method for importing vocabularies for a job from csv. Files larger than
+    ``CSV_IMPORT_BACKGROUND_SIZE`` are imported in the background.
     """
     job = get_object_or_404(Job, pk=job_id) if job_id else None
 
@@ -124,52 +189,15 @@ def import_from_csv(request: HttpRequest, job_id: int | None = None) -> HttpResp
     csv_file = form.cleaned_data["csv_file"]
     selected_job = form.cleaned_data["job"]
     try:
-        data = Dataset()
-        data.load(csv_file.read().decode("utf-8"), format="csv")
-
-        if _report_dataset_issue(request, data):
-            return render(
-                request,
-                "admin/csv_form.html",
-                _build_context(request, form, job, job_id),
-            )
-
-        # request.user is `User | AnonymousUser`, but this view is only
-        # reachable by authenticated staff users.
-        words_created, units_created, errors, imported_word_ids = import_words_from_csv(
-            data, selected_job, request.user  # type: ignore[arg-type]
-        )
-
-        if errors:
-            error_summary = " | ".join(errors[:5])
-            messages.warning(
-                request,
-                _("Import completed with warnings: %(summary)s")
-                % {"summary": error_summary},
-            )
+        if csv_file.size > settings.CSV_IMPORT_BACKGROUND_SIZE:
+            redirect_url = _start_background_import(request, csv_file, selected_job)
         else:
-            messages.success(
-                request, _build_success_message(words_created, units_created)
-            )
-
-        if imported_word_ids:
-            # Run the three drains sequentially in one thread:
-            #   1. sentences  — audio can only be made once the sentence exists
-            #   2. audio
-            #   3. images
-            # They must not run in parallel: each does a full ``Word.save()``,
-            # so concurrent drains would write back stale in-memory copies and
-            # clobber each other's file fields (re-triggering generation).
-            def _generate_word_assets() -> None:
-                drain_pending_sentences(imported_word_ids, job_title=selected_job.name)
-                drain_pending_audio(imported_word_ids)
-                drain_pending_images(imported_word_ids, job_title=selected_job.name)
-
-            threading.Thread(
-                target=_generate_word_assets,
-                daemon=True,
-            ).start()
-        return redirect(reverse("admin:cmsv2_job_change", args=[selected_job.pk]))
+            redirect_url = _import_now(request, csv_file, selected_job)
+        if redirect_url:
+            return redirect(redirect_url)
+        return render(
+            request, "admin/csv_form.html", _build_context(request, form, job, job_id)
+        )
 
     except InvalidDimensions:
         messages.error(
@@ -181,7 +209,7 @@ def import_from_csv(request: HttpRequest, job_id: int | None = None) -> HttpResp
         return render(
             request, "admin/csv_form.html", _build_context(request, form, job, job_id)
         )
-    except (AttributeError, IndexError, TypeError, ValueError) as e:
+    except (AttributeError, IndexError, TypeError, ValueError, csv.Error) as e:
         messages.error(
             request,
             _("Import failed: %(e)s") % {"e": e},
@@ -190,3 +218,59 @@ def import_from_csv(request: HttpRequest, job_id: int | None = None) -> HttpResp
         return render(
             request, "admin/csv_form.html", _build_context(request, form, job, job_id)
         )
+
+
+@staff_member_required
+def import_csv_progress(request: HttpRequest, import_id: int) -> HttpResponse:
+    """
+    Shows the progress of a CSV file imported in the background
+    """
+    csv_import = get_object_or_404(
+        CSVImport.objects.select_related("job"), pk=import_id
+    )
+    return render(
+        request,
+        "admin/csv_form.html",
+        {
+            **admin.site.each_context(request),
+            "job": csv_import.job,
+            "csv_import": csv_import,
+            "title": _("CSV import for vocabulary"),
+            "status_url": reverse("cmsv2:import_csv_status", args=[csv_import.pk]),
+            "poll_interval": STATUS_POLL_INTERVAL,
+        },
+    )
+
+
+@staff_member_required
+def import_csv_status(_request: HttpRequest, import_id: int) -> JsonResponse:
+    """
+    Returns the progress of a CSV file imported in the background, polled by
+    the progress page
+    """
+    csv_import = get_object_or_404(CSVImport, pk=import_id)
+    message: str
+    if csv_import.status == CSVImport.Status.FAILED:
+        message = _("Import failed: %(e)s") % {"e": csv_import.last_error}
+    elif csv_import.status == CSVImport.Status.DONE and csv_import.errors:
+        message = _build_warning_message(csv_import.errors)
+    elif csv_import.status == CSVImport.Status.DONE:
+        message = _build_success_message(
+            csv_import.words_created, csv_import.units_created
+        )
+    elif csv_import.lease_owner:
+        message = ngettext(
+            "%(count)s row imported...",
+            "%(count)s rows imported...",
+            csv_import.rows_processed,
+        ) % {"count": csv_import.rows_processed}
+    else:
+        message = str(_("Waiting for the import to start..."))
+    return JsonResponse(
+        {
+            "status": csv_import.status,
+            "progress": csv_import.progress,
+            "message": message,
+            "errors": csv_import.errors,
+        }
+    )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import re
 import subprocess
 import tempfile
 
@@ -19,23 +20,6 @@ def validate_audio_upload(uploaded_file: UploadedFile) -> None:
     uploaded_file.seek(0)
 
 
-def run_ffmpeg(*args: str) -> "subprocess.CompletedProcess[bytes]":
-    """
-    Run ffmpeg with the given arguments, raising ValidationError on failure.
-
-    Returns the completed process so callers can read stderr.
-    """
-    try:
-        return subprocess.run(["ffmpeg", *args], check=True, capture_output=True)
-    except subprocess.CalledProcessError as e:
-        raise ValidationError({"audio": _("Invalid audio file")}) from e
-
-
-def probe_ffmpeg(path: str) -> None:
-    """Probe an audio file path with ffmpeg to check that it contains a valid audio stream."""
-    run_ffmpeg("-v", "error", "-i", path, "-map", "0:a:0", "-f", "null", "-")
-
-
 #: True-peak ceiling and loudness range used alongside the integrated
 #: loudness target (EBU R128 defaults, they rarely need tuning)
 _LOUDNORM_TRUE_PEAK = -1.5
@@ -45,43 +29,38 @@ _LOUDNORM_RANGE = 11.0
 _DEFAULT_SAMPLE_RATE = "24000"
 _DEFAULT_BITRATE = "96k"
 
+#: Description of the ID3 tag (``TXXX`` frame) normalized audio stores its own
+#: loudness measurement in
+LOUDNESS_TAG = "loudnorm"
+
+#: The loudnorm measurement values needed for a linear normalization
+_MEASUREMENT_KEYS = ("input_i", "input_tp", "input_lra", "input_thresh")
+
+#: Matches the audio stream ffmpeg describes on stderr, e.g.
+#: "Audio: mp3 (mp3float), 24000 Hz, mono, fltp, 160 kb/s"
+_AUDIO_STREAM_RE = re.compile(r"Audio: .*?(\d+) Hz(?:.*?(\d+) kb/s)?")
 
-def _probe_audio_params(path: str) -> tuple[str, str]:
+
+def run_ffmpeg(
+    *args: str, input_bytes: bytes | None = None
+) -> "subprocess.CompletedProcess[bytes]":
     """
-    Read the sample rate and bitrate of an audio file via ffprobe.
+    Run ffmpeg with the given arguments, raising ValidationError on failure.
 
-    Used to re-encode at the source's own rate/bitrate; loudnorm otherwise
-    forces 48 kHz output and re-picks the bitrate, needlessly inflating files.
-    Falls back to defaults if probing fails.
+    Returns the completed process so callers can read stdout and stderr.
+    ``input_bytes`` is passed to ffmpeg's stdin (read with ``-i pipe:0``).
     """
     try:
-        result = subprocess.run(
-            [
-                "ffprobe",
-                "-v",
-                "error",
-                "-select_streams",
-                "a:0",
-                "-show_entries",
-                "stream=sample_rate,bit_rate",
-                "-of",
-                "default=noprint_wrappers=1",
-                path,
-            ],
-            check=True,
-            capture_output=True,
-            text=True,
+        return subprocess.run(
+            ["ffmpeg", *args], input=input_bytes, check=True, capture_output=True
         )
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return _DEFAULT_SAMPLE_RATE, _DEFAULT_BITRATE
-    values = dict(
-        line.split("=", 1) for line in result.stdout.splitlines() if "=" in line
-    )
-    sample_rate = values.get("sample_rate") or _DEFAULT_SAMPLE_RATE
-    bitrate = values.get("bit_rate")
-    if not bitrate or bitrate == "N/A":
-        bitrate = _DEFAULT_BITRATE
-    return sample_rate, bitrate
+    except subprocess.CalledProcessError as e:
+        raise ValidationError({"audio": _("Invalid audio file")}) from e
+
+
+def probe_ffmpeg(path: str) -> None:
+    """Probe an audio file path with ffmpeg to check that it contains a valid audio stream."""
+    run_ffmpeg("-v", "error", "-i", path, "-map", "0:a:0", "-f", "null", "-")
 
 
 def _parse_loudnorm_stats(stderr: bytes) -> dict[str, str]:
@@ -94,6 +73,105 @@ def _parse_loudnorm_stats(stderr: bytes) -> dict[str, str]:
     return result
 
 
+def _parse_audio_params(stderr: bytes) -> tuple[str, str]:
+    """
+    Read the sample rate and bitrate of the input from ffmpeg's stream info.
+
+    Used to re-encode at the source's own rate/bitrate; loudnorm otherwise
+    forces 48 kHz output and re-picks the bitrate, needlessly inflating files.
+    Falls back to defaults if the stream info can't be parsed.
+    """
+    match = _AUDIO_STREAM_RE.search(stderr.decode("utf-8", "replace"))
+    if not match:
+        return _DEFAULT_SAMPLE_RATE, _DEFAULT_BITRATE
+    sample_rate, kbps = match.groups()
+    return sample_rate, f"{kbps}k" if kbps else _DEFAULT_BITRATE
+
+
+def _syncsafe(data: bytes) -> int:
+    """Decode a 28 bit "syncsafe" integer of an ID3v2 header."""
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+def _encode_syncsafe(value: int) -> bytes:
+    """Encode a 28 bit "syncsafe" integer of an ID3v2 header."""
+    return bytes((value >> shift) & 0x7F for shift in (21, 14, 7, 0))
+
+
+def _loudness_tag(measurement: dict[str, str]) -> bytes:
+    """
+    Build an ID3v2.4 tag storing a loudness measurement in a ``TXXX`` frame,
+    which :func:`read_loudness_tag` reads back.
+    """
+    data = f"\0{LOUDNESS_TAG}\0{json.dumps(measurement)}".encode("latin-1")
+    frame = b"TXXX" + _encode_syncsafe(len(data)) + b"\0\0" + data
+    return b"ID3\4\0\0" + _encode_syncsafe(len(frame)) + frame
+
+
+def read_loudness_tag(audio_bytes: bytes) -> dict[str, str] | None:
+    """
+    Read the loudness measurement :func:`normalize_loudness` stored in an mp3.
+
+    Only the ID3v2 header at the start of the file is parsed, so this is much
+    cheaper than measuring the audio (or even launching ffprobe).
+
+    Returns None if the audio doesn't carry a measurement.
+    """
+    if len(audio_bytes) < 10 or audio_bytes[:3] != b"ID3":
+        return None
+    version = audio_bytes[3]
+    end = 10 + _syncsafe(audio_bytes[6:10])
+    position = 10
+    while position + 10 <= min(end, len(audio_bytes)):
+        frame_id = audio_bytes[position : position + 4]
+        if not frame_id.strip(b"\0"):
+            # Padding
+            break
+        size_bytes = audio_bytes[position + 4 : position + 8]
+        size = (
+            _syncsafe(size_bytes) if version >= 4 else int.from_bytes(size_bytes, "big")
+        )
+        data = audio_bytes[position + 10 : position + 10 + size]
+        position += 10 + size
+        if frame_id != b"TXXX":
+            continue
+        # Text encoding byte, description and value, each terminated by a null
+        # byte (ASCII text is written as ISO-8859-1)
+        description, _separator, value = data[1:].partition(b"\0")
+        if description.decode("latin-1") != LOUDNESS_TAG:
+            continue
+        try:
+            measurement: dict[str, str] = json.loads(value.rstrip(b"\0"))
+        except ValueError:
+            return None
+        if not all(key in measurement for key in _MEASUREMENT_KEYS):
+            return None
+        return measurement
+    return None
+
+
+def _output_measurement(
+    stats: dict[str, str], sample_rate: str, bitrate: str
+) -> dict[str, str] | None:
+    """
+    Turn the statistics loudnorm prints about its output into the measurement
+    of the normalized audio, which a later normalization can start from.
+    """
+    try:
+        measurement = {
+            f"input_{key}": stats[f"output_{key}"]
+            for key in ("i", "tp", "lra", "thresh")
+        }
+    except KeyError:
+        return None
+    return {
+        **measurement,
+        "target_offset": "0.00",
+        "sample_rate": sample_rate,
+        "bitrate": bitrate,
+    }
+
+
 def normalize_loudness(audio_bytes: bytes, target_lufs: float) -> bytes:
     """
     Normalize mp3 audio to a target integrated loudness (EBU R128 loudnorm).
@@ -106,47 +184,73 @@ def normalize_loudness(audio_bytes: bytes, target_lufs: float) -> bytes:
     applies a fixed (linear) gain to reach the target. Single-pass loudnorm
     normalizes dynamically and is unreliable on single words, which is exactly
     where the volume jumps are worst.
+
+    The audio is piped through ffmpeg instead of written to temporary files,
+    and the sample rate and bitrate are read from the first pass instead of
+    probed separately. The normalized audio carries its own measurement, as
+    reported by the second pass, in an ID3 tag, so normalizing it again (e.g.
+    to a new target) skips the first pass.
     """
     target = f"loudnorm=I={target_lufs}:TP={_LOUDNORM_TRUE_PEAK}:LRA={_LOUDNORM_RANGE}"
-    with (
-        tempfile.NamedTemporaryFile(suffix=".mp3") as src,
-        tempfile.NamedTemporaryFile(suffix=".mp3") as dst,
-    ):
-        src.write(audio_bytes)
-        src.flush()
-        sample_rate, bitrate = _probe_audio_params(src.name)
-
+    measured = read_loudness_tag(audio_bytes)
+    if measured is not None:
+        sample_rate = measured.get("sample_rate", _DEFAULT_SAMPLE_RATE)
+        bitrate = measured.get("bitrate", _DEFAULT_BITRATE)
+    else:
         # Pass 1: measure loudness. "-f null -" discards the audio output; we
-        # only want loudnorm's measurement, which it prints as JSON to stderr.
+        # only want loudnorm's measurement, which it prints as JSON to stderr
+        # (after the description of the input stream).
         measurement = run_ffmpeg(
+            "-hide_banner",
             "-i",
-            src.name,
+            "pipe:0",
             "-af",
             f"{target}:print_format=json",
             "-f",
             "null",
             "-",
+            input_bytes=audio_bytes,
         )
         measured = _parse_loudnorm_stats(measurement.stderr)
+        sample_rate, bitrate = _parse_audio_params(measurement.stderr)
 
-        # Pass 2: feed pass 1's measurements back so loudnorm applies a single
-        # fixed gain to hit the target, preserving the source rate/bitrate.
-        run_ffmpeg(
-            "-y",
-            "-i",
-            src.name,
-            "-af",
-            f"{target}:linear=true"
-            f":measured_I={measured['input_i']}"
-            f":measured_TP={measured['input_tp']}"
-            f":measured_LRA={measured['input_lra']}"
-            f":measured_thresh={measured['input_thresh']}"
-            f":offset={measured['target_offset']}",
-            "-ar",
-            sample_rate,
-            "-b:a",
-            bitrate,
-            dst.name,
+    # Pass 2: feed pass 1's measurements back so loudnorm applies a single
+    # fixed gain to hit the target, preserving the source rate/bitrate, and let
+    # it print the loudness of its output. ffmpeg writes its ID3 tag before the
+    # output is known, so it doesn't write one and the tag with the output's
+    # measurement is prepended afterwards. The Xing header can't be rewritten
+    # on a pipe, so don't write one (the output is CBR and doesn't need it).
+    result = run_ffmpeg(
+        "-hide_banner",
+        "-i",
+        "pipe:0",
+        "-af",
+        f"{target}:linear=true"
+        f":measured_I={measured['input_i']}"
+        f":measured_TP={measured['input_tp']}"
+        f":measured_LRA={measured['input_lra']}"
+        f":measured_thresh={measured['input_thresh']}"
+        f":offset={measured.get('target_offset', '0.0')}"
+        ":print_format=json",
+        "-ar",
+        sample_rate,
+        "-b:a",
+        bitrate,
+        "-id3v2_version",
+        "0",
+        "-write_xing",
+        "0",
+        "-f",
+        "mp3",
+        "pipe:1",
+        input_bytes=audio_bytes,
+    )
+    try:
+        output_measurement = _output_measurement(
+            _parse_loudnorm_stats(result.stderr), sample_rate, bitrate
         )
-        dst.seek(0)
-        return dst.read()
+    except (ValidationError, ValueError):
+        output_measurement = None
+    if output_measurement is None:
+        return result.stdout
+    return _loudness_tag(output_measurement) + result.stdout
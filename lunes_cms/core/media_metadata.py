@@ -0,0 +1,172 @@
+"""
+Request-scoped cache of media file metadata.
+
+Rendering an admin changelist or an API response checks whether images exist
+(and which downscaled copies exist) and reads the modification times of audio
+files for their cache-busted URLs, often several times for the same file. Within
+a ``GET`` or ``HEAD`` request, :class:`MediaMetadataMiddleware` caches these
+lookups, so every file is looked up once. For storages on the local file system,
+a single ``stat`` call answers both questions. Once more than
+:data:`LISTING_THRESHOLD` files of the same directory were looked up, e.g. for a
+changelist page, the directory is listed once and answers the remaining existence
+checks. A single lookup never lists a (possibly huge) directory. Outside of such
+requests, the helpers ask the storage directly.
+
+Requests with other methods aren't cached, since they may change files while
+they are processed.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+from django.core.files.storage import FileSystemStorage, Storage
+from django.http import HttpRequest, HttpResponse
+
+T = TypeVar("T")
+
+#: How many files of a directory are looked up one by one during a request before
+#: the directory is listed instead
+LISTING_THRESHOLD = 32
+
+_cache: ContextVar[dict[tuple[str, int, str], Any] | None] = ContextVar(
+    "media_metadata_cache", default=None
+)
+
+
+@contextmanager
+def media_metadata_cache() -> Iterator[None]:
+    """
+    Cache the metadata of media files looked up inside this context.
+    """
+    token = _cache.set({})
+    try:
+        yield
+    finally:
+        _cache.reset(token)
+
+
+def _memoize(kind: str, storage: Storage, name: str, compute: Callable[[], T]) -> T:
+    cache = _cache.get()
+    if cache is None:
+        return compute()
+    key = (kind, id(storage), name)
+    if key not in cache:
+        cache[key] = compute()
+    result: T = cache[key]
+    return result
+
+
+def _local_path(storage: Storage, name: str) -> str:
+    """
+    Get the path of a file of a local storage.
+
+    :raises NotImplementedError: If the storage isn't on the local file system
+    :return: The path of the file
+    """
+    if not isinstance(storage, FileSystemStorage):
+        raise NotImplementedError("Only files of local storages have a path")
+    return storage.path(name)
+
+
+def _stat(storage: Storage, name: str) -> os.stat_result | None:
+    """
+    Get the status of a file of a local storage.
+
+    :raises NotImplementedError: If the storage isn't on the local file system
+    :return: The status, or ``None`` if the file doesn't exist
+    """
+    path = _local_path(storage, name)
+
+    def stat() -> os.stat_result | None:
+        try:
+            return os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    return _memoize("stat", storage, name, stat)
+
+
+def _listing(storage: Storage, name: str) -> frozenset[str] | None:
+    """
+    Get the names in the directory of a file of a local storage, once more than
+    :data:`LISTING_THRESHOLD` files of the directory were looked up in the
+    current cache.
+
+    :raises NotImplementedError: If the storage isn't on the local file system
+    :return: The names, or ``None`` if the file is to be looked up on its own
+    """
+    directory = os.path.dirname(_local_path(storage, name))
+    cache = _cache.get()
+    if cache is None or ("stat", id(storage), name) in cache:
+        return None
+    key = ("listing", id(storage), directory)
+    if key not in cache:
+        lookups = cache.get(("lookups", id(storage), directory), 0) + 1
+        cache[("lookups", id(storage), directory)] = lookups
+        if lookups <= LISTING_THRESHOLD:
+            return None
+        try:
+            with os.scandir(directory) as entries:
+                cache[key] = frozenset(entry.name for entry in entries)
+        except (FileNotFoundError, NotADirectoryError):
+            cache[key] = frozenset()
+    listing: frozenset[str] = cache[key]
+    return listing
+
+
+def file_exists(storage: Storage, name: str) -> bool:
+    """
+    Check whether a media file exists.
+
+    :param storage: The storage of the file
+    :param name: The name of the file
+    :return: Whether the file exists
+    """
+    try:
+        listing = _listing(storage, name)
+    except NotImplementedError:
+        return _memoize("exists", storage, name, lambda: storage.exists(name))
+    if listing is not None:
+        return os.path.basename(name) in listing
+    return _stat(storage, name) is not None
+
+
+def file_modified_time(storage: Storage, name: str) -> float:
+    """
+    Get the last modification time of a media file.
+
+    :param storage: The storage of the file
+    :param name: The name of the file
+    :raises FileNotFoundError: If the file doesn't exist
+    :raises NotImplementedError: If the storage doesn't support modification times
+    :return: The POSIX timestamp of the last modification
+    """
+    try:
+        status = _stat(storage, name)
+    except NotImplementedError:
+        return _memoize(
+            "mtime", storage, name, lambda: storage.get_modified_time(name).timestamp()
+        )
+    if status is None:
+        raise FileNotFoundError(name)
+    return status.st_mtime
+
+
+class MediaMetadataMiddleware:
+    """
+    Middleware caching the metadata of media files during ``GET`` and ``HEAD`` requests.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if request.method not in ("GET", "HEAD"):
+            return self.get_response(request)
+        with media_metadata_cache():
+            return self.get_response(request)
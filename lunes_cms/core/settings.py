@@ -63,6 +63,18 @@ OPENAI_IMAGE_QUALITY = os.environ.get("LUNES_CMS_OPENAI_IMAGE_QUALITY", "low")
 #: OpenAI model used for text generation (e.g. example sentences)
 OPENAI_TEXT_MODEL = os.environ.get("LUNES_CMS_OPENAI_TEXT_MODEL", "gpt-4.1")
 
+#: How many requests the background generation sends to the text-to-speech model at the same time
+OPENAI_TTS_CONCURRENCY = int(os.environ.get("LUNES_CMS_OPENAI_TTS_CONCURRENCY", 4))
+
+#: How many requests the background generation sends to the image model at the same time
+OPENAI_IMAGE_CONCURRENCY = int(os.environ.get("LUNES_CMS_OPENAI_IMAGE_CONCURRENCY", 2))
+
+#: How many requests the background generation sends to the text model at the same time
+OPENAI_TEXT_CONCURRENCY = int(os.environ.get("LUNES_CMS_OPENAI_TEXT_CONCURRENCY", 4))
+
+#: Maximum size in MB of the cache of generated text-to-speech audio (0 disables the cache)
+OPENAI_TTS_CACHE_SIZE = int(os.environ.get("LUNES_CMS_OPENAI_TTS_CACHE_SIZE", 500))
+
 ###################
 # MATOMO TRACKING #
 ###################
@@ -149,6 +161,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "lunes_cms.core.media_metadata.MediaMetadataMiddleware",
 ]
 
 ########################
@@ -370,6 +383,22 @@ MEDIA_ROOT = os.environ.get("LUNES_CMS_MEDIA_ROOT", os.path.join(BASE_DIR, "medi
 TEMP_AUDIO_DIR = os.path.join(MEDIA_ROOT, "temp_audio")
 TEMP_IMAGE_DIR = os.path.join(MEDIA_ROOT, "temp_image")
 
+#: Directory for the prebuilt offline bundles of jobs
+JOB_BUNDLE_ROOT = os.environ.get(
+    "LUNES_CMS_JOB_BUNDLE_ROOT", os.path.join(MEDIA_ROOT, "bundles")
+)
+
+#: Size in bytes above which uploaded CSV files are imported in the background by the
+#: ``run_import_worker`` command instead of during the upload request
+CSV_IMPORT_BACKGROUND_SIZE = int(
+    os.environ.get("LUNES_CMS_CSV_IMPORT_BACKGROUND_SIZE", 1024 * 1024)
+)
+
+#: Directory for the cache of generated text-to-speech audio
+OPENAI_TTS_CACHE_DIR = os.environ.get(
+    "LUNES_CMS_OPENAI_TTS_CACHE_DIR", os.path.join(MEDIA_ROOT, "tts_cache")
+)
+
 
 ##########
 # EMAILS #
@@ -576,6 +605,50 @@ SPECTACULAR_SETTINGS = {
     ],
 }
 
+###########
+# CACHING #
+###########
+
+#: Configuration of the cache (see :setting:`django:CACHES`). The default local-memory cache
+#: is private to each process, so deployments with several worker processes should
+#: configure a shared backend to make content changes visible in all of them right away.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "LUNES_CMS_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("LUNES_CMS_CACHE_LOCATION", ""),
+    }
+}
+
+#: How many days deletions are kept for the API's change feed. Clients whose last sync is
+#: older than this have to download their content in full again.
+CHANGES_RETENTION_DAYS = int(os.environ.get("LUNES_CMS_CHANGES_RETENTION_DAYS", 90))
+
+#: How many seconds responses of the read-only API are cached (``0`` disables the cache).
+#: Cached responses are invalidated whenever the content changes, so this only bounds
+#: how long processes without a shared cache may serve stale content.
+API_CACHE_TIMEOUT = int(os.environ.get("LUNES_CMS_API_CACHE_TIMEOUT", 300))
+
+#############
+# ANALYTICS #
+#############
+
+#: Maximum number of events accepted by a single request to the bulk analytics endpoint
+ANALYTICS_BULK_MAX_EVENTS = int(
+    os.environ.get("LUNES_CMS_ANALYTICS_BULK_MAX_EVENTS", 100)
+)
+
+#: How many analytics events each process buffers in memory before writing them with a
+#: single query (``0`` disables the buffer). Buffered events are lost if the process dies,
+#: so requests are answered with ``202 Accepted`` instead of ``201 Created``.
+ANALYTICS_BUFFER_SIZE = int(os.environ.get("LUNES_CMS_ANALYTICS_BUFFER_SIZE", 0))
+
+#: How many seconds analytics events stay in the buffer at most before they are written
+ANALYTICS_BUFFER_MAX_AGE = float(
+    os.environ.get("LUNES_CMS_ANALYTICS_BUFFER_MAX_AGE", 5)
+)
+
 ##################
 # DJANGO JAZZMIN #
 ##################
@@ -612,6 +685,7 @@ JAZZMIN_SETTINGS = {
         "cmsv2.Unit": "fas fa-book",
         "cmsv2.Word": "fab fa-amilia",
         "cmsv2.Feedback": "fas fa-comment",
+        "cmsv2.GenerationTask": "fas fa-tasks",
     },
     "site_version": _cms_version,
     # Render the Analytics app section directly below Dashboard. Jazzmin's
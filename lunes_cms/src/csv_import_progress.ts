@@ -0,0 +1,57 @@
+type CSVImportProgressConfig = {
+    statusUrl: string
+    pollInterval: number
+}
+
+type CSVImportStatus = {
+    status: "pending" | "done" | "failed"
+    progress: number
+    message: string
+    errors: string[]
+}
+
+// Called from Django template (csv_form.html) while a large file is imported in the background
+window.initCSVImportProgress = function (config: CSVImportProgressConfig): void {
+    const progressBar = document.getElementById("csv_import_progress_bar") as HTMLElement
+    const messageArea = document.getElementById("csv_import_message") as HTMLElement
+    const errorList = document.getElementById("csv_import_errors") as HTMLUListElement
+
+    function render(data: CSVImportStatus): void {
+        progressBar.style.width = `${data.progress}%`
+        progressBar.textContent = `${data.progress} %`
+        progressBar.classList.toggle("progress-bar-animated", data.status === "pending")
+        progressBar.classList.toggle("bg-danger", data.status === "failed")
+        progressBar.classList.toggle("bg-success", data.status === "done")
+        messageArea.textContent = data.message
+        errorList.replaceChildren(
+            ...data.errors.map((error) => {
+                const item = document.createElement("li")
+                item.textContent = error
+                return item
+            }),
+        )
+    }
+
+    function poll(): void {
+        fetch(config.statusUrl, { headers: { Accept: "application/json" } })
+            .then((response) => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`)
+                }
+                return response.json()
+            })
+            .then((data: CSVImportStatus) => {
+                render(data)
+                if (data.status === "pending") {
+                    window.setTimeout(poll, config.pollInterval)
+                }
+            })
+            .catch((error) => {
+                console.error("Error:", error)
+                // Keep polling, the status is only temporarily unavailable
+                window.setTimeout(poll, config.pollInterval)
+            })
+    }
+
+    poll()
+}
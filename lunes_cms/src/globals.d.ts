@@ -8,6 +8,7 @@ interface Window {
     audioAssetManagerConfig?: AudioAssetManagerConfig
     initAudioGenerator: (config: AudioGeneratorConfig) => void
     initImageGenerator: (config: ImageGeneratorConfig) => void
+    initCSVImportProgress: (config: CSVImportProgressConfig) => void
     document_overlay: (event: MouseEvent & { target: HTMLSelectElement }) => void
     renderReportsChart: (canvas: HTMLCanvasElement, data: ChartData) => void
 }
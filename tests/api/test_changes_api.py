@@ -0,0 +1,281 @@
+"""
+Tests for the change feed of the v2 API.
+"""
+
+from datetime import datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.test.client import Client
+from django.utils import timezone
+from pytest_django.fixtures import SettingsWrapper
+
+from lunes_cms.api.v2.changes import CURSOR_OVERLAP
+from lunes_cms.cmsv2.models import AlternativeWord, Job, Tombstone, Unit, Word
+from lunes_cms.cmsv2.models import word as word_module
+from lunes_cms.cmsv2.models.static import CheckStatus
+from lunes_cms.cmsv2.models.unit import UnitWordRelation
+from lunes_cms.cmsv2.services import (
+    audio_generation,
+    image_generation,
+    sentence_generation,
+)
+
+CHANGES_ENDPOINT = "/api/v2/changes/"
+
+
+def _published_unit() -> tuple[Job, Unit]:
+    job = Job.objects.create(name="Koch/Köchin", released=True)
+    unit = Unit.objects.create(title="Küche", released=True)
+    unit.jobs.add(job)
+    return job, unit
+
+
+def _add_published_word(unit: Unit, word: str) -> Word:
+    word_obj = Word.objects.create(word=word, singular_article=1)
+    Word.objects.filter(pk=word_obj.pk).update(
+        audio_check_status=CheckStatus.CONFIRMED,
+        image_check_status=CheckStatus.CONFIRMED,
+    )
+    UnitWordRelation.objects.create(unit=unit, word=word_obj)
+    return word_obj
+
+
+def _changes_since(since: datetime) -> dict:
+    """Get the changes since the given time, ignoring the overlap of the cursor"""
+    response = Client().get(
+        CHANGES_ENDPOINT, {"since": (since + CURSOR_OVERLAP).isoformat()}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.django_db()
+def test_without_cursor_only_a_cursor_is_returned() -> None:
+    """A client without a previous sync only gets the cursor to start from."""
+    _published_unit()
+
+    response = Client().get(CHANGES_ENDPOINT).json()
+
+    assert response["cursor"]
+    assert response["jobs"] == {"changed": [], "removed": []}
+    assert response["unit_words"] == {"changed": [], "removed": []}
+
+
+@pytest.mark.django_db()
+def test_invalid_cursor_is_rejected() -> None:
+    """Cursors have to be timestamps."""
+    assert Client().get(CHANGES_ENDPOINT, {"since": "yesterday"}).status_code == 400
+
+
+@pytest.mark.django_db()
+def test_expired_cursor_is_rejected(settings: SettingsWrapper) -> None:
+    """Cursors from before the retention of the tombstones are rejected."""
+    settings.CHANGES_RETENTION_DAYS = 30
+    since = timezone.now() - timedelta(days=31)
+
+    response = Client().get(CHANGES_ENDPOINT, {"since": since.isoformat()})
+
+    assert response.status_code == 400
+    assert "30 days" in response.json()["since"][0]
+
+
+@pytest.mark.django_db()
+def test_expired_tombstones_are_pruned(settings: SettingsWrapper) -> None:
+    """The prune_tombstones command only removes tombstones of expired deletions."""
+    settings.CHANGES_RETENTION_DAYS = 30
+    _, unit = _published_unit()
+    for word in ("Topf", "Pfanne"):
+        _add_published_word(unit, word).delete()
+    expired = Tombstone.objects.filter(content_type__model="word").first()
+    assert expired is not None
+    Tombstone.objects.filter(pk=expired.pk).update(
+        deleted_at=timezone.now() - timedelta(days=31)
+    )
+    out = StringIO()
+
+    call_command("prune_tombstones", stdout=out)
+
+    assert "Removed 1 tombstones" in out.getvalue()
+    assert not Tombstone.objects.filter(pk=expired.pk).exists()
+    assert Tombstone.objects.filter(content_type__model="word").count() == 1
+
+
+@pytest.mark.django_db()
+def test_only_changes_after_the_cursor_are_returned() -> None:
+    """Content which didn't change since the cursor is left out."""
+    _, unit = _published_unit()
+    _add_published_word(unit, "Topf")
+    since = timezone.now()
+    pan = _add_published_word(unit, "Pfanne")
+
+    changes = _changes_since(since)
+
+    assert [relation["word"] for relation in changes["unit_words"]["changed"]] == [
+        "Pfanne"
+    ]
+    assert changes["unit_words"]["changed"][0]["unit"] == unit.pk
+    assert [word["id"] for word in changes["words"]["changed"]] == [pan.pk]
+    # The number of words of the unit changed
+    [changed_unit] = changes["units"]["changed"]
+    assert changed_unit["number_words"] == 2
+    assert changes["jobs"]["changed"] == []
+
+
+@pytest.mark.django_db()
+def test_old_cursor_returns_everything() -> None:
+    """All published content changed since a cursor from before its creation."""
+    job, unit = _published_unit()
+    _add_published_word(unit, "Topf")
+
+    changes = _changes_since(timezone.now() - timedelta(days=1))
+
+    assert job.pk in {job["id"] for job in changes["jobs"]["changed"]}
+    [changed_unit] = [u for u in changes["units"]["changed"] if u["id"] == unit.pk]
+    assert changed_unit["jobs"] == [job.pk]
+    assert [
+        relation["word"]
+        for relation in changes["unit_words"]["changed"]
+        if relation["unit"] == unit.pk
+    ] == ["Topf"]
+
+
+@pytest.mark.django_db()
+def test_deletions_are_returned_as_removed() -> None:
+    """Deleted content is reported by its tombstones."""
+    job, unit = _published_unit()
+    pot = _add_published_word(unit, "Topf")
+    pan = _add_published_word(unit, "Pfanne")
+    pot_id, unit_id, job_id = pot.pk, unit.pk, job.pk
+    since = timezone.now()
+
+    UnitWordRelation.objects.get(word=pan).delete()
+    pot.delete()
+
+    changes = _changes_since(since)
+    assert changes["unit_words"]["removed"] == [
+        {"unit": unit_id, "word": pot_id},
+        {"unit": unit_id, "word": pan.pk},
+    ]
+    assert changes["words"]["removed"] == [pot_id]
+    assert changes["units"]["changed"][0]["number_words"] == 0
+
+    unit.delete()
+    job.delete()
+
+    changes = _changes_since(since)
+    assert changes["units"]["removed"] == [unit_id]
+    assert changes["jobs"]["removed"] == [job_id]
+
+
+@pytest.mark.django_db()
+def test_unpublished_content_is_returned_as_removed() -> None:
+    """Content which isn't published anymore is reported as removed."""
+    job, unit = _published_unit()
+    word = _add_published_word(unit, "Topf")
+    since = timezone.now()
+
+    # Without an audio file, saving resets the audio check status
+    word.save()
+
+    changes = _changes_since(since)
+    assert changes["unit_words"]["removed"] == [{"unit": unit.pk, "word": word.pk}]
+    assert changes["words"]["removed"] == [word.pk]
+
+    job.units.remove(unit)
+
+    changes = _changes_since(since)
+    assert changes["units"]["removed"] == [unit.pk]
+    assert changes["jobs"]["changed"][0]["number_units"] == 0
+
+
+@pytest.mark.django_db()
+def test_readded_word_is_not_removed() -> None:
+    """A word removed from a unit and added again is only reported as changed."""
+    _, unit = _published_unit()
+    word = _add_published_word(unit, "Topf")
+    since = timezone.now()
+
+    UnitWordRelation.objects.get(word=word).delete()
+    UnitWordRelation.objects.create(unit=unit, word=word)
+
+    changes = _changes_since(since)
+    assert changes["unit_words"]["removed"] == []
+    assert len(changes["unit_words"]["changed"]) == 1
+
+
+@pytest.mark.django_db()
+def test_alternative_words_change_their_word() -> None:
+    """Alternative words are part of the serialized word."""
+    _, unit = _published_unit()
+    word = _add_published_word(unit, "Topf")
+    since = timezone.now()
+
+    AlternativeWord.objects.create(word=word, alt_word="Kochtopf", singular_article=1)
+
+    changes = _changes_since(since)
+    [relation] = changes["unit_words"]["changed"]
+    assert relation["alternative_words"][0]["alt_word"] == "Kochtopf"
+
+
+@pytest.mark.django_db()
+def test_generated_sentence_changes_its_word() -> None:
+    """Example sentences generated in the background are part of the changes."""
+    _, unit = _published_unit()
+    word = _add_published_word(unit, "Topf")
+    since = timezone.now()
+
+    with mock.patch.object(
+        sentence_generation,
+        "openai_example_sentence",
+        return_value="Der Topf steht auf dem Herd.",
+    ):
+        assert sentence_generation.generate_word_sentence(word, "Koch/Köchin")
+
+    changes = _changes_since(since)
+    assert [changed["id"] for changed in changes["words"]["changed"]] == [word.pk]
+
+
+@pytest.mark.django_db()
+def test_generated_assets_change_their_word(
+    settings: SettingsWrapper, tmp_path: Path
+) -> None:
+    """Audio and images generated in the background are part of the changes."""
+    settings.MEDIA_ROOT = str(tmp_path)
+    _, unit = _published_unit()
+    pot, pan, stove = (
+        _add_published_word(unit, word) for word in ("Topf", "Pfanne", "Herd")
+    )
+    Word.objects.filter(pk=pan.pk).update(example_sentence="Die Pfanne ist heiß.")
+    pan.refresh_from_db()
+    since = timezone.now()
+
+    with (
+        mock.patch.object(
+            audio_generation, "openai_word_audio_bytes", return_value=b"fake-mp3"
+        ),
+        mock.patch.object(
+            audio_generation, "openai_sentence_audio_bytes", return_value=b"fake-mp3"
+        ),
+        mock.patch.object(
+            image_generation, "openai_word_image_bytes", return_value=b"fake-png"
+        ),
+        mock.patch.object(Word, "convert_audio", lambda self: None),
+        mock.patch.object(
+            word_module, "convert_image_to_webp", lambda image_field: False
+        ),
+    ):
+        audio_generation.generate_word_audio(pot)
+        audio_generation.generate_sentence_audio(pan)
+        image_generation.generate_word_image(stove)
+
+    # Generated audio and images have to be checked again, which unpublishes the words
+    words = _changes_since(since)["words"]
+    assert {word["id"] for word in words["changed"]} | set(words["removed"]) == {
+        pot.pk,
+        pan.pk,
+        stove.pk,
+    }
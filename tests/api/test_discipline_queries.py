@@ -0,0 +1,58 @@
+"""
+Tests that the disciplines of the v1 API are counted with a constant number of
+queries, no matter how many disciplines are nested in the tree.
+"""
+
+from __future__ import annotations
+
+import pytest
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+
+from lunes_cms.cms.models import Discipline, TrainingSet
+
+OVERVIEW_ENDPOINT = "/api/disciplines_by_level/"
+
+
+def _create_tree(title: str, depth: int) -> Discipline:
+    root = parent = Discipline.objects.create(title=title, released=True)
+    for level in range(depth):
+        parent = Discipline.objects.create(
+            title=f"{title} {level}", released=True, parent=parent
+        )
+        training_set = TrainingSet.objects.create(
+            title=f"{title} {level}", released=True
+        )
+        training_set.discipline.add(parent)
+    return root
+
+
+def _overview() -> tuple[int, dict[int, dict]]:
+    with CaptureQueriesContext(connection) as queries:
+        response = Client().get(OVERVIEW_ENDPOINT)
+    assert response.status_code == 200
+    return len(queries), {item["id"]: item for item in response.json()}
+
+
+@pytest.mark.django_db()
+def test_overview_queries_do_not_depend_on_the_size_of_the_tree() -> None:
+    """The overview counts the nested training sets of all disciplines at once."""
+    small_tree = _create_tree("Klein", 2)
+    small_queries, _result = _overview()
+
+    large_tree = _create_tree("Groß", 10)
+    empty_trees = [_create_tree("Leer", 0) for _ in range(3)]
+    large_queries, result = _overview()
+
+    assert small_queries == large_queries
+    assert result[small_tree.pk]["total_discipline_children"] == 1
+    assert len(result[small_tree.pk]["nested_training_sets"]) == 2
+    assert result[large_tree.pk]["total_discipline_children"] == 1
+    assert result[large_tree.pk]["total_training_sets"] == 0
+    assert set(result[large_tree.pk]["nested_training_sets"]) == set(
+        TrainingSet.objects.filter(title__startswith="Groß").values_list(
+            "id", flat=True
+        )
+    )
+    assert not any(empty_tree.pk in result for empty_tree in empty_trees)
@@ -0,0 +1,73 @@
+"""
+Tests for the cache of validated group API keys.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+
+from lunes_cms.cms.models import group_api_key, GroupAPIKey
+
+
+@pytest.fixture(autouse=True)
+def empty_cache() -> Iterator[None]:
+    """Start every test without cached keys."""
+    # pylint: disable-next=protected-access
+    with mock.patch.dict(group_api_key._validated_keys, clear=True):
+        yield
+
+
+@pytest.fixture
+def api_key(db: None) -> GroupAPIKey:
+    """A valid key of a new group."""
+    return GroupAPIKey.objects.create(group=Group.objects.create(name="Schule"))
+
+
+def _get_disciplines(api_key: GroupAPIKey) -> tuple[int, int]:
+    with CaptureQueriesContext(connection) as queries:
+        response = Client().get(
+            f"/api/disciplines_by_group/{api_key.group_id}/",
+            HTTP_AUTHORIZATION=f"Api-Key {api_key.token}",
+        )
+    key_queries = [
+        query
+        for query in queries.captured_queries
+        if GroupAPIKey._meta.db_table in query["sql"]
+    ]
+    return response.status_code, len(key_queries)
+
+
+@pytest.mark.django_db()
+def test_api_key_is_looked_up_once(api_key: GroupAPIKey) -> None:
+    """The key is validated once per request and then taken from the cache."""
+    assert _get_disciplines(api_key) == (200, 1)
+    assert _get_disciplines(api_key) == (200, 0)
+
+
+@pytest.mark.django_db()
+def test_revoked_api_key_is_rejected_right_away(api_key: GroupAPIKey) -> None:
+    """Revoking a key removes it from the cache."""
+    assert _get_disciplines(api_key) == (200, 1)
+
+    api_key.revoked = True
+    api_key.save()
+
+    assert _get_disciplines(api_key)[0] == 403
+
+
+@pytest.mark.django_db()
+def test_api_key_expires_from_the_cache(api_key: GroupAPIKey) -> None:
+    """Keys changed by other processes are validated again after the timeout."""
+    assert _get_disciplines(api_key) == (200, 1)
+    GroupAPIKey.objects.filter(pk=api_key.pk).update(revoked=True)
+
+    assert _get_disciplines(api_key) == (200, 0)
+    with mock.patch.object(group_api_key, "monotonic", return_value=1e12):
+        assert _get_disciplines(api_key) == (403, 1)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from django.core.files.base import ContentFile
+from django.test.client import Client
+from PIL import Image
+from pytest_django.fixtures import SettingsWrapper
+
+from lunes_cms.cmsv2.models import Job, Unit, Word
+from lunes_cms.cmsv2.models.static import CheckStatus
+from lunes_cms.cmsv2.models.unit import UnitWordRelation
+from lunes_cms.cmsv2.utils import image_derivative_name
+
+
+@pytest.fixture
+def unit_with_word(settings: SettingsWrapper, tmp_path: Path) -> tuple[Unit, Word]:
+    """
+    A published word with a confirmed image.
+    """
+    settings.MEDIA_ROOT = str(tmp_path)
+    buffer = BytesIO()
+    Image.new("RGB", (800, 600), "red").save(buffer, format="PNG")
+    word = Word.objects.create(word="Hammer", singular_article=1)
+    word.image.save("hammer.png", ContentFile(buffer.getvalue()))
+    Word.objects.filter(pk=word.pk).update(
+        audio_check_status=CheckStatus.CONFIRMED,
+        image_check_status=CheckStatus.CONFIRMED,
+    )
+    job = Job.objects.create(name="Handwerker/-in", released=True)
+    unit = Unit.objects.create(title="Werkzeug", released=True)
+    unit.jobs.add(job)
+    UnitWordRelation.objects.create(unit=unit, word=word)
+    return unit, word
+
+
+@pytest.mark.django_db()
+def test_full_size_images_by_default(unit_with_word: tuple[Unit, Word]) -> None:
+    _, word = unit_with_word
+
+    response = Client().get(f"/api/v2/words/{word.pk}/")
+
+    assert response.status_code == 200
+    assert response.json()["images"][0].endswith(f"/media/{word.image.name}")
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("url", ["/api/v2/words/", "/api/v2/units/{unit}/words/"])
+def test_downscaled_images_on_request(
+    unit_with_word: tuple[Unit, Word], url: str
+) -> None:
+    unit, word = unit_with_word
+
+    response = Client().get(url.format(unit=unit.pk), {"image_size": 256})
+
+    assert response.status_code == 200
+    (result,) = [item for item in response.json() if item["id"] == word.pk]
+    assert result["images"][0].endswith(
+        f"/media/{image_derivative_name(word.image.name, 256)}"
+    )
+
+
+@pytest.mark.django_db()
+def test_invalid_image_size(unit_with_word: tuple[Unit, Word]) -> None:
+    _, word = unit_with_word
+
+    response = Client().get(f"/api/v2/words/{word.pk}/", {"image_size": 100})
+
+    assert response.status_code == 400
+    assert "image_size" in response.json()
@@ -0,0 +1,151 @@
+"""
+Tests for the offline bundles of jobs.
+"""
+
+import json
+import os
+import time
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
+from zipfile import ZipFile
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test.client import Client
+from pytest_django.fixtures import SettingsWrapper
+
+from lunes_cms.api.v2 import bundle
+from lunes_cms.api.v2.querysets import get_published_jobs
+from lunes_cms.cmsv2.models import Job, Unit, Word
+from lunes_cms.cmsv2.models.static import CheckStatus
+from lunes_cms.cmsv2.models.unit import UnitWordRelation
+
+
+@pytest.fixture(name="bundle_settings")
+def fixture_bundle_settings(settings: SettingsWrapper, tmp_path: Path) -> Path:
+    """Keep media files and bundles of the tests in a temporary directory."""
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.JOB_BUNDLE_ROOT = str(tmp_path / "bundles")
+    return tmp_path / "bundles"
+
+
+def _published_job() -> Job:
+    job = Job.objects.create(name="Koch/Köchin", released=True)
+    unit = Unit.objects.create(title="Küche", released=True)
+    unit.jobs.add(job)
+    word = Word.objects.create(word="Topf", singular_article=1)
+    word.audio.save("Topf.mp3", ContentFile(b"audio"), save=False)
+    Word.objects.filter(pk=word.pk).update(
+        audio=word.audio.name,
+        audio_check_status=CheckStatus.CONFIRMED,
+        image_check_status=CheckStatus.CONFIRMED,
+    )
+    UnitWordRelation.objects.create(unit=unit, word=word)
+    return job
+
+
+@pytest.mark.django_db()
+def test_bundle_contains_manifest_and_media(bundle_settings: Path) -> None:
+    """The bundle contains the manifest and the media files at their URL path."""
+    job = _published_job()
+
+    response = Client().get(f"/api/v2/jobs/{job.pk}/bundle/")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/zip"
+    with ZipFile(BytesIO(b"".join(response.streaming_content))) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        assert manifest["name"] == "Koch/Köchin"
+        [unit] = manifest["units"]
+        [word] = unit["words"]
+        assert word["word"] == "Topf"
+        assert archive.read(word["audio"].lstrip("/")) == b"audio"
+    assert len(list(bundle_settings.glob("*.zip"))) == 1
+
+
+@pytest.mark.django_db()
+def test_unchanged_bundle_is_reused(bundle_settings: Path) -> None:
+    """Unchanged bundles are revalidated, changed ones are built next to the outdated file."""
+    job = _published_job()
+    client = Client()
+    etag = client.get(f"/api/v2/jobs/{job.pk}/bundle/")["ETag"]
+
+    assert (
+        client.get(
+            f"/api/v2/jobs/{job.pk}/bundle/", HTTP_IF_NONE_MATCH=etag
+        ).status_code
+        == 304
+    )
+
+    unit = job.units.get()
+    unit.title = "Großküche"
+    unit.save()
+    response = client.get(f"/api/v2/jobs/{job.pk}/bundle/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    # Concurrent requests may still send the outdated bundle
+    assert len(list(bundle_settings.glob("*.zip"))) == 2
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("bundle_settings")
+def test_bundle_is_looked_up_by_content_version() -> None:
+    """The manifest is only serialized again after the content of the job changed."""
+    job = _published_job()
+    client = Client()
+
+    with mock.patch.object(
+        bundle, "get_job_manifest", wraps=bundle.get_job_manifest
+    ) as get_job_manifest:
+        etag = client.get(f"/api/v2/jobs/{job.pk}/bundle/")["ETag"]
+        assert client.get(f"/api/v2/jobs/{job.pk}/bundle/")["ETag"] == etag
+        assert get_job_manifest.call_count == 1
+
+        job.save()
+        assert client.get(f"/api/v2/jobs/{job.pk}/bundle/")["ETag"] == etag
+        assert get_job_manifest.call_count == 2
+
+
+@pytest.mark.django_db()
+def test_outdated_bundles_are_removed_after_grace_period(bundle_settings: Path) -> None:
+    """Outdated bundles are kept for a while after they were superseded."""
+    job = get_published_jobs().get(pk=_published_job().pk)
+    outdated, _ = bundle.get_job_bundle(job)
+    unit = job.units.get()
+    unit.title = "Großküche"
+    unit.save()
+    current, _ = bundle.get_job_bundle(job)
+
+    assert bundle.remove_outdated_bundles() == 0
+    superseded_at = time.time() - bundle.OUTDATED_BUNDLE_GRACE_PERIOD.total_seconds()
+    os.utime(outdated, (superseded_at - 120, superseded_at - 120))
+    os.utime(current, (superseded_at - 60, superseded_at - 60))
+
+    assert bundle.remove_outdated_bundles() == 1
+    assert list(bundle_settings.glob("*.zip")) == [current]
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("bundle_settings")
+def test_bundle_of_unreleased_job_is_denied() -> None:
+    """Unreleased jobs can't be downloaded."""
+    job = Job.objects.create(name="Maler/-in", released=False)
+
+    assert Client().get(f"/api/v2/jobs/{job.pk}/bundle/").status_code == 403
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("bundle_settings")
+def test_build_job_bundles_command() -> None:
+    """The command only builds bundles whose content changed."""
+    job = _published_job()
+    out = StringIO()
+
+    call_command("build_job_bundles", "--job", str(job.pk), stdout=out)
+    call_command("build_job_bundles", "--job", str(job.pk), stdout=out)
+
+    assert "Built 1 of 1 bundles" in out.getvalue()
+    assert "Removed 0 outdated bundles" in out.getvalue()
+    assert "Built 0 of 1 bundles" in out.getvalue()
@@ -0,0 +1,164 @@
+"""
+Tests for the versioned response cache of the v2 API.
+"""
+
+import pytest
+from django.test.client import Client
+
+from lunes_cms.cmsv2.content_version import bump_content_version
+from lunes_cms.cmsv2.models import Job, Unit, Word
+from lunes_cms.cmsv2.models.static import CheckStatus
+from lunes_cms.cmsv2.models.unit import UnitWordRelation
+
+JOBS_ENDPOINT = "/api/v2/jobs/"
+
+
+def _published_unit() -> tuple[Job, Unit]:
+    job = Job.objects.create(name="Koch/Köchin", released=True)
+    unit = Unit.objects.create(title="Küche", released=True)
+    unit.jobs.add(job)
+    return job, unit
+
+
+def _add_published_word(unit: Unit, word: str) -> Word:
+    word_obj = Word.objects.create(word=word, singular_article=1)
+    Word.objects.filter(pk=word_obj.pk).update(
+        audio_check_status=CheckStatus.CONFIRMED,
+        image_check_status=CheckStatus.CONFIRMED,
+    )
+    UnitWordRelation.objects.create(unit=unit, word=word_obj)
+    return word_obj
+
+
+@pytest.mark.django_db()
+def test_jobs_are_served_from_cache(django_assert_num_queries) -> None:
+    """A repeated request must not hit the database again."""
+    Job.objects.create(name="Maler/-in", released=True)
+    client = Client()
+    first = client.get(JOBS_ENDPOINT)
+
+    with django_assert_num_queries(0):
+        second = client.get(JOBS_ENDPOINT)
+
+    assert first.json() == second.json()
+
+
+@pytest.mark.django_db()
+def test_saving_a_job_invalidates_the_cache() -> None:
+    """Saving a job must not serve the cached job list anymore."""
+    job = Job.objects.create(name="Maler/-in", released=True)
+    client = Client()
+    client.get(JOBS_ENDPOINT)
+
+    job.name = "Lackierer/-in"
+    job.save()
+
+    names = {job["name"] for job in client.get(JOBS_ENDPOINT).json()}
+    assert "Lackierer/-in" in names
+    assert "Maler/-in" not in names
+
+
+@pytest.mark.django_db()
+def test_queryset_update_is_served_stale_until_bumped() -> None:
+    """Bulk updates bypass the signals and have to bump the version explicitly."""
+    job, unit = _published_unit()
+    client = Client()
+    assert len(client.get(f"{JOBS_ENDPOINT}{job.pk}/units/").json()) == 1
+
+    Unit.objects.filter(pk=unit.pk).update(released=False)
+    assert len(client.get(f"{JOBS_ENDPOINT}{job.pk}/units/").json()) == 1
+
+    bump_content_version([job.pk])
+    assert client.get(f"{JOBS_ENDPOINT}{job.pk}/units/").json() == []
+
+
+@pytest.mark.django_db()
+def test_new_relation_invalidates_unit_and_job_words() -> None:
+    """New words of a unit show up in the words of the unit and of its jobs."""
+    job, unit = _published_unit()
+    _add_published_word(unit, "Topf")
+    client = Client()
+    assert len(client.get(f"/api/v2/units/{unit.pk}/words/").json()) == 1
+    assert len(client.get(f"{JOBS_ENDPOINT}{job.pk}/words/").json()) == 1
+
+    _add_published_word(unit, "Pfanne")
+
+    assert len(client.get(f"/api/v2/units/{unit.pk}/words/").json()) == 2
+    assert len(client.get(f"{JOBS_ENDPOINT}{job.pk}/words/").json()) == 2
+
+
+@pytest.mark.django_db()
+def test_editing_a_word_invalidates_all_jobs_containing_it() -> None:
+    """Edited words are updated in every job they belong to."""
+    job, unit = _published_unit()
+    word = _add_published_word(unit, "Topf")
+    client = Client()
+    assert len(client.get(f"{JOBS_ENDPOINT}{job.pk}/words/").json()) == 1
+
+    # Without an audio file, saving resets the audio check status and unpublishes the word
+    word.save()
+
+    assert client.get(f"{JOBS_ENDPOINT}{job.pk}/words/").json() == []
+
+
+@pytest.mark.django_db()
+def test_removing_a_unit_from_a_job_invalidates_the_job() -> None:
+    """Units removed from a job disappear from its units."""
+    job, unit = _published_unit()
+    client = Client()
+    assert len(client.get(f"{JOBS_ENDPOINT}{job.pk}/units/").json()) == 1
+
+    job.units.remove(unit)
+
+    assert client.get(f"{JOBS_ENDPOINT}{job.pk}/units/").json() == []
+
+
+@pytest.mark.django_db()
+def test_matching_etag_is_answered_with_not_modified(
+    django_assert_num_queries,
+) -> None:
+    """Revalidating unchanged content must not hit the database."""
+    job, unit = _published_unit()
+    _add_published_word(unit, "Topf")
+    client = Client()
+    response = client.get(f"{JOBS_ENDPOINT}{job.pk}/words/")
+    assert response.status_code == 200
+    assert response.has_header("Last-Modified")
+
+    with django_assert_num_queries(0):
+        revalidated = client.get(
+            f"{JOBS_ENDPOINT}{job.pk}/words/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+    assert revalidated.status_code == 304
+    assert revalidated["ETag"] == response["ETag"]
+    assert not revalidated.content
+
+
+@pytest.mark.django_db()
+def test_etag_changes_with_the_content() -> None:
+    """The ETag of changed content doesn't match the previous one."""
+    job, unit = _published_unit()
+    client = Client()
+    etag = client.get(f"{JOBS_ENDPOINT}{job.pk}/units/")["ETag"]
+
+    _add_published_word(unit, "Topf")
+
+    response = client.get(f"{JOBS_ENDPOINT}{job.pk}/units/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert response.json()[0]["number_words"] == 1
+
+
+@pytest.mark.django_db()
+def test_if_modified_since_is_answered_with_not_modified() -> None:
+    """Content unchanged since the given date isn't sent again."""
+    job, _ = _published_unit()
+    client = Client()
+    last_modified = client.get(f"{JOBS_ENDPOINT}{job.pk}/units/")["Last-Modified"]
+
+    response = client.get(
+        f"{JOBS_ENDPOINT}{job.pk}/units/", HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+
+    assert response.status_code == 304
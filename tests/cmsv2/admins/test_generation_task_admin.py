@@ -0,0 +1,58 @@
+"""
+Tests for the admin interface of the generation task queue.
+"""
+
+from __future__ import annotations
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from lunes_cms.cmsv2.models import GenerationTask, Job, Word
+
+
+@pytest.fixture
+def job(db: None) -> Job:
+    return Job.objects.create(name="Test Job")
+
+
+@pytest.mark.django_db()
+def test_generation_task_changelist_shows_queue_stats(
+    admin_client: Client, job: Job
+) -> None:
+    word = Word.objects.create(word="Hammer", singular_article=1)
+    GenerationTask.objects.create(word=word, job=job, kind=GenerationTask.Kind.AUDIO)
+
+    response = admin_client.get(
+        reverse("admin:cmsv2_generationtask_changelist"), {"job__id__exact": job.pk}
+    )
+
+    assert response.status_code == 200
+    audio = next(
+        row
+        for row in response.context["queue_stats"]
+        if row["label"] == GenerationTask.Kind.AUDIO.label
+    )
+    assert audio["pending"] == 1
+    assert audio["progress"] == 0
+
+
+@pytest.mark.django_db()
+def test_retry_resets_failed_tasks(admin_client: Client, job: Job) -> None:
+    word = Word.objects.create(word="Hammer", singular_article=1)
+    task = GenerationTask.objects.create(
+        word=word,
+        job=job,
+        kind=GenerationTask.Kind.IMAGE,
+        status=GenerationTask.Status.FAILED,
+        attempts=5,
+    )
+
+    admin_client.post(
+        reverse("admin:cmsv2_generationtask_changelist"),
+        {"action": "retry_tasks", "_selected_action": [task.pk]},
+    )
+
+    task.refresh_from_db()
+    assert task.status == GenerationTask.Status.PENDING
+    assert task.attempts == 0
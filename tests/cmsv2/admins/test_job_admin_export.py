@@ -12,8 +12,10 @@ import zipfile
 import pytest
 from django.contrib import admin
 from django.contrib.messages.storage.fallback import FallbackStorage
-from django.http import HttpRequest
+from django.db import connection
+from django.http import HttpRequest, StreamingHttpResponse
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 
 from lunes_cms.cmsv2.admins.job_admin import JobAdmin
 from lunes_cms.cmsv2.models import Job, Unit, Word
@@ -37,6 +39,12 @@ def _post_request(request_factory: RequestFactory) -> HttpRequest:
     return request
 
 
+def _read_export(response: StreamingHttpResponse) -> dict[str, str]:
+    content = b"".join(response.streaming_content)  # type: ignore[arg-type]
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        return {name: archive.read(name).decode() for name in archive.namelist()}
+
+
 @pytest.mark.django_db()
 def test_export_to_csv_only_lists_units_of_the_exported_job(
     job_admin: JobAdmin, request_factory: RequestFactory
@@ -54,8 +62,43 @@ def test_export_to_csv_only_lists_units_of_the_exported_job(
     request = _post_request(request_factory)
     response = job_admin.export_to_csv(request, Job.objects.filter(pk=job_a.pk))
 
-    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
-        csv_content = archive.read(archive.namelist()[0]).decode()
+    (csv_content,) = _read_export(response).values()
 
     assert "Backofen" in csv_content
     assert "Bremsen" not in csv_content
+
+
+def _create_job_with_words(name: str, number_of_words: int) -> Job:
+    job = Job.objects.create(name=name)
+    units = [Unit.objects.create(title=f"{name} {i}") for i in range(2)]
+    for unit in units:
+        unit.jobs.add(job)
+    for i in range(number_of_words):
+        word = Word.objects.create(word=f"{name} {i}", singular_article=1)
+        UnitWordRelation.objects.create(unit=units[i % 2], word=word)
+    return job
+
+
+@pytest.mark.django_db()
+def test_export_to_csv_queries_do_not_depend_on_the_number_of_words(
+    job_admin: JobAdmin, request_factory: RequestFactory
+) -> None:
+    small_job = _create_job_with_words("Bäcker", 5)
+    large_job = _create_job_with_words("Maurer", 20)
+
+    def export(job: Job) -> tuple[int, str]:
+        request = _post_request(request_factory)
+        with CaptureQueriesContext(connection) as queries:
+            response = job_admin.export_to_csv(request, Job.objects.filter(pk=job.pk))
+            files = _read_export(response)
+        assert list(files) == [f"{job.name}.csv"]
+        return len(queries), files[f"{job.name}.csv"]
+
+    small_queries, _ = export(small_job)
+    large_queries, csv_content = export(large_job)
+
+    assert small_queries == large_queries
+    lines = csv_content.splitlines()
+    assert len(lines) == 21
+    assert lines[1].startswith("Maurer 0,")
+    assert lines[1].endswith(",Maurer 0")
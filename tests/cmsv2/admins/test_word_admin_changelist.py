@@ -0,0 +1,41 @@
+"""
+Tests for the number of queries of the word admin changelist.
+"""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from lunes_cms.cmsv2.admins.word_admin import WordAdmin
+from lunes_cms.cmsv2.models import Unit, Word
+from lunes_cms.cmsv2.models.unit import UnitWordRelation
+
+
+def _changelist_queries(admin_client: Client, per_page: int) -> int:
+    with (
+        mock.patch.object(WordAdmin, "list_per_page", per_page),
+        CaptureQueriesContext(connection) as context,
+    ):
+        response = admin_client.get(reverse("admin:cmsv2_word_changelist"))
+    assert response.status_code == 200
+    assert response.content.count(b'class="unit-name"') == 2 * per_page
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_changelist_queries_do_not_grow_with_the_page_size(
+    admin_client: Client,
+) -> None:
+    units = [Unit.objects.create(title=f"Werkzeug {i}") for i in range(2)]
+    for i in range(20):
+        word = Word.objects.create(word=f"Hammer {i:02}", singular_article=1)
+        for unit in units:
+            UnitWordRelation.objects.create(unit=unit, word=word)
+
+    assert _changelist_queries(admin_client, 5) == _changelist_queries(admin_client, 20)
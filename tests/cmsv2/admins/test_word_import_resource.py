@@ -10,7 +10,9 @@ from typing import Any
 import pytest
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, User
+from django.db import connection
 from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
 from tablib import Dataset
 
 from lunes_cms.cmsv2.admins.word_import_resource import (
@@ -23,8 +25,10 @@ from lunes_cms.cmsv2.admins.word_import_resource import (
     RowResult,
     validate_header_structure,
 )
-from lunes_cms.cmsv2.models import Word
+from lunes_cms.cmsv2.content_version import get_job_versions
+from lunes_cms.cmsv2.models import Unit, Word
 from lunes_cms.cmsv2.models.job import Job
+from lunes_cms.cmsv2.models.unit import UnitWordRelation
 
 # ---------------------------------------------------------------------------
 # Column mapping
@@ -561,3 +565,61 @@ def test_pipe_separated_units_reuse_the_row_cache(job: Job, user: User) -> None:
     assert set(hammer.units.values_list("pk", flat=True)) == set(
         saege.units.values_list("pk", flat=True)
     )
+
+
+@pytest.mark.django_db
+def test_repeated_unit_in_one_row_links_the_word_once(job: Job, user: User) -> None:
+    ds = _make_dataset(
+        ["Einheit", "Vokabel", "Artikel"],
+        [["Werkzeuge | Werkzeuge", "Hammer", "der"]],
+    )
+    _, units_created, errors, _ = import_words_from_csv(ds, job, user)
+    assert errors == []
+    assert units_created == 1
+    assert _job_words(job).get(word="Hammer").units.count() == 1
+
+
+# ---------------------------------------------------------------------------
+# Bulk inserts
+# ---------------------------------------------------------------------------
+
+
+def _import_queries(job: Job, user: User, number_of_rows: int) -> int:
+    ds = _make_dataset(
+        ["Einheit", "Vokabel", "Artikel", "Beispielsatz"],
+        [
+            [f"Werkzeug {i % 2} | Baustelle", f"Hammer {i}", "der", "Ein Satz."]
+            for i in range(number_of_rows)
+        ],
+    )
+    with CaptureQueriesContext(connection) as context:
+        words_created, units_created, errors, word_ids = import_words_from_csv(
+            ds, job, user
+        )
+    assert errors == []
+    assert (words_created, units_created) == (number_of_rows, 3)
+    assert len(word_ids) == number_of_rows
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_import_queries_do_not_grow_with_the_number_of_rows(
+    user: User,
+) -> None:
+    """Words and their unit relations are inserted in bulk, not row by row."""
+    small = _import_queries(Job.objects.create(name="Small"), user, 5)
+    large = _import_queries(Job.objects.create(name="Large"), user, 20)
+    assert small == large
+    assert UnitWordRelation.objects.filter(unit__jobs__name="Large").count() == 40
+
+
+@pytest.mark.django_db
+def test_import_invalidates_the_cached_content_of_the_job(job: Job, user: User) -> None:
+    version = get_job_versions([job.pk])[job.pk]
+    ds = _make_dataset(
+        ["Einheit", "Vokabel", "Artikel"],
+        [["Werkzeug", "Hammer", "der"]],
+    )
+    import_words_from_csv(ds, job, user)
+    assert get_job_versions([job.pk])[job.pk] != version
+    assert Unit.objects.get(jobs=job).number_words == 0
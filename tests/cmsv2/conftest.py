@@ -3,9 +3,11 @@ Shared fixtures for the cmsv2 tests.
 """
 
 from collections.abc import Generator
+from pathlib import Path
 from unittest import mock
 
 import pytest
+from pytest_django.fixtures import SettingsWrapper
 
 from lunes_cms.cmsv2.models import Word
 
@@ -18,3 +20,12 @@ def bypass_audio_conversion() -> Generator[None, None, None]:
     """
     with mock.patch.object(Word, "convert_audio", lambda self: None):
         yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_tts_cache(settings: SettingsWrapper, tmp_path: Path) -> None:
+    """
+    Give every test an empty TTS cache, so audio generated by one test is
+    never served to another one instead of calling the (mocked) API.
+    """
+    settings.OPENAI_TTS_CACHE_DIR = str(tmp_path / "tts_cache")
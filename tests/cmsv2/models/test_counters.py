@@ -0,0 +1,122 @@
+"""
+Tests for the counters of public words per unit and released units per job.
+"""
+
+from __future__ import annotations
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from lunes_cms.cmsv2.models import Job, Unit, Word
+from lunes_cms.cmsv2.models.static import CheckStatus
+from lunes_cms.cmsv2.models.unit import UnitWordRelation
+
+
+def _confirmed_word(word: str) -> Word:
+    word_obj = Word.objects.create(word=word, singular_article=1)
+    Word.objects.filter(pk=word_obj.pk).update(
+        audio_check_status=CheckStatus.CONFIRMED,
+        image_check_status=CheckStatus.CONFIRMED,
+    )
+    return word_obj
+
+
+def _number_words(unit: Unit) -> int:
+    unit.refresh_from_db()
+    return unit.number_words
+
+
+def _number_units(job: Job) -> int:
+    job.refresh_from_db()
+    return job.number_units
+
+
+@pytest.mark.django_db
+def test_number_words_follows_relations() -> None:
+    """Adding and removing public words updates the counter of the unit."""
+    unit = Unit.objects.create(title="Werkzeug")
+    hammer = UnitWordRelation.objects.create(unit=unit, word=_confirmed_word("Hammer"))
+    UnitWordRelation.objects.create(unit=unit, word=_confirmed_word("Zange"))
+    UnitWordRelation.objects.create(
+        unit=unit, word=Word.objects.create(word="Säge", singular_article=2)
+    )
+    assert _number_words(unit) == 2
+
+    hammer.delete()
+    assert _number_words(unit) == 1
+
+
+@pytest.mark.django_db
+def test_number_words_follows_check_status_of_words() -> None:
+    """Unpublishing a word updates the counters of all of its units."""
+    word = _confirmed_word("Hammer")
+    units = [Unit.objects.create(title=title) for title in ("Werkzeug", "Metall")]
+    for unit in units:
+        UnitWordRelation.objects.create(unit=unit, word=word)
+    assert [_number_words(unit) for unit in units] == [1, 1]
+
+    word.refresh_from_db()
+    # Without an audio file, saving resets the audio check status
+    word.save()
+
+    assert [_number_words(unit) for unit in units] == [0, 0]
+
+
+@pytest.mark.django_db
+def test_number_units_follows_release_and_membership() -> None:
+    """Releasing, adding, removing and deleting units updates the counters of jobs."""
+    job = Job.objects.create(name="Tischler/-in")
+    unit = Unit.objects.create(title="Werkzeug")
+    job.units.add(unit, Unit.objects.create(title="Holz", released=True))
+    assert _number_units(job) == 1
+
+    unit.released = True
+    unit.save()
+    assert _number_units(job) == 2
+
+    unit.jobs.clear()
+    assert _number_units(job) == 1
+
+    job.units.add(unit)
+    unit.delete()
+    assert _number_units(job) == 1
+
+    job.units.clear()
+    assert _number_units(job) == 0
+
+
+@pytest.mark.django_db
+def test_saving_outdated_instances_keeps_counters() -> None:
+    """Saving an instance loaded before its counter changed doesn't reset the counter."""
+    job = Job.objects.create(name="Tischler/-in")
+    unit = Unit.objects.create(title="Werkzeug", released=True)
+    job.units.add(unit)
+    UnitWordRelation.objects.create(unit=unit, word=_confirmed_word("Hammer"))
+
+    job.save()
+    unit.save()
+
+    assert _number_units(job) == 1
+    assert _number_words(unit) == 1
+
+
+@pytest.mark.django_db
+def test_reconcile_counters_command() -> None:
+    """The command repairs counters which drifted by queryset updates."""
+    job = Job.objects.create(name="Tischler/-in")
+    unit = Unit.objects.create(title="Werkzeug")
+    job.units.add(unit)
+    UnitWordRelation.objects.create(unit=unit, word=_confirmed_word("Hammer"))
+    Unit.objects.filter(pk=unit.pk).update(released=True, number_words=5)
+    out = StringIO()
+
+    call_command("reconcile_counters", "--dry-run", stdout=out)
+    assert f"Unit #{unit.pk}: 5 -> 1 words" in out.getvalue()
+    assert f"Job #{job.pk}: 0 -> 1 units" in out.getvalue()
+    assert _number_words(unit) == 5
+
+    call_command("reconcile_counters", stdout=out)
+    assert _number_words(unit) == 1
+    assert _number_units(job) == 1
@@ -0,0 +1,112 @@
+"""
+Tests for the denormalized public flag of unit word relations.
+"""
+
+from __future__ import annotations
+
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from pytest_django.fixtures import SettingsWrapper
+
+from lunes_cms.cmsv2.models import Unit, Word
+from lunes_cms.cmsv2.models.static import CheckStatus
+from lunes_cms.cmsv2.models.unit import UnitWordRelation
+
+
+def _word_with_audio(settings: SettingsWrapper, tmp_path: Path) -> Word:
+    settings.MEDIA_ROOT = str(tmp_path)
+    word = Word.objects.create(word="Hammer", singular_article=1)
+    word.audio.save("hammer.mp3", ContentFile(b"audio"))
+    return word
+
+
+@pytest.mark.django_db
+def test_relation_is_public_with_confirmed_word() -> None:
+    """A relation without an own image is public if the word's audio and image are confirmed."""
+    word = Word.objects.create(word="Hammer", singular_article=1)
+    unit = Unit.objects.create(title="Werkzeug")
+    assert not UnitWordRelation.objects.create(unit=unit, word=word).is_public
+
+    Word.objects.filter(pk=word.pk).update(
+        audio_check_status=CheckStatus.CONFIRMED,
+        image_check_status=CheckStatus.CONFIRMED,
+    )
+    relation = UnitWordRelation.objects.get(unit=unit, word=word)
+    relation.save()
+
+    assert relation.is_public
+
+
+@pytest.mark.django_db
+def test_confirming_the_audio_publishes_the_relations(
+    settings: SettingsWrapper, tmp_path: Path
+) -> None:
+    """Changing the check statuses of a word updates all of its relations."""
+    word = _word_with_audio(settings, tmp_path)
+    relation = UnitWordRelation.objects.create(
+        unit=Unit.objects.create(title="Werkzeug"), word=word
+    )
+    UnitWordRelation.objects.filter(pk=relation.pk).update(
+        image="images/hammer.png", image_check_status=CheckStatus.CONFIRMED
+    )
+    assert not relation.is_public
+
+    word.audio_check_status = CheckStatus.CONFIRMED
+    word.save()
+    relation.refresh_from_db()
+    assert relation.is_public
+
+    word.audio_check_status = CheckStatus.NOT_CHECKED
+    word.save()
+    relation.refresh_from_db()
+    assert not relation.is_public
+
+
+@pytest.mark.django_db
+def test_own_image_of_relation_has_to_be_confirmed() -> None:
+    """The image of a relation takes precedence over the default image of its word."""
+    word = Word.objects.create(word="Hammer", singular_article=1)
+    Word.objects.filter(pk=word.pk).update(
+        audio_check_status=CheckStatus.CONFIRMED,
+        image_check_status=CheckStatus.CONFIRMED,
+    )
+    relation = UnitWordRelation.objects.create(
+        unit=Unit.objects.create(title="Werkzeug"), word=word
+    )
+    UnitWordRelation.objects.filter(pk=relation.pk).update(image="images/hammer.png")
+    relation.refresh_from_db()
+    relation.save()
+    assert not relation.is_public
+
+    relation.image_check_status = CheckStatus.CONFIRMED
+    relation.save(update_fields=["image_check_status"])
+
+    relation.refresh_from_db()
+    assert relation.is_public
+
+
+@pytest.mark.django_db
+def test_update_public_flags_command() -> None:
+    """The command repairs flags which got out of sync by queryset updates."""
+    word = Word.objects.create(word="Hammer", singular_article=1)
+    relation = UnitWordRelation.objects.create(
+        unit=Unit.objects.create(title="Werkzeug"), word=word
+    )
+    Word.objects.filter(pk=word.pk).update(
+        audio_check_status=CheckStatus.CONFIRMED,
+        image_check_status=CheckStatus.CONFIRMED,
+    )
+    out = StringIO()
+
+    call_command("update_public_flags", "--dry-run", stdout=out)
+    relation.refresh_from_db()
+    assert not relation.is_public
+    assert "1 relation(s) are out of sync" in out.getvalue()
+
+    call_command("update_public_flags", stdout=out)
+    relation.refresh_from_db()
+    assert relation.is_public
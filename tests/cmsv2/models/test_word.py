@@ -5,6 +5,7 @@ Tests for Word.save()'s check-status bookkeeping (issue #917).
 from __future__ import annotations
 
 import pytest
+from django.core.files.base import ContentFile
 
 from lunes_cms.cmsv2.models import Word
 
@@ -36,3 +37,52 @@ def test_unrelated_save_does_not_reset_confirmed_example_sentence_status() -> No
     word.refresh_from_db()
     assert word.example_sentence_check_status == "CONFIRMED"
     assert word.plural == "Hämmer"
+
+
+@pytest.mark.django_db
+def test_save_with_update_fields_ignores_stale_fields() -> None:
+    """Background generation tasks save a word concurrently from stale
+    instances. Saving some fields must not act on the stale values of others,
+    e.g. delete the example sentence audio saved in the meantime."""
+    word = Word.objects.create(word="Hammer", singular_article=1)
+    stale = Word.objects.get(pk=word.pk)
+
+    word.example_sentence = "Der Hammer ist schwer."
+    word.save(update_fields=["example_sentence"])
+    word.example_sentence_audio.save(
+        "hammer_example_sentence.mp3", ContentFile(b"mp3"), save=False
+    )
+    word.save(update_fields=["example_sentence_audio"])
+
+    stale.plural = "Hämmer"
+    stale.save(update_fields=["plural"])
+
+    word.refresh_from_db()
+    assert word.plural == "Hämmer"
+    assert word.example_sentence == "Der Hammer ist schwer."
+    assert word.example_sentence_audio.name
+    assert word.example_sentence_audio.storage.exists(word.example_sentence_audio.name)
+
+
+@pytest.mark.django_db
+def test_changed_example_sentence_resets_its_audio_with_update_fields() -> None:
+    """Saving a changed example sentence with ``update_fields`` also resets the
+    deleted audio in the database."""
+    word = Word.objects.create(
+        word="Hammer", singular_article=1, example_sentence="Der Hammer ist schwer."
+    )
+    word.example_sentence_audio.save(
+        "hammer_example_sentence.mp3", ContentFile(b"mp3"), save=False
+    )
+    word.example_sentence_check_status = "CONFIRMED"
+    word.save(update_fields=["example_sentence_audio", "example_sentence_check_status"])
+    audio_name = word.example_sentence_audio.name
+    assert audio_name
+
+    word.example_sentence = "Der Hammer ist laut."
+    word.save(update_fields=["example_sentence"])
+
+    word.refresh_from_db()
+    assert not word.example_sentence_audio
+    assert not word.example_sentence_audio.storage.exists(audio_name)
+    assert word.example_sentence_check_status == "NOT_CHECKED"
@@ -0,0 +1,147 @@
+"""
+Tests for the background import of large CSV files.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from pytest_django.fixtures import SettingsWrapper
+
+from lunes_cms.cmsv2.models import CSVImport, GenerationTask, Job, Unit, Word
+from lunes_cms.cmsv2.services import csv_import_queue
+from lunes_cms.cmsv2.services.csv_import_queue import (
+    claim_import,
+    enqueue_csv_import,
+    read_csv_header,
+    run_import,
+)
+
+Status = CSVImport.Status
+
+CSV = (
+    "Einheit,Vokabel,Artikel\n"
+    "Werkzeug,Hammer,der\n"
+    "Werkzeug,Säge,die\n"
+    ",Zange,die\n"
+    "Baustelle | Werkzeug,Bagger,der\n"
+    "Baustelle,Kran,der,zu viel\n"
+    "Baustelle,Helm,der\n"
+)
+
+
+@pytest.fixture
+def job(db: None) -> Job:
+    return Job.objects.create(name="Handwerker/-in")
+
+
+@pytest.fixture
+def user(db: None) -> User:
+    return get_user_model().objects.create_superuser(
+        username="importer", password="password"
+    )
+
+
+@pytest.fixture
+def csv_import(
+    settings: SettingsWrapper, tmp_path: Path, job: Job, user: User
+) -> CSVImport:
+    settings.MEDIA_ROOT = str(tmp_path)
+    csv_file = ContentFile(CSV.encode("utf-8"), name="vocabulary.csv")
+    return enqueue_csv_import(csv_file, job, user)
+
+
+def _run(chunk_size: int = 2, stopped: threading.Event | None = None) -> CSVImport:
+    leased = claim_import("worker:1")
+    assert leased is not None
+    with mock.patch.object(csv_import_queue, "CHUNK_SIZE", chunk_size):
+        run_import(leased, stopped)
+    leased.refresh_from_db()
+    return leased
+
+
+def test_read_csv_header() -> None:
+    csv_file = ContentFile(b"\xef\xbb\xbfEinheit,Vokabel\nWerkzeug,Hammer\n")
+
+    assert read_csv_header(csv_file) == (["Einheit", "Vokabel"], True)
+    assert csv_file.tell() == 0
+    assert not csv_file.closed
+    assert read_csv_header(ContentFile(b"Einheit,Vokabel\n")) == (
+        ["Einheit", "Vokabel"],
+        False,
+    )
+
+
+@pytest.mark.django_db
+def test_file_is_imported_in_chunks(csv_import: CSVImport, job: Job) -> None:
+    path = Path(csv_import.file.path)
+
+    finished = _run()
+
+    assert finished.status == Status.DONE
+    assert finished.progress == 100
+    assert finished.rows_processed == 6
+    assert (finished.words_created, finished.units_created) == (4, 2)
+    assert finished.error_count == 2
+    assert finished.errors[0].startswith("Row 3:")
+    assert finished.errors[1].startswith("Row 5:")
+    assert not path.exists()
+    # Units are reused across chunks
+    assert Unit.objects.filter(jobs=job).count() == 2
+    assert set(
+        Word.objects.get(word="Bagger").units.values_list("title", flat=True)
+    ) == {"Baustelle", "Werkzeug"}
+    assert Word.objects.get(word="Helm").units.get().title == "Baustelle"
+    # The generation of the assets is enqueued chunk by chunk
+    assert GenerationTask.objects.filter(job=job).values("word").distinct().count() == 4
+
+
+@pytest.mark.django_db
+def test_stopped_import_is_continued_after_the_last_chunk(
+    csv_import: CSVImport, job: Job
+) -> None:
+    stopped = threading.Event()
+
+    def import_one_chunk(
+        csv_import: CSVImport,
+        numbered_rows: list[tuple[int, dict]],
+        units: dict[str, Unit],
+        bytes_processed: int,
+    ) -> None:
+        original_import_chunk(csv_import, numbered_rows, units, bytes_processed)
+        stopped.set()
+
+    original_import_chunk = csv_import_queue.import_chunk
+    with mock.patch.object(csv_import_queue, "import_chunk", import_one_chunk):
+        interrupted = _run(stopped=stopped)
+
+    assert interrupted.status == Status.PENDING
+    assert interrupted.lease_owner == ""
+    assert interrupted.rows_processed == 2
+    assert 0 < interrupted.progress < 100
+
+    finished = _run()
+
+    assert finished.status == Status.DONE
+    assert (finished.words_created, finished.units_created) == (4, 2)
+    assert Word.objects.filter(units__jobs=job).distinct().count() == 4
+    assert Unit.objects.filter(jobs=job).count() == 2
+
+
+@pytest.mark.django_db
+def test_import_of_a_deleted_user_fails(csv_import: CSVImport, user: User) -> None:
+    path = Path(csv_import.file.path)
+    user.delete()
+
+    failed = _run()
+
+    assert failed.status == Status.FAILED
+    assert "deleted" in failed.last_error
+    assert not Word.objects.exists()
+    assert not path.exists()
@@ -0,0 +1,209 @@
+"""
+Tests for the persistent queue of background generation tasks.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+import httpx
+import pytest
+from django.db import connection
+from django.utils import timezone
+from openai import RateLimitError
+
+from lunes_cms.cmsv2.models import GenerationTask, Word
+from lunes_cms.cmsv2.services import generation_queue
+from lunes_cms.cmsv2.services.generation_queue import (
+    claim_task,
+    enqueue_word_assets,
+    GenerationWorker,
+    MAX_ATTEMPTS,
+    queue_stats,
+    run_task,
+)
+
+Kind = GenerationTask.Kind
+Status = GenerationTask.Status
+
+
+def _word(word: str = "Hammer") -> Word:
+    return Word.objects.create(word=word, singular_article=1)
+
+
+def _rate_limit_error() -> RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/audio/speech")
+    response = httpx.Response(429, headers={"retry-after": "7"}, request=request)
+    return RateLimitError("Rate limit reached", response=response, body=None)
+
+
+@pytest.mark.django_db
+def test_enqueue_skips_words_with_pending_tasks() -> None:
+    word = _word()
+
+    enqueue_word_assets([word.pk])
+    enqueue_word_assets([word.pk])
+
+    assert sorted(word.generation_tasks.values_list("kind", flat=True)) == sorted(
+        Kind.values
+    )
+
+
+@pytest.mark.django_db
+def test_only_sentence_audio_waits_for_the_example_sentence() -> None:
+    word = _word()
+    enqueue_word_assets([word.pk])
+
+    sentence_task = claim_task([Kind.SENTENCE], "worker:1")
+    assert sentence_task is not None
+    # The other assets of the word are processed while the sentence is generated
+    claimed = {
+        task.kind for task in iter(lambda: claim_task(list(Kind), "worker:2"), None)
+    }
+    assert claimed == {Kind.AUDIO, Kind.IMAGE}
+
+    with mock.patch.object(generation_queue, "generate_word_sentence"):
+        assert run_task(sentence_task)
+
+    sentence_audio_task = claim_task(list(Kind), "worker:2")
+    assert sentence_audio_task is not None
+    assert sentence_audio_task.kind == Kind.SENTENCE_AUDIO
+
+
+@pytest.mark.django_db
+def test_tasks_are_processed_word_by_word() -> None:
+    hammer, saw = _word("Hammer"), _word("Säge")
+    enqueue_word_assets([hammer.pk, saw.pk], kinds=[Kind.AUDIO, Kind.IMAGE])
+
+    claimed = [
+        (task.word_id, task.kind)
+        for task in iter(lambda: claim_task(list(Kind), "worker:1"), None)
+    ]
+
+    assert claimed == [
+        (hammer.pk, Kind.AUDIO),
+        (hammer.pk, Kind.IMAGE),
+        (saw.pk, Kind.AUDIO),
+        (saw.pk, Kind.IMAGE),
+    ]
+
+
+@pytest.mark.django_db
+def test_failed_task_is_retried_with_backoff() -> None:
+    word = _word()
+    enqueue_word_assets([word.pk], kinds=[Kind.IMAGE])
+
+    task = claim_task([Kind.IMAGE], "worker:1")
+    assert task is not None
+    with mock.patch.object(
+        generation_queue, "generate_word_image", side_effect=RuntimeError("boom")
+    ):
+        assert run_task(task)
+
+    task.refresh_from_db()
+    assert task.status == Status.PENDING
+    assert task.attempts == 1
+    assert task.next_run_at > timezone.now()
+    assert task.lease_owner == ""
+    assert "boom" in task.last_error
+    # Not due before the backoff expired
+    assert claim_task([Kind.IMAGE], "worker:1") is None
+
+
+@pytest.mark.django_db
+def test_task_fails_after_max_attempts() -> None:
+    word = _word()
+    enqueue_word_assets([word.pk], kinds=[Kind.IMAGE])
+    GenerationTask.objects.update(attempts=MAX_ATTEMPTS - 1)
+
+    task = claim_task([Kind.IMAGE], "worker:1")
+    assert task is not None
+    with mock.patch.object(
+        generation_queue, "generate_word_image", side_effect=RuntimeError("boom")
+    ):
+        run_task(task)
+
+    task.refresh_from_db()
+    assert task.status == Status.FAILED
+    assert task.attempts == MAX_ATTEMPTS
+    assert task.finished_at is not None
+
+
+@pytest.mark.django_db
+def test_rate_limited_task_does_not_count_as_attempt() -> None:
+    word = _word()
+    enqueue_word_assets([word.pk], kinds=[Kind.AUDIO])
+
+    task = claim_task([Kind.AUDIO], "worker:1")
+    assert task is not None
+    with (
+        mock.patch.object(
+            generation_queue, "generate_word_audio", side_effect=_rate_limit_error()
+        ),
+        mock.patch.object(generation_queue, "get_bucket") as get_bucket,
+    ):
+        assert run_task(task)
+
+    get_bucket.return_value.pause.assert_called_once_with(7.0)
+    task.refresh_from_db()
+    assert task.status == Status.PENDING
+    assert task.attempts == 0
+    assert task.next_run_at > timezone.now() + timedelta(seconds=5)
+
+
+@pytest.mark.django_db
+def test_expired_lease_is_taken_over() -> None:
+    word = _word()
+    enqueue_word_assets([word.pk], kinds=[Kind.IMAGE])
+    GenerationTask.objects.update(
+        lease_owner="crashed:1",
+        lease_expires_at=timezone.now() - timedelta(seconds=1),
+    )
+
+    task = claim_task([Kind.IMAGE], "worker:1")
+
+    assert task is not None
+    assert task.lease_owner == "worker:1"
+
+
+@pytest.mark.django_db
+def test_queue_stats() -> None:
+    hammer, saw = _word("Hammer"), _word("Säge")
+    enqueue_word_assets([hammer.pk, saw.pk], kinds=[Kind.AUDIO])
+    GenerationTask.objects.filter(word=hammer).update(status=Status.DONE)
+
+    stats = {row["label"]: row for row in queue_stats(GenerationTask.objects.all())}
+
+    assert stats[Kind.AUDIO.label] == {
+        "label": Kind.AUDIO.label,
+        "pending": 1,
+        "done": 1,
+        "failed": 0,
+        "progress": 50,
+    }
+    assert stats[Kind.IMAGE.label]["progress"] == 100
+
+
+def test_polling_threads_become_idle() -> None:
+    """Threads which find no task don't keep each other from exiting."""
+
+    def claim_nothing(*_args: object) -> None:
+        time.sleep(0.005)
+
+    worker = GenerationWorker(poll_interval=0, exit_when_idle=True)
+    timeout = threading.Timer(10, worker.stop)
+    timeout.start()
+    started = time.monotonic()
+    with (
+        mock.patch.object(generation_queue, "claim_task", side_effect=claim_nothing),
+        mock.patch.object(
+            connection.features, "has_select_for_update_skip_locked", True
+        ),
+    ):
+        worker.run()
+    timeout.cancel()
+
+    assert time.monotonic() - started < 5
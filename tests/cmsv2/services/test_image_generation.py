@@ -6,17 +6,23 @@ from __future__ import annotations
 
 import threading
 from collections.abc import Generator
+from datetime import timedelta
 from pathlib import Path
 from typing import Any
 from unittest import mock
 
 import pytest
 from django.core.files.base import ContentFile
+from django.utils import timezone
 from pytest_django.fixtures import SettingsWrapper
 
-from lunes_cms.cmsv2.models import Word
+from lunes_cms.cmsv2.models import GenerationTask, Job, Word
 from lunes_cms.cmsv2.models import word as word_module
 from lunes_cms.cmsv2.services import image_generation
+from lunes_cms.cmsv2.services.generation_queue import (
+    enqueue_word_assets,
+    GenerationWorker,
+)
 from lunes_cms.cmsv2.utils import OpenAIConfigurationError
 
 
@@ -38,8 +44,7 @@ def fast_worker(
     transactional_db: None, settings: SettingsWrapper, tmp_path: Path
 ) -> Generator[None, None, None]:
     """
-    Strip the throttle so tests don't sleep, start from an empty Word table,
-    and write media to an isolated temp dir.
+    Start from an empty Word table and write media to an isolated temp dir.
 
     The worker scans the *whole* Word table. The session-scoped ``test_data``
     fixture plus ``transaction=True`` (no rollback between tests) can leave rows
@@ -48,24 +53,29 @@ def fast_worker(
     """
     settings.MEDIA_ROOT = str(tmp_path)
     Word.objects.all().delete()
-    with mock.patch.object(image_generation, "time") as mocked_time:
-        mocked_time.sleep = lambda _seconds: None
-        yield
+    yield
 
 
-def _run_drain(word_ids: list[int] | None = None) -> None:
+def _run_drain(word_ids: list[int] | None = None, job_title: str | None = None) -> None:
     """
-    Run the worker in a thread, like it runs in production.
+    Enqueue image tasks and run the worker in a thread until it is idle,
+    like ``run_generation_worker --once``.
 
-    ``drain_pending_images`` calls ``connection.close()`` on exit (it returns
-    the DB connection of its worker thread); calling it inline would close the
-    *test's* connection. All worker tests are ``transaction=True`` so the
-    worker thread sees committed data.
+    The worker calls ``connection.close()`` on exit (it returns the DB
+    connection of its thread); calling it inline would close the *test's*
+    connection. All worker tests are ``transaction=True`` so the worker thread
+    sees committed data.
     """
-    thread = threading.Thread(
-        target=image_generation.drain_pending_images,
-        kwargs={"word_ids": word_ids, "throttle_seconds": 0},
+    job = Job.objects.get_or_create(name=job_title)[0] if job_title else None
+    enqueue_word_assets(
+        word_ids if word_ids is not None else Word.objects.values_list("pk", flat=True),
+        job=job,
+        kinds=[GenerationTask.Kind.IMAGE],
+    )
+    worker = GenerationWorker(
+        kinds=[GenerationTask.Kind.IMAGE], poll_interval=0.01, exit_when_idle=True
     )
+    thread = threading.Thread(target=worker.run)
     thread.start()
     thread.join(timeout=10)
     assert not thread.is_alive()
@@ -182,7 +192,7 @@ def test_drain_does_not_repick_a_failed_row(fast_worker: None) -> None:
 
     word.refresh_from_db()
     assert not word.image
-    # Tried exactly once this pass, then parked in failed_pks (no money-burning loop).
+    # Tried exactly once, then rescheduled with a backoff (no money-burning loop).
     assert image_call.call_count == 1
 
 
@@ -204,19 +214,18 @@ def test_drain_only_processes_given_word_ids(fast_worker: None) -> None:
 
 
 @pytest.mark.django_db(transaction=True)
-def test_drain_is_single_flight(fast_worker: None) -> None:
-    _make_word(word="Hammer")
+def test_worker_skips_tasks_leased_by_another_worker(fast_worker: None) -> None:
+    word = _make_word(word="Hammer")
+    enqueue_word_assets([word.pk], kinds=[GenerationTask.Kind.IMAGE])
+    GenerationTask.objects.update(
+        lease_owner="other-node:1",
+        lease_expires_at=timezone.now() + timedelta(minutes=5),
+    )
 
-    image_generation._drain_lock.acquire()  # pylint: disable=protected-access
-    try:
-        with mock.patch.object(
-            image_generation, "openai_word_image_bytes"
-        ) as image_call:
-            # Lock already held -> should return immediately, doing nothing.
-            _run_drain()
-        assert image_call.call_count == 0
-    finally:
-        image_generation._drain_lock.release()  # pylint: disable=protected-access
+    with mock.patch.object(image_generation, "openai_word_image_bytes") as image_call:
+        # The task is in progress elsewhere -> nothing to do.
+        _run_drain()
+    assert image_call.call_count == 0
 
 
 def test_build_image_prompt_includes_word_and_optional_hints() -> None:
@@ -258,16 +267,6 @@ def test_drain_passes_job_title_to_image_generation(fast_worker: None) -> None:
     with mock.patch.object(
         image_generation, "openai_word_image_bytes", return_value=b"png"
     ) as image_call:
-        thread = threading.Thread(
-            target=image_generation.drain_pending_images,
-            kwargs={
-                "word_ids": [imported.pk],
-                "throttle_seconds": 0,
-                "job_title": "Tischler/in",
-            },
-        )
-        thread.start()
-        thread.join(timeout=10)
-        assert not thread.is_alive()
+        _run_drain(word_ids=[imported.pk], job_title="Tischler/in")
 
     image_call.assert_called_once_with(mock.ANY, job_title="Tischler/in")
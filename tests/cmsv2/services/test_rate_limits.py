@@ -0,0 +1,140 @@
+"""
+Tests for the client-side rate limiting of OpenAI requests.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Generator
+from unittest import mock
+
+import httpx
+import pytest
+
+from lunes_cms.cmsv2.services import rate_limits
+
+
+class FakeClock:
+    """
+    Replaces ``time`` in the rate limit module, sleeping just advances the clock.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.slept: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> Generator[FakeClock, None, None]:
+    fake_clock = FakeClock()
+    with (
+        mock.patch.object(rate_limits, "time", fake_clock),
+        mock.patch.object(rate_limits, "_buckets", {}),
+    ):
+        yield fake_clock
+
+
+def _response(
+    status_code: int = 200, headers: dict[str, str] | None = None
+) -> httpx.Response:
+    request = httpx.Request(
+        "POST",
+        "https://api.openai.com/v1/audio/speech",
+        content=json.dumps({"model": "gpt-4o-mini-tts", "input": "Hammer"}),
+    )
+    return httpx.Response(status_code, headers=headers, request=request)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("1s", 1.0), ("6m0s", 360.0), ("20ms", 0.02), ("1h2m3.5s", 3723.5), ("", 0.0)],
+)
+def test_parse_duration(value: str, expected: float) -> None:
+    assert rate_limits.parse_duration(value) == pytest.approx(expected)
+
+
+def test_unknown_limits_do_not_block(clock: FakeClock) -> None:
+    bucket = rate_limits.TokenBucket()
+
+    for _ in range(100):
+        bucket.acquire()
+
+    assert not clock.slept
+
+
+def test_bucket_adopts_limits_from_headers(clock: FakeClock) -> None:
+    rate_limits.record_rate_limits(
+        _response(
+            headers={
+                "x-ratelimit-limit-requests": "60",
+                "x-ratelimit-remaining-requests": "2",
+                "x-ratelimit-reset-requests": "58s",
+            }
+        )
+    )
+    bucket = rate_limits.get_bucket("gpt-4o-mini-tts")
+
+    bucket.acquire()
+    bucket.acquire()
+    assert not clock.slept
+    # The bucket is empty, the next token is added after a second
+    bucket.acquire()
+    assert clock.slept == [pytest.approx(1.0)]
+
+
+def test_rate_limited_response_pauses_the_model(clock: FakeClock) -> None:
+    rate_limits.record_rate_limits(_response(429, headers={"retry-after": "7"}))
+
+    rate_limits.get_bucket("gpt-4o-mini-tts").acquire()
+
+    assert clock.slept == [pytest.approx(7.0)]
+    # Other models are not affected
+    rate_limits.get_bucket("gpt-image-2").acquire()
+    assert len(clock.slept) == 1
+
+
+def test_depleted_token_limit_pauses_the_model(clock: FakeClock) -> None:
+    rate_limits.record_rate_limits(
+        _response(
+            headers={
+                "x-ratelimit-remaining-tokens": "0",
+                "x-ratelimit-reset-tokens": "1.5s",
+            }
+        )
+    )
+
+    rate_limits.get_bucket("gpt-4o-mini-tts").acquire()
+
+    assert clock.slept == [pytest.approx(1.5)]
+
+
+def test_request_hook_takes_a_token(clock: FakeClock) -> None:
+    rate_limits.record_rate_limits(
+        _response(
+            headers={
+                "x-ratelimit-limit-requests": "60",
+                "x-ratelimit-remaining-requests": "5",
+                "x-ratelimit-reset-requests": "55s",
+            }
+        )
+    )
+
+    rate_limits.limit_request(_response().request)
+
+    assert rate_limits.get_bucket("gpt-4o-mini-tts").tokens == pytest.approx(4.0)
+
+
+def test_requests_without_model_are_ignored(clock: FakeClock) -> None:
+    request = httpx.Request("GET", "https://api.openai.com/v1/models")
+
+    rate_limits.limit_request(request)
+    rate_limits.record_rate_limits(httpx.Response(429, request=request))
+
+    assert not rate_limits._buckets  # pylint: disable=protected-access
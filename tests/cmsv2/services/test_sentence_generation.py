@@ -6,14 +6,20 @@ from __future__ import annotations
 
 import threading
 from collections.abc import Generator
+from datetime import timedelta
 from typing import Any
 from unittest import mock
 
 import pytest
 from django.conf import settings
+from django.utils import timezone
 
-from lunes_cms.cmsv2.models import Job, Unit, Word
+from lunes_cms.cmsv2.models import GenerationTask, Job, Unit, Word
 from lunes_cms.cmsv2.services import sentence_generation
+from lunes_cms.cmsv2.services.generation_queue import (
+    enqueue_word_assets,
+    GenerationWorker,
+)
 from lunes_cms.cmsv2.utils import OpenAIConfigurationError
 
 
@@ -100,35 +106,36 @@ def test_generation_raises_on_empty_response(content: str | None) -> None:
 @pytest.fixture
 def fast_worker(transactional_db: None) -> Generator[None, None, None]:
     """
-    Strip the throttle so tests don't sleep, and start from an empty Word table.
+    Start from an empty Word table.
 
     The worker scans the *whole* Word table. The session-scoped ``test_data``
     fixture plus ``transaction=True`` (no rollback between tests) can leave rows
     around, so wipe them first to keep these tests isolated.
     """
     Word.objects.all().delete()
-    with mock.patch.object(sentence_generation, "time") as mocked_time:
-        mocked_time.sleep = lambda _seconds: None
-        yield
+    yield
 
 
 def _run_drain(word_ids: list[int] | None = None, job_title: str | None = None) -> None:
     """
-    Run the worker in a thread, like it runs in production.
+    Enqueue example sentence tasks and run the worker in a thread until it is
+    idle, like ``run_generation_worker --once``.
 
-    ``drain_pending_sentences`` calls ``connection.close()`` on exit (it returns
-    the DB connection of its worker thread); calling it inline would close the
-    *test's* connection. All worker tests are ``transaction=True`` so the worker
-    thread sees committed data.
+    The worker calls ``connection.close()`` on exit (it returns the DB
+    connection of its thread); calling it inline would close the *test's*
+    connection. All worker tests are ``transaction=True`` so the worker thread
+    sees committed data.
     """
-    thread = threading.Thread(
-        target=sentence_generation.drain_pending_sentences,
-        kwargs={
-            "word_ids": word_ids,
-            "throttle_seconds": 0,
-            "job_title": job_title,
-        },
+    job = Job.objects.get_or_create(name=job_title)[0] if job_title else None
+    enqueue_word_assets(
+        word_ids if word_ids is not None else Word.objects.values_list("pk", flat=True),
+        job=job,
+        kinds=[GenerationTask.Kind.SENTENCE],
+    )
+    worker = GenerationWorker(
+        kinds=[GenerationTask.Kind.SENTENCE], poll_interval=0.01, exit_when_idle=True
     )
+    thread = threading.Thread(target=worker.run)
     thread.start()
     thread.join(timeout=10)
     assert not thread.is_alive()
@@ -273,7 +280,7 @@ def test_drain_does_not_repick_a_failed_row(fast_worker: None) -> None:
 
     word.refresh_from_db()
     assert word.example_sentence == ""
-    # Tried exactly once, then parked in failed_pks (no money-burning loop).
+    # Tried exactly once, then rescheduled with a backoff (no money-burning loop).
     assert gen.call_count == 1
 
 
@@ -301,14 +308,15 @@ def test_drain_skips_words_with_empty_word(fast_worker: None) -> None:
 
 
 @pytest.mark.django_db(transaction=True)
-def test_drain_is_single_flight(fast_worker: None) -> None:
-    _make_word(word="Hammer")
+def test_worker_skips_tasks_leased_by_another_worker(fast_worker: None) -> None:
+    word = _make_word(word="Hammer")
+    enqueue_word_assets([word.pk], kinds=[GenerationTask.Kind.SENTENCE])
+    GenerationTask.objects.update(
+        lease_owner="other-node:1",
+        lease_expires_at=timezone.now() + timedelta(minutes=5),
+    )
 
-    sentence_generation._drain_lock.acquire()  # pylint: disable=protected-access
-    try:
-        with mock.patch.object(sentence_generation, "openai_example_sentence") as gen:
-            # Lock already held -> should return immediately, doing nothing.
-            _run_drain(job_title="Tischler")
-        assert gen.call_count == 0
-    finally:
-        sentence_generation._drain_lock.release()  # pylint: disable=protected-access
+    with mock.patch.object(sentence_generation, "openai_example_sentence") as gen:
+        # The task is in progress elsewhere -> nothing to do.
+        _run_drain(job_title="Tischler")
+    assert gen.call_count == 0
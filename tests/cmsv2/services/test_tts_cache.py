@@ -0,0 +1,117 @@
+"""
+Tests for the content-addressed cache of generated text-to-speech audio.
+"""
+
+from __future__ import annotations
+
+import os
+from unittest import mock
+
+import pytest
+from pytest_django.fixtures import SettingsWrapper
+
+from lunes_cms.cmsv2.services import audio_generation, tts_cache
+
+
+def _fake_client(audio: bytes) -> mock.MagicMock:
+    client = mock.MagicMock()
+    client.audio.speech.create.return_value.iter_bytes.return_value = [audio]
+    return client
+
+
+def test_identical_request_is_served_from_the_cache() -> None:
+    client = _fake_client(b"raw-mp3")
+    with (
+        mock.patch.object(audio_generation, "get_openai_client", return_value=client),
+        mock.patch.object(
+            audio_generation, "normalize_loudness", return_value=b"normalized-mp3"
+        ) as normalize,
+    ):
+        first = audio_generation.openai_word_audio_bytes("der Hammer")
+        second = audio_generation.openai_word_audio_bytes("der Hammer")
+
+    assert first == second == b"normalized-mp3"
+    assert client.audio.speech.create.call_count == 1
+    assert normalize.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "setting, value",
+    [
+        ("OPENAI_TTS_VOICE", "alloy"),
+        ("OPENAI_TTS_MODEL", "tts-1"),
+        ("OPENAI_TTS_LOUDNESS_LUFS", -20.0),
+    ],
+)
+def test_changed_inputs_miss_the_cache(
+    settings: SettingsWrapper, setting: str, value: str | float
+) -> None:
+    client = _fake_client(b"raw-mp3")
+    with (
+        mock.patch.object(audio_generation, "get_openai_client", return_value=client),
+        mock.patch.object(
+            audio_generation, "normalize_loudness", side_effect=lambda data, _lufs: data
+        ),
+    ):
+        audio_generation.openai_word_audio_bytes("der Hammer")
+        setattr(settings, setting, value)
+        audio_generation.openai_word_audio_bytes("der Hammer")
+
+    assert client.audio.speech.create.call_count == 2
+
+
+def test_hits_and_misses_are_counted() -> None:
+    key = tts_cache.cache_key(input="der Hammer")
+    before = tts_cache.stats()
+
+    assert tts_cache.load(key) is None
+    tts_cache.store(key, b"mp3")
+    assert tts_cache.load(key) == b"mp3"
+
+    after = tts_cache.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(settings: SettingsWrapper) -> None:
+    settings.OPENAI_TTS_CACHE_SIZE = 1
+    data = b"x" * 300 * 1024
+    keys = [tts_cache.cache_key(input=str(i)) for i in range(3)]
+    for age, key in zip([300, 200, 100], keys):
+        tts_cache.store(key, data)
+        path = tts_cache._path(key)  # pylint: disable=protected-access
+        os.utime(path, (path.stat().st_atime - age, path.stat().st_mtime - age))
+    # Reading the oldest entry makes it the most recently used one
+    assert tts_cache.load(keys[0]) == data
+
+    tts_cache.store(tts_cache.cache_key(input="3"), data)
+
+    assert tts_cache.load(keys[0]) == data
+    assert tts_cache.load(keys[1]) is None
+    assert tts_cache.load(keys[2]) == data
+
+
+def test_cache_is_only_scanned_when_it_is_full(settings: SettingsWrapper) -> None:
+    settings.OPENAI_TTS_CACHE_SIZE = 1
+    data = b"x" * 300 * 1024
+    with mock.patch.object(
+        tts_cache,
+        "_evict",
+        wraps=tts_cache._evict,  # pylint: disable=protected-access
+    ) as evict:
+        for i in range(3):
+            tts_cache.store(tts_cache.cache_key(input=str(i)), data)
+        assert evict.call_count == 1
+
+        tts_cache.store(tts_cache.cache_key(input="3"), data)
+        assert evict.call_count == 2
+
+
+def test_cache_can_be_disabled(settings: SettingsWrapper) -> None:
+    settings.OPENAI_TTS_CACHE_SIZE = 0
+    key = tts_cache.cache_key(input="der Hammer")
+
+    tts_cache.store(key, b"mp3")
+
+    assert tts_cache.load(key) is None
+    assert not os.path.exists(settings.OPENAI_TTS_CACHE_DIR)
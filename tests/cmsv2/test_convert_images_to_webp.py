@@ -0,0 +1,155 @@
+"""
+Tests for the command converting existing images to WebP.
+"""
+
+from __future__ import annotations
+
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from PIL import Image
+from pytest_django.fixtures import SettingsWrapper
+
+from lunes_cms.cmsv2.content_version import get_job_versions
+from lunes_cms.cmsv2.models import Job, Unit, Word
+from lunes_cms.cmsv2.models.unit import UnitWordRelation
+
+
+@pytest.fixture
+def media(settings: SettingsWrapper, tmp_path: Path) -> Path:
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    (tmp_path / "media" / "images").mkdir(parents=True)
+    return tmp_path / "media"
+
+
+def _word_with_image(media: Path, name: str) -> Word:
+    """Create a word with a PNG image, bypassing the conversion on save."""
+    Image.new("RGB", (64, 64), "red").save(media / "images" / f"{name}.png")
+    word = Word.objects.create(word=name, singular_article=1)
+    Word.objects.filter(pk=word.pk).update(image=f"images/{name}.png")
+    word.refresh_from_db()
+    return word
+
+
+def _convert(tmp_path: Path, **options: object) -> None:
+    call_command(
+        "convert_images_to_webp",
+        **{
+            "workers": 1,
+            "batch_size": 2,
+            "progress_file": str(tmp_path / "progress.json"),
+            **options,
+        },
+    )
+
+
+@pytest.mark.django_db
+def test_images_are_converted(media: Path, tmp_path: Path) -> None:
+    words = [_word_with_image(media, name) for name in ("Hammer", "Säge", "Zange")]
+    job = Job.objects.create(name="Handwerk")
+    unit = Unit.objects.create(title="Werkzeug")
+    unit.jobs.add(job)
+    relation = UnitWordRelation.objects.create(unit=unit, word=words[0])
+    Image.new("RGB", (64, 64), "blue").save(media / "images" / "relation.jpg")
+    UnitWordRelation.objects.filter(pk=relation.pk).update(image="images/relation.jpg")
+    version = get_job_versions([job.pk])[job.pk]
+
+    _convert(tmp_path)
+
+    for word in words:
+        modified_at = word.modified_at
+        word.refresh_from_db()
+        assert word.image.name == f"images/{word.word}.webp"
+        assert word.modified_at > modified_at
+        with Image.open(word.image.path) as img:
+            assert img.format == "WEBP"
+    relation.refresh_from_db()
+    assert relation.image.name == "images/relation.webp"
+    # The originals are deleted
+    assert sorted(path.name for path in (media / "images").glob("*[!w].*")) == [
+        "Hammer.webp",
+        "Säge.webp",
+        "Zange.webp",
+        "relation.webp",
+    ]
+    assert (media / "images" / "Hammer_256w.webp").exists()
+    assert get_job_versions([job.pk])[job.pk] != version
+    # The progress of a completed run is removed
+    assert not (tmp_path / "progress.json").exists()
+
+
+@pytest.mark.django_db
+def test_conversion_in_worker_processes(media: Path, tmp_path: Path) -> None:
+    words = [_word_with_image(media, name) for name in ("Hammer", "Säge", "Zange")]
+
+    _convert(tmp_path, workers=2)
+
+    assert sorted(Word.objects.values_list("image", flat=True)) == sorted(
+        f"images/{word.word}.webp" for word in words
+    )
+
+
+@pytest.mark.django_db
+def test_invalid_images_are_skipped(media: Path, tmp_path: Path) -> None:
+    broken = _word_with_image(media, "Hammer")
+    (media / "images" / "Hammer.png").write_bytes(b"no image")
+    word = _word_with_image(media, "Säge")
+
+    _convert(tmp_path)
+
+    broken.refresh_from_db()
+    word.refresh_from_db()
+    assert broken.image.name == "images/Hammer.png"
+    assert word.image.name == "images/Säge.webp"
+    # The next run tries the broken image again
+    stdout = StringIO()
+    _convert(tmp_path, stdout=stdout)
+    assert "failed: 1" in stdout.getvalue()
+
+
+@pytest.mark.django_db
+def test_interrupted_run_is_resumed(media: Path, tmp_path: Path) -> None:
+    words = [_word_with_image(media, name) for name in ("Hammer", "Säge", "Zange")]
+    (tmp_path / "progress.json").write_text(json.dumps({"words": words[1].pk}))
+
+    _convert(tmp_path)
+
+    assert list(Word.objects.order_by("pk").values_list("image", flat=True)) == [
+        "images/Hammer.png",
+        "images/Säge.png",
+        "images/Zange.webp",
+    ]
+
+    _convert(tmp_path, restart=True)
+
+    assert not Word.objects.exclude(image__endswith=".webp").exists()
+
+
+@pytest.mark.django_db
+def test_limit_and_dry_run(media: Path, tmp_path: Path) -> None:
+    _word_with_image(media, "Hammer")
+    _word_with_image(media, "Säge")
+
+    _convert(tmp_path, dry_run=True)
+    assert not Word.objects.filter(image__endswith=".webp").exists()
+
+    _convert(tmp_path, limit=1)
+    assert Word.objects.filter(image__endswith=".webp").count() == 1
+    progress = json.loads((tmp_path / "progress.json").read_text())
+    assert progress == {"words": Word.objects.get(image__endswith=".webp").pk}
+
+
+@pytest.mark.django_db
+def test_missing_copies_of_webp_images_are_created(media: Path, tmp_path: Path) -> None:
+    Image.new("RGB", (64, 64), "red").save(media / "images" / "Hammer.webp")
+    word = Word.objects.create(word="Hammer", singular_article=1)
+    Word.objects.filter(pk=word.pk).update(image="images/Hammer.webp")
+
+    _convert(tmp_path)
+
+    assert (media / "images" / "Hammer_64w.webp").exists()
+    word.refresh_from_db()
+    assert word.image.name == "images/Hammer.webp"
@@ -0,0 +1,83 @@
+"""
+Tests for the downscaled copies of word and unit-word images.
+"""
+
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from django.core.files.base import ContentFile
+from PIL import Image
+from pytest_django.fixtures import SettingsWrapper
+
+from lunes_cms.cmsv2.models import Word
+from lunes_cms.cmsv2.utils import (
+    get_image_derivative,
+    get_image_tag,
+    image_derivative_name,
+    IMAGE_SIZES,
+)
+
+
+def _png(width: int, height: int) -> ContentFile:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), "red").save(buffer, format="PNG")
+    return ContentFile(buffer.getvalue())
+
+
+def _derivative_name(word: Word, size: int) -> str:
+    assert word.image.name is not None
+    return image_derivative_name(word.image.name, size)
+
+
+@pytest.fixture
+def word(settings: SettingsWrapper, tmp_path: Path) -> Word:
+    settings.MEDIA_ROOT = str(tmp_path)
+    word = Word.objects.create(word="Hammer", singular_article=1)
+    word.image.save("hammer.png", _png(800, 400))
+    return word
+
+
+@pytest.mark.django_db
+def test_converted_image_has_downscaled_copies(word: Word) -> None:
+    assert word.image.name is not None
+    assert word.image.name.endswith(".webp")
+    sizes = {}
+    for size in IMAGE_SIZES:
+        with Image.open(word.image.storage.path(_derivative_name(word, size))) as img:
+            sizes[size] = img.size
+    # The copies fit into a square of their size, but are never upscaled
+    assert sizes == {64: (64, 32), 256: (256, 128), 512: (512, 256), 1024: (800, 400)}
+
+
+@pytest.mark.django_db
+def test_uploaded_webp_image_gets_downscaled_copies(
+    settings: SettingsWrapper, tmp_path: Path
+) -> None:
+    settings.MEDIA_ROOT = str(tmp_path)
+    buffer = BytesIO()
+    Image.new("RGB", (300, 300), "blue").save(buffer, format="WEBP")
+    word = Word.objects.create(word="Säge", singular_article=2)
+    word.image.save("saege.webp", ContentFile(buffer.getvalue()))
+
+    assert word.image.storage.exists(_derivative_name(word, 64))
+
+
+@pytest.mark.django_db
+def test_smallest_large_enough_copy_is_used(word: Word) -> None:
+    assert get_image_derivative(word.image, 50).name == _derivative_name(word, 64)
+    assert get_image_derivative(word.image, 300).name == _derivative_name(word, 512)
+    # Larger than all copies
+    assert get_image_derivative(word.image, 2000) == word.image
+    # The admin thumbnails use the copies
+    assert _derivative_name(word, 64) in get_image_tag(word.image, 50)
+
+
+@pytest.mark.django_db
+def test_image_without_copies_is_used_as_is(word: Word) -> None:
+    for size in IMAGE_SIZES:
+        word.image.storage.delete(_derivative_name(word, size))
+
+    assert get_image_derivative(word.image, 64) == word.image
@@ -0,0 +1,148 @@
+"""
+Tests for the command normalizing existing audio to a new loudness.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from pytest_django.fixtures import SettingsWrapper
+
+from lunes_cms.cmsv2.content_version import get_job_versions
+from lunes_cms.cmsv2.management.commands import renormalize_audio_loudness
+from lunes_cms.cmsv2.models import Job, Unit, Word
+from lunes_cms.cmsv2.models.unit import UnitWordRelation
+
+TARGET = -16.0
+
+
+@pytest.fixture
+def words(settings: SettingsWrapper, tmp_path: Path) -> list[Word]:
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    words = []
+    for name in ("Hammer", "Säge", "Zange"):
+        word = Word.objects.create(word=name, singular_article=1)
+        word.audio.save(f"{name}.mp3", ContentFile(b"audio"))
+        words.append(word)
+    return words
+
+
+def _renormalize(tmp_path: Path, **options: object) -> None:
+    call_command(
+        "renormalize_audio_loudness",
+        target=TARGET,
+        workers=1,
+        batch_size=2,
+        progress_file=str(tmp_path / "progress.json"),
+        **options,
+    )
+
+
+@pytest.fixture
+def normalize() -> Iterator[mock.MagicMock]:
+    with mock.patch.object(
+        renormalize_audio_loudness, "normalize_loudness", return_value=b"normalized"
+    ) as normalize:
+        yield normalize
+
+
+@pytest.mark.django_db
+def test_audio_is_replaced_and_marked_as_modified(
+    words: list[Word], normalize: mock.MagicMock, tmp_path: Path
+) -> None:
+    modified_at = [word.modified_at for word in words]
+    job = Job.objects.create(name="Handwerk")
+    unit = Unit.objects.create(title="Werkzeug")
+    unit.jobs.add(job)
+    UnitWordRelation.objects.create(unit=unit, word=words[0])
+    version = get_job_versions([job.pk])[job.pk]
+
+    _renormalize(tmp_path)
+
+    assert normalize.call_count == 3
+    for word, before in zip(words, modified_at):
+        word.refresh_from_db()
+        assert Path(word.audio.path).read_bytes() == b"normalized"
+        assert word.modified_at > before
+    # The progress of a completed run is removed
+    assert not (tmp_path / "progress.json").exists()
+    # Cached API responses containing the audio URLs are invalidated
+    assert get_job_versions([job.pk])[job.pk] != version
+
+
+@pytest.mark.django_db
+def test_interrupted_run_is_resumed(
+    words: list[Word], normalize: mock.MagicMock, tmp_path: Path
+) -> None:
+    (tmp_path / "progress.json").write_text(
+        json.dumps({"target": TARGET, "word audio": words[1].pk})
+    )
+
+    _renormalize(tmp_path)
+
+    assert normalize.call_count == 1
+    assert Path(words[0].audio.path).read_bytes() == b"audio"
+    assert Path(words[2].audio.path).read_bytes() == b"normalized"
+    assert not (tmp_path / "progress.json").exists()
+
+
+@pytest.mark.django_db
+def test_progress_of_another_target_is_ignored(
+    words: list[Word], normalize: mock.MagicMock, tmp_path: Path
+) -> None:
+    (tmp_path / "progress.json").write_text(
+        json.dumps({"target": -20.0, "word audio": words[-1].pk})
+    )
+
+    _renormalize(tmp_path)
+
+    assert normalize.call_count == len(words)
+
+
+@pytest.mark.django_db
+def test_limit_and_dry_run(
+    words: list[Word], normalize: mock.MagicMock, tmp_path: Path
+) -> None:
+    _renormalize(tmp_path, dry_run=True)
+    normalize.assert_not_called()
+    assert not (tmp_path / "progress.json").exists()
+
+    _renormalize(tmp_path, limit=1)
+    assert normalize.call_count == 1
+    assert Path(words[1].audio.path).read_bytes() == b"audio"
+    progress = json.loads((tmp_path / "progress.json").read_text())
+    assert progress == {"target": TARGET, "word audio": words[0].pk}
+
+
+@pytest.mark.django_db
+def test_normalized_and_invalid_audio_is_left_alone(
+    words: list[Word], normalize: mock.MagicMock, tmp_path: Path
+) -> None:
+    Path(words[0].audio.path).write_bytes(b"tagged")
+    Path(words[1].audio.path).write_bytes(b"invalid")
+
+    def fake_normalize(audio: bytes, target: float) -> bytes:
+        if audio == b"invalid":
+            raise ValidationError("invalid")
+        return b"normalized"
+
+    normalize.side_effect = fake_normalize
+    with mock.patch.object(
+        renormalize_audio_loudness,
+        "read_loudness_tag",
+        side_effect=lambda audio: {"input_i": "-16.02"} if audio == b"tagged" else None,
+    ):
+        _renormalize(tmp_path)
+
+    assert Path(words[0].audio.path).read_bytes() == b"tagged"
+    assert Path(words[1].audio.path).read_bytes() == b"invalid"
+    assert Path(words[2].audio.path).read_bytes() == b"normalized"
+    modified = Word.objects.filter(modified_at__gt=words[2].modified_at)
+    assert list(modified.values_list("pk", flat=True)) == [words[2].pk]
@@ -7,12 +7,16 @@ processing happens.
 
 from __future__ import annotations
 
+from pathlib import Path
+
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.test import Client
 from django.urls import reverse
+from pytest_django.fixtures import SettingsWrapper
 
-from lunes_cms.cmsv2.models import Job, Word
+from lunes_cms.cmsv2.models import CSVImport, GenerationTask, Job, Word
 
 
 def _upload(content: str) -> SimpleUploadedFile:
@@ -75,3 +79,73 @@ def test_valid_file_still_imports_successfully(admin_client: Client, job: Job) -
     messages = [str(m) for m in response.context["messages"]]
     assert any("import successful" in m.lower() for m in messages)
     assert Word.objects.filter(units__jobs=job, word="Hammer").exists()
+
+
+@pytest.mark.django_db()
+def test_import_enqueues_asset_generation(admin_client: Client, job: Job) -> None:
+    admin_client.post(
+        reverse("cmsv2:import_csv"),
+        {
+            "job": job.pk,
+            "csv_file": _upload("Einheit,Vokabel,Artikel\nWerkzeug,Hammer,der\n"),
+        },
+        follow=True,
+    )
+
+    tasks = GenerationTask.objects.filter(word__word="Hammer", job=job)
+    assert sorted(tasks.values_list("kind", flat=True)) == sorted(
+        GenerationTask.Kind.values
+    )
+    assert all(task.status == GenerationTask.Status.PENDING for task in tasks)
+
+
+@pytest.mark.django_db()
+def test_large_file_is_imported_in_the_background(
+    admin_client: Client, job: Job, settings: SettingsWrapper, tmp_path: Path
+) -> None:
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.CSV_IMPORT_BACKGROUND_SIZE = 10
+
+    response = admin_client.post(
+        reverse("cmsv2:import_csv"),
+        {
+            "job": job.pk,
+            "csv_file": _upload("Einheit,Vokabel,Artikel\nWerkzeug,Hammer,der\n"),
+        },
+    )
+
+    csv_import = CSVImport.objects.get(job=job)
+    progress_url = reverse("cmsv2:import_csv_progress", args=[csv_import.pk])
+    assert response.status_code == 302
+    assert response["Location"] == progress_url
+    assert not Word.objects.filter(units__jobs=job).exists()
+    assert admin_client.get(progress_url).status_code == 200
+
+    status_url = reverse("cmsv2:import_csv_status", args=[csv_import.pk])
+    assert admin_client.get(status_url).json()["status"] == "pending"
+
+    call_command("run_import_worker", once=True)
+
+    status = admin_client.get(status_url).json()
+    assert status["status"] == "done"
+    assert status["progress"] == 100
+    assert "import successful" in status["message"].lower()
+    assert Word.objects.filter(units__jobs=job, word="Hammer").exists()
+
+
+@pytest.mark.django_db()
+def test_large_file_with_wrong_header_is_rejected_before_queueing(
+    admin_client: Client, job: Job, settings: SettingsWrapper, tmp_path: Path
+) -> None:
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.CSV_IMPORT_BACKGROUND_SIZE = 10
+
+    response = admin_client.post(
+        reverse("cmsv2:import_csv"),
+        {"job": job.pk, "csv_file": _upload("Vokabel,Artikel\nHammer,der\n")},
+        follow=True,
+    )
+
+    messages = [str(m) for m in response.context["messages"]]
+    assert any("not in the correct format" in m.lower() for m in messages)
+    assert not CSVImport.objects.exists()
@@ -16,7 +16,8 @@ from django.core.files.base import ContentFile
 
 from lunes_cms.cms.models.document import Document
 from lunes_cms.cmsv2.models.word import Word
-from lunes_cms.core.audio import normalize_loudness
+from lunes_cms.core import audio
+from lunes_cms.core.audio import normalize_loudness, read_loudness_tag
 
 #: These tests invoke real ffmpeg/ffprobe, which aren't installed everywhere
 #: (e.g. CI). Skip rather than fail when the binaries are missing.
@@ -201,3 +202,166 @@ class TestNormalizeLoudness:
     def test_raises_validation_error_on_invalid_audio(self, tmp_path: Path) -> None:
         with pytest.raises(ValidationError):
             normalize_loudness(b"not-an-mp3", -16.0)
+
+    def test_renormalizes_tagged_clip_in_one_pass(self, tmp_path: Path) -> None:
+        normalized = normalize_loudness(_make_mp3(tmp_path, volume="0.2"), -16.0)
+        assert read_loudness_tag(normalized) is not None
+
+        with mock.patch.object(
+            audio, "run_ffmpeg", wraps=audio.run_ffmpeg
+        ) as run_ffmpeg:
+            renormalized = normalize_loudness(normalized, -20.0)
+
+        assert run_ffmpeg.call_count == 1
+        assert abs(_measure_lufs(renormalized, tmp_path) - (-20.0)) < 2.0
+
+
+def _id3_tag(*frames: tuple[bytes, bytes]) -> bytes:
+    """Build an ID3v2.4 header with the given frames, like ffmpeg writes it."""
+
+    def syncsafe(value: int) -> bytes:
+        return bytes((value >> shift) & 0x7F for shift in (21, 14, 7, 0))
+
+    body = b"".join(
+        frame_id + syncsafe(len(data)) + b"\0\0" + data for frame_id, data in frames
+    )
+    padding = b"\0" * 16
+    return b"ID3\4\0\0" + syncsafe(len(body) + len(padding)) + body + padding
+
+
+MEASUREMENT = {
+    "input_i": "-16.00",
+    "input_tp": "-4.10",
+    "input_lra": "2.30",
+    "input_thresh": "-26.50",
+    "target_offset": "0.00",
+    "sample_rate": "24000",
+    "bitrate": "160k",
+}
+
+#: What ffmpeg prints to stderr when measuring a generated clip
+MEASUREMENT_STDERR = b"""Input #0, mp3, from 'pipe:0':
+  Duration: N/A, start: 0.000000, bitrate: 160 kb/s
+  Stream #0:0: Audio: mp3 (mp3float), 24000 Hz, mono, fltp, 160 kb/s
+Stream mapping:
+  Stream #0:0 -> #0:0 (mp3 (mp3float) -> pcm_s16le (native))
+Output #0, null, to 'pipe:':
+  Stream #0:0: Audio: pcm_s16le, 48000 Hz, mono, s16, 768 kb/s
+[Parsed_loudnorm_0 @ 0x1]
+{
+\t"input_i" : "-27.61",
+\t"input_tp" : "-14.13",
+\t"input_lra" : "3.10",
+\t"input_thresh" : "-38.02",
+\t"output_i" : "-16.21",
+\t"output_tp" : "-1.50",
+\t"output_lra" : "2.90",
+\t"output_thresh" : "-26.61",
+\t"normalization_type" : "dynamic",
+\t"target_offset" : "0.21"
+}
+"""
+
+
+#: What ffmpeg prints to stderr when applying the measurement to a generated clip
+APPLY_STDERR = b"""[Parsed_loudnorm_0 @ 0x1]
+{
+\t"input_i" : "-27.61",
+\t"input_tp" : "-14.13",
+\t"input_lra" : "3.10",
+\t"input_thresh" : "-38.02",
+\t"output_i" : "-16.02",
+\t"output_tp" : "-2.54",
+\t"output_lra" : "3.00",
+\t"output_thresh" : "-26.43",
+\t"normalization_type" : "linear",
+\t"target_offset" : "0.02"
+}
+"""
+
+
+def _completed(stdout: bytes = b"", stderr: bytes = b"") -> mock.MagicMock:
+    return mock.MagicMock(stdout=stdout, stderr=stderr)
+
+
+class TestLoudnessTag:
+    def test_reads_measurement_from_txxx_frame(self) -> None:
+        tag = _id3_tag(
+            (b"TSSE", b"\0Lavf61.7.100\0"),
+            (b"TXXX", b"\0loudnorm\0" + json.dumps(MEASUREMENT).encode() + b"\0"),
+        )
+
+        assert read_loudness_tag(tag + b"\xff\xfbmp3-frames") == MEASUREMENT
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"\xff\xfbmp3-frames",
+            _id3_tag((b"TXXX", b"\0comment\0hello\0")),
+            _id3_tag((b"TXXX", b"\0loudnorm\0not json\0")),
+            _id3_tag((b"TXXX", b'\0loudnorm\0{"input_i": "-16.0"}\0')),
+        ],
+    )
+    def test_ignores_audio_without_measurement(self, data: bytes) -> None:
+        assert read_loudness_tag(data) is None
+
+    def test_writes_tag_read_by_read_loudness_tag(self) -> None:
+        tag = audio._loudness_tag(MEASUREMENT)  # pylint: disable=protected-access
+
+        assert read_loudness_tag(tag + b"\xff\xfbmp3-frames") == MEASUREMENT
+
+    def test_measures_and_applies_without_probing(self) -> None:
+        with mock.patch.object(
+            audio,
+            "run_ffmpeg",
+            side_effect=[
+                _completed(stderr=MEASUREMENT_STDERR),
+                _completed(stdout=b"normalized", stderr=APPLY_STDERR),
+            ],
+        ) as run_ffmpeg:
+            normalized = normalize_loudness(b"raw", -16.0)
+
+        assert run_ffmpeg.call_count == 2
+        apply_args = run_ffmpeg.call_args.args
+        assert apply_args[apply_args.index("-ar") + 1] == "24000"
+        assert apply_args[apply_args.index("-b:a") + 1] == "160k"
+        # ffmpeg's own tag is replaced by one with the loudness of the output
+        assert apply_args[apply_args.index("-id3v2_version") + 1] == "0"
+        assert normalized.endswith(b"normalized")
+        stored = read_loudness_tag(normalized)
+        assert stored is not None
+        assert stored["input_i"] == "-16.02"
+        assert stored["input_tp"] == "-2.54"
+        assert stored["sample_rate"] == "24000"
+
+    def test_no_measurement_is_stored_without_output_statistics(self) -> None:
+        with mock.patch.object(
+            audio,
+            "run_ffmpeg",
+            side_effect=[
+                _completed(stderr=MEASUREMENT_STDERR),
+                _completed(stdout=b"normalized"),
+            ],
+        ):
+            assert normalize_loudness(b"raw", -16.0) == b"normalized"
+
+    def test_tagged_audio_is_normalized_in_one_pass(self) -> None:
+        tagged = _id3_tag(
+            (b"TXXX", b"\0loudnorm\0" + json.dumps(MEASUREMENT).encode() + b"\0")
+        )
+        with mock.patch.object(
+            audio,
+            "run_ffmpeg",
+            return_value=_completed(stdout=b"renormalized", stderr=APPLY_STDERR),
+        ) as run_ffmpeg:
+            renormalized = normalize_loudness(tagged, -20.0)
+
+        run_ffmpeg.assert_called_once()
+        apply_args = run_ffmpeg.call_args.args
+        loudnorm = apply_args[apply_args.index("-af") + 1]
+        assert "measured_I=-16.00" in loudnorm
+        assert apply_args[apply_args.index("-b:a") + 1] == "160k"
+        assert renormalized.endswith(b"renormalized")
+        stored = read_loudness_tag(renormalized)
+        assert stored is not None
+        assert stored["bitrate"] == "160k"
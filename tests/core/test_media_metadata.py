@@ -0,0 +1,117 @@
+"""
+Tests for the request-scoped cache of media file metadata.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.core.files.storage import FileSystemStorage
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+
+from lunes_cms.core import media_metadata
+from lunes_cms.core.media_metadata import (
+    file_exists,
+    file_modified_time,
+    LISTING_THRESHOLD,
+    media_metadata_cache,
+    MediaMetadataMiddleware,
+)
+
+
+@pytest.fixture
+def storage(tmp_path: Path) -> FileSystemStorage:
+    (tmp_path / "hammer.webp").write_bytes(b"image")
+    os.utime(tmp_path / "hammer.webp", (1_700_000_000, 1_700_000_000))
+    return FileSystemStorage(location=str(tmp_path))
+
+
+def _lookups(storage: FileSystemStorage) -> tuple[bool, bool, float]:
+    return (
+        file_exists(storage, "hammer.webp"),
+        file_exists(storage, "missing.webp"),
+        file_modified_time(storage, "hammer.webp"),
+    )
+
+
+def test_each_file_is_looked_up_once(storage: FileSystemStorage) -> None:
+    with mock.patch.object(media_metadata.os, "stat", wraps=os.stat) as stat:
+        assert _lookups(storage) == (True, False, 1_700_000_000)
+        assert stat.call_count == 3
+
+        stat.reset_mock()
+        with media_metadata_cache():
+            assert _lookups(storage) == _lookups(storage)
+        assert stat.call_count == 2
+
+
+def test_single_file_of_large_directory_is_not_listed(
+    storage: FileSystemStorage, tmp_path: Path
+) -> None:
+    for i in range(2000):
+        (tmp_path / f"image_{i}.webp").write_bytes(b"")
+
+    with (
+        mock.patch.object(media_metadata.os, "stat", wraps=os.stat) as stat,
+        mock.patch.object(media_metadata.os, "scandir", wraps=os.scandir) as scandir,
+        media_metadata_cache(),
+    ):
+        assert file_exists(storage, "image_1999.webp")
+        assert file_exists(storage, "image_1999.webp")
+
+    assert (stat.call_count, scandir.call_count) == (1, 0)
+
+
+def test_directory_is_listed_for_many_files(
+    storage: FileSystemStorage, tmp_path: Path
+) -> None:
+    names = [f"image_{i}.webp" for i in range(LISTING_THRESHOLD * 2)]
+    for name in names[::2]:
+        (tmp_path / name).write_bytes(b"")
+
+    with (
+        mock.patch.object(media_metadata.os, "stat", wraps=os.stat) as stat,
+        mock.patch.object(media_metadata.os, "scandir", wraps=os.scandir) as scandir,
+        media_metadata_cache(),
+    ):
+        assert [file_exists(storage, name) for name in names] == [
+            i % 2 == 0 for i in range(len(names))
+        ]
+        assert file_modified_time(storage, "hammer.webp") == 1_700_000_000
+
+    assert (stat.call_count, scandir.call_count) == (LISTING_THRESHOLD + 1, 1)
+
+
+def test_missing_file_has_no_modified_time(storage: FileSystemStorage) -> None:
+    with media_metadata_cache(), pytest.raises(FileNotFoundError):
+        file_modified_time(storage, "missing.webp")
+
+
+def test_remote_storage_is_asked_once() -> None:
+    remote = mock.Mock()
+    remote.exists.return_value = True
+
+    with media_metadata_cache():
+        assert file_exists(remote, "hammer.webp")
+        assert file_exists(remote, "hammer.webp")
+
+    remote.exists.assert_called_once_with("hammer.webp")
+
+
+@pytest.mark.parametrize(("method", "stats"), [("get", 1), ("post", 2)])
+def test_middleware_caches_reading_requests(
+    storage: FileSystemStorage, method: str, stats: int
+) -> None:
+    def view(_request: HttpRequest) -> HttpResponse:
+        file_exists(storage, "hammer.webp")
+        file_exists(storage, "hammer.webp")
+        return HttpResponse()
+
+    with mock.patch.object(media_metadata.os, "stat", wraps=os.stat) as stat:
+        MediaMetadataMiddleware(view)(getattr(RequestFactory(), method)("/"))
+
+    assert stat.call_count == stats